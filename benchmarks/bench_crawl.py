@@ -0,0 +1,343 @@
+"""
+Benchmark Crawler.crawl end to end against a synthetic site, served offline
+through an httpx.MockTransport so every run crawls exactly the same pages.
+
+The site is generated from its page count, links per page, page size, response
+latency and the fraction of pages answering 503 Service Unavailable, which are
+retried then recorded as failed. Page 0 is the base URL and every page links to
+its children in a tree, so the whole site is reachable, topped up with links
+across the site to the links per page.
+
+Each round crawls the site in a fresh process, reporting pages per second, the
+median and 99th percentile latency of fetching and parsing a page, the peak
+resident memory of the process and the CPU time spent per page. The median of
+each result across rounds is printed, and written with every round to a JSON
+file to compare against a run of another version with --baseline.
+
+Run from the repository root with:
+
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import importlib.metadata
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from multiprocessing import get_context
+from typing import Any
+
+import httpx
+
+from sitemappy.crawler import Crawler
+from sitemappy.link_scraper import DEFAULT_REQUEST_TIMEOUT_S
+
+BASE_URL = "https://example.com"
+PAGE_PREFIX = "/page-"
+
+DEFAULT_PAGES = 5_000
+DEFAULT_FAN_OUT = 20
+DEFAULT_PAGE_BYTES = 20 * 1024
+DEFAULT_LATENCY_MS = 10.0
+DEFAULT_ERROR_RATE = 0.01
+DEFAULT_WORKERS = 10
+DEFAULT_ROUNDS = 3
+
+# Results where a larger value is better, the rest are better smaller
+HIGHER_IS_BETTER = {"pages_per_second"}
+
+
+@dataclass(frozen=True)
+class SyntheticSite:
+    """
+    Shape of a synthetic site, generating each page when it is requested.
+    """
+
+    pages: int = DEFAULT_PAGES
+    fan_out: int = DEFAULT_FAN_OUT
+    page_bytes: int = DEFAULT_PAGE_BYTES
+    latency_ms: float = DEFAULT_LATENCY_MS
+    error_rate: float = DEFAULT_ERROR_RATE
+
+    def links(self, index: int) -> list[int]:
+        """
+        :return: Pages the page links to, its children then pages across the site
+        """
+        first_child = index * self.fan_out + 1
+        links = list(range(first_child, min(first_child + self.fan_out, self.pages)))
+
+        links += [
+            (index * 7919 + link * 104729) % self.pages
+            for link in range(self.fan_out - len(links))
+        ]
+
+        return links
+
+    def is_error(self, index: int) -> bool:
+        """
+        :return: True if the page answers 503, never the base URL
+        """
+        # Spread the failing pages across the site by a multiplicative hash
+        return index > 0 and (index * 2654435761 % 2**32) / 2**32 < self.error_rate
+
+    def page(self, index: int, filler: bytes) -> bytes:
+        """
+        :param index: Page to generate
+        :param filler: Text to pad pages out to their size with, sliced from a
+            different offset on each page so pages are not identical
+        :return: Encoded HTML page
+        """
+        anchors = "".join(
+            f"<li><a href='{PAGE_PREFIX}{link}'>Page {link}</a></li>"
+            for link in self.links(index)
+        )
+        head = (
+            f"<html><head><title>Page {index}</title></head><body>"
+            f"<h1>Page {index}</h1><ul>{anchors}</ul><p>"
+        ).encode()
+        tail = b"</p></body></html>"
+
+        padding = max(0, self.page_bytes - len(head) - len(tail))
+        offset = index * 7919 % (len(filler) - padding + 1)
+
+        return head + filler[offset : offset + padding] + tail
+
+    def filler(self) -> bytes:
+        """
+        :return: Text twice the size of a page, to slice padding from
+        """
+        words = b" ".join(f"word{index * 31 % 997}".encode() for index in range(997))
+
+        return (words * (2 * self.page_bytes // len(words) + 1))[: 2 * self.page_bytes]
+
+    def transport(self) -> httpx.MockTransport:
+        """
+        :return: Transport serving the site after the latency of each response
+        """
+        filler = self.filler()
+        latency = self.latency_ms / 1000
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            index = 0 if path == "/" else None
+
+            if path.startswith(PAGE_PREFIX) and path[len(PAGE_PREFIX) :].isdigit():
+                index = int(path[len(PAGE_PREFIX) :])
+
+            if latency:
+                await asyncio.sleep(latency)
+
+            if index is None or index >= self.pages:
+                return httpx.Response(HTTPStatus.NOT_FOUND)
+
+            if self.is_error(index):
+                return httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE)
+
+            return httpx.Response(
+                HTTPStatus.OK,
+                headers={"Content-Type": "text/html; charset=utf-8"},
+                content=self.page(index, filler),
+            )
+
+        return httpx.MockTransport(handle)
+
+
+@dataclass(frozen=True)
+class CrawlerOptions:
+    """
+    Options of the crawler benchmarked.
+    """
+
+    workers: int = DEFAULT_WORKERS
+    streaming: bool = False
+    parse_workers: int = 0
+
+
+def cpu_seconds() -> float:
+    """
+    :return: User and system CPU time of this process and its finished children,
+        such as parse workers
+    """
+    return sum(
+        usage.ru_utime + usage.ru_stime
+        for usage in (
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+        )
+    )
+
+
+def peak_rss_mib() -> float:
+    """
+    :return: Peak resident memory of this process
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Reported in bytes on macOS, and KiB elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def time_pages(
+    get_links: Callable[[str], Coroutine[Any, Any, list[str]]],
+    latencies: list[float],
+) -> Callable[[str], Coroutine[Any, Any, list[str]]]:
+    """
+    :return: get_links, recording the seconds each page took to fetch and parse
+    """
+
+    async def timed_get_links(url: str) -> list[str]:
+        started_at = time.perf_counter()
+        try:
+            return await get_links(url)
+        finally:
+            latencies.append(time.perf_counter() - started_at)
+
+    return timed_get_links
+
+
+async def crawl(site: SyntheticSite, options: CrawlerOptions) -> dict[str, float]:
+    """
+    Crawl the site once, measuring it.
+
+    :return: Results of the crawl
+    """
+    crawler = Crawler(
+        BASE_URL,
+        number_of_workers=options.workers,
+        stream_links=options.streaming,
+        parse_workers=options.parse_workers,
+    )
+
+    # Serve the site offline, in place of the network
+    crawler.client = crawler.scraper.client = httpx.AsyncClient(
+        transport=site.transport(), timeout=DEFAULT_REQUEST_TIMEOUT_S
+    )
+
+    latencies: list[float] = []
+    crawler.scraper.get_links = time_pages(  # type: ignore[method-assign, assignment]
+        crawler.scraper.get_links, latencies
+    )
+
+    cpu_started_at = cpu_seconds()
+    started_at = time.perf_counter()
+    results = await crawler.crawl()
+    elapsed = time.perf_counter() - started_at
+    cpu = cpu_seconds() - cpu_started_at
+
+    pages = len(results)
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+
+    return {
+        "pages_crawled": pages,
+        "pages_failed": len(crawler.failures),
+        "elapsed_s": elapsed,
+        "pages_per_second": pages / elapsed,
+        "latency_p50_ms": percentiles[49] * 1000 if percentiles else 0.0,
+        "latency_p99_ms": percentiles[98] * 1000 if percentiles else 0.0,
+        "peak_rss_mib": peak_rss_mib(),
+        "cpu_ms_per_page": cpu / pages * 1000 if pages else 0.0,
+    }
+
+
+def run_round(site: SyntheticSite, options: CrawlerOptions) -> dict[str, float]:
+    return asyncio.run(crawl(site, options))
+
+
+def run(site: SyntheticSite, options: CrawlerOptions, rounds: int) -> dict[str, Any]:
+    """
+    Crawl the site for each round, each in a new process so the peak memory of
+    one round does not carry over to the next.
+
+    :return: Machine-readable results of every round and their medians
+    """
+    results = []
+
+    for _ in range(rounds):
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            results.append(executor.submit(run_round, site, options).result())
+
+    try:
+        version = importlib.metadata.version("sitemappy-cli")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    return {
+        "version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "site": asdict(site),
+        "crawler": asdict(options),
+        "rounds": results,
+        "median": {
+            name: statistics.median(result[name] for result in results)
+            for name in results[0]
+        },
+    }
+
+
+def print_results(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    header = f"{'result':>16} {'median':>12}"
+    print(header + f" {'baseline':>12} {'change':>8}" if baseline else header)
+
+    for name, value in results["median"].items():
+        line = f"{name:>16} {value:>12.2f}"
+
+        if baseline and baseline["median"].get(name):
+            before = baseline["median"][name]
+            change = value / before - 1
+            better = change > 0 if name in HIGHER_IS_BETTER else change < 0
+            line += f" {before:>12.2f} {change:>+7.1%}" + (" *" if better else "")
+
+        print(line)
+
+    if baseline and (baseline["site"], baseline["crawler"]) != (
+        results["site"],
+        results["crawler"],
+    ):
+        print("The baseline crawled a different site or with different options")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES)
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT)
+    parser.add_argument("--page-bytes", type=int, default=DEFAULT_PAGE_BYTES)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_ERROR_RATE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--parse-workers", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="JSON results of a run to compare to")
+    args = parser.parse_args()
+
+    results = run(
+        SyntheticSite(
+            args.pages, args.fan_out, args.page_bytes, args.latency_ms, args.error_rate
+        ),
+        CrawlerOptions(args.workers, args.streaming, args.parse_workers),
+        args.rounds,
+    )
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
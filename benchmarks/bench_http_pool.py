@@ -0,0 +1,133 @@
+"""
+Benchmark the requests per second AsyncScraper achieves against a local test
+server at different worker counts, with httpx's default connection pool, a pool
+sized to the worker count by create_http_client, and a sized pool keeping every
+connection alive.
+
+The server adds a fixed latency to every response, as a remote site would, so
+throughput is bound by how many requests are in flight at once.
+
+Run from the repository root with:
+
+    python benchmarks/bench_http_pool.py
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from sitemappy.link_scraper import AsyncScraper, create_http_client
+
+HOST = "127.0.0.1"
+
+DEFAULT_WORKER_COUNTS = [10, 50, 100, 200]
+DEFAULT_REQUESTS = 2_000
+DEFAULT_LATENCY_MS = 200
+
+PAGE = b"".join(
+    f"<a href='/page-{index}'>Page {index}</a>".encode() for index in range(20)
+)
+
+
+async def serve_page(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float
+) -> None:
+    """
+    Serve the same page for every request on a keep-alive HTTP/1.1 connection.
+    """
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(latency)
+
+            keep_alive = b"connection: close" not in request.lower()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/html; charset=utf-8\r\n"
+                + f"Content-Length: {len(PAGE)}\r\n".encode()
+                + (b"\r\n" if keep_alive else b"Connection: close\r\n\r\n")
+                + PAGE
+            )
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def measure_request_rate(
+    client: httpx.AsyncClient, base_url: str, workers: int, requests: int
+) -> float:
+    """
+    Fetch and parse pages with concurrent workers until the number of requests
+    has been made.
+
+    :return: Requests per second achieved
+    """
+    scraper = AsyncScraper(base_url, client=client)
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+
+        while remaining > 0:
+            remaining -= 1
+            await scraper.get_links(f"{base_url}/page-{remaining}")
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started_at
+
+    await client.aclose()
+
+    return requests / elapsed
+
+
+async def run(worker_counts: list[int], requests: int, latency_ms: int) -> None:
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_page(reader, writer, latency_ms / 1000),
+        HOST,
+        0,
+    )
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://{HOST}:{port}"
+
+    print(
+        f"{'workers':>8} {'default req/s':>14} {'sized req/s':>12} "
+        f"{'all keep-alive req/s':>21} {'speed-up':>9}"
+    )
+
+    async with server:
+        for workers in worker_counts:
+            default_rate = await measure_request_rate(
+                httpx.AsyncClient(), base_url, workers, requests
+            )
+            sized_rate = await measure_request_rate(
+                create_http_client(workers), base_url, workers, requests
+            )
+            keepalive_rate = await measure_request_rate(
+                create_http_client(workers, keepalive_connections=workers),
+                base_url,
+                workers,
+                requests,
+            )
+
+            print(
+                f"{workers:>8} {default_rate:>14.1f} {sized_rate:>12.1f} "
+                f"{keepalive_rate:>21.1f} {sized_rate / default_rate:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKER_COUNTS)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--latency-ms", type=int, default=DEFAULT_LATENCY_MS)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.workers, args.requests, args.latency_ms))
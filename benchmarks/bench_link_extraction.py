@@ -0,0 +1,132 @@
+"""
+Benchmark the BeautifulSoup and streaming link extraction paths of AsyncScraper
+on large synthetic pages.
+
+Run from the repository root with:
+
+    python benchmarks/bench_link_extraction.py
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+
+import httpx
+
+from sitemappy.link_scraper import AsyncScraper
+
+BASE_URL = "https://example.com"
+CHUNK_SIZE_BYTES = 64 * 1024
+
+DEFAULT_PAGE_SIZES_MB = [1, 5, 10]
+DEFAULT_ROUNDS = 3
+
+
+def generate_page(size_bytes: int) -> bytes:
+    """
+    Generate a synthetic page of roughly the given size, mixing navigation links,
+    paragraphs of text and non-anchor markup.
+
+    :param size_bytes: Approximate size of the page
+    :return: Encoded HTML page
+    """
+    blocks = []
+    total = 0
+    index = 0
+
+    while total < size_bytes:
+        block = (
+            f"<div class='card'><h2>Article {index}</h2>"
+            f"<img src='/images/{index}.png' alt='Article {index}'>"
+            f"<p>{'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4}</p>"
+            f"<a href='/articles/{index}'>Read more</a> "
+            f"<a href='https://example.com/tags/{index % 50}'>Tag</a></div>\n"
+        )
+        blocks.append(block)
+        total += len(block)
+        index += 1
+
+    return f"<html><body>{''.join(blocks)}</body></html>".encode()
+
+
+def client_for(content: bytes) -> httpx.AsyncClient:
+    async def chunks() -> AsyncIterator[bytes]:
+        for index in range(0, len(content), CHUNK_SIZE_BYTES):
+            yield content[index : index + CHUNK_SIZE_BYTES]
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda _: httpx.Response(HTTPStatus.OK, content=chunks())
+        )
+    )
+
+
+async def measure_time(content: bytes, streaming: bool) -> tuple[float, int]:
+    """
+    Extract the links of a page once, measuring the time taken.
+
+    :return: Seconds taken and number of links
+    """
+    scraper = AsyncScraper(BASE_URL, client=client_for(content), streaming=streaming)
+
+    started_at = time.perf_counter()
+    links = await scraper.get_links(BASE_URL)
+
+    return time.perf_counter() - started_at, len(links)
+
+
+async def measure_peak_memory(content: bytes, streaming: bool) -> float:
+    """
+    Extract the links of a page once with tracemalloc enabled. Tracing slows
+    extraction down, so this is measured separately to the time taken.
+
+    :return: Peak traced memory in MB
+    """
+    scraper = AsyncScraper(BASE_URL, client=client_for(content), streaming=streaming)
+
+    tracemalloc.start()
+    await scraper.get_links(BASE_URL)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 1024 / 1024
+
+
+async def run(page_sizes_mb: list[int], rounds: int) -> None:
+    print(
+        f"{'page':>8} {'mode':>14} {'links':>8} {'best s':>8} "
+        f"{'peak MB':>8} {'speed-up':>9}"
+    )
+
+    for size_mb in page_sizes_mb:
+        content = generate_page(size_mb * 1024 * 1024)
+        best: dict[bool, tuple[float, int]] = {}
+        peaks: dict[bool, float] = {}
+
+        for streaming in (False, True):
+            results = [await measure_time(content, streaming) for _ in range(rounds)]
+            best[streaming] = min(results)
+            peaks[streaming] = await measure_peak_memory(content, streaming)
+
+        for streaming, (elapsed, links) in best.items():
+            peak_mb = peaks[streaming]
+            speed_up = best[False][0] / elapsed
+            mode = "streaming" if streaming else "beautifulsoup"
+            print(
+                f"{size_mb:>6}MB {mode:>14} {links:>8} {elapsed:>8.3f} "
+                f"{peak_mb:>8.1f} {speed_up:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--page-sizes-mb", type=int, nargs="+", default=DEFAULT_PAGE_SIZES_MB
+    )
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.page_sizes_mb, args.rounds))
@@ -0,0 +1,97 @@
+"""
+Benchmark the memory used to hold the results of a crawl as a dict of pages to
+lists of links, against a LinkGraph interning every URL.
+
+Every page of the synthetic site links to the site's navigation and to a few
+other pages, as a real site's pages do, so most links are shared between pages.
+
+Run from the repository root with:
+
+    python benchmarks/bench_link_graph.py
+"""
+
+import argparse
+import tracemalloc
+from collections.abc import Callable, Iterator
+
+from sitemappy.link_graph import LinkGraph
+
+BASE_URL = "https://example.com"
+
+DEFAULT_PAGES = 100_000
+DEFAULT_NAVIGATION_LINKS = 30
+DEFAULT_CONTENT_LINKS = 10
+
+
+def crawled_pages(
+    pages: int, navigation_links: int, content_links: int
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    Generate the pages of a synthetic site and their links, with every URL
+    built as a new string, as it would be when parsed from a page.
+    """
+    for index in range(pages):
+        links = [f"{BASE_URL}/section-{link}" for link in range(navigation_links)]
+        links += [
+            f"{BASE_URL}/page-{(index * 7919 + link * 104729) % pages}"
+            for link in range(content_links)
+        ]
+
+        yield f"{BASE_URL}/page-{index}", links
+
+
+def measure_memory(
+    store: Callable[[Iterator[tuple[str, list[str]]]], object],
+    pages: Iterator[tuple[str, list[str]]],
+) -> int:
+    """
+    :return: Bytes still allocated once every page has been stored
+    """
+    tracemalloc.start()
+    results = store(pages)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del results
+
+    return allocated
+
+
+def store_dict(pages: Iterator[tuple[str, list[str]]]) -> dict[str, list[str]]:
+    return dict(pages)
+
+
+def store_link_graph(pages: Iterator[tuple[str, list[str]]]) -> LinkGraph:
+    graph = LinkGraph()
+
+    for page, links in pages:
+        graph.add(page, links)
+
+    return graph
+
+
+def run(pages: int, navigation_links: int, content_links: int) -> None:
+    dict_bytes = measure_memory(
+        store_dict, crawled_pages(pages, navigation_links, content_links)
+    )
+    graph_bytes = measure_memory(
+        store_link_graph, crawled_pages(pages, navigation_links, content_links)
+    )
+
+    print(f"{'pages':>8} {'dict MiB':>9} {'LinkGraph MiB':>14} {'reduction':>10}")
+    print(
+        f"{pages:>8} {dict_bytes / 2**20:>9.1f} {graph_bytes / 2**20:>14.1f} "
+        f"{dict_bytes / graph_bytes:>9.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES)
+    parser.add_argument(
+        "--navigation-links", type=int, default=DEFAULT_NAVIGATION_LINKS
+    )
+    parser.add_argument("--content-links", type=int, default=DEFAULT_CONTENT_LINKS)
+    args = parser.parse_args()
+
+    run(args.pages, args.navigation_links, args.content_links)
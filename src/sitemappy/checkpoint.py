@@ -0,0 +1,157 @@
+import json
+import os
+import time
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+DEFAULT_CHECKPOINT_INTERVAL_S = 5.0
+
+ENQUEUED = "enqueued"
+CRAWLED = "crawled"
+LISTED = "listed"
+REDIRECT_TARGET = "redirect_target"
+
+# Bytes read at a time while looking back for the end of the last whole event
+TRUNCATE_CHUNK_BYTES = 64 * 1024
+
+
+def truncate_partial_event(path: str) -> None:
+    """
+    Truncate a journal after its last whole event, dropping an event partially
+    written when a crawl was interrupted, so events appended to it start on a
+    line of their own.
+
+    :param path: Journal file, which may not exist
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, "rb+") as journal_file:
+        position = journal_file.seek(0, os.SEEK_END)
+
+        while position > 0:
+            start = max(position - TRUNCATE_CHUNK_BYTES, 0)
+            journal_file.seek(start)
+            newline = journal_file.read(position - start).rfind(b"\n")
+
+            if newline != -1:
+                journal_file.truncate(start + newline + 1)
+                return
+
+            position = start
+
+        journal_file.truncate(0)
+
+
+class CrawlJournal:
+    """
+    An append-only journal of the pages enqueued and crawled by a Crawler, from
+    which a crawl can be resumed.
+
+    Each event is a line of JSON. Events are buffered in memory and appended to
+    the file once the flush interval has passed, so taking a checkpoint only
+    writes the events since the last one rather than the whole crawl state.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        append: bool = False,
+        flush_interval: float = DEFAULT_CHECKPOINT_INTERVAL_S,
+    ):
+        """
+        Open a journal, creating it if it does not exist.
+
+        :param path: Journal file
+        :param append: Append to an existing journal rather than replacing it
+            *(default: False)*
+        :param flush_interval: Seconds between appending recorded events to the
+            journal file *(default: 5)*
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+
+        if append:
+            truncate_partial_event(path)
+
+        # Closed by close()
+        self._file: TextIO = open(path, "a" if append else "w")
+        self._pending: list[str] = []
+        self._flushed_at = time.monotonic()
+
+    def record_enqueued(self, url: str, depth: int) -> None:
+        """
+        Record a page being added to the crawl queue.
+
+        :param url: Page added to the queue
+        :param depth: Depth of links from the base URL the page was found at
+        """
+        self._record(json.dumps({ENQUEUED: url, "depth": depth}))
+
+    def record_crawled(
+        self,
+        url: str,
+        links: list[str],
+        listed: bool = True,
+        redirect_target: bool = False,
+    ) -> None:
+        """
+        Record a page having been crawled.
+
+        :param url: Page that was crawled
+        :param links: Links gathered from the page
+        :param listed: Whether the page belongs in a sitemap *(default: True)*
+        :param redirect_target: Whether the page was crawled by fetching a page
+            redirected to it, which is recorded as crawled too *(default: False)*
+        """
+        event: dict[str, Any] = {CRAWLED: url, "links": links}
+
+        # Only written for the few pages left out or redirected to, to keep
+        # events small
+        if not listed:
+            event[LISTED] = False
+
+        if redirect_target:
+            event[REDIRECT_TARGET] = True
+
+        self._record(json.dumps(event))
+
+    def _record(self, event: str) -> None:
+        self._pending.append(event)
+
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Append the events recorded since the last flush to the journal file.
+        """
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._file.flush()
+            self._pending = []
+
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flush any recorded events and close the journal file.
+        """
+        self.flush()
+        self._file.close()
+
+    @staticmethod
+    def replay(path: str) -> Iterator[dict[str, Any]]:
+        """
+        Read the events of a journal in the order they were recorded.
+
+        :param path: Journal file
+        :return: Iterator of events, a partially written final event from an
+            interrupted crawl is skipped
+        """
+        with open(path) as journal_file:
+            for line in journal_file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
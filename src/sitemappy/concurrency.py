@@ -0,0 +1,210 @@
+"""
+An adaptive limit on the requests a crawl has in flight, grown while the server
+keeps up and cut back when it shows signs of overload.
+"""
+
+import asyncio
+import time
+from collections import deque
+from http import HTTPStatus
+from types import TracebackType
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 100
+
+# Responses asking the crawler to back off
+OVERLOAD_STATUSES = frozenset(
+    {HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE}
+)
+
+DEFAULT_BACKOFF = 0.5
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_MAX_ERROR_RATE = 0.1
+
+# Weight of each new response in the smoothed latency and error rate
+SMOOTHING = 0.1
+
+
+class AdaptiveConcurrency:
+    """
+    An additive-increase, multiplicative-decrease (AIMD) limit on concurrent
+    requests, used as an async context manager around each request.
+
+    While every allowed request is in flight, the limit grows by one for every
+    limit's worth of healthy responses. It is multiplied by the backoff on a 429
+    or 503 response, a failed request, an error rate above the maximum, or
+    latency rising beyond the tolerance of the fastest response seen.
+
+    Decreases are spaced at least one smoothed latency apart, so a burst of
+    failures from requests already in flight only counts once.
+    """
+
+    def __init__(  # noqa: PLR0913 - Each tuning parameter of the controller
+        self,
+        initial: int,
+        min_concurrency: int = DEFAULT_MIN_CONCURRENCY,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        *,
+        backoff: float = DEFAULT_BACKOFF,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    ):
+        """
+        Initialise a new adaptive concurrency limit.
+
+        :param initial: Concurrent requests to start with, clamped to the bounds
+        :param min_concurrency: Fewest concurrent requests to shrink to
+            *(default: 1)*
+        :param max_concurrency: Most concurrent requests to grow to
+            *(default: 100)*
+        :param backoff: Fraction of the limit kept when it is decreased
+            *(default: 0.5)*
+        :param latency_tolerance: Multiple of the fastest response time the
+            smoothed response time may rise to before the limit is decreased
+            *(default: 2)*
+        :param max_error_rate: Smoothed fraction of responses that may be server
+            errors before the limit is decreased *(default: 0.1)*
+        """
+        if min_concurrency > max_concurrency:
+            raise ValueError("Minimum concurrency is above the maximum concurrency")
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+
+        self._limit = float(min(max(initial, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+        self._min_latency: float | None = None
+        self._smoothed_latency = 0.0
+        self._error_rate = 0.0
+        self._decreased_at = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """
+        :return: Requests currently allowed in flight at once
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :return: Requests currently in flight
+        """
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """
+        Wait, without blocking the event loop, until a request is allowed.
+        """
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Pass on the wake up this request will not use
+                    self._wake_waiters()
+                raise
+
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """
+        Mark a request as finished, letting a waiting request through.
+        """
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
+
+    def record_response(self, status_code: int, latency: float) -> None:
+        """
+        Adjust the limit for a response.
+
+        :param status_code: HTTP status of the response
+        :param latency: Seconds between sending the request and receiving the
+            response headers
+        """
+        server_error = status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        self._error_rate += SMOOTHING * (server_error - self._error_rate)
+
+        if status_code in OVERLOAD_STATUSES or self._error_rate > self.max_error_rate:
+            self._decrease()
+            return
+
+        if self._min_latency is None:
+            self._min_latency = self._smoothed_latency = latency
+
+        self._min_latency = min(self._min_latency, latency)
+        self._smoothed_latency += SMOOTHING * (latency - self._smoothed_latency)
+
+        if self._smoothed_latency > self._min_latency * self.latency_tolerance:
+            self._decrease()
+        else:
+            self._increase()
+
+    def record_error(self) -> None:
+        """
+        Adjust the limit for a request that failed without a response, such as
+        a timeout or refused connection.
+        """
+        self._error_rate += SMOOTHING * (1 - self._error_rate)
+        self._decrease()
+
+    def _increase(self) -> None:
+        # Only grow a limit that is in use, rather than while the crawl is
+        # waiting on pages to crawl
+        if self._limit >= self.max_concurrency or self._in_flight < self.limit:
+            return
+
+        previous_limit = self.limit
+        self._limit = min(self._limit + 1 / self._limit, float(self.max_concurrency))
+
+        if self.limit > previous_limit:
+            self.increases += 1
+            self._wake_waiters()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+
+        if now - self._decreased_at < self._smoothed_latency:
+            return
+
+        self._decreased_at = now
+
+        if self._limit > self.min_concurrency:
+            self._limit = max(self._limit * self.backoff, float(self.min_concurrency))
+            self.decreases += 1
+
+    def _wake_waiters(self) -> None:
+        # Woken requests check the limit again, as another request may have
+        # taken the free slot first
+        for _ in range(self.limit - self._in_flight):
+            if not self._waiters:
+                break
+
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
@@ -0,0 +1,499 @@
+"""
+Distributed crawling, where worker nodes lease batches of URLs from a coordinator
+holding the shared frontier, seen set and results.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from .crawler import UNLIMITED_DEPTH, Crawler
+from .frontier import CrawlItem
+from .link_graph import LinkGraph
+from .link_scraper import scope_prefixes
+from .seen import SeenSetBackend, create_seen_set
+from .urls import canonicalize_url
+
+DEFAULT_COORDINATOR_HOST = "127.0.0.1"
+DEFAULT_COORDINATOR_PORT = 8765
+
+DEFAULT_LEASE_TIMEOUT_S = 60.0
+
+IDLE_POLL_INTERVAL_S = 0.5
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# A crawled page, the depth it was leased at and the links found on it
+CrawledPage = tuple[str, int, list[str]]
+
+
+class Coordinator(Protocol):
+    """
+    A coordinator holding the shared state of a distributed crawl.
+    """
+
+    async def lease(self, node_id: str, limit: int) -> list[CrawlItem]:
+        """
+        Lease a batch of pages to crawl.
+
+        :param node_id: Identifier of the node leasing the pages
+        :param limit: Maximum number of pages to lease
+        :return: Pages to crawl and their depth, empty if none are available
+        """
+        ...
+
+    async def submit(self, node_id: str, pages: list[CrawledPage]) -> None:
+        """
+        Submit the links found on leased pages, releasing their lease.
+
+        :param node_id: Identifier of the node submitting the pages
+        :param pages: Pages crawled by the node
+        """
+        ...
+
+    async def is_finished(self) -> bool:
+        """
+        :return: Whether every page has been crawled and no leases are held
+        """
+        ...
+
+    async def close(self) -> None:
+        """
+        Release any connection to the coordinator.
+        """
+        ...
+
+
+@dataclass
+class Lease:
+    """
+    A page leased to a node.
+    """
+
+    page: str
+    node_id: str
+    depth: int
+    leased_at: float
+
+
+class LocalCoordinator:
+    """
+    An in-memory coordinator, used directly by nodes in the same process or
+    served to remote nodes by a CoordinatorServer.
+
+    Leases expire after a timeout, so the pages of a node that has died are
+    crawled by another node. Once the frontier is empty, idle nodes steal pages
+    that have been leased to another node for over half the timeout, and the
+    first result submitted for a page is kept. Leases are held by canonical URL,
+    so a page recorded at a variant of the URL it was leased at, such as one
+    redirected to with a trailing slash, releases its lease.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        crawl_depth: int = UNLIMITED_DEPTH,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT_S,
+        seen_set: SeenSetBackend = SeenSetBackend.EXACT,
+    ):
+        """
+        Initialise a new coordinator, seeded with the base URL.
+
+        :param base_url: Website to crawl
+        :param crawl_depth: Depth of links from base URL to follow
+            *(default: 0 - unlimited)*
+        :param lease_timeout: Seconds before a leased page is reassigned
+            *(default: 60)*
+        :param seen_set: Storage backend for URLs that have already been seen
+            *(default: exact)*
+        """
+        self.base_url = base_url
+        self.crawl_depth = crawl_depth
+        self.lease_timeout = lease_timeout
+
+        self.results = LinkGraph()
+
+        self._scope_prefixes = scope_prefixes(base_url)
+        self._frontier: deque[CrawlItem] = deque([(base_url, 0)])
+        self._seen_urls = create_seen_set(seen_set)
+        self._seen_urls.add(canonicalize_url(base_url))
+        self._leases: dict[str, Lease] = {}
+
+    async def lease(self, node_id: str, limit: int) -> list[CrawlItem]:
+        now = time.monotonic()
+        self._reclaim_expired_leases(now)
+
+        items: list[CrawlItem] = []
+
+        while self._frontier and len(items) < limit:
+            page, depth = self._frontier.popleft()
+
+            # Expired leases may have been submitted after being reclaimed
+            if page not in self.results:
+                self._leases[canonicalize_url(page)] = Lease(page, node_id, depth, now)
+                items.append((page, depth))
+
+        if not items:
+            items = self._steal_leases(node_id, limit, now)
+
+        return items
+
+    async def submit(
+        self,
+        node_id: str,  # noqa: ARG002 - Part of the Coordinator protocol
+        pages: list[CrawledPage],
+    ) -> None:
+        for page, depth, links in pages:
+            self._leases.pop(canonicalize_url(page), None)
+
+            if page in self.results:
+                continue
+
+            self.results.add(page, links)
+
+            for link in links:
+                self._schedule(link, depth + 1)
+
+    async def is_finished(self) -> bool:
+        return not self._frontier and not self._leases
+
+    async def close(self) -> None:
+        pass
+
+    def status(self) -> dict[str, int]:
+        """
+        :return: Number of pages crawled, queued and leased
+        """
+        return {
+            "crawled": len(self.results),
+            "queued": len(self._frontier),
+            "leased": len(self._leases),
+        }
+
+    def _schedule(self, link: str, depth: int) -> None:
+        # Out of depth links are dropped here, rather than leased and skipped
+        if UNLIMITED_DEPTH < self.crawl_depth <= depth:
+            return
+
+        canonical_link = canonicalize_url(link)
+
+        if (
+            canonical_link.startswith(self._scope_prefixes)
+            and canonical_link not in self._seen_urls
+        ):
+            self._seen_urls.add(canonical_link)
+            self._frontier.append((link, depth))
+
+    def _reclaim_expired_leases(self, now: float) -> None:
+        expired = [
+            (canonical_page, lease)
+            for canonical_page, lease in self._leases.items()
+            if now - lease.leased_at >= self.lease_timeout
+        ]
+
+        for canonical_page, lease in expired:
+            del self._leases[canonical_page]
+            self._frontier.appendleft((lease.page, lease.depth))
+
+    def _steal_leases(self, node_id: str, limit: int, now: float) -> list[CrawlItem]:
+        stealable = sorted(
+            (
+                (lease.leased_at, canonical_page)
+                for canonical_page, lease in self._leases.items()
+                if lease.node_id != node_id
+                and now - lease.leased_at >= self.lease_timeout / 2
+            )
+        )[:limit]
+
+        items = []
+
+        for _, canonical_page in stealable:
+            lease = self._leases[canonical_page]
+            self._leases[canonical_page] = Lease(lease.page, node_id, lease.depth, now)
+            items.append((lease.page, lease.depth))
+
+        return items
+
+
+class CoordinatorServer:
+    """
+    A TCP server exposing a LocalCoordinator to remote nodes, using one JSON
+    message per line.
+    """
+
+    def __init__(self, coordinator: LocalCoordinator):
+        """
+        Initialise a new coordinator server.
+
+        :param coordinator: Coordinator to serve
+        """
+        self.coordinator = coordinator
+        self.port: int | None = None
+
+    async def serve(
+        self,
+        host: str = DEFAULT_COORDINATOR_HOST,
+        port: int = DEFAULT_COORDINATOR_PORT,
+    ) -> LinkGraph:
+        """
+        Serve the coordinator until the crawl has finished.
+
+        :param host: Interface to listen on
+        :param port: Port to listen on, 0 picks a free port which is then set as
+            CoordinatorServer.port
+        :return: *LinkGraph* - Map of pages that have been crawled and links
+            gathered from that page, across every node.
+        """
+        server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_MESSAGE_BYTES
+        )
+        self.port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            while not await self.coordinator.is_finished():
+                await asyncio.sleep(IDLE_POLL_INTERVAL_S)
+
+            # Give polling nodes the chance to see the crawl has finished
+            await asyncio.sleep(IDLE_POLL_INTERVAL_S * 2)
+
+        return self.coordinator.results
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self._handle_message(json.loads(line))
+                except (
+                    json.JSONDecodeError,
+                    AttributeError,
+                    KeyError,
+                    TypeError,
+                    ValueError,
+                ) as error:
+                    # A malformed message is answered with an error rather than
+                    # dropping the node's connection
+                    print(f"Malformed message from a node: {error!r}", file=sys.stderr)
+                    response = {"error": f"Malformed message: {error!r}"}
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        match message.get("op"):
+            case "lease":
+                items = await self.coordinator.lease(message["node"], message["limit"])
+                return {"items": items}
+            case "submit":
+                pages = [
+                    (page, depth, links) for page, depth, links in message["pages"]
+                ]
+                await self.coordinator.submit(message["node"], pages)
+                return {}
+            case "status":
+                return self.coordinator.status() | {
+                    "finished": await self.coordinator.is_finished()
+                }
+            case operation:
+                return {"error": f"Unknown operation {operation!r}"}
+
+
+class RemoteCoordinator:
+    """
+    A client for a coordinator served by a CoordinatorServer.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_COORDINATOR_HOST,
+        port: int = DEFAULT_COORDINATOR_PORT,
+    ):
+        """
+        Initialise a new remote coordinator client, connecting on first use.
+
+        :param host: Host of the coordinator server
+        :param port: Port of the coordinator server
+        """
+        self.host = host
+        self.port = port
+
+        self._connection: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None = (
+            None
+        )
+        self._lock = asyncio.Lock()
+
+    async def _request(self, message: dict[str, Any]) -> dict[str, Any]:
+        async with self._lock:
+            if self._connection is None:
+                self._connection = await asyncio.open_connection(
+                    self.host, self.port, limit=MAX_MESSAGE_BYTES
+                )
+
+            reader, writer = self._connection
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+
+            line = await reader.readline()
+
+        if not line:
+            raise ConnectionError("Coordinator closed the connection")
+
+        response: dict[str, Any] = json.loads(line)
+
+        if "error" in response:
+            raise RuntimeError(response["error"])
+
+        return response
+
+    async def lease(self, node_id: str, limit: int) -> list[CrawlItem]:
+        response = await self._request({"op": "lease", "node": node_id, "limit": limit})
+        return [(page, depth) for page, depth in response["items"]]
+
+    async def submit(self, node_id: str, pages: list[CrawledPage]) -> None:
+        await self._request({"op": "submit", "node": node_id, "pages": pages})
+
+    async def is_finished(self) -> bool:
+        response = await self._request({"op": "status"})
+        return bool(response["finished"])
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            _, writer = self._connection
+            writer.close()
+            await writer.wait_closed()
+            self._connection = None
+
+
+def default_node_id() -> str:
+    """
+    :return: Identifier for this process, unique across machines
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class NodeCrawler(Crawler):
+    """
+    A Crawler that leases pages from a coordinator and submits the links found
+    on them, leaving scheduling of the links to the coordinator.
+
+    Pages are leased as workers free up and submitted as they finish, so a slow
+    page only holds up the worker crawling it.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        coordinator: Coordinator,
+        node_id: str | None = None,
+        **crawler_kwargs: Any,
+    ):
+        """
+        Initialise a new distributed crawl node.
+
+        :param base_url: Website to crawl
+        :param coordinator: Coordinator to lease pages from, closed once the
+            crawl has finished
+        :param node_id: Identifier of this node
+            *(default: None - host name and process ID)*
+        :param crawler_kwargs: Arguments for the Crawler
+        """
+        super().__init__(base_url, **crawler_kwargs)
+
+        self.coordinator = coordinator
+        self.node_id = node_id or default_node_id()
+
+        # Leased pages once crawled, skipped or failed
+        self._finished: asyncio.Queue[CrawlItem] = asyncio.Queue()
+
+    async def _enqueue(self, link: str, depth: int) -> None:
+        # Links are scheduled by the coordinator when the page is submitted
+        pass
+
+    async def _claim_redirect_target(self, target: str, depth: int) -> bool:  # noqa: ARG002
+        # The page redirected to is scheduled by the coordinator, from the link
+        # submitted for the page redirected from
+        return False
+
+    async def _crawl_page(self, page_to_crawl: str, depth: int) -> None:
+        try:
+            await super()._crawl_page(page_to_crawl, depth)
+        finally:
+            # A failure is recorded by the worker before it next awaits, so
+            # before the finished page is taken from the queue
+            self._finished.put_nowait((page_to_crawl, depth))
+
+    def _record(self, page: str, links: list[str], listed: bool = True) -> None:
+        # Results are always held until submitted to the coordinator
+        self._results.add(page, links)
+
+        for sink in self.sinks:
+            sink.write(page, links, listed)
+
+    async def crawl(self) -> LinkGraph:
+        """
+        Crawl pages leased from the coordinator until the whole crawl has finished.
+
+        :return: *LinkGraph* - Map of pages crawled by this node and
+            links gathered from that page.
+        """
+        crawled = LinkGraph()
+        workers = self._start_workers()
+
+        # Depths of the pages leased and not yet submitted, by canonical URL as
+        # a page may be recorded at a variant of the URL it was leased at
+        leased: dict[str, int] = {}
+
+        while True:
+            if len(leased) < self.number_of_workers:
+                for page, depth in await self.coordinator.lease(
+                    self.node_id, self.number_of_workers - len(leased)
+                ):
+                    leased[canonicalize_url(page)] = depth
+                    self._crawl_queue.put_nowait((page, depth))
+
+            if not leased:
+                if await self.coordinator.is_finished():
+                    break
+
+                await asyncio.sleep(IDLE_POLL_INTERVAL_S)
+                continue
+
+            finished = [await self._finished.get()]
+
+            while not self._finished.empty():
+                finished.append(self._finished.get_nowait())
+
+            # Failed pages are submitted without links, so their leases are not
+            # reassigned to be crawled again forever
+            failed: list[CrawledPage] = [
+                (page, depth, []) for page, depth in finished if page in self.failures
+            ]
+
+            await self.coordinator.submit(
+                self.node_id,
+                [
+                    (page, leased[canonicalize_url(page)], links)
+                    for page, links in self._results.items()
+                ]
+                + failed,
+            )
+
+            for page, _ in finished:
+                del leased[canonicalize_url(page)]
+
+            if self.outputs.keep_results:
+                crawled.update(self._results)
+            self._results = LinkGraph()
+
+        await self._stop_workers(workers)
+        await self.coordinator.close()
+
+        return crawled
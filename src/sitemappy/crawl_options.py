@@ -0,0 +1,225 @@
+"""
+Options of a Crawler, grouped by the part of the crawl they tune, so a crawler
+is configured with a few small objects rather than dozens of arguments.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL_S
+from .concurrency import DEFAULT_MAX_CONCURRENCY, DEFAULT_MIN_CONCURRENCY
+from .frontier import DEFAULT_MEMORY_LIMIT, FrontierBackend, FrontierStrategy
+from .link_scraper import (
+    DEFAULT_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY_S,
+    DEFAULT_REQUEST_TIMEOUT_S,
+)
+from .metrics import NO_METRICS_PORT, NO_STATS_INTERVAL
+from .politeness import DEFAULT_BURST
+from .profiling import NO_LOOP_LAG_MONITOR, ProfileMode
+from .retry import DEFAULT_FAILURE_THRESHOLD, DEFAULT_MAX_RETRIES
+from .seen import SeenSetBackend
+from .sinks import ResultSink
+from .spider_traps import DEFAULT_MAX_URLS_PER_TEMPLATE
+from .validator_cache import DEFAULT_CACHE_MAX_BYTES
+
+DEFAULT_PAGE_TIMEOUT_S = 30.0
+
+
+@dataclass(frozen=True)
+class AdaptiveConcurrencyOptions:
+    """
+    Bounds to grow and shrink the number of requests in flight between, backing
+    off on 429 and 503 responses, failed requests and rising latency.
+
+    :param min_workers: Fewest requests in flight *(default: 1)*
+    :param max_workers: Most requests in flight *(default: 100)*
+    """
+
+    min_workers: int = DEFAULT_MIN_CONCURRENCY
+    max_workers: int = DEFAULT_MAX_CONCURRENCY
+
+
+@dataclass(frozen=True)
+class FrontierOptions:
+    """
+    How pages waiting to be crawled, and URLs already seen, are stored.
+
+    :param backend: Storage backend for pages waiting to be crawled, disk
+        spills to a local SQLite file beyond the memory limit
+        *(default: memory)*
+    :param memory_limit: Pages the disk frontier holds in memory
+        *(default: 10,000)*
+    :param strategy: Order to crawl pages waiting in the frontier in, strictly
+        by depth, shallowest path first or taking turns across hosts and path
+        prefixes *(default: fifo)*
+    :param seen_set: Storage backend for URLs that have already been seen,
+        fingerprint stores 64-bit hashes and bloom a fixed-size Bloom filter
+        *(default: exact)*
+    """
+
+    backend: FrontierBackend = FrontierBackend.MEMORY
+    memory_limit: int = DEFAULT_MEMORY_LIMIT
+    strategy: FrontierStrategy = FrontierStrategy.FIFO
+    seen_set: SeenSetBackend = SeenSetBackend.EXACT
+
+
+@dataclass(frozen=True)
+class CheckpointOptions:
+    """
+    A journal to record the crawl in, so it can be resumed if interrupted.
+
+    :param path: Journal file to record the crawl in
+    :param resume: Resume the crawl recorded in the journal, continuing to
+        append to it *(default: False)*
+    :param interval: Seconds between appending recorded pages to the journal
+        *(default: 5)*
+    """
+
+    path: str
+    resume: bool = False
+    interval: float = DEFAULT_CHECKPOINT_INTERVAL_S
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    """
+    A cache of page validators and links kept across crawls, so unchanged pages
+    are not downloaded or parsed again.
+
+    :param path: SQLite file to cache pages in
+    :param max_bytes: Size of cached pages to keep before evicting the least
+        recently used *(default: 64 MiB)*
+    """
+
+    path: str
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+
+
+@dataclass(frozen=True)
+class ConnectionOptions:
+    """
+    How connections to the site are pooled, and how long requests may take.
+
+    :param keepalive_connections: Idle connections kept alive for reuse by the
+        workers, at most one per worker *(default: 20)*
+    :param keepalive_expiry: Seconds an idle connection is kept alive for reuse
+        by the workers *(default: 5)*
+    :param request_timeout: Seconds to wait to connect, read, write or acquire a
+        connection for each request *(default: 5)*
+    :param page_timeout: Seconds to wait for each attempt to fetch and parse a
+        page *(default: 30 - 0 is no timeout)*
+    :param http2: Multiplex requests over HTTP/2 to servers that support it,
+        requires the h2 package *(default: False)*
+    """
+
+    keepalive_connections: int = DEFAULT_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_S
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT_S
+    page_timeout: float = DEFAULT_PAGE_TIMEOUT_S
+    http2: bool = False
+
+
+@dataclass(frozen=True)
+class PolitenessOptions:
+    """
+    How hard the site is pressed beyond the delay between requests, by bursts,
+    robots.txt and retries of failed requests.
+
+    :param burst: Requests allowed back-to-back before the politeness delay
+        applies *(default: 1 - no burst)*
+    :param respect_robots: Fetch the robots.txt of each host once, never
+        queueing links it disallows and slowing to its Crawl-delay
+        *(default: False)*
+    :param max_retries: Times to retry a page after a timeout, a failed
+        connection or a 429, 502, 503 or 504 response, waiting an exponentially
+        growing delay or as long as Retry-After asks *(default: 2)*
+    :param circuit_breaker_threshold: Consecutive failed requests to a host
+        before its pages wait for a trial request to succeed, failing without
+        being requested if the trials keep failing
+        *(default: 5 - 0 never stops requesting)*
+    """
+
+    burst: int = DEFAULT_BURST
+    respect_robots: bool = False
+    max_retries: int = DEFAULT_MAX_RETRIES
+    circuit_breaker_threshold: int = DEFAULT_FAILURE_THRESHOLD
+
+
+@dataclass(frozen=True)
+class DedupOptions:
+    """
+    Which links and pages are skipped as repeats of others.
+
+    :param avoid_spider_traps: Suppress links into endless URL spaces, whose
+        paths repeat segments or run too deep or long, or that share a template
+        with too many other links, reporting the templates suppressed with the
+        failures *(default: False)*
+    :param max_urls_per_template: Links sharing a template, differing only in
+        IDs, dates or query parameter values, to queue when avoiding spider
+        traps *(default: 1,000 - 0 is unlimited)*
+    :param skip_duplicates: Fingerprint the content of each page before parsing
+        it, recording pages with the same or nearly the same content as a page
+        already parsed without their links *(default: False)*
+    """
+
+    avoid_spider_traps: bool = False
+    max_urls_per_template: int = DEFAULT_MAX_URLS_PER_TEMPLATE
+    skip_duplicates: bool = False
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """
+    Where the pages, failures, duplicates and metrics of the crawl are written.
+
+    :param sinks: Sinks to write each page to as it is crawled, flushed once the
+        crawl has finished *(default: none)*
+    :param keep_results: Keep crawled pages in memory, to be returned by crawl(),
+        set to False when the sinks hold the results *(default: True)*
+    :param failures_output: JSON file to write pages that could not be crawled
+        to, mapped to the error, replacing any file left by an earlier crawl
+        *(default: None - failures are only kept in memory)*
+    :param duplicates_output: JSON file to write the pages skipped as duplicates
+        to, mapped to the page they duplicate, replacing any file left by an
+        earlier crawl *(default: None - duplicates are only kept in memory)*
+    :param metrics_output: JSON file to write the metrics of the crawl to once it
+        has finished *(default: None - metrics are only kept in memory)*
+    """
+
+    sinks: Sequence[ResultSink] = ()
+    keep_results: bool = True
+    failures_output: str | None = None
+    duplicates_output: str | None = None
+    metrics_output: str | None = None
+
+
+@dataclass(frozen=True)
+class MonitoringOptions:
+    """
+    How the running crawl is reported on and profiled.
+
+    :param stats_interval: Seconds between printing a line of crawl stats to
+        stderr *(default: 0 - no stats lines)*
+    :param metrics_port: Port on localhost to serve the metrics of the running
+        crawl on at /metrics, for Prometheus to scrape
+        *(default: 0 - no metrics server)*
+    :param profile: Profile the crawl with cProfile, by sampling the event loop's
+        stack, or by tracing the memory still allocated once it finishes
+        *(default: none)*
+    :param profile_output: File to write the profile to, required to profile
+        *(default: None)*
+    :param loop_lag_threshold: Seconds the event loop may be blocked for, by
+        parsing a page or any other callback, before the code blocking it is
+        printed to stderr *(default: 0 - not monitored)*
+    """
+
+    stats_interval: float = NO_STATS_INTERVAL
+    metrics_port: int = NO_METRICS_PORT
+    profile: ProfileMode = ProfileMode.NONE
+    profile_output: str | None = None
+    loop_lag_threshold: float = NO_LOOP_LAG_MONITOR
+
+    def __post_init__(self) -> None:
+        if self.profile != ProfileMode.NONE and self.profile_output is None:
+            raise ValueError("A profile output file is required to profile a crawl")
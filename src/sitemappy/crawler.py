@@ -1,120 +1,736 @@
 import asyncio
-import json
+import sys
 import time
+from contextlib import aclosing, nullcontext
+from urllib.parse import urldefrag
 
-from .link_scraper import AsyncScraper
+import httpx
+
+from .checkpoint import (
+    CRAWLED,
+    ENQUEUED,
+    LISTED,
+    REDIRECT_TARGET,
+    CrawlJournal,
+)
+from .concurrency import AdaptiveConcurrency
+from .crawl_options import (
+    AdaptiveConcurrencyOptions,
+    CacheOptions,
+    CheckpointOptions,
+    ConnectionOptions,
+    DedupOptions,
+    FrontierOptions,
+    MonitoringOptions,
+    OutputOptions,
+    PolitenessOptions,
+)
+from .fetch_policy import FetchPolicy
+from .fingerprints import DuplicateIndex
+from .frontier import CrawlItem, DiskFrontier, create_frontier
+from .link_graph import LinkGraph
+from .link_scraper import AsyncScraper, create_http_client, create_parse_executor
+from .metrics import (
+    METRICS_HOST,
+    NO_METRICS_PORT,
+    NO_STATS_INTERVAL,
+    CrawlMetrics,
+    MetricsServer,
+    print_stats_periodically,
+    write_metrics,
+)
+from .politeness import PolitenessLimiter
+from .profiling import NO_LOOP_LAG_MONITOR, LoopLagMonitor, profile
+from .redirects import RedirectCache
+from .retry import CircuitBreaker, RetryableResponseError, RetryPolicy
+from .robots import RobotsCache, RobotsDisallowedError
+from .seen import SeenSet, create_seen_set
+from .sinks import StdoutSink, write_report
+from .sitemap_reader import SitemapSeeder
+from .spider_traps import SpiderTrapDetector
+from .urls import canonicalize_url
+from .validator_cache import CacheStats, ValidatorCache
 
 HTTP_TRANSPORTS = ["http://", "https://"]
 
-POLITENESS_DELAY_DEFAULT_S = 0
+POLITENESS_DELAY_DEFAULT_S = 0.0
 
 UNLIMITED_DEPTH = 0
 STARTING_DEPTH = 0
 
+UNLIMITED_PAGES = 0
+
 DEFAULT_NUMBER_OF_WORKERS = 10
 
+PARSE_IN_EVENT_LOOP = 0
+
+NO_PAGE_TIMEOUT = 0
+
+# Longest a page waits on an open circuit before checking it again, so pages
+# carry on soon after a trial request closes it
+CIRCUIT_POLL_INTERVAL_S = 1.0
+
+# Failed requests worth retrying, as the page may be fetched if requested again
+RETRYABLE_ERRORS = (RetryableResponseError, httpx.TransportError, TimeoutError)
+
 
 class Crawler:
     """
     A Crawler to spin up a set of workers running through Queue items until complete.
     """
 
-    def __init__(  # noqa: PLR0913 - Could move to Pydantic models in the future
+    def __init__(  # noqa: PLR0913 - Options past the first few are grouped
         self,
         base_url: str,
         number_of_workers: int = DEFAULT_NUMBER_OF_WORKERS,
         crawl_depth: int = UNLIMITED_DEPTH,
-        politeness_delay: int = POLITENESS_DELAY_DEFAULT_S,
+        politeness_delay: float = POLITENESS_DELAY_DEFAULT_S,
         enable_cmd_out: bool = False,
+        *,
+        max_pages: int = UNLIMITED_PAGES,
+        parse_workers: int = PARSE_IN_EVENT_LOOP,
+        stream_links: bool = False,
+        seed_sitemaps: bool = False,
+        follow_redirects: bool = True,
+        adaptive_concurrency: AdaptiveConcurrencyOptions | None = None,
+        frontier: FrontierOptions | None = None,
+        checkpoint: CheckpointOptions | None = None,
+        cache: CacheOptions | None = None,
+        connection: ConnectionOptions | None = None,
+        politeness: PolitenessOptions | None = None,
+        fetch_policy: FetchPolicy | None = None,
+        dedup: DedupOptions | None = None,
+        outputs: OutputOptions | None = None,
+        monitoring: MonitoringOptions | None = None,
     ):
         """
         Initialise a new Crawler with asynchronous scraper.
 
         :param base_url: Website to crawl
 
-        :param number_of_workers: Workers to concurrently crawl pages for links
+        :param number_of_workers: Workers to concurrently crawl pages for links,
+            or the number to start with under adaptive concurrency
             *(default: 10)*
 
         :param crawl_depth: Depth of links from base URL to follow
             *(default: 0 - unlimited)*
 
-        :param politeness_delay: Delay between each request
-            *(default: 0 - no delay)*
+        :param politeness_delay: Delay in seconds between each request to a host,
+            fractions of a second are supported *(default: 0 - no delay)*
+
+        :param enable_cmd_out: Print each page and its links as it is crawled
+            *(default: False)*
+
+        :param max_pages: Pages to crawl before stopping, the frontier strategy
+            decides which pages are crawled within the budget
+            *(default: 0 - unlimited)*
+
+        :param parse_workers: Processes to parse pages in, so parsing does not
+            block the event loop from fetching pages
+            *(default: 0 - parse in the event loop)*
+
+        :param stream_links: Stream each page through an incremental link
+            extractor instead of parsing it with BeautifulSoup
+            *(default: False)*
+
+        :param seed_sitemaps: Queue every page listed in the sitemaps the site
+            publishes, found through robots.txt or at /sitemap.xml, as links
+            from the base URL, while the crawl starts *(default: False)*
+
+        :param follow_redirects: Follow redirects within the subdomain, recording
+            each page redirected from with a link to the page redirected to, and
+            requesting URLs known to redirect at the end of their chain
+            *(default: True)*
+
+        :param adaptive_concurrency: Bounds to grow and shrink the number of
+            requests in flight between *(default: None - a fixed number of
+            workers)*
+
+        :param frontier: Storage of pages waiting to be crawled and URLs seen
+            *(default: None - in memory, first in first out)*
+
+        :param checkpoint: Journal to record the crawl in, or resume it from
+            *(default: None - no checkpoints)*
+
+        :param cache: Cache of page validators and links kept across crawls
+            *(default: None - no cache)*
+
+        :param connection: Connection pooling and timeouts of requests
+            *(default: None - the defaults of ConnectionOptions)*
+
+        :param politeness: Bursts, robots.txt and retries of requests
+            *(default: None - the defaults of PolitenessOptions)*
+
+        :param fetch_policy: Policy deciding which pages are worth downloading
+            *(default: None - skip assets and pages over 10 MiB)*
+
+        :param dedup: Spider traps and duplicate pages to skip
+            *(default: None - skip neither)*
+
+        :param outputs: Sinks and files to write the crawl to
+            *(default: None - results are only kept in memory)*
+
+        :param monitoring: Stats lines, metrics server, profiling and event loop
+            monitoring of the running crawl *(default: None - none of them)*
         """
+        frontier = frontier or FrontierOptions()
+        connection = connection or ConnectionOptions()
+        politeness = politeness or PolitenessOptions()
+        dedup = dedup or DedupOptions()
+        outputs = outputs or OutputOptions()
+        monitoring = monitoring or MonitoringOptions()
+
         self.number_of_workers = number_of_workers
         self.crawl_depth = crawl_depth
+        self.max_pages = max_pages
         self.politeness_delay = politeness_delay
         self.enable_cmd_out = enable_cmd_out
+        self.parse_workers = parse_workers
+        self.seed_sitemaps = seed_sitemaps
+        self.page_timeout = connection.page_timeout
+        self.checkpoint = checkpoint
+        self.resume = checkpoint.resume if checkpoint else False
+        self.outputs = outputs
+        self.monitoring = monitoring
+
+        # Print pages in batches, rather than making a write for every page
+        self.sinks = (
+            [*outputs.sinks, StdoutSink()] if enable_cmd_out else list(outputs.sinks)
+        )
+
+        self.cache = ValidatorCache(cache.path, cache.max_bytes) if cache else None
+        self.duplicates = DuplicateIndex() if dedup.skip_duplicates else None
+        self.metrics = CrawlMetrics()
+        self.redirects = RedirectCache() if follow_redirects else None
+
+        self.concurrency = (
+            AdaptiveConcurrency(
+                number_of_workers,
+                adaptive_concurrency.min_workers,
+                adaptive_concurrency.max_workers,
+            )
+            if adaptive_concurrency
+            else None
+        )
 
-        self.scraper = AsyncScraper(base_url)
+        # One pooled connection per worker, closed once the crawl has finished
+        self.client = create_http_client(
+            self.worker_count,
+            connection.keepalive_connections,
+            connection.keepalive_expiry,
+            connection.request_timeout,
+            connection.http2,
+        )
+        self.politeness = PolitenessLimiter(politeness_delay, politeness.burst)
+        self.retry_policy = RetryPolicy(politeness.max_retries)
+        self.circuit_breaker = CircuitBreaker(politeness.circuit_breaker_threshold)
+        self.robots = (
+            RobotsCache(self.client, limiter=self.politeness)
+            if politeness.respect_robots
+            else None
+        )
+        self.scraper = AsyncScraper(
+            base_url,
+            client=self.client,
+            streaming=stream_links,
+            cache=self.cache,
+            fetch_policy=fetch_policy,
+            observer=self.concurrency,
+            duplicates=self.duplicates,
+            metrics=self.metrics,
+            redirects=self.redirects,
+            robots=self.robots,
+        )
+        self.spider_traps = (
+            SpiderTrapDetector(dedup.max_urls_per_template)
+            if dedup.avoid_spider_traps
+            else None
+        )
 
-        self._crawl_queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
-        self._results: dict[str, list[str]] = {}
-        self._crawled_urls: set[str] = set()
+        self._crawl_queue: asyncio.Queue[CrawlItem] = create_frontier(
+            frontier.backend, frontier.memory_limit, frontier.strategy
+        )
+        self._results = LinkGraph()
+        self._seen_urls: SeenSet = create_seen_set(frontier.seen_set)
+
+        self._journal: CrawlJournal | None = None
+
+        # Tasks printing, serving and monitoring metrics while the crawl runs
+        self._metrics_tasks: list[asyncio.Task[None]] = []
+
+        # Pages crawled or being crawled, counted against max_pages
+        self._pages_started = 0
+
+        # Pages that could not be crawled, mapped to why
+        self.failures: dict[str, str] = {}
 
     async def _worker(self) -> None:
         while True:
             # Get next item from queue and current depth
             page_to_crawl, depth = await self._crawl_queue.get()
 
-            # If the page has already been crawled,
-            # or crawl depth is configured and has been reached
-            if page_to_crawl in self._crawled_urls or (
-                UNLIMITED_DEPTH < self.crawl_depth <= depth
-            ):
+            # A page failing must neither end the worker nor leave the queue
+            # waiting on it, so every page is marked done however it finishes
+            self.metrics.active_workers += 1
+
+            try:
+                await self._crawl_page(page_to_crawl, depth)
+            except Exception as error:
+                self._record_failure(page_to_crawl, error)
+            finally:
+                self.metrics.active_workers -= 1
                 self._crawl_queue.task_done()
-                continue
 
-            # Add to list of crawled URLs if not already been crawled
-            self._crawled_urls.add(page_to_crawl)
+    async def _crawl_page(self, page_to_crawl: str, depth: int) -> None:
+        # Links are pruned by depth when enqueued, but pages restored from a
+        # checkpoint may be beyond the depth of the resumed crawl, and the
+        # rest of the queue is drained once the page budget is spent
+        if UNLIMITED_DEPTH < self.crawl_depth <= depth or self._budget_spent():
+            return
+
+        # Links are checked against robots.txt when enqueued, but the base URL,
+        # restored pages and pages leased from a coordinator are not
+        if self.robots and not await self.robots.allowed(page_to_crawl):
+            raise RobotsDisallowedError("Disallowed by robots.txt")
+
+        self._pages_started += 1
+
+        links = await self._fetch(page_to_crawl)
+        self.metrics.pages_crawled += 1
+
+        served_from = self._served_from(page_to_crawl)
+        listed = served_from not in self.scraper.unlisted
+        self.scraper.unlisted.discard(served_from)
 
-            # If the politeness delay is configured, delay between each
-            # request across threads
-            if self.politeness_delay > POLITENESS_DELAY_DEFAULT_S:
-                time.sleep(self.politeness_delay)
+        redirect_target = canonicalize_url(served_from) != canonicalize_url(
+            page_to_crawl
+        )
 
-            links = await self.scraper.get_links(page_to_crawl)
+        if redirect_target:
+            # Only the page at the end of a redirect belongs in a sitemap
+            self._record_crawled(page_to_crawl, [served_from], listed=False)
 
-            for link in links:
-                if self.scraper.is_in_same_subdomain(link):
-                    # If retrieved link is in the same subdomain, set
-                    # depth and add to the queue
-                    new_depth = depth + 1
-                    await self._crawl_queue.put((link, new_depth))
+            # The links were gathered from the page redirected to, so are
+            # recorded as its links, unless it is out of scope, disallowed or
+            # already seen
+            if not await self._claim_redirect_target(served_from, depth):
+                return
+        elif (
+            served_from != page_to_crawl
+            and self.robots
+            and not await self.robots.allowed(served_from)
+        ):
+            # The scraper does not follow a redirect to a variant of the page
+            # disallowed by robots.txt, such as one with a trailing slash
+            self._record_crawled(page_to_crawl, [served_from], listed=False)
+            return
 
-            # Add to dictionary of results, using Set separately to avoid
-            # race conditions across async tasks
-            self.cmd_out(json.dumps({page_to_crawl: links}))
-            self._results[page_to_crawl] = links
-            self._crawl_queue.task_done()
+        # A redirect to a variant of the page, such as with a trailing slash, is
+        # recorded as the page redirected to, which is the URL it is served at
+        page_to_crawl = served_from
 
-    async def crawl(self) -> dict[str, list[str]]:
+        enqueue_started_at = time.monotonic()
+
+        for link in links:
+            await self._enqueue(link, depth + 1)
+
+        self.metrics.enqueue.observe(time.monotonic() - enqueue_started_at)
+
+        self._record_crawled(page_to_crawl, links, listed, redirect_target)
+
+    def _served_from(self, page: str) -> str:
         """
-        Start async workers crawling through website, starting from the
-        Crawler.base_url.
+        :param page: Page that has been fetched
+        :return: URL at the end of any redirects from the page, which the
+            scraper marks as unlisted if it was not served as a 200 HTML page
+        """
+        return self.redirects.resolve(page) if self.redirects else page
+
+    async def _claim_redirect_target(self, target: str, depth: int) -> bool:
+        """
+        Mark a page redirected to as seen, so it is not crawled again.
+
+        :param target: URL redirected to
+        :param depth: Depth of the page redirected from
+        :return: True if the page is in scope, allowed by robots.txt and had not
+            been seen
+        """
+        canonical_target = canonicalize_url(target)
+
+        if (
+            not self.scraper.is_in_same_subdomain(canonical_target)
+            or canonical_target in self._seen_urls
+        ):
+            return False
+
+        if self.robots and not await self.robots.allowed(target):
+            return False
+
+        self._seen_urls.add(canonical_target)
+
+        if self._journal:
+            self._journal.record_enqueued(target, depth)
+
+        return True
+
+    def _record_crawled(
+        self,
+        page: str,
+        links: list[str],
+        listed: bool = True,
+        redirect_target: bool = False,
+    ) -> None:
+        self._record(page, links, listed)
+
+        if self._journal:
+            self._journal.record_crawled(page, links, listed, redirect_target)
+
+    async def _fetch(self, page_to_crawl: str) -> list[str]:
+        """
+        Get the links on a page, retrying temporary failures with backoff.
+
+        :param page_to_crawl: Page to get the links of
+        :return: Links gathered from the page
+        :raises CircuitOpenError: If the page's host has stayed down
+        """
+        retries = 0
+
+        while True:
+            # Pages wait out an open circuit rather than failing, as the host
+            # may only be down for a moment
+            while wait := self.circuit_breaker.wait_time(page_to_crawl):
+                await asyncio.sleep(min(wait, CIRCUIT_POLL_INTERVAL_S))
+
+            try:
+                # Workers beyond the adaptive concurrency limit wait for a slot
+                async with self.concurrency or nullcontext():
+                    # Wait for the politeness delay without blocking the event
+                    # loop, so other workers can carry on parsing and enqueueing
+                    await self.politeness.wait(page_to_crawl)
+
+                    async with asyncio.timeout(self.page_timeout or None):
+                        links = await self.scraper.get_links(page_to_crawl)
+            except RETRYABLE_ERRORS as error:
+                if isinstance(error, TimeoutError) and self.concurrency:
+                    self.concurrency.record_error()
+
+                self.circuit_breaker.record_failure(page_to_crawl)
+
+                retry_after = (
+                    error.retry_after
+                    if isinstance(error, RetryableResponseError)
+                    else None
+                )
+                delay = self.retry_policy.delay(retries, retry_after)
+
+                if delay is None:
+                    raise
+
+                # Back off outside the concurrency slot, so other pages use it
+                retries += 1
+                await asyncio.sleep(delay)
+            else:
+                self.circuit_breaker.record_success(page_to_crawl)
+                return links
+
+    def _record_failure(self, page: str, error: Exception) -> None:
+        # Failed pages are not journaled, so a resumed crawl tries them again
+        self.failures[page] = f"{type(error).__name__}: {error}"
+        self.metrics.pages_failed += 1
+        self.scraper.unlisted.discard(self._served_from(page))
+
+    def _record(self, page: str, links: list[str], listed: bool = True) -> None:
+        if self.outputs.keep_results:
+            self._results.add(page, links)
+
+        for sink in self.sinks:
+            sink.write(page, links, listed)
+
+    async def _enqueue(self, link: str, depth: int) -> None:
+        """
+        Add a link to the crawl queue if it is within the crawl depth, in the same
+        subdomain, allowed by robots.txt and no variant of it has been seen before.
 
-        :return: *dict[str, list[str]]* - Map of pages that have been crawled and links
-            gathered from that page.
+        :param link: Link found on a crawled page
+        :param depth: Depth of links from the base URL the link was found at
         """
+        # Out of depth links, and any links once the page budget is spent, are
+        # dropped here rather than queued and skipped
+        if UNLIMITED_DEPTH < self.crawl_depth <= depth or self._budget_spent():
+            return
+
+        # Fragments are never sent to the server, so only name part of a page
+        link = urldefrag(link).url
+
+        # Links known to redirect are queued at the end of their chain, so the
+        # redirects are not requested again
+        if self.redirects:
+            link = self.redirects.resolve(link)
+
+        if not self.scraper.is_in_same_subdomain(canonicalize_url(link)):
+            return
+
+        # Disallowed links are dropped rather than queued, so they never take a
+        # worker from the pages that can be crawled. Checked against the link as
+        # it will be requested, as the canonical form drops trailing slashes
+        if self.robots and not await self.robots.allowed(link):
+            return
+
+        await self._schedule(link, depth)
+
+    def _budget_spent(self) -> bool:
+        return UNLIMITED_PAGES < self.max_pages <= self._pages_started
+
+    async def _schedule(self, link: str, depth: int) -> None:
+        """
+        Add an in-scope link to the crawl queue if no variant of it has been seen.
+
+        The canonical form of the link is only used to recognise variants, the
+        link is crawled and recorded as it was found, so a page is requested at
+        the URL the site links to.
+
+        :param link: Link to crawl
+        :param depth: Depth of links from the base URL the link was found at
+        """
+        canonical_link = canonicalize_url(link)
+
+        if canonical_link not in self._seen_urls:
+            # Mark as seen when enqueued, so duplicate links found on other
+            # pages never reach the queue
+            self._seen_urls.add(canonical_link)
+
+            # Checked once seen, so each trap link is counted once however many
+            # pages link to it
+            if self.spider_traps and self.spider_traps.is_trap(canonical_link):
+                return
+
+            await self._crawl_queue.put((link, depth))
+
+            if self._journal:
+                self._journal.record_enqueued(link, depth)
+
+    def _seed(self) -> None:
+        if self.resume and self.checkpoint:
+            self._restore(self.checkpoint.path)
+
+        if self.checkpoint:
+            self._journal = CrawlJournal(
+                self.checkpoint.path,
+                append=self.resume,
+                flush_interval=self.checkpoint.interval,
+            )
+
+        if self.resume:
+            return
+
+        self._seen_urls.add(canonicalize_url(self.scraper.base_url))
         self._crawl_queue.put_nowait((self.scraper.base_url, STARTING_DEPTH))
 
-        workers = [
-            asyncio.create_task(self._worker()) for _ in range(self.number_of_workers)
-        ]
+        if self._journal:
+            self._journal.record_enqueued(self.scraper.base_url, STARTING_DEPTH)
+
+    async def _seed_from_sitemaps(self) -> None:
+        """
+        Queue the pages listed in the site's sitemaps, as links from the base URL.
+
+        Workers are already crawling while the sitemaps are streamed, so pages
+        are crawled as soon as they are parsed.
+        """
+        seeder = SitemapSeeder(
+            self.client,
+            self.robots or RobotsCache(self.client),
+            self.politeness,
+        )
+
+        # Closed on leaving, so a sitemap being read is not left open
+        async with aclosing(seeder.urls(self.scraper.base_url)) as urls:
+            async for url in urls:
+                # Stop reading sitemaps once no more pages would be queued
+                if self._budget_spent():
+                    break
+
+                await self._enqueue(url, STARTING_DEPTH + 1)
+
+        self.failures |= seeder.errors
+
+    def _restore(self, checkpoint: str) -> None:
+        """
+        Rebuild the seen set and crawl queue from a checkpoint journal, recording
+        the pages already crawled as results.
+
+        :param checkpoint: Journal file of the crawl to resume
+        """
+        # Pages enqueued but not yet crawled, in the order they were enqueued,
+        # keyed by canonical URL as a page may be recorded at a variant of the
+        # URL it was enqueued at, such as with a trailing slash
+        pending: dict[str, CrawlItem] = {}
+
+        for event in CrawlJournal.replay(checkpoint):
+            if ENQUEUED in event:
+                canonical_url = canonicalize_url(event[ENQUEUED])
+                self._seen_urls.add(canonical_url)
+                pending[canonical_url] = (event[ENQUEUED], event["depth"])
+            elif CRAWLED in event:
+                self._record(event[CRAWLED], event["links"], event.get(LISTED, True))
+                pending.pop(canonicalize_url(event[CRAWLED]), None)
+
+                # A page redirected to was crawled by the same fetch as the
+                # page redirected from, which has already been counted
+                if not event.get(REDIRECT_TARGET, False):
+                    self._pages_started += 1
+
+        for item in pending.values():
+            self._crawl_queue.put_nowait(item)
+
+    def _start_workers(self) -> list[asyncio.Task[None]]:
+        if self.parse_workers > PARSE_IN_EVENT_LOOP:
+            self.scraper.parse_executor = create_parse_executor(self.parse_workers)
+
+        self.metrics.start()
+
+        if self.monitoring.stats_interval > NO_STATS_INTERVAL:
+            self._metrics_tasks.append(
+                asyncio.create_task(
+                    print_stats_periodically(
+                        self.current_metrics, self.monitoring.stats_interval
+                    )
+                )
+            )
 
-        await self._crawl_queue.join()
+        if self.monitoring.metrics_port != NO_METRICS_PORT:
+            self._metrics_tasks.append(asyncio.create_task(self._serve_metrics()))
 
-        for worker in workers:
-            worker.cancel()
+        if self.monitoring.loop_lag_threshold > NO_LOOP_LAG_MONITOR:
+            self._metrics_tasks.append(
+                asyncio.create_task(
+                    LoopLagMonitor(self.monitoring.loop_lag_threshold).monitor()
+                )
+            )
+
+        return [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def _serve_metrics(self) -> None:
+        try:
+            await MetricsServer(self.current_metrics).serve(
+                METRICS_HOST, self.monitoring.metrics_port
+            )
+        except OSError as error:
+            # The crawl carries on without metrics, rather than failing
+            print(f"Metrics could not be served: {error}", file=sys.stderr)
+
+    async def _stop_workers(self, workers: list[asyncio.Task[None]]) -> None:
+        for task in [*workers, *self._metrics_tasks]:
+            task.cancel()
+
+        self._metrics_tasks = []
+        self.metrics.finish()
+
+        await self.client.aclose()
+
+        if self.scraper.parse_executor:
+            self.scraper.parse_executor.shutdown()
+            self.scraper.parse_executor = None
+
+        if isinstance(self._crawl_queue, DiskFrontier):
+            self._crawl_queue.close()
+
+        if self.cache:
+            self.cache.close()
+
+        # Sinks are flushed rather than closed, as they are owned by the caller
+        for sink in self.sinks:
+            sink.flush()
+
+        # Closing the journal appends the pages recorded since the last
+        # checkpoint, including when the crawl is interrupted
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+        self._write_reports()
+
+    def _write_reports(self) -> None:
+        # Suppressed templates are reported alongside the pages that failed
+        if self.spider_traps:
+            self.failures |= self.spider_traps.report()
+
+        if self.outputs.failures_output:
+            write_report(self.outputs.failures_output, self.failures)
+
+        if self.outputs.duplicates_output:
+            write_report(
+                self.outputs.duplicates_output,
+                self.duplicates.duplicates if self.duplicates else {},
+            )
+
+        if self.outputs.metrics_output:
+            write_metrics(self.outputs.metrics_output, self.current_metrics())
+
+    async def crawl(self) -> LinkGraph:
+        """
+        Start async workers crawling through website, starting from the
+        Crawler.base_url.
+
+        :return: *LinkGraph* - Map of pages that have been crawled and links
+            gathered from that page, empty if results are not kept.
+        """
+        with profile(self.monitoring.profile, self.monitoring.profile_output):
+            self._seed()
+            workers = self._start_workers()
+
+            try:
+                # A resumed crawl has already queued the pages of the sitemaps
+                if self.seed_sitemaps and not self.resume:
+                    await self._seed_from_sitemaps()
+
+                await self._crawl_queue.join()
+            finally:
+                await self._stop_workers(workers)
 
         return self._results
 
-    def cmd_out(self, msg: str) -> None:
+    def current_metrics(self) -> CrawlMetrics:
+        """
+        :return: Metrics of the crawl, with the queue depth and number of
+            workers as they are now
+        """
+        self.metrics.queue_depth = self._crawl_queue.qsize()
+        self.metrics.workers = (
+            self.concurrency.limit if self.concurrency else self.worker_count
+        )
+
+        return self.metrics
+
+    @property
+    def worker_count(self) -> int:
         """
-        If cmd output is enabled, print message.
+        :return: Worker tasks to start, enough for the maximum concurrency when
+            it is adaptive
+        """
+        if self.concurrency:
+            return self.concurrency.max_concurrency
+
+        return self.number_of_workers
+
+    @property
+    def concurrency_limit(self) -> int | None:
+        """
+        :return: Requests allowed in flight at once that adaptive concurrency
+            settled on, if it was used
+        """
+        return self.concurrency.limit if self.concurrency else None
 
-        :param msg: Message to print
-        :return:
+    @property
+    def achieved_request_rate(self) -> float:
+        """
+        :return: Requests per second achieved across all workers during the crawl
+        """
+        return self.politeness.achieved_rate
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """
+        :return: Hits, misses and bytes saved by the cache during the crawl, if
+            one was used
         """
-        if self.enable_cmd_out:
-            print(msg)
+        return self.cache.stats if self.cache else None
@@ -0,0 +1,96 @@
+import posixpath
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import httpx
+
+DEFAULT_MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+
+# Extensions of URLs that are almost never HTML pages, so are not fetched
+ASSET_EXTENSIONS = frozenset(
+    (
+        # Documents
+        ".pdf .doc .docx .xls .xlsx .ppt .pptx .odt .csv "
+        # Images
+        ".png .jpg .jpeg .gif .svg .webp .avif .ico .bmp .tif .tiff "
+        # Audio and video
+        ".mp3 .wav .ogg .flac .m4a .mp4 .m4v .mov .avi .mkv .webm "
+        # Archives and binaries
+        ".zip .gz .tgz .bz2 .xz .tar .rar .7z .exe .dmg .msi .apk .iso "
+        # Page resources
+        ".css .js .mjs .json .woff .woff2 .ttf .otf .eot"
+    ).split()
+)
+
+
+class SkippedPageError(Exception):
+    """
+    Raised when a response is not worth downloading under a FetchPolicy.
+    """
+
+
+@dataclass(frozen=True)
+class FetchPolicy:
+    """
+    Decides which pages are worth downloading for links, so assets and oversized
+    responses are skipped before their bodies are downloaded.
+
+    :param max_page_bytes: Largest page body to download, larger pages are
+        abandoned *(default: 10 MiB)*
+    :param skip_assets: Skip URLs with the file extension of an asset, such as a
+        PDF, image or video, without requesting them *(default: True)*
+    """
+
+    max_page_bytes: int = DEFAULT_MAX_PAGE_BYTES
+    skip_assets: bool = True
+
+    def should_request(self, url: str) -> bool:
+        """
+        Check whether a URL is worth requesting, before any request is made.
+
+        :param url: URL of the page
+        :return: False if the URL is likely to be an asset rather than a page
+        """
+        if not self.skip_assets:
+            return True
+
+        extension = posixpath.splitext(urlparse(url).path)[1].lower()
+
+        return extension not in ASSET_EXTENSIONS
+
+    def check_headers(self, response: httpx.Response) -> None:
+        """
+        Check whether a response body is worth downloading, from its headers.
+
+        Responses without a Content-Type or Content-Length are downloaded, with
+        the size of the body checked as it is read.
+
+        :param response: Streamed response whose body has not been read
+        :raises SkippedPageError: If the body is not HTML, or is too large
+        """
+        content_type = response.headers.get("Content-Type")
+
+        if content_type is not None:
+            media_type = content_type.partition(";")[0].strip().lower()
+
+            if media_type not in HTML_CONTENT_TYPES:
+                raise SkippedPageError(f"Page is {media_type}, not HTML")
+
+        content_length = response.headers.get("Content-Length", "")
+
+        if content_length.isdigit():
+            self.check_size(int(content_length))
+
+    def check_size(self, bytes_read: int) -> None:
+        """
+        Check the size of a page body as it is read.
+
+        :param bytes_read: Bytes of the body read so far
+        :raises SkippedPageError: If the body is larger than allowed
+        """
+        if bytes_read > self.max_page_bytes:
+            raise SkippedPageError(
+                f"Page body is larger than {self.max_page_bytes} bytes"
+            )
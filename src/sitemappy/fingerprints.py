@@ -0,0 +1,225 @@
+"""
+Content fingerprints of crawled pages, so a page serving the same content as
+another URL is recognised before it is parsed for links.
+"""
+
+import hashlib
+import re
+from urllib.parse import urldefrag, urljoin
+
+from .urls import canonicalize_url
+from .validator_cache import content_hash
+
+FINGERPRINT_BITS = 64
+FINGERPRINT_BYTES = FINGERPRINT_BITS // 8
+
+# Bits that may differ between the fingerprints of near-duplicate pages
+DEFAULT_MAX_DISTANCE = 3
+
+# Words of a page's text, lower-cased, ignoring words too short to tell pages
+# apart
+FEATURE = re.compile(rb"[a-z0-9]{3,}")
+
+# Markup, and the scripts and styles pages built from the same template share,
+# none of which is text a visitor reads
+INVISIBLE = re.compile(rb"<(script|style)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.DOTALL)
+
+# Targets of a page's links
+HREF = re.compile(rb"""<a\s[^>]*?\bhref\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+
+# Pages with fewer distinct words are only matched exactly, as a few words give
+# too little evidence that two pages are near duplicates
+MIN_FEATURES = 16
+
+# Beyond this many distinct words, only a quarter of them, chosen by hash so
+# the same words are chosen on every page, are counted
+SAMPLE_ABOVE_FEATURES = 1024
+SAMPLE_MASK = 0b11
+
+# Each word's hash is counted in one 32-bit lane per bit of a single integer, so
+# a page's votes are summed with one big integer addition per word rather than
+# one per bit
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+
+
+def _spread_table(byte: int) -> list[int]:
+    return [
+        sum(1 << ((byte * 8 + bit) * LANE_BITS) for bit in range(8) if value >> bit & 1)
+        for value in range(256)
+    ]
+
+
+# Lanes to add for each value of each byte of a word's hash
+SPREAD = tuple(_spread_table(byte) for byte in range(FINGERPRINT_BITS // 8))
+
+
+def simhash(content: bytes) -> int | None:
+    """
+    Fingerprint a page so pages sharing most of the words of their text have
+    fingerprints differing in few bits.
+
+    Each bit is set if most of the distinct words on the page have it set in
+    their hash. Only text a visitor reads is fingerprinted, as the markup of
+    pages built from the same template is the same. Words are hashed with
+    BLAKE2b rather than the salted builtin hash, so fingerprints can be compared
+    across processes and crawls.
+
+    :param content: Raw bytes of the page
+    :return: 64-bit fingerprint, or None if the page has too few words
+    """
+    features = set(FEATURE.findall(INVISIBLE.sub(b" ", content).lower()))
+
+    if len(features) < MIN_FEATURES:
+        return None
+
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature, digest_size=FINGERPRINT_BYTES).digest())
+        for feature in features
+    ]
+
+    if len(hashes) > SAMPLE_ABOVE_FEATURES:
+        hashes = [h for h in hashes if not h & SAMPLE_MASK]
+
+    s0, s1, s2, s3, s4, s5, s6, s7 = SPREAD
+    votes = 0
+
+    for h in hashes:
+        votes += (
+            s0[h & 0xFF]
+            + s1[h >> 8 & 0xFF]
+            + s2[h >> 16 & 0xFF]
+            + s3[h >> 24 & 0xFF]
+            + s4[h >> 32 & 0xFF]
+            + s5[h >> 40 & 0xFF]
+            + s6[h >> 48 & 0xFF]
+            + s7[h >> 56]
+        )
+
+    majority = len(hashes) // 2
+
+    return sum(
+        1 << bit
+        for bit in range(FINGERPRINT_BITS)
+        if votes >> (bit * LANE_BITS) & LANE_MASK > majority
+    )
+
+
+def links_hash(content: bytes, link_base: str) -> str:
+    """
+    :param content: Raw bytes of the page
+    :param link_base: URL the page's relative links resolve against
+    :return: Hash of the distinct pages the page links to, in any order
+    """
+    links = {
+        urldefrag(urljoin(link_base, href.decode(errors="replace"))).url
+        for href in HREF.findall(content)
+    }
+
+    return content_hash(" ".join(sorted(links)).encode())
+
+
+def hamming_distance(fingerprint: int, other: int) -> int:
+    """
+    :return: Number of bits that differ between two fingerprints
+    """
+    return (fingerprint ^ other).bit_count()
+
+
+class DuplicateIndex:
+    """
+    The content fingerprints of every page parsed, to find pages duplicating
+    one already parsed before parsing them.
+
+    Exact duplicates are found by a content hash. Near duplicates are found by
+    SimHash, splitting each fingerprint into one more band than the bits that
+    may differ, so a near duplicate shares at least one band with the page it
+    duplicates and only pages sharing a band are compared.
+
+    A duplicate must also link to exactly the same pages once its links are
+    resolved, as parsing a page linking to any other page would find a new
+    link. Pages at different paths with the same relative links link to
+    different pages.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        """
+        Initialise a new, empty duplicate index.
+
+        :param max_distance: Bits that may differ between the fingerprints of
+            near-duplicate pages *(default: 3 - 0 only finds exact duplicates)*
+        """
+        self.max_distance = max_distance
+
+        self._band_count = max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self._band_count
+
+        self._exact: dict[tuple[str, str], str] = {}
+        self._bands: list[dict[int, list[tuple[int, str, str]]]] = [
+            {} for _ in range(self._band_count)
+        ]
+
+        # Pages found to duplicate another, mapped to the page first parsed
+        self.duplicates: dict[str, str] = {}
+
+    def find_duplicate(
+        self, url: str, content: bytes, link_base: str | None = None
+    ) -> str | None:
+        """
+        Find the page a page duplicates, or index it if it duplicates none.
+
+        :param url: URL of the page
+        :param content: Raw bytes of the page
+        :param link_base: URL the page's relative links resolve against
+            *(default: None - the URL of the page)*
+        :return: Canonical URL of the page first parsed with the same, or nearly
+            the same, content and the same links, or None if the page is new
+        """
+        page = canonicalize_url(url)
+        links = links_hash(content, link_base or url)
+        exact = (content_hash(content), links)
+
+        original = self._exact.get(exact)
+        fingerprint = None
+
+        if original is None and self.max_distance:
+            fingerprint = simhash(content)
+            original = self._find_near_duplicate(fingerprint, links)
+
+        if original is not None:
+            if original != page:
+                self.duplicates[page] = original
+                return original
+            return None
+
+        self._exact[exact] = page
+
+        if fingerprint is not None:
+            for band, key in zip(
+                self._bands, self._band_keys(fingerprint), strict=True
+            ):
+                band.setdefault(key, []).append((fingerprint, links, page))
+
+        return None
+
+    def _find_near_duplicate(self, fingerprint: int | None, links: str) -> str | None:
+        if fingerprint is None:
+            return None
+
+        for band, key in zip(self._bands, self._band_keys(fingerprint), strict=True):
+            for candidate, candidate_links, page in band.get(key, ()):
+                if (
+                    candidate_links == links
+                    and hamming_distance(fingerprint, candidate) <= self.max_distance
+                ):
+                    return page
+
+        return None
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        band_mask = (1 << self._band_bits) - 1
+
+        return [
+            fingerprint >> (band * self._band_bits) & band_mask
+            for band in range(self._band_count)
+        ]
@@ -0,0 +1,378 @@
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from collections.abc import Callable, Hashable
+from enum import StrEnum
+from urllib.parse import urlparse
+
+CrawlItem = tuple[str, int]
+
+DEFAULT_MEMORY_LIMIT = 10_000
+SPILL_BATCH_SIZE = 1_000
+
+
+class FrontierBackend(StrEnum):
+    """
+    Storage backends for the queue of pages waiting to be crawled.
+    """
+
+    MEMORY = "memory"
+    DISK = "disk"
+
+
+class FrontierStrategy(StrEnum):
+    """
+    Orders in which pages waiting to be crawled are taken from the queue.
+    """
+
+    FIFO = "fifo"
+    BFS = "bfs"
+    SHALLOW_FIRST = "shallow-first"
+    ROUND_ROBIN = "round-robin"
+
+
+def depth_priority(item: CrawlItem) -> tuple[int, ...]:
+    """
+    Prioritise pages by the depth of links they were found at, so every page at
+    one depth is crawled before any page at the next.
+
+    :param item: Page and its depth
+    :return: Priority of the page, lowest first
+    """
+    return (item[1],)
+
+
+def path_priority(item: CrawlItem) -> tuple[int, ...]:
+    """
+    Prioritise pages by how close their path is to the root of the site, then
+    by depth, so section landing pages are crawled before the pages within them.
+
+    :param item: Page and its depth
+    :return: Priority of the page, lowest first
+    """
+    url, depth = item
+    parsed_url = urlparse(url)
+    segments = sum(1 for segment in parsed_url.path.split("/") if segment)
+
+    # Query strings usually filter or paginate the page without them
+    return (segments + bool(parsed_url.query), depth)
+
+
+def url_group(url: str) -> tuple[str, str]:
+    """
+    Group a URL by its host and the first segment of its path, such as
+    ("monzo.com", "blog") for https://monzo.com/blog/2024/01/post.
+
+    :param url: URL of the page
+    :return: Host and path prefix of the page
+    """
+    parsed_url = urlparse(url)
+    prefix = parsed_url.path.lstrip("/").partition("/")[0]
+
+    return parsed_url.netloc, prefix
+
+
+class SpillBuffer:
+    """
+    A FIFO buffer holding a bounded number of items in memory, spilling the
+    remainder to a SQLite database on local disk.
+
+    Items are held in three segments, read in order: an in-memory head, the
+    spilled items on disk, and an in-memory tail that is written to disk in
+    batches.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ):
+        """
+        Initialise a new spill buffer.
+
+        :param path: SQLite database file to spill to
+            *(default: None - a temporary file removed on close)*
+        :param memory_limit: Items to hold in memory before spilling to disk
+            *(default: 10,000)*
+        """
+        self.memory_limit = memory_limit
+
+        self._temporary = path is None
+        if path is None:
+            file_descriptor, path = tempfile.mkstemp(
+                prefix="sitemappy-frontier-", suffix=".sqlite"
+            )
+            os.close(file_descriptor)
+
+        self.path = path
+
+        self._head: deque[CrawlItem] = deque()
+        self._tail: list[CrawlItem] = []
+        self._spilled = 0
+
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            DROP TABLE IF EXISTS frontier;
+            CREATE TABLE frontier (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL
+            );
+            """
+        )
+
+    def __len__(self) -> int:
+        return len(self._head) + self._spilled + len(self._tail)
+
+    @property
+    def spilled(self) -> int:
+        """
+        :return: Number of items currently held on disk
+        """
+        return self._spilled
+
+    def append(self, item: CrawlItem) -> None:
+        """
+        Add an item to the end of the buffer.
+
+        :param item: Item to add
+        """
+        if not self._spilled and not self._tail and len(self._head) < self.memory_limit:
+            self._head.append(item)
+            return
+
+        self._tail.append(item)
+
+        if len(self._tail) >= SPILL_BATCH_SIZE:
+            self._flush_tail()
+
+    def popleft(self) -> CrawlItem:
+        """
+        Remove and return the item at the front of the buffer.
+
+        :return: The oldest item in the buffer
+        """
+        if not self._head:
+            self._refill_head()
+
+        return self._head.popleft()
+
+    def close(self) -> None:
+        """
+        Close the database, removing it if it is a temporary file.
+        """
+        self._connection.close()
+
+        if self._temporary:
+            os.remove(self.path)
+
+    def _flush_tail(self) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO frontier (url, depth) VALUES (?, ?)", self._tail
+            )
+
+        self._spilled += len(self._tail)
+        self._tail = []
+
+    def _refill_head(self) -> None:
+        if not self._spilled:
+            self._head.extend(self._tail)
+            self._tail = []
+            return
+
+        with self._connection:
+            rows = self._connection.execute(
+                "SELECT id, url, depth FROM frontier ORDER BY id LIMIT ?",
+                (self.memory_limit,),
+            ).fetchall()
+            self._connection.execute(
+                "DELETE FROM frontier WHERE id <= ?", (rows[-1][0],)
+            )
+
+        self._head.extend((url, depth) for _, url, depth in rows)
+        self._spilled -= len(rows)
+
+
+class DiskFrontier(asyncio.Queue[CrawlItem]):
+    """
+    A FIFO crawl queue bounded in memory, spilling to local disk when the
+    number of pages waiting to be crawled exceeds the memory limit.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ):
+        """
+        Initialise a new disk-backed crawl queue.
+
+        :param path: SQLite database file to spill to
+            *(default: None - a temporary file removed on close)*
+        :param memory_limit: Pages to hold in memory before spilling to disk
+            *(default: 10,000)*
+        """
+        self._buffer = SpillBuffer(path, memory_limit)
+        super().__init__()
+
+    # asyncio.Queue subclasses customise storage through these hooks, as
+    # asyncio.PriorityQueue and asyncio.LifoQueue do
+    def _init(self, maxsize: int) -> None:  # noqa: ARG002 - Always unbounded
+        self._queue = self._buffer
+
+    def _put(self, item: CrawlItem) -> None:
+        self._buffer.append(item)
+
+    def _get(self) -> CrawlItem:
+        return self._buffer.popleft()
+
+    @property
+    def spilled(self) -> int:
+        """
+        :return: Number of pages currently held on disk
+        """
+        return self._buffer.spilled
+
+    def close(self) -> None:
+        """
+        Close the backing database.
+        """
+        self._buffer.close()
+
+
+class PriorityFrontier(asyncio.Queue[CrawlItem]):
+    """
+    A crawl queue taking the page with the lowest priority first, and pages of
+    equal priority in the order they were added.
+    """
+
+    def __init__(self, priority: Callable[[CrawlItem], tuple[int, ...]]):
+        """
+        Initialise a new priority crawl queue.
+
+        :param priority: Priority of a page, such as depth_priority
+        """
+        self._priority = priority
+        self._order = itertools.count()
+        super().__init__()
+
+    def _init(self, maxsize: int) -> None:  # noqa: ARG002 - Always unbounded
+        self._queue: list[tuple[tuple[int, ...], int, CrawlItem]] = []
+
+    def _put(self, item: CrawlItem) -> None:
+        heapq.heappush(self._queue, (self._priority(item), next(self._order), item))
+
+    def _get(self) -> CrawlItem:
+        return heapq.heappop(self._queue)[-1]
+
+
+class RoundRobinBuffer:
+    """
+    A buffer holding a FIFO queue of items for each group of URLs, taking an
+    item from each group in turn.
+    """
+
+    def __init__(self, group: Callable[[str], Hashable] = url_group):
+        """
+        Initialise a new round-robin buffer.
+
+        :param group: Group of a URL *(default: url_group - host and path prefix)*
+        """
+        self._group = group
+        self._groups: dict[Hashable, deque[CrawlItem]] = {}
+        self._turns: deque[Hashable] = deque()
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, item: CrawlItem) -> None:
+        """
+        Add an item to the end of its group's queue.
+
+        :param item: Item to add
+        """
+        key = self._group(item[0])
+        items = self._groups.get(key)
+
+        if items is None:
+            items = self._groups[key] = deque()
+            self._turns.append(key)
+
+        items.append(item)
+        self._length += 1
+
+    def popleft(self) -> CrawlItem:
+        """
+        Remove and return the oldest item of the group whose turn it is.
+
+        :return: The oldest item in the group
+        """
+        key = self._turns.popleft()
+        items = self._groups[key]
+        item = items.popleft()
+        self._length -= 1
+
+        # Groups leave the rotation once empty, rejoining at the back when a
+        # new item is added to them
+        if items:
+            self._turns.append(key)
+        else:
+            del self._groups[key]
+
+        return item
+
+
+class RoundRobinFrontier(asyncio.Queue[CrawlItem]):
+    """
+    A crawl queue taking pages from each host and path prefix in turn, so one
+    large section of a site cannot crowd out the rest.
+    """
+
+    def _init(self, maxsize: int) -> None:  # noqa: ARG002 - Always unbounded
+        self._queue = RoundRobinBuffer()
+
+    def _put(self, item: CrawlItem) -> None:
+        self._queue.append(item)
+
+    def _get(self) -> CrawlItem:
+        return self._queue.popleft()
+
+
+def create_frontier(
+    backend: FrontierBackend,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    strategy: FrontierStrategy = FrontierStrategy.FIFO,
+) -> asyncio.Queue[CrawlItem]:
+    """
+    Create a crawl queue for the given backend and strategy.
+
+    :param backend: Storage backend for the queue
+    :param memory_limit: Pages to hold in memory before spilling to disk, only
+        used by the disk backend *(default: 10,000)*
+    :param strategy: Order to take pages from the queue in, the disk backend
+        only supports FIFO *(default: FIFO)*
+    :return: Empty crawl queue
+    """
+    if backend == FrontierBackend.DISK:
+        if strategy != FrontierStrategy.FIFO:
+            raise ValueError(f"The disk frontier cannot use the {strategy} strategy")
+
+        return DiskFrontier(memory_limit=memory_limit)
+
+    if strategy == FrontierStrategy.BFS:
+        return PriorityFrontier(depth_priority)
+    if strategy == FrontierStrategy.SHALLOW_FIRST:
+        return PriorityFrontier(path_priority)
+    if strategy == FrontierStrategy.ROUND_ROBIN:
+        return RoundRobinFrontier()
+
+    return asyncio.Queue()
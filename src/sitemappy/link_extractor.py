@@ -0,0 +1,43 @@
+from html.parser import HTMLParser
+
+ANCHOR_TAG = "a"
+HREF_ATTRIBUTE = "href"
+
+
+class AnchorHrefExtractor(HTMLParser):
+    """
+    An incremental HTML tokenizer that only collects the href of anchor tags.
+
+    Chunks of a page can be fed in as they are received, no document tree is
+    built, and collected hrefs can be taken as the page is streamed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise a new anchor href extractor.
+        """
+        super().__init__(convert_charrefs=True)
+        self._hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != ANCHOR_TAG:
+            return
+
+        href = None
+
+        # Duplicated attributes are resolved to the last value, as BeautifulSoup does
+        for name, value in attrs:
+            if name == HREF_ATTRIBUTE:
+                href = value
+
+        if href:
+            self._hrefs.append(href)
+
+    def take_hrefs(self) -> list[str]:
+        """
+        Take the hrefs collected since the last call.
+
+        :return: List of href values in the order they appear on the page
+        """
+        hrefs, self._hrefs = self._hrefs, []
+        return hrefs
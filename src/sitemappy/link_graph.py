@@ -0,0 +1,148 @@
+"""
+A compact store of the pages crawled and the links gathered from each page.
+
+Every URL is held once, in a table interning it to an integer id, and the links
+of each page are held as ids packed into arrays, rather than as a list of URL
+strings per page that repeats every shared link.
+"""
+
+from array import array
+from collections.abc import Iterator, Mapping
+
+# Row of a URL that has been interned from a link but not crawled as a page
+NOT_CRAWLED = -1
+
+
+class LinkGraph(Mapping[str, list[str]]):
+    """
+    A map of pages crawled to the links gathered from that page, with URLs
+    interned to ids and links stored as a compressed sparse row adjacency.
+
+    Pages are added with add(), and the list of links of a page is only built
+    when the page is looked up, so the graph can be passed wherever a map of
+    pages to links is read.
+    """
+
+    def __init__(self, pages: Mapping[str, list[str]] | None = None):
+        """
+        Initialise a new link graph.
+
+        :param pages: Pages and their links to add to the graph
+            *(default: None - empty)*
+        """
+        # Intern table of every URL seen as a page or a link
+        self._ids: dict[str, int] = {}
+        self._urls: list[str] = []
+
+        # Row of each URL id, or NOT_CRAWLED if it has not been added as a page
+        self._rows = array("i")
+
+        # URL id of the page of each row, and the end of its links in _links
+        self._row_pages = array("I")
+        self._row_ends = array("Q")
+        self._links = array("I")
+
+        self._pages = 0
+
+        if pages is not None:
+            self.update(pages)
+
+    def add(self, page: str, links: list[str]) -> None:
+        """
+        Add a crawled page, replacing its links if it has already been added.
+
+        :param page: Page that was crawled
+        :param links: Links gathered from the page
+        """
+        page_id = self._intern(page)
+
+        if self._rows[page_id] == NOT_CRAWLED:
+            self._pages += 1
+
+        self._rows[page_id] = len(self._row_pages)
+        self._row_pages.append(page_id)
+        self._links.extend(self._intern(link) for link in links)
+        self._row_ends.append(len(self._links))
+
+    def update(self, pages: Mapping[str, list[str]]) -> None:
+        """
+        Add every page of another map of pages to links.
+
+        :param pages: Pages and their links to add to the graph
+        """
+        for page, links in pages.items():
+            self.add(page, links)
+
+    @property
+    def link_count(self) -> int:
+        """
+        :return: Links gathered across all crawled pages, without building any
+            lists of links
+        """
+        return sum(self._row_length(row) for row in self._live_rows())
+
+    @property
+    def url_count(self) -> int:
+        """
+        :return: Unique URLs interned, as crawled pages or links
+        """
+        return len(self._urls)
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """
+        :return: The graph as a dict of pages to lists of links
+        """
+        return dict(self.items())
+
+    def __getitem__(self, page: str) -> list[str]:
+        row = self._row(page)
+
+        if row == NOT_CRAWLED:
+            raise KeyError(page)
+
+        start = self._row_ends[row - 1] if row else 0
+        urls = self._urls
+
+        return [urls[link_id] for link_id in self._links[start : self._row_ends[row]]]
+
+    def __contains__(self, page: object) -> bool:
+        return isinstance(page, str) and self._row(page) != NOT_CRAWLED
+
+    def __iter__(self) -> Iterator[str]:
+        urls = self._urls
+
+        for row in self._live_rows():
+            yield urls[self._row_pages[row]]
+
+    def __len__(self) -> int:
+        return self._pages
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def _intern(self, url: str) -> int:
+        url_id = self._ids.get(url)
+
+        if url_id is None:
+            url_id = len(self._urls)
+            self._ids[url] = url_id
+            self._urls.append(url)
+            self._rows.append(NOT_CRAWLED)
+
+        return url_id
+
+    def _row(self, page: str) -> int:
+        page_id = self._ids.get(page)
+
+        return NOT_CRAWLED if page_id is None else self._rows[page_id]
+
+    def _live_rows(self) -> Iterator[int]:
+        # Rows of pages that were added again are superseded by their last row
+        for row, page_id in enumerate(self._row_pages):
+            if self._rows[page_id] == row:
+                yield row
+
+    def _row_length(self, row: int) -> int:
+        start = self._row_ends[row - 1] if row else 0
+
+        return self._row_ends[row] - start
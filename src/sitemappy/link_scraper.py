@@ -1,56 +1,488 @@
+import asyncio
+import codecs
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Protocol
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 
+from .fetch_policy import FetchPolicy, SkippedPageError
+from .fingerprints import DuplicateIndex
+from .link_extractor import AnchorHrefExtractor
+from .metrics import CrawlMetrics
+from .redirects import RedirectCache, RedirectError, TooManyRedirectsError
+from .retry import RETRYABLE_STATUSES, RetryableResponseError, parse_retry_after
+from .robots import RobotsCache
+from .urls import canonicalize_url
+from .validator_cache import CachedPage, ValidatorCache, content_hash, new_content_hash
+
 HTTP_TRANSPORTS = ["http://", "https://"]
 
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_S = 5.0
+DEFAULT_REQUEST_TIMEOUT_S = 5.0
+
+
+def resolve_link(base_url: str, link: str) -> str:
+    """
+    Resolve a link found on a page against the URL the page was served from.
+
+    :param base_url: URL of the page the link was found on
+    :param link: Value of a link's href
+    :return: Absolute URL of the link
+    """
+    if not any(link.startswith(prefix) for prefix in HTTP_TRANSPORTS):
+        # If the link does not start with the HTTP transport, it must be
+        # a relative path so append the base URL.
+        link = urljoin(base_url, link)
+
+    return link
+
+
+def scope_prefixes(base_url: str) -> tuple[str, ...]:
+    """
+    Get the prefixes of every canonical link in the same subdomain as a base URL.
+
+    :param base_url: Base URL of the site being scraped
+    :return: Prefix for each HTTP transport, including the host and any
+        non-default port
+    """
+    netloc = urlparse(canonicalize_url(base_url)).netloc
+
+    return tuple(f"{prefix}{netloc}/" for prefix in HTTP_TRANSPORTS)
+
+
+def extract_links(
+    page: str | bytes, base_url: str, encoding: str | None = None
+) -> list[str]:
+    """
+    Parse a page with BeautifulSoup and extract the links of its anchor tags.
+
+    This is a module level function so it can be sent to a process pool.
+
+    :param page: Decoded page, or raw bytes of the page
+    :param base_url: Base URL to resolve relative links against
+    :param encoding: Encoding of the raw bytes of the page
+    :return: List of URLs referenced on the page
+    """
+    links = []
+
+    soup = BeautifulSoup(page, "html.parser", from_encoding=encoding)
+
+    for html_link_element in soup.find_all("a"):
+        link: str = html_link_element.get("href")
+
+        if link:
+            links.append(resolve_link(base_url, link))
+
+    return links
+
+
+def create_parse_executor(parse_workers: int) -> Executor:
+    """
+    Create an executor to parse pages in parallel with the event loop.
+
+    A process pool is used so parsing is not limited by the GIL, unless the
+    interpreter is a free-threaded build, where threads avoid copying pages
+    between processes.
+
+    :param parse_workers: Number of processes or threads to parse pages with
+    :return: Executor for AsyncScraper.parse_executor
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+
+    if not is_gil_enabled():
+        return ThreadPoolExecutor(max_workers=parse_workers)
+
+    return ProcessPoolExecutor(max_workers=parse_workers)
+
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keepalive_connections: int = DEFAULT_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_S,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT_S,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """
+    Create a client whose connection pool is sized for a number of concurrent
+    requests, so the pool does not cap how many pages are fetched at once.
+
+    Idle connections are kept alive between requests, so workers reuse them
+    rather than repeating TCP and TLS handshakes. httpcore scans the whole pool
+    for idle connections on every request, so keeping many more connections
+    alive costs CPU that can outweigh the handshakes saved.
+
+    :param max_connections: Connections to open at once, one per concurrent
+        request *(default: 10)*
+    :param keepalive_connections: Idle connections to keep alive, at most
+        max_connections *(default: 20)*
+    :param keepalive_expiry: Seconds an idle connection is kept alive
+        *(default: 5)*
+    :param request_timeout: Seconds to wait to connect, read, write or acquire
+        a connection from the pool *(default: 5)*
+    :param http2: Multiplex requests over HTTP/2 connections to servers that
+        support it, requires the h2 package *(default: False)*
+    :return: Client to pass to AsyncScraper, to be closed once crawling is done
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(keepalive_connections, max_connections),
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=request_timeout,
+    )
+
+
+class ResponseObserver(Protocol):
+    """
+    Notified of the outcome of every request an AsyncScraper makes.
+    """
+
+    def record_response(self, status_code: int, latency: float) -> None:
+        """
+        Record a response, as soon as its headers have been received.
+
+        :param status_code: HTTP status of the response
+        :param latency: Seconds between sending the request and receiving the
+            response headers
+        """
+        ...
+
+    def record_error(self) -> None:
+        """
+        Record a request that failed without a response, such as a timeout.
+        """
+        ...
+
 
 class AsyncScraper:
     """
     An asynchronous scraper to get all links for a given webpage.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913 - Could move to Pydantic models in the future
         self,
         base_url: str,
         client: httpx.AsyncClient | None = None,
+        *,
+        streaming: bool = False,
+        parse_executor: Executor | None = None,
+        cache: ValidatorCache | None = None,
+        fetch_policy: FetchPolicy | None = None,
+        observer: ResponseObserver | None = None,
+        duplicates: DuplicateIndex | None = None,
+        metrics: CrawlMetrics | None = None,
+        redirects: RedirectCache | None = None,
+        robots: RobotsCache | None = None,
     ):
         """
         Initialise a new asynchronous link scaper.
 
         :param base_url: Base URL of the site to crawl
         :param client: httpx.AsyncClient for making requests
+        :param streaming: Stream page bodies through an incremental anchor
+            tokenizer instead of building a BeautifulSoup tree
+            *(default: False)*
+        :param parse_executor: Executor to parse pages with BeautifulSoup in,
+            keeping the event loop free to fetch pages
+            *(default: None - parse in the event loop)*
+        :param cache: Cache of page validators and links, to make conditional
+            requests and reuse the links of unchanged pages
+            *(default: None - fetch and parse every page)*
+        :param fetch_policy: Policy deciding which pages are worth downloading
+            *(default: None - skip assets and pages over 10 MiB)*
+        :param observer: Notified of the status and latency of every response,
+            and of failed requests *(default: None)*
+        :param duplicates: Index of the content of pages parsed, so pages
+            duplicating one already parsed are not parsed again, and have no
+            links *(default: None - parse every page)*
+        :param metrics: Metrics to record the fetch and parse latency, bytes
+            downloaded and status of every page in *(default: None)*
+        :param redirects: Cache of redirects, to follow redirects within the
+            subdomain and record each hop in *(default: None - redirect
+            responses are parsed like any other page)*
+        :param robots: Cache of robots.txt rules, to only follow redirects to
+            pages they allow *(default: None - follow every redirect)*
         """
         self.base_url = base_url
         self.parsed_base_url = urlparse(base_url)
+        self._scope_prefixes = scope_prefixes(base_url)
         self.client = client if client else httpx.AsyncClient()
+        self.streaming = streaming
+        self.parse_executor = parse_executor
+        self.cache = cache
+        self.fetch_policy = fetch_policy if fetch_policy else FetchPolicy()
+        self.observer = observer
+        self.duplicates = duplicates
+        self.metrics = metrics
+        self.redirects = redirects
+        self.robots = robots
+
+        # URLs fetched that were not served as a 200 HTML page, such as error
+        # pages and skipped assets, to leave out of sitemaps. Redirects are
+        # marked by the URL at the end of their chain, and taken by the crawler
+        # once it has recorded the page
+        self.unlisted: set[str] = set()
 
     async def get_links(self, url: str) -> list[str]:
         """
         Get all links present on a webpage.
 
+        With a redirect cache, redirects are followed while they stay within the
+        subdomain and robots.txt allows them, and the links are those of the
+        page at the end of the chain.
+        A URL already known to redirect is requested at the end of its chain.
+
+        Assets, non-HTML responses and pages too large for the fetch policy are
+        skipped without downloading their body, and have no links.
+
+        With a cache, the page is only downloaded if it has changed since it was
+        cached, and is only parsed if its content has changed.
+
+        With a duplicate index, a page with the same or nearly the same content
+        as a page already parsed is not parsed, as its links have already been
+        found. Pages streamed through the incremental extractor are parsed as
+        they arrive, so are never checked.
+
         :param url: The URL of the webpage to scrape
         :return: List of URLs referenced on the page
+        :raises RetryableResponseError: If the response is a temporary failure,
+            such as a 429 or 503, worth requesting again
+        :raises httpx.TransportError: If the request failed without a response
+        :raises TooManyRedirectsError: If the page redirects more times than the
+            redirect cache follows
         """
-        links = []
+        if not self.redirects:
+            return await self._get_page_links(url)
+
+        url = self.redirects.resolve(url)
+
+        for _ in range(self.redirects.max_redirects + 1):
+            try:
+                return await self._get_page_links(url)
+            except RedirectError as redirect:
+                self.redirects.record(url, redirect.location)
+
+                # The chain is only followed within the subdomain being scraped,
+                # to pages robots.txt allows
+                if not self.is_in_same_subdomain(canonicalize_url(redirect.location)):
+                    return []
+
+                if self.robots and not await self.robots.allowed(redirect.location):
+                    return []
+
+                url = redirect.location
+
+        raise TooManyRedirectsError(
+            f"More than {self.redirects.max_redirects} redirects"
+        )
+
+    async def _get_page_links(self, url: str) -> list[str]:
+        if not self.fetch_policy.should_request(url):
+            self.unlisted.add(url)
+            return []
+
+        cached = self.cache.get(canonicalize_url(url)) if self.cache else None
+        headers = cached.conditional_headers() if cached else {}
+
+        requested_at = time.monotonic()
+
+        try:
+            async with self.client.stream("GET", url, headers=headers) as page:
+                self._check_response(page, requested_at)
+
+                if self.redirects and page.is_redirect:
+                    raise RedirectError(
+                        page.status_code,
+                        urljoin(str(page.url), page.headers["Location"]),
+                    )
+
+                if cached and page.status_code == HTTPStatus.NOT_MODIFIED:
+                    return self._reuse_links(cached, bytes_saved=cached.content_length)
+
+                # Error pages are still parsed, as they may link to other pages
+                if page.status_code != HTTPStatus.OK:
+                    self.unlisted.add(url)
+
+                self.fetch_policy.check_headers(page)
+
+                # Links are relative to where the page was served from
+                link_base = str(page.url)
+
+                if self.streaming:
+                    links = await self._get_links_streamed(url, link_base, page)
+                    self._record_fetch(requested_at)
+                    return links
+
+                content = await self._read_body(page)
+                self._record_fetch(requested_at)
+        except SkippedPageError:
+            self.unlisted.add(url)
+            return []
+        except httpx.TransportError:
+            if self.observer:
+                self.observer.record_error()
+            raise
+
+        return await self._get_body_links(url, link_base, page, content, cached)
+
+    async def _get_body_links(
+        self,
+        url: str,
+        link_base: str,
+        page: httpx.Response,
+        content: bytes,
+        cached: CachedPage | None,
+    ) -> list[str]:
+        page_hash = content_hash(content) if self.cache else ""
+
+        if cached and page_hash == cached.content_hash:
+            return self._reuse_links(cached, bytes_saved=0)
+
+        # Fingerprinting is cheaper than parsing, so is done first. Duplicates
+        # are not cached, as their links were never found, so must not be reused
+        if self.duplicates and self.duplicates.find_duplicate(url, content, link_base):
+            return []
+
+        parse_started_at = time.monotonic()
+        links = await self._parse_links(link_base, content, page.encoding)
 
-        page = await self.client.get(url=url)
-        soup = BeautifulSoup(page.text, "html.parser")
+        if self.metrics:
+            self.metrics.parse.observe(time.monotonic() - parse_started_at)
 
-        for html_link_element in soup.find_all("a"):
-            link: str = html_link_element.get("href")
+        self._cache_links(url, page, page_hash, len(content), links)
 
-            if link:
-                if not any(link.startswith(prefix) for prefix in HTTP_TRANSPORTS):
-                    # If the link does not start with the HTTP transport, it must be
-                    # a relative path so append the base URL.
-                    link = urljoin(self.base_url, link)
+        return links
+
+    async def _parse_links(
+        self, link_base: str, content: bytes, encoding: str | None
+    ) -> list[str]:
+        if self.parse_executor:
+            # Send the raw bytes, so decoding happens in the executor too
+            links: list[str] = await asyncio.get_running_loop().run_in_executor(
+                self.parse_executor,
+                extract_links,
+                content,
+                link_base,
+                encoding,
+            )
+            return links
+
+        return extract_links(
+            content.decode(encoding or "utf-8", errors="replace"), link_base
+        )
+
+    def _record_bytes(self, chunk_length: int) -> None:
+        # Bytes of pages abandoned as too large were still downloaded
+        if self.metrics:
+            self.metrics.bytes_downloaded += chunk_length
+
+    def _record_fetch(self, requested_at: float) -> None:
+        # Streamed pages are parsed as they are read, so this includes parsing
+        if self.metrics:
+            self.metrics.fetch.observe(time.monotonic() - requested_at)
+
+    def _check_response(self, page: httpx.Response, requested_at: float) -> None:
+        if self.metrics:
+            self.metrics.status_codes[page.status_code] += 1
+
+        if self.observer:
+            self.observer.record_response(
+                page.status_code, time.monotonic() - requested_at
+            )
+
+        if page.status_code in RETRYABLE_STATUSES:
+            raise RetryableResponseError(
+                page.status_code, parse_retry_after(page.headers.get("Retry-After"))
+            )
+
+    async def _read_body(self, page: httpx.Response) -> bytes:
+        chunks: list[bytes] = []
+        content_length = 0
+
+        async for chunk in page.aiter_bytes():
+            content_length += len(chunk)
+            self._record_bytes(len(chunk))
+            self.fetch_policy.check_size(content_length)
+            chunks.append(chunk)
+
+        return b"".join(chunks)
+
+    async def _get_links_streamed(
+        self, url: str, link_base: str, page: httpx.Response
+    ) -> list[str]:
+        links: list[str] = []
+        extractor = AnchorHrefExtractor()
+        page_hash = new_content_hash()
+        content_length = 0
 
-                links.append(link)
+        # Decode the raw bytes as they arrive, as page.aiter_text() does, so
+        # the content hash covers the page as it was sent
+        decoder = codecs.getincrementaldecoder(page.encoding or "utf-8")(
+            errors="replace"
+        )
+
+        async for chunk in page.aiter_bytes():
+            content_length += len(chunk)
+            self._record_bytes(len(chunk))
+            self.fetch_policy.check_size(content_length)
+
+            if self.cache:
+                page_hash.update(chunk)
+
+            extractor.feed(decoder.decode(chunk))
+            links.extend(
+                resolve_link(link_base, link) for link in extractor.take_hrefs()
+            )
+
+        extractor.feed(decoder.decode(b"", final=True))
+        extractor.close()
+        links.extend(resolve_link(link_base, link) for link in extractor.take_hrefs())
+
+        self._cache_links(url, page, page_hash.hexdigest(), content_length, links)
 
         return links
 
+    def _reuse_links(self, cached: CachedPage, bytes_saved: int) -> list[str]:
+        if self.cache:
+            self.cache.stats.hits += 1
+            self.cache.stats.bytes_saved += bytes_saved
+
+        return cached.links
+
+    def _cache_links(
+        self,
+        url: str,
+        page: httpx.Response,
+        page_hash: str,
+        content_length: int,
+        links: list[str],
+    ) -> None:
+        if not self.cache:
+            return
+
+        self.cache.stats.misses += 1
+
+        if page.is_success:
+            self.cache.put(
+                canonicalize_url(url),
+                CachedPage(
+                    etag=page.headers.get("ETag"),
+                    last_modified=page.headers.get("Last-Modified"),
+                    content_hash=page_hash,
+                    content_length=content_length,
+                    links=links,
+                ),
+            )
+
     def is_in_same_subdomain(self, link: str) -> bool:
         """
         Identify if a link/URL is part of the subdomain being scraped.
@@ -59,7 +491,4 @@ class AsyncScraper:
         :return: Boolean value indicating the link is part of the configured
             AsyncScraper.base_url
         """
-        return any(
-            link.startswith(f"{prefix}{self.parsed_base_url.hostname}/")
-            for prefix in HTTP_TRANSPORTS
-        )
+        return link.startswith(self._scope_prefixes)
@@ -3,9 +3,12 @@ Main entry point for the sitemappy CLI, powered by typer.
 """
 
 import asyncio
+import importlib.util
 import json
 import os
-from typing import Annotated
+from collections.abc import Mapping
+from typing import Annotated, Any
+from urllib.parse import urljoin
 
 import typer
 import validators
@@ -13,16 +16,112 @@ from rich import print
 from rich.table import Table
 from validators import ValidationError
 
+from sitemappy.coordinator import (
+    DEFAULT_COORDINATOR_HOST,
+    DEFAULT_COORDINATOR_PORT,
+    DEFAULT_LEASE_TIMEOUT_S,
+    CoordinatorServer,
+    LocalCoordinator,
+    NodeCrawler,
+    RemoteCoordinator,
+)
+from sitemappy.crawl_options import (
+    AdaptiveConcurrencyOptions,
+    CacheOptions,
+    CheckpointOptions,
+    ConnectionOptions,
+    DedupOptions,
+    FrontierOptions,
+    MonitoringOptions,
+    OutputOptions,
+    PolitenessOptions,
+)
 from sitemappy.crawler import Crawler
+from sitemappy.fetch_policy import FetchPolicy
+from sitemappy.frontier import FrontierBackend, FrontierStrategy
+from sitemappy.profiling import ProfileMode
+from sitemappy.seen import SeenSetBackend
+from sitemappy.sharding import ShardedCrawler
+from sitemappy.sinks import (
+    NdjsonFileSink,
+    OutputFormat,
+    SitemapXmlSink,
+    duplicates_path,
+    failures_path,
+    metrics_path,
+    profile_path,
+)
+from sitemappy.validator_cache import CacheStats
+
+DEFAULT_OUTPUT = "result.json"
+DEFAULT_OUTPUTS = {
+    OutputFormat.JSON: DEFAULT_OUTPUT,
+    OutputFormat.NDJSON: "result.ndjson",
+    OutputFormat.SITEMAP_XML: "sitemap.xml",
+}
 
 DEFAULT_WORKERS = 10
 MIN_WORKERS = 1
 
+DEFAULT_MIN_WORKERS = 1
+DEFAULT_MAX_WORKERS = 100
+
 DEFAULT_CRAWL_DEPTH = 0
 MIN_CRAWL_DEPTH = 0
 
-DEFAULT_POLITENESS_DELAY_S = 0
-MIN_POLITENESS_DELAY_S = 0
+DEFAULT_POLITENESS_DELAY_S = 0.0
+MIN_POLITENESS_DELAY_S = 0.0
+
+DEFAULT_POLITENESS_BURST = 1
+MIN_POLITENESS_BURST = 1
+
+DEFAULT_FRONTIER_MEMORY_LIMIT = 10_000
+MIN_FRONTIER_MEMORY_LIMIT = 1
+
+DEFAULT_MAX_PAGES = 0
+MIN_MAX_PAGES = 0
+
+DEFAULT_PARSE_WORKERS = 0
+MIN_PARSE_WORKERS = 0
+
+DEFAULT_PROCESSES = 1
+MIN_PROCESSES = 1
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MIN_CACHE_MAX_BYTES = 1
+
+DEFAULT_KEEPALIVE_CONNECTIONS = 20
+MIN_KEEPALIVE_CONNECTIONS = 0
+
+DEFAULT_KEEPALIVE_EXPIRY_S = 5.0
+MIN_KEEPALIVE_EXPIRY_S = 0.0
+
+DEFAULT_REQUEST_TIMEOUT_S = 5.0
+
+DEFAULT_PAGE_TIMEOUT_S = 30.0
+MIN_PAGE_TIMEOUT_S = 0.0
+
+DEFAULT_MAX_RETRIES = 2
+MIN_MAX_RETRIES = 0
+
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+MIN_CIRCUIT_BREAKER_THRESHOLD = 0
+
+DEFAULT_MAX_PAGE_BYTES = 10 * 1024 * 1024
+MIN_MAX_PAGE_BYTES = 1
+
+DEFAULT_MAX_URLS_PER_TEMPLATE = 1000
+MIN_MAX_URLS_PER_TEMPLATE = 0
+
+DEFAULT_STATS_INTERVAL_S = 0.0
+MIN_STATS_INTERVAL_S = 0.0
+
+DEFAULT_METRICS_PORT = 0
+MIN_METRICS_PORT = 0
+MAX_METRICS_PORT = 65535
+
+DEFAULT_LOOP_LAG_THRESHOLD_S = 0.0
+MIN_LOOP_LAG_THRESHOLD_S = 0.0
 
 
 app = typer.Typer(rich_markup_mode="rich")
@@ -74,28 +173,345 @@ def validate_crawl_depth(crawl_depth: int) -> int:
     return crawl_depth
 
 
-def validate_politeness_delay(politeness_delay_s: int) -> int:
+def validate_politeness_delay(politeness_delay_s: float) -> float:
     """
     Validate that the politeness_delay arg meets the minimum requirement (0).
     If the argument is invalid, raise a typer.BadParameter exception.
 
-    :param politeness_delay_s: Integer to validate
-    :return: Valid politeness_delay_s int.
+    :param politeness_delay_s: Float to validate
+    :return: Valid politeness_delay_s float.
     """
     if politeness_delay_s < MIN_POLITENESS_DELAY_S:
         raise typer.BadParameter(
-            f"Politeness delay must be at least {MIN_CRAWL_DEPTH} seconds! ❌"
+            f"Politeness delay must be at least {MIN_POLITENESS_DELAY_S:g} seconds! ❌"
         )
 
     return politeness_delay_s
 
 
+def validate_politeness_burst(politeness_burst: int) -> int:
+    """
+    Validate that the politeness_burst arg meets the minimum requirement (1).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param politeness_burst: Integer to validate
+    :return: Valid politeness_burst int.
+    """
+    if politeness_burst < MIN_POLITENESS_BURST:
+        raise typer.BadParameter(
+            f"Politeness burst must be at least {MIN_POLITENESS_BURST}! ❌"
+        )
+
+    return politeness_burst
+
+
+def validate_frontier_memory_limit(frontier_memory_limit: int) -> int:
+    """
+    Validate that the frontier_memory_limit arg meets the minimum requirement (1).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param frontier_memory_limit: Integer to validate
+    :return: Valid frontier_memory_limit int.
+    """
+    if frontier_memory_limit < MIN_FRONTIER_MEMORY_LIMIT:
+        raise typer.BadParameter(
+            f"Frontier memory limit must be at least {MIN_FRONTIER_MEMORY_LIMIT}! ❌"
+        )
+
+    return frontier_memory_limit
+
+
+def validate_max_pages(max_pages: int) -> int:
+    """
+    Validate that the max_pages arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param max_pages: Integer to validate
+    :return: Valid max_pages int.
+    """
+    if max_pages < MIN_MAX_PAGES:
+        raise typer.BadParameter(f"Max pages must be at least {MIN_MAX_PAGES}! ❌")
+
+    return max_pages
+
+
+def validate_parse_workers(parse_workers: int) -> int:
+    """
+    Validate that the parse_workers arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param parse_workers: Integer to validate
+    :return: Valid parse_workers int.
+    """
+    if parse_workers < MIN_PARSE_WORKERS:
+        raise typer.BadParameter(
+            f"Number of parse workers must be at least {MIN_PARSE_WORKERS}! ❌"
+        )
+
+    return parse_workers
+
+
+def validate_processes(processes: int) -> int:
+    """
+    Validate that the processes arg meets the minimum requirement (1).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param processes: Integer to validate
+    :return: Valid processes int.
+    """
+    if processes < MIN_PROCESSES:
+        raise typer.BadParameter(
+            f"Number of processes must be at least {MIN_PROCESSES}! ❌"
+        )
+
+    return processes
+
+
+def validate_cache_max_bytes(cache_max_bytes: int) -> int:
+    """
+    Validate that the cache_max_bytes arg meets the minimum requirement (1).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param cache_max_bytes: Integer to validate
+    :return: Valid cache_max_bytes int.
+    """
+    if cache_max_bytes < MIN_CACHE_MAX_BYTES:
+        raise typer.BadParameter(
+            f"Cache size must be at least {MIN_CACHE_MAX_BYTES} byte! ❌"
+        )
+
+    return cache_max_bytes
+
+
+def validate_keepalive_connections(keepalive_connections: int) -> int:
+    """
+    Validate that the keepalive_connections arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param keepalive_connections: Integer to validate
+    :return: Valid keepalive_connections int.
+    """
+    if keepalive_connections < MIN_KEEPALIVE_CONNECTIONS:
+        raise typer.BadParameter(
+            f"Keep-alive connections must be at least {MIN_KEEPALIVE_CONNECTIONS}! ❌"
+        )
+
+    return keepalive_connections
+
+
+def validate_keepalive_expiry(keepalive_expiry_s: float) -> float:
+    """
+    Validate that the keepalive_expiry arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param keepalive_expiry_s: Float to validate
+    :return: Valid keepalive_expiry_s float.
+    """
+    if keepalive_expiry_s < MIN_KEEPALIVE_EXPIRY_S:
+        raise typer.BadParameter(
+            f"Keep-alive expiry must be at least {MIN_KEEPALIVE_EXPIRY_S:g} seconds! ❌"
+        )
+
+    return keepalive_expiry_s
+
+
+def validate_request_timeout(request_timeout_s: float) -> float:
+    """
+    Validate that the request_timeout arg is greater than 0.
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param request_timeout_s: Float to validate
+    :return: Valid request_timeout_s float.
+    """
+    if request_timeout_s <= 0:
+        raise typer.BadParameter("Request timeout must be greater than 0 seconds! ❌")
+
+    return request_timeout_s
+
+
+def validate_page_timeout(page_timeout_s: float) -> float:
+    """
+    Validate that the page_timeout arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param page_timeout_s: Float to validate
+    :return: Valid page_timeout_s float.
+    """
+    if page_timeout_s < MIN_PAGE_TIMEOUT_S:
+        raise typer.BadParameter(
+            f"Page timeout must be at least {MIN_PAGE_TIMEOUT_S} seconds! ❌"
+        )
+
+    return page_timeout_s
+
+
+def validate_max_retries(max_retries: int) -> int:
+    """
+    Validate that the max_retries arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param max_retries: Integer to validate
+    :return: Valid max_retries int.
+    """
+    if max_retries < MIN_MAX_RETRIES:
+        raise typer.BadParameter(f"Max retries must be at least {MIN_MAX_RETRIES}! ❌")
+
+    return max_retries
+
+
+def validate_circuit_breaker_threshold(circuit_breaker_threshold: int) -> int:
+    """
+    Validate that the circuit_breaker_threshold arg meets the minimum
+    requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param circuit_breaker_threshold: Integer to validate
+    :return: Valid circuit_breaker_threshold int.
+    """
+    if circuit_breaker_threshold < MIN_CIRCUIT_BREAKER_THRESHOLD:
+        raise typer.BadParameter(
+            "Circuit breaker threshold must be at least "
+            f"{MIN_CIRCUIT_BREAKER_THRESHOLD}! ❌"
+        )
+
+    return circuit_breaker_threshold
+
+
+def validate_http2(http2: bool) -> bool:
+    """
+    Validate that HTTP/2 support is installed, if the http2 arg is enabled.
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param http2: Boolean to validate
+    :return: Valid http2 bool.
+    """
+    if http2 and importlib.util.find_spec("h2") is None:
+        raise typer.BadParameter(
+            "HTTP/2 requires the http2 extra: pip install 'sitemappy-cli[http2]' ❌"
+        )
+
+    return http2
+
+
+def validate_max_page_bytes(max_page_bytes: int) -> int:
+    """
+    Validate that the max_page_bytes arg meets the minimum requirement (1).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param max_page_bytes: Integer to validate
+    :return: Valid max_page_bytes int.
+    """
+    if max_page_bytes < MIN_MAX_PAGE_BYTES:
+        raise typer.BadParameter(
+            f"Max page size must be at least {MIN_MAX_PAGE_BYTES} byte! ❌"
+        )
+
+    return max_page_bytes
+
+
+def validate_max_urls_per_template(max_urls_per_template: int) -> int:
+    """
+    Validate that the max_urls_per_template arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param max_urls_per_template: Integer to validate
+    :return: Valid max_urls_per_template int.
+    """
+    if max_urls_per_template < MIN_MAX_URLS_PER_TEMPLATE:
+        raise typer.BadParameter(
+            f"Max URLs per template must be at least {MIN_MAX_URLS_PER_TEMPLATE}! ❌"
+        )
+
+    return max_urls_per_template
+
+
+def validate_stats_interval(stats_interval: float) -> float:
+    """
+    Validate that the stats_interval arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param stats_interval: Float to validate
+    :return: Valid stats_interval float.
+    """
+    if stats_interval < MIN_STATS_INTERVAL_S:
+        raise typer.BadParameter(
+            f"Stats interval must be at least {MIN_STATS_INTERVAL_S} seconds! ❌"
+        )
+
+    return stats_interval
+
+
+def validate_metrics_port(metrics_port: int) -> int:
+    """
+    Validate that the metrics_port arg is a port number (0 to 65535).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param metrics_port: Integer to validate
+    :return: Valid metrics_port int.
+    """
+    if not MIN_METRICS_PORT <= metrics_port <= MAX_METRICS_PORT:
+        raise typer.BadParameter(
+            f"Metrics port must be between {MIN_METRICS_PORT} and "
+            f"{MAX_METRICS_PORT}! ❌"
+        )
+
+    return metrics_port
+
+
+def validate_loop_lag_threshold(loop_lag_threshold_s: float) -> float:
+    """
+    Validate that the loop_lag_threshold arg meets the minimum requirement (0).
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param loop_lag_threshold_s: Float to validate
+    :return: Valid loop_lag_threshold float.
+    """
+    if loop_lag_threshold_s < MIN_LOOP_LAG_THRESHOLD_S:
+        raise typer.BadParameter(
+            f"Loop lag threshold must be at least {MIN_LOOP_LAG_THRESHOLD_S} "
+            "seconds! ❌"
+        )
+
+    return loop_lag_threshold_s
+
+
+def validate_coordinator_address(address: str | None) -> str | None:
+    """
+    Validate that the coordinator arg is a HOST:PORT address, if provided.
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param address: String to validate
+    :return: Valid address str.
+    """
+    if address is not None:
+        host, _, port = address.rpartition(":")
+
+        if not host or not port.isdigit():
+            raise typer.BadParameter("Coordinator address must be HOST:PORT! ❌")
+
+    return address
+
+
+def validate_resume(checkpoint: str | None) -> str | None:
+    """
+    Validate that the resume arg is an existing checkpoint journal, if provided.
+    If the argument is invalid, raise a typer.BadParameter exception.
+
+    :param checkpoint: Path to validate
+    :return: Valid checkpoint str.
+    """
+    if checkpoint is not None and not os.path.isfile(checkpoint):
+        raise typer.BadParameter(f"No checkpoint found at {checkpoint}! ❌")
+
+    return checkpoint
+
+
 @app.command(
     help="[magenta][bold]Sitemappy[/bold] (or sitemap-py 😉)[/magenta] is a CLI tool "
     "to crawl a website and create a JSON [red]sitemap[/red]."
     "\n\nFor more information about the tool go to https://github.com/dan-wilton/sitemappy/"
 )
-def main(
+def main(  # noqa: PLR0913 - Typer options are declared as arguments
     base_url: Annotated[
         str,
         typer.Argument(
@@ -103,42 +519,597 @@ def main(
             callback=validate_base_url,
         ),
     ],
+    *,
     workers: int = typer.Option(
         default=DEFAULT_WORKERS,
         callback=validate_workers,
     ),
+    adaptive_concurrency: bool = typer.Option(
+        default=False,
+        help="Grow and shrink the requests in flight between --min-workers and "
+        "--max-workers, starting from --workers and backing off on 429 and 503 "
+        "responses, failed requests and rising latency",
+    ),
+    min_workers: int = typer.Option(
+        default=DEFAULT_MIN_WORKERS,
+        callback=validate_workers,
+        help="Fewest requests in flight under adaptive concurrency",
+    ),
+    max_workers: int = typer.Option(
+        default=DEFAULT_MAX_WORKERS,
+        callback=validate_workers,
+        help="Most requests in flight under adaptive concurrency",
+    ),
     crawl_depth: int = typer.Option(
         default=DEFAULT_CRAWL_DEPTH,
         callback=validate_crawl_depth,
     ),
-    politeness_delay: int = typer.Option(
+    politeness_delay: float = typer.Option(
         default=DEFAULT_POLITENESS_DELAY_S,
         callback=validate_politeness_delay,
     ),
+    politeness_burst: int = typer.Option(
+        default=DEFAULT_POLITENESS_BURST,
+        callback=validate_politeness_burst,
+    ),
     enable_cmd_out: bool = False,
+    stream_links: bool = typer.Option(
+        default=False,
+        help="Stream pages through an incremental link extractor, "
+        "without building a BeautifulSoup tree",
+    ),
+    frontier: Annotated[
+        FrontierBackend,
+        typer.Option(
+            help="Where to hold pages waiting to be crawled, disk spills to a "
+            "local SQLite file beyond the frontier memory limit",
+        ),
+    ] = FrontierBackend.MEMORY,
+    frontier_memory_limit: int = typer.Option(
+        default=DEFAULT_FRONTIER_MEMORY_LIMIT,
+        callback=validate_frontier_memory_limit,
+        help="Pages the disk frontier holds in memory",
+    ),
+    frontier_strategy: Annotated[
+        FrontierStrategy,
+        typer.Option(
+            help="Order to crawl queued pages in: as found, strictly by depth, "
+            "shallowest URL path first, or taking turns across hosts and path "
+            "prefixes",
+        ),
+    ] = FrontierStrategy.FIFO,
+    max_pages: int = typer.Option(
+        default=DEFAULT_MAX_PAGES,
+        callback=validate_max_pages,
+        help="Pages to crawl before stopping, chosen in frontier strategy order "
+        "(0 is unlimited)",
+    ),
+    seen_set: Annotated[
+        SeenSetBackend,
+        typer.Option(
+            help="How to remember seen URLs, as exact strings, 64-bit "
+            "fingerprints or a fixed-size Bloom filter",
+        ),
+    ] = SeenSetBackend.EXACT,
+    parse_workers: int = typer.Option(
+        default=DEFAULT_PARSE_WORKERS,
+        callback=validate_parse_workers,
+        help="Processes to parse pages in, so fetching continues while pages "
+        "are parsed (0 parses in the event loop)",
+    ),
+    processes: int = typer.Option(
+        default=DEFAULT_PROCESSES,
+        callback=validate_processes,
+        help="Processes to partition the crawl across, each owning a hash "
+        "partition of the site's URLs",
+    ),
+    coordinator: Annotated[
+        str | None,
+        typer.Option(
+            callback=validate_coordinator_address,
+            metavar="HOST:PORT",
+            help="Run as a worker node of a distributed crawl, leasing pages "
+            "from a sitemappy-coordinator",
+        ),
+    ] = None,
+    checkpoint: Annotated[
+        str | None,
+        typer.Option(
+            metavar="PATH",
+            help="Journal the crawl to a file as it runs, so it can be resumed "
+            "with --resume if interrupted",
+        ),
+    ] = None,
+    resume: Annotated[
+        str | None,
+        typer.Option(
+            callback=validate_resume,
+            metavar="PATH",
+            help="Resume the crawl journaled to a checkpoint file, continuing to "
+            "journal to it",
+        ),
+    ] = None,
+    cache: Annotated[
+        str | None,
+        typer.Option(
+            metavar="PATH",
+            help="Cache page validators and links in a file across crawls, so "
+            "unchanged pages are not downloaded or parsed again",
+        ),
+    ] = None,
+    cache_max_bytes: int = typer.Option(
+        default=DEFAULT_CACHE_MAX_BYTES,
+        callback=validate_cache_max_bytes,
+        help="Size of cached pages to keep before evicting the least recently used",
+    ),
+    keepalive_connections: int = typer.Option(
+        default=DEFAULT_KEEPALIVE_CONNECTIONS,
+        callback=validate_keepalive_connections,
+        help="Idle connections kept alive for reuse, at most one per worker",
+    ),
+    keepalive_expiry: float = typer.Option(
+        default=DEFAULT_KEEPALIVE_EXPIRY_S,
+        callback=validate_keepalive_expiry,
+        help="Seconds an idle connection is kept alive for reuse",
+    ),
+    request_timeout: float = typer.Option(
+        default=DEFAULT_REQUEST_TIMEOUT_S,
+        callback=validate_request_timeout,
+        help="Seconds to wait to connect, read, write or acquire a connection "
+        "for each request",
+    ),
+    page_timeout: float = typer.Option(
+        default=DEFAULT_PAGE_TIMEOUT_S,
+        callback=validate_page_timeout,
+        help="Seconds to wait for each attempt to fetch and parse a page "
+        "(0 is no timeout)",
+    ),
+    max_retries: int = typer.Option(
+        default=DEFAULT_MAX_RETRIES,
+        callback=validate_max_retries,
+        help="Times to retry a page after a timeout, failed connection or 429, "
+        "502, 503 or 504 response, backing off or waiting for Retry-After",
+    ),
+    circuit_breaker_threshold: int = typer.Option(
+        default=DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        callback=validate_circuit_breaker_threshold,
+        help="Consecutive failed requests to a host before its pages wait for a "
+        "trial request to succeed (0 never stops requesting)",
+    ),
+    http2: bool = typer.Option(
+        default=False,
+        callback=validate_http2,
+        help="Multiplex requests over HTTP/2 to servers that support it",
+    ),
+    max_page_bytes: int = typer.Option(
+        default=DEFAULT_MAX_PAGE_BYTES,
+        callback=validate_max_page_bytes,
+        help="Largest page to download, larger pages are recorded without their links",
+    ),
+    skip_assets: bool = typer.Option(
+        default=True,
+        help="Record links to assets such as PDFs, images and video by their "
+        "extension, without requesting them",
+    ),
+    respect_robots: bool = typer.Option(
+        default=True,
+        help="Skip pages disallowed by each host's robots.txt, and slow to its "
+        "Crawl-delay",
+    ),
+    seed_sitemaps: bool = typer.Option(
+        default=False,
+        help="Queue every page listed in the sitemaps the site publishes, found "
+        "through robots.txt or at /sitemap.xml, while the crawl starts",
+    ),
+    follow_redirects: bool = typer.Option(
+        default=True,
+        help="Follow redirects within the site, recording each page redirected "
+        "from with a link to the page redirected to",
+    ),
+    avoid_spider_traps: bool = typer.Option(
+        default=False,
+        help="Skip links into endless calendars, faceted search and session "
+        "IDs, reporting the URL templates skipped with the failed pages",
+    ),
+    max_urls_per_template: int = typer.Option(
+        default=DEFAULT_MAX_URLS_PER_TEMPLATE,
+        callback=validate_max_urls_per_template,
+        help="Links differing only in IDs, dates or query parameter values to "
+        "crawl when avoiding spider traps (0 is unlimited)",
+    ),
+    skip_duplicates: bool = typer.Option(
+        default=False,
+        help="Skip parsing pages with the same or nearly the same content as a "
+        "page already parsed, reporting the page each duplicates",
+    ),
+    stats_interval: float = typer.Option(
+        default=DEFAULT_STATS_INTERVAL_S,
+        callback=validate_stats_interval,
+        help="Seconds between printing a line of crawl stats to stderr (0 prints none)",
+    ),
+    save_metrics: bool = typer.Option(
+        default=False,
+        help="Write the metrics of the crawl next to the results",
+    ),
+    metrics_port: int = typer.Option(
+        default=DEFAULT_METRICS_PORT,
+        callback=validate_metrics_port,
+        help="Port to serve Prometheus metrics of the running crawl on at "
+        "http://127.0.0.1:PORT/metrics (0 serves none)",
+    ),
+    profile: Annotated[
+        ProfileMode,
+        typer.Option(
+            help="Profile the crawl with cProfile, by sampling the event loop's "
+            "stack as folded stacks for a flame graph, or by tracing the memory "
+            "still allocated when it finishes, written next to the results",
+        ),
+    ] = ProfileMode.NONE,
+    loop_lag_threshold: float = typer.Option(
+        default=DEFAULT_LOOP_LAG_THRESHOLD_S,
+        callback=validate_loop_lag_threshold,
+        help="Seconds the event loop may be blocked for, such as by parsing a "
+        "page, before printing the code blocking it to stderr (0 is off)",
+    ),
+    output: Annotated[
+        str | None,
+        typer.Option(
+            metavar="PATH",
+            help="File to write the sitemap to, or the sitemap index for "
+            "sitemap-xml [default: result.json, result.ndjson or sitemap.xml]",
+        ),
+    ] = None,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option(
+            help="Write the sitemap as one JSON object once the crawl has "
+            "finished, or stream each page to NDJSON or gzipped sitemaps.org "
+            "XML as it is crawled without holding the sitemap in memory",
+        ),
+    ] = OutputFormat.JSON,
 ) -> None:
     # The main bit ✨
-    crawler = Crawler(
-        base_url,
-        number_of_workers=workers,
-        crawl_depth=crawl_depth,
-        politeness_delay=politeness_delay,
-        enable_cmd_out=enable_cmd_out,
+    validate_frontier_options(
+        frontier,
+        frontier_strategy,
+        max_pages,
+        seed_sitemaps,
+        processes=processes,
+        coordinator=coordinator,
     )
+    validate_concurrency_options(adaptive_concurrency, min_workers, max_workers)
+    validate_metrics_options(metrics_port, profile, processes, coordinator)
+
+    if checkpoint and resume and checkpoint != resume:
+        raise typer.BadParameter("--resume continues the journal it resumes from")
+
+    if (checkpoint or resume) and (coordinator or processes > MIN_PROCESSES):
+        raise typer.BadParameter(
+            "--checkpoint and --resume cannot be used with --processes or --coordinator"
+        )
+
+    if cache and processes > MIN_PROCESSES:
+        raise typer.BadParameter("--cache cannot be used with --processes")
+
+    output = output or DEFAULT_OUTPUTS[output_format]
+
+    sink: NdjsonFileSink | SitemapXmlSink | None = None
+    if output_format != OutputFormat.JSON:
+        if processes > MIN_PROCESSES:
+            raise typer.BadParameter(
+                f"--output-format {output_format} cannot be used with --processes"
+            )
+
+        sink = create_sink(base_url, output_format, output)
+
+    # Pages that could not be crawled are written next to the results, as are
+    # the pages skipped as duplicates of another
+    failures_output = failures_path(output)
+    duplicates_output = duplicates_path(output)
+
+    journal = resume or checkpoint
+
+    crawler_kwargs: dict[str, Any] = {
+        "number_of_workers": workers,
+        "crawl_depth": crawl_depth,
+        "politeness_delay": politeness_delay,
+        "enable_cmd_out": enable_cmd_out,
+        "max_pages": max_pages,
+        "parse_workers": parse_workers,
+        "stream_links": stream_links,
+        "seed_sitemaps": seed_sitemaps,
+        "follow_redirects": follow_redirects,
+        "adaptive_concurrency": (
+            AdaptiveConcurrencyOptions(min_workers, max_workers)
+            if adaptive_concurrency
+            else None
+        ),
+        "frontier": FrontierOptions(
+            frontier, frontier_memory_limit, frontier_strategy, seen_set
+        ),
+        "checkpoint": (
+            CheckpointOptions(journal, resume=bool(resume)) if journal else None
+        ),
+        "cache": CacheOptions(cache, cache_max_bytes) if cache else None,
+        "connection": ConnectionOptions(
+            keepalive_connections,
+            keepalive_expiry,
+            request_timeout,
+            page_timeout,
+            http2,
+        ),
+        "politeness": PolitenessOptions(
+            politeness_burst, respect_robots, max_retries, circuit_breaker_threshold
+        ),
+        "fetch_policy": FetchPolicy(max_page_bytes, skip_assets),
+        "dedup": DedupOptions(
+            avoid_spider_traps, max_urls_per_template, skip_duplicates
+        ),
+        # Metrics and the profile are written next to the results too, if the
+        # crawl saves or profiles them
+        "outputs": OutputOptions(
+            sinks=(sink,) if sink else (),
+            keep_results=sink is None,
+            failures_output=failures_output,
+            duplicates_output=duplicates_output,
+            metrics_output=metrics_path(output) if save_metrics else None,
+        ),
+        "monitoring": MonitoringOptions(
+            stats_interval,
+            metrics_port,
+            profile,
+            profile_path(output, profile) if profile != ProfileMode.NONE else None,
+            loop_lag_threshold,
+        ),
+    }
+
+    crawler = create_crawler(base_url, processes, coordinator, crawler_kwargs)
 
     print(f"[green]Crawling {base_url} ...[/green]")
-    results = asyncio.run(crawler.crawl())
+    try:
+        results = asyncio.run(crawler.crawl())
+    finally:
+        # Pages crawled before any failure are kept in the NDJSON file
+        if sink:
+            sink.close()
+
+    cache_stats = crawler.cache_stats if cache else None
+    concurrency_limit = crawler.concurrency_limit if adaptive_concurrency else None
+
+    if sink:
+        print_summary(
+            base_url,
+            sink.pages_written,
+            sink.links_written,
+            sink.path,
+            achieved_request_rate=crawler.achieved_request_rate,
+            cache_stats=cache_stats,
+            concurrency_limit=concurrency_limit,
+        )
+    else:
+        write_results(
+            base_url,
+            results,
+            achieved_request_rate=crawler.achieved_request_rate,
+            cache_stats=cache_stats,
+            output=output,
+            concurrency_limit=concurrency_limit,
+        )
+
+    print_failures(failures_output)
+    print_duplicates(duplicates_output)
+
+
+def validate_metrics_options(
+    metrics_port: int, profile: ProfileMode, processes: int, coordinator: str | None
+) -> None:
+    """
+    Validate that metrics are only served, and crawls only profiled, when the
+    crawl runs in one process.
+    If the arguments are invalid, raise a typer.BadParameter exception.
+
+    :param metrics_port: Port to serve metrics on, 0 if none
+    :param profile: How to profile the crawl
+    :param processes: Processes to partition the crawl across
+    :param coordinator: HOST:PORT of the coordinator to lease pages from, if the
+        crawler is a node of a distributed crawl
+    """
+    if metrics_port != DEFAULT_METRICS_PORT and processes > MIN_PROCESSES:
+        raise typer.BadParameter("--metrics-port cannot be used with --processes")
+
+    if profile != ProfileMode.NONE and (coordinator or processes > MIN_PROCESSES):
+        raise typer.BadParameter(
+            "--profile cannot be used with --processes or --coordinator"
+        )
+
+
+def validate_concurrency_options(
+    adaptive_concurrency: bool, min_workers: int, max_workers: int
+) -> None:
+    """
+    Validate that the bounds of adaptive concurrency are in order, if it is used.
+    If the arguments are invalid, raise a typer.BadParameter exception.
 
-    # Write the results and feedback to user
-    with open("result.json", "w") as results_file:
-        json.dump(results, results_file)
+    :param adaptive_concurrency: Whether adaptive concurrency is used
+    :param min_workers: Fewest requests in flight
+    :param max_workers: Most requests in flight
+    """
+    if adaptive_concurrency and min_workers > max_workers:
+        raise typer.BadParameter("Min workers must not be greater than max workers! ❌")
+
+
+def validate_frontier_options(  # noqa: PLR0913 - Each option of the frontier
+    frontier: FrontierBackend,
+    frontier_strategy: FrontierStrategy,
+    max_pages: int,
+    seed_sitemaps: bool,
+    *,
+    processes: int,
+    coordinator: str | None,
+) -> None:
+    """
+    Validate that the frontier strategy, page budget and sitemap seeding can be
+    used with the frontier backend and how the crawl is run.
+    If the arguments are invalid, raise a typer.BadParameter exception.
+
+    :param frontier: Storage backend for pages waiting to be crawled
+    :param frontier_strategy: Order to crawl queued pages in
+    :param max_pages: Pages to crawl before stopping
+    :param seed_sitemaps: Whether to queue the pages of the site's sitemaps
+    :param processes: Processes to partition the crawl across
+    :param coordinator: HOST:PORT of the coordinator to lease pages from, if the
+        crawler is a node of a distributed crawl
+    """
+    if frontier == FrontierBackend.DISK and frontier_strategy != FrontierStrategy.FIFO:
+        raise typer.BadParameter(
+            f"--frontier-strategy {frontier_strategy} cannot be used with "
+            "--frontier disk"
+        )
+
+    # Each process or node would spend the whole budget
+    if max_pages and (coordinator or processes > MIN_PROCESSES):
+        raise typer.BadParameter(
+            "--max-pages cannot be used with --processes or --coordinator"
+        )
+
+    # Only a single process crawler seeds its own frontier
+    if seed_sitemaps and (coordinator or processes > MIN_PROCESSES):
+        raise typer.BadParameter(
+            "--seed-sitemaps cannot be used with --processes or --coordinator"
+        )
+
+
+def create_sink(
+    base_url: str, output_format: OutputFormat, output: str
+) -> NdjsonFileSink | SitemapXmlSink:
+    """
+    Create a sink streaming pages to the output file as they are crawled.
+
+    :param base_url: Website being crawled, sitemap files are listed in the
+        sitemap index as served from its root
+    :param output_format: NDJSON or sitemap XML
+    :param output: File to write to
+    :return: Sink to pass to the Crawler, to be closed once the crawl is done
+    """
+    if output_format == OutputFormat.SITEMAP_XML:
+        return SitemapXmlSink(output, sitemap_url=urljoin(base_url, "/"))
+
+    return NdjsonFileSink(output)
+
+
+def create_crawler(
+    base_url: str,
+    processes: int,
+    coordinator: str | None,
+    crawler_kwargs: dict[str, Any],
+) -> Crawler | ShardedCrawler:
+    """
+    Create a crawler for a single process, multiple processes or as a node of
+    a distributed crawl.
+
+    :param base_url: Website to crawl
+    :param processes: Processes to partition the crawl across
+    :param coordinator: HOST:PORT of the coordinator to lease pages from, if the
+        crawler is a node of a distributed crawl
+    :param crawler_kwargs: Arguments for the Crawler
+    :return: Crawler to run
+    """
+    if coordinator:
+        if processes > MIN_PROCESSES:
+            raise typer.BadParameter("--processes cannot be used with --coordinator")
+
+        # Nodes hand the links they find to the coordinator, which queues them
+        # without checking them for spider traps
+        if crawler_kwargs["dedup"].avoid_spider_traps:
+            raise typer.BadParameter(
+                "--avoid-spider-traps cannot be used with --coordinator"
+            )
+
+        host, _, port = coordinator.rpartition(":")
+        return NodeCrawler(
+            base_url, coordinator=RemoteCoordinator(host, int(port)), **crawler_kwargs
+        )
+
+    if processes > MIN_PROCESSES:
+        return ShardedCrawler(base_url, processes=processes, **crawler_kwargs)
+
+    return Crawler(base_url, **crawler_kwargs)
+
+
+def write_results(  # noqa: PLR0913 - Each column of the summary table
+    base_url: str,
+    results: Mapping[str, list[str]],
+    *,
+    achieved_request_rate: float | None = None,
+    cache_stats: CacheStats | None = None,
+    output: str = DEFAULT_OUTPUT,
+    concurrency_limit: int | None = None,
+) -> None:
+    """
+    Write the results of a crawl to file and print a summary table.
 
+    :param base_url: Website that was crawled
+    :param results: Map of pages that have been crawled and links gathered from
+        that page
+    :param achieved_request_rate: Requests per second achieved during the crawl,
+        if it was measured
+    :param cache_stats: Hits, misses and bytes saved by the cache during the
+        crawl, if one was used
+    :param output: File to write the results to
+    :param concurrency_limit: Requests in flight adaptive concurrency settled
+        on, if it was used
+    """
     total_number_of_links = 0
 
-    # Get total number of links found
-    for links in results.values():
-        total_number_of_links += len(links)
+    # Write the results and feedback to user, a page at a time so the links of
+    # every page are never held as lists at once
+    with open(output, "w") as results_file:
+        results_file.write("{")
+
+        for index, (page, links) in enumerate(results.items()):
+            if index:
+                results_file.write(", ")
+
+            results_file.write(f"{json.dumps(page)}: {json.dumps(links)}")
+            total_number_of_links += len(links)
+
+        results_file.write("}")
+
+    print_summary(
+        base_url,
+        len(results),
+        total_number_of_links,
+        output,
+        achieved_request_rate=achieved_request_rate,
+        cache_stats=cache_stats,
+        concurrency_limit=concurrency_limit,
+    )
+
+
+def print_summary(  # noqa: PLR0913 - Each column of the summary table
+    base_url: str,
+    pages_crawled: int,
+    links_found: int,
+    output: str,
+    *,
+    achieved_request_rate: float | None = None,
+    cache_stats: CacheStats | None = None,
+    concurrency_limit: int | None = None,
+) -> None:
+    """
+    Print a summary table of a crawl and the file its results were written to.
 
+    :param base_url: Website that was crawled
+    :param pages_crawled: Number of pages crawled
+    :param links_found: Number of links gathered from the crawled pages
+    :param output: File the results were written to
+    :param achieved_request_rate: Requests per second achieved during the crawl,
+        if it was measured
+    :param cache_stats: Hits, misses and bytes saved by the cache during the
+        crawl, if one was used
+    :param concurrency_limit: Requests in flight adaptive concurrency settled
+        on, if it was used
+    """
     # Create a results table with number of pages
     # crawled and links found
     table = Table(
@@ -150,12 +1121,111 @@ def main(
     )
     table.add_column("Links Found", style="cyan", justify="right")
 
-    table.add_row(f"{len(results.keys())}", f"{total_number_of_links}")
+    row = [f"{pages_crawled}", f"{links_found}"]
+
+    if achieved_request_rate is not None:
+        table.add_column("Requests/s", style="green", justify="right")
+        row.append(f"{achieved_request_rate:.2f}")
+
+    if cache_stats is not None:
+        table.add_column("Cache Hits", style="yellow", justify="right")
+        table.add_column("Bytes Saved", style="yellow", justify="right")
+        row += [f"{cache_stats.hit_rate:.1%}", f"{cache_stats.bytes_saved:,}"]
+
+    if concurrency_limit is not None:
+        table.add_column("Concurrency", style="blue", justify="right")
+        row.append(f"{concurrency_limit}")
+
+    table.add_row(*row)
 
     # Print the results and output file!
     print(
         "\n\n",
         table,
         f"\n\n[green]Sitemap successfully written to file![/green]"
-        f"\nfile:///{os.path.realpath(results_file.name)}",
+        f"\nfile:///{os.path.realpath(output)}",
+    )
+
+
+def print_failures(failures_output: str) -> None:
+    """
+    Print the pages that could not be crawled, if any failed, including the
+    templates of links suppressed as spider traps.
+
+    :param failures_output: File the failed pages were written to, if any were
+    """
+    if not os.path.exists(failures_output):
+        return
+
+    with open(failures_output, encoding="utf-8") as failures_file:
+        failures = json.load(failures_file)
+
+    print(
+        f"\n[yellow]{len(failures)} pages could not be crawled ⚠️[/yellow]"
+        f"\nfile:///{os.path.realpath(failures_output)}"
+    )
+
+
+def print_duplicates(duplicates_output: str) -> None:
+    """
+    Print the pages skipped as duplicates of another page, if any were.
+
+    :param duplicates_output: File the duplicate pages were written to, if any were
+    """
+    if not os.path.exists(duplicates_output):
+        return
+
+    with open(duplicates_output, encoding="utf-8") as duplicates_file:
+        duplicates = json.load(duplicates_file)
+
+    print(
+        f"\n[cyan]{len(duplicates)} pages duplicated a page already crawled 📑[/cyan]"
+        f"\nfile:///{os.path.realpath(duplicates_output)}"
     )
+
+
+coordinator_app = typer.Typer(rich_markup_mode="rich")
+
+
+@coordinator_app.command(
+    help="[magenta][bold]Sitemappy[/bold] coordinator[/magenta] for distributed "
+    "crawls, holding the shared frontier and results while "
+    "[cyan]sitemappy --coordinator HOST:PORT[/cyan] worker nodes crawl pages."
+)
+def coordinator(  # noqa: PLR0913 - Typer options are declared as arguments
+    base_url: Annotated[
+        str,
+        typer.Argument(
+            help="a valid website URL to sitemap 🔎",
+            callback=validate_base_url,
+        ),
+    ],
+    *,
+    host: str = DEFAULT_COORDINATOR_HOST,
+    port: int = DEFAULT_COORDINATOR_PORT,
+    crawl_depth: int = typer.Option(
+        default=DEFAULT_CRAWL_DEPTH,
+        callback=validate_crawl_depth,
+    ),
+    lease_timeout: float = typer.Option(
+        default=DEFAULT_LEASE_TIMEOUT_S,
+        help="Seconds before pages leased to a node are reassigned",
+    ),
+    seen_set: Annotated[
+        SeenSetBackend,
+        typer.Option(help="How to remember seen URLs"),
+    ] = SeenSetBackend.EXACT,
+) -> None:
+    server = CoordinatorServer(
+        LocalCoordinator(
+            base_url,
+            crawl_depth=crawl_depth,
+            lease_timeout=lease_timeout,
+            seen_set=seen_set,
+        )
+    )
+
+    print(f"[green]Coordinating crawl of {base_url} on {host}:{port} ...[/green]")
+    results = asyncio.run(server.serve(host, port))
+
+    write_results(base_url, results)
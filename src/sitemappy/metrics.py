@@ -0,0 +1,394 @@
+"""
+Metrics of a running crawl: stage latencies, bytes downloaded, response
+statuses, queue depth and throughput, cheap enough to record on every page.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable
+from typing import Any, TextIO
+
+NO_STATS_INTERVAL = 0.0
+NO_METRICS_PORT = 0
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PATH = "/metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS_S = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+MIB = 1024 * 1024
+
+
+class LatencyHistogram:
+    """
+    Latencies counted into fixed buckets, so recording one is a binary search
+    and memory does not grow with the number recorded.
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_S):
+        """
+        Initialise a new, empty histogram.
+
+        :param bounds: Upper bounds of the buckets in seconds, in order, with a
+            last bucket for anything slower *(default: 1 ms to 60 s)*
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        :param seconds: Latency to record
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, quantile: float) -> float:
+        """
+        :param quantile: Fraction of the latencies recorded, such as 0.95
+        :return: Upper bound of the bucket holding the quantile, or 0 if none
+            have been recorded
+        """
+        if not self.count:
+            return 0.0
+
+        rank = quantile * self.count
+        seen = 0
+
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        :param other: Histogram with the same buckets to add to this one
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: Count, sum, median and 95th percentile, and the count of each
+            bucket by its upper bound
+        """
+        return {
+            "count": self.count,
+            "sum_s": self.sum,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": {
+                str(bound): count
+                for bound, count in zip(
+                    (*self.bounds, "+Inf"), self.counts, strict=True
+                )
+            },
+        }
+
+
+class CrawlMetrics:
+    """
+    Counters, gauges and latency histograms of a crawl.
+
+    Every update is a few integer additions, so the metrics are always recorded,
+    and only rendered when asked for.
+    """
+
+    def __init__(self) -> None:
+        # Requesting a page until its body has been read
+        self.fetch = LatencyHistogram()
+
+        # Extracting the links of a page once read
+        self.parse = LatencyHistogram()
+
+        # Checking and queueing every link found on a page
+        self.enqueue = LatencyHistogram()
+
+        self.bytes_downloaded = 0
+        self.status_codes: Counter[int] = Counter()
+        self.pages_crawled = 0
+        self.pages_failed = 0
+
+        # Gauges, updated by the crawler before the metrics are rendered
+        self.queue_depth = 0
+        self.active_workers = 0
+        self.workers = 0
+
+        self._started_at: float | None = None
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        """
+        Start timing the crawl.
+        """
+        self._started_at = time.monotonic()
+
+    def finish(self) -> None:
+        """
+        Stop timing the crawl.
+        """
+        self._elapsed = self.elapsed
+        self._started_at = None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        :return: Seconds the crawl has been running for
+        """
+        if self._started_at is None:
+            return self._elapsed
+
+        return self._elapsed + time.monotonic() - self._started_at
+
+    @property
+    def pages_per_second(self) -> float:
+        """
+        :return: Pages crawled per second since the crawl started
+        """
+        elapsed = self.elapsed
+
+        return self.pages_crawled / elapsed if elapsed else 0.0
+
+    def merge(self, other: "CrawlMetrics") -> None:
+        """
+        Add the metrics of a crawl run alongside this one, such as another shard.
+
+        :param other: Finished metrics to add
+        """
+        self.fetch.merge(other.fetch)
+        self.parse.merge(other.parse)
+        self.enqueue.merge(other.enqueue)
+
+        self.bytes_downloaded += other.bytes_downloaded
+        self.status_codes.update(other.status_codes)
+        self.pages_crawled += other.pages_crawled
+        self.pages_failed += other.pages_failed
+        self.workers += other.workers
+
+        # Crawls running alongside each other overlap, so take the longest
+        self._elapsed = max(self._elapsed, other.elapsed)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: Every metric, as a JSON serialisable summary
+        """
+        return {
+            "elapsed_s": self.elapsed,
+            "pages_crawled": self.pages_crawled,
+            "pages_failed": self.pages_failed,
+            "pages_per_second": self.pages_per_second,
+            "bytes_downloaded": self.bytes_downloaded,
+            "status_codes": {
+                str(status): count
+                for status, count in sorted(self.status_codes.items())
+            },
+            "queue_depth": self.queue_depth,
+            "active_workers": self.active_workers,
+            "workers": self.workers,
+            "fetch": self.fetch.to_dict(),
+            "parse": self.parse.to_dict(),
+            "enqueue": self.enqueue.to_dict(),
+        }
+
+    def stats_line(self) -> str:
+        """
+        :return: One line summarising the crawl so far
+        """
+        statuses = Counter[str]()
+        for status, count in self.status_codes.items():
+            statuses[f"{status // 100}xx"] += count
+
+        return " | ".join(
+            [
+                f"{self.elapsed:.0f}s",
+                f"{self.pages_crawled} pages ({self.pages_per_second:.1f}/s)",
+                f"{self.pages_failed} failed",
+                f"queue {self.queue_depth}",
+                f"workers {self.active_workers}/{self.workers}",
+                f"{self.bytes_downloaded / MIB:.1f} MiB",
+                f"fetch p50 {self.fetch.quantile(0.5) * 1000:.0f}ms "
+                f"p95 {self.fetch.quantile(0.95) * 1000:.0f}ms",
+                f"parse p95 {self.parse.quantile(0.95) * 1000:.0f}ms",
+                " ".join(
+                    f"{group} {count}" for group, count in sorted(statuses.items())
+                ),
+            ]
+        )
+
+    def to_prometheus(self) -> str:
+        """
+        :return: Every metric in the Prometheus text exposition format
+        """
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP sitemappy_{name} {help_text}")
+            lines.append(f"# TYPE sitemappy_{name} {kind}")
+
+        for name, histogram, help_text in (
+            ("fetch_seconds", self.fetch, "Time to request a page and read its body"),
+            ("parse_seconds", self.parse, "Time to extract the links of a page"),
+            ("enqueue_seconds", self.enqueue, "Time to queue the links of a page"),
+        ):
+            metric(name, "histogram", help_text)
+            cumulative = 0
+
+            for bound, count in zip(
+                (*histogram.bounds, "+Inf"), histogram.counts, strict=True
+            ):
+                cumulative += count
+                lines.append(f'sitemappy_{name}_bucket{{le="{bound}"}} {cumulative}')
+
+            lines.append(f"sitemappy_{name}_sum {histogram.sum}")
+            lines.append(f"sitemappy_{name}_count {histogram.count}")
+
+        metric("responses_total", "counter", "Responses received by status code")
+        lines.extend(
+            f'sitemappy_responses_total{{status="{status}"}} {count}'
+            for status, count in sorted(self.status_codes.items())
+        )
+
+        for name, kind, value, help_text in (
+            (
+                "bytes_downloaded_total",
+                "counter",
+                self.bytes_downloaded,
+                "Bytes of page bodies downloaded",
+            ),
+            ("pages_crawled_total", "counter", self.pages_crawled, "Pages crawled"),
+            (
+                "pages_failed_total",
+                "counter",
+                self.pages_failed,
+                "Pages that could not be crawled",
+            ),
+            ("queue_depth", "gauge", self.queue_depth, "Pages waiting to be crawled"),
+            ("active_workers", "gauge", self.active_workers, "Workers crawling a page"),
+            (
+                "pages_per_second",
+                "gauge",
+                self.pages_per_second,
+                "Pages crawled per second",
+            ),
+        ):
+            metric(name, kind, help_text)
+            lines.append(f"sitemappy_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: str, metrics: CrawlMetrics) -> None:
+    """
+    Write the summary of a crawl's metrics as a JSON object.
+
+    :param path: File to write the metrics to
+    :param metrics: Metrics of the crawl
+    """
+    with open(path, "w", encoding="utf-8") as metrics_file:
+        json.dump(metrics.to_dict(), metrics_file, indent=2)
+
+
+async def print_stats_periodically(
+    metrics: Callable[[], CrawlMetrics],
+    interval: float,
+    output: TextIO = sys.stderr,
+) -> None:
+    """
+    Print a stats line every interval, until cancelled.
+
+    :param metrics: Current metrics of the crawl, with its gauges updated
+    :param interval: Seconds between each line
+    :param output: Stream to print to *(default: stderr, so results printed to
+        stdout are not interleaved with stats)*
+    """
+    while True:
+        await asyncio.sleep(interval)
+        print(metrics().stats_line(), file=output, flush=True)
+
+
+class MetricsServer:
+    """
+    A minimal HTTP server exposing the metrics of a crawl for Prometheus to
+    scrape, answering each request on its own connection.
+    """
+
+    def __init__(self, metrics: Callable[[], CrawlMetrics]):
+        """
+        Initialise a new metrics server.
+
+        :param metrics: Current metrics of the crawl, with its gauges updated
+        """
+        self.metrics = metrics
+        self.port: int | None = None
+
+    async def serve(
+        self, host: str = METRICS_HOST, port: int = NO_METRICS_PORT
+    ) -> None:
+        """
+        Serve the metrics at /metrics until cancelled.
+
+        :param host: Interface to listen on *(default: localhost only)*
+        :param port: Port to listen on, 0 picks a free port which is then set as
+            MetricsServer.port
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+
+            # The headers are read and ignored
+            while (await reader.readline()).strip():
+                pass
+
+            # A request line is the method, the target and the HTTP version
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].partition("?")[0] if len(parts) > 1 else ""
+
+            if path == METRICS_PATH:
+                status, content_type = "200 OK", PROMETHEUS_CONTENT_TYPE
+                body = self.metrics().to_prometheus().encode()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b""
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
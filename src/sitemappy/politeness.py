@@ -0,0 +1,150 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+NO_DELAY_S = 0.0
+
+DEFAULT_BURST = 1
+MIN_BURST = 1
+
+
+class TokenBucket:
+    """
+    A token bucket spacing out acquisitions at a fixed rate, allowing a burst of
+    acquisitions while the bucket is full.
+    """
+
+    def __init__(self, delay: float, burst: int = DEFAULT_BURST):
+        """
+        Initialise a new, full token bucket.
+
+        :param delay: Seconds between each token being added to the bucket
+        :param burst: Maximum number of tokens the bucket holds
+            *(default: 1 - no burst)*
+        """
+        self.delay = delay
+        self.burst = max(burst, MIN_BURST)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket, reserving a future one if it is empty.
+
+        The reservation is made synchronously, so concurrent callers on the same
+        event loop are each given their own slot without needing a lock.
+
+        :return: Seconds to wait before the reserved token is available
+        """
+        now = time.monotonic()
+
+        # Refill the bucket with the tokens added since the last reservation
+        self._tokens = min(
+            float(self.burst),
+            self._tokens + (now - self._updated_at) / self.delay,
+        )
+        self._updated_at = now
+
+        self._tokens -= 1
+
+        if self._tokens >= 0:
+            return NO_DELAY_S
+
+        return -self._tokens * self.delay
+
+    async def acquire(self) -> None:
+        """
+        Wait, without blocking the event loop, until a token is available.
+        """
+        wait = self.reserve()
+
+        if wait > NO_DELAY_S:
+            await asyncio.sleep(wait)
+
+
+class PolitenessLimiter:
+    """
+    A per-host rate limiter to space out requests made by concurrent workers.
+    """
+
+    def __init__(self, delay: float = NO_DELAY_S, burst: int = DEFAULT_BURST):
+        """
+        Initialise a new politeness limiter.
+
+        :param delay: Seconds between each request to the same host, fractions
+            of a second are supported *(default: 0 - no delay)*
+        :param burst: Requests allowed back-to-back before the delay applies
+            *(default: 1 - no burst)*
+        """
+        self.delay = delay
+        self.burst = burst
+
+        self._buckets: dict[str, TokenBucket] = {}
+
+        self._requests = 0
+        self._first_request_at = 0.0
+        self._last_request_at = 0.0
+
+    async def wait(self, url: str) -> None:
+        """
+        Wait until a request to the host of the URL is allowed.
+
+        :param url: URL about to be requested
+        """
+        if self.delay > NO_DELAY_S or self._buckets:
+            host = urlparse(url).hostname or ""
+            bucket = self._buckets.get(host)
+
+            if bucket is None and self.delay > NO_DELAY_S:
+                bucket = self._buckets[host] = TokenBucket(self.delay, self.burst)
+
+            if bucket:
+                await bucket.acquire()
+
+        self._record_request()
+
+    def set_host_delay(self, url: str, delay: float) -> None:
+        """
+        Space requests to the host of a URL at least a delay apart, such as the
+        Crawl-delay asked for by its robots.txt.
+
+        A delay longer than the politeness delay replaces it for the host, with
+        no burst, as the host has asked for one request per delay.
+
+        :param url: URL of a page on the host
+        :param delay: Seconds between each request to the host
+        """
+        if delay <= self.delay:
+            return
+
+        self._buckets[urlparse(url).hostname or ""] = TokenBucket(delay)
+
+    def _record_request(self) -> None:
+        now = time.monotonic()
+
+        if not self._requests:
+            self._first_request_at = now
+
+        self._requests += 1
+        self._last_request_at = now
+
+    @property
+    def requests(self) -> int:
+        """
+        :return: Number of requests allowed through the limiter
+        """
+        return self._requests
+
+    @property
+    def achieved_rate(self) -> float:
+        """
+        :return: Requests per second achieved between the first and last request,
+            or 0 if there are not enough requests to measure a rate
+        """
+        elapsed = self._last_request_at - self._first_request_at
+
+        if self._requests < 2 or elapsed <= 0:  # noqa: PLR2004 - Two points for a rate
+            return 0.0
+
+        return (self._requests - 1) / elapsed
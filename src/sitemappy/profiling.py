@@ -0,0 +1,314 @@
+"""
+Opt-in profiling of a crawl, to tell whether a slow crawl is waiting on the
+network, parsing pages or churning through its queue and results.
+"""
+
+import asyncio
+import cProfile
+import linecache
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from types import FrameType
+from typing import TextIO
+
+PACKAGE = __name__.partition(".")[0]
+
+NO_LOOP_LAG_MONITOR = 0.0
+
+# Seconds between samples of the event loop's stack
+DEFAULT_SAMPLE_INTERVAL_S = 0.005
+
+# Frames kept for each allocation, enough to reach the line of sitemappy that
+# caused it from deep inside the standard library or BeautifulSoup
+TRACEMALLOC_FRAMES = 32
+
+# Allocation sites listed in the tracemalloc report
+TOP_ALLOCATION_SITES = 25
+
+
+class ProfileMode(StrEnum):
+    """
+    Ways to profile a crawl.
+    """
+
+    NONE = "none"
+
+    # Every function call, deterministically, written as pstats
+    CPROFILE = "cprofile"
+
+    # The event loop's stack every few milliseconds, written as folded stacks
+    SAMPLING = "sampling"
+
+    # Memory still allocated once the crawl finishes, by the line allocating it
+    TRACEMALLOC = "tracemalloc"
+
+
+PROFILE_EXTENSIONS = {
+    ProfileMode.CPROFILE: ".prof",
+    ProfileMode.SAMPLING: ".folded",
+    ProfileMode.TRACEMALLOC: ".txt",
+}
+
+
+def _module(frame: FrameType) -> str:
+    return str(frame.f_globals.get("__name__", frame.f_code.co_filename))
+
+
+def _describe_frame(frame: FrameType) -> str:
+    return f"{_module(frame)}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+
+
+def describe_site(frame: FrameType | None) -> str:
+    """
+    :param frame: Innermost frame of a stack
+    :return: Where the stack is, naming the innermost frame of sitemappy too if
+        the stack is inside a library
+    """
+    if frame is None:
+        return "unknown"
+
+    innermost = frame
+
+    while frame and not _module(frame).startswith(PACKAGE):
+        frame = frame.f_back
+
+    if frame is None or frame is innermost:
+        return _describe_frame(innermost)
+
+    return f"{_describe_frame(innermost)}, called from {_describe_frame(frame)}"
+
+
+@contextmanager
+def profile(mode: ProfileMode, output: str | None) -> Iterator[None]:
+    """
+    Profile the code run within the context, writing the profile once it exits.
+
+    Only the calling thread is profiled, so pages parsed in parse worker
+    processes are not.
+
+    :param mode: How to profile, none runs the code unprofiled
+    :param output: File to write the profile to
+    """
+    if mode == ProfileMode.NONE or output is None:
+        yield
+    elif mode == ProfileMode.CPROFILE:
+        with cProfile.Profile() as profiler:
+            try:
+                yield
+            finally:
+                profiler.dump_stats(output)
+    elif mode == ProfileMode.SAMPLING:
+        sampler = StackSampler()
+
+        try:
+            with sampler:
+                yield
+        finally:
+            sampler.write(output)
+    else:
+        with trace_allocations(output):
+            yield
+
+
+class StackSampler:
+    """
+    A sampling profiler, recording the stack of a thread every few milliseconds
+    from a background thread.
+
+    Samples are written as folded stacks, one line of frames and the number of
+    samples taken in them, to be rendered as a flame graph by tools such as
+    speedscope or flamegraph.pl. Time the event loop spends waiting on the
+    network is sampled in the selector, so it shows alongside time spent parsing.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL_S):
+        """
+        Initialise a new stack sampler.
+
+        :param interval: Seconds between samples *(default: 0.005)*
+        """
+        self.interval = interval
+
+        # Stacks sampled, outermost frame first, and how many times
+        self.samples: Counter[tuple[str, ...]] = Counter()
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "StackSampler":
+        """
+        Start sampling the calling thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """
+        Stop sampling.
+        """
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: str) -> None:
+        """
+        :param path: File to write the folded stacks to, most sampled first
+        """
+        with open(path, "w", encoding="utf-8") as folded:
+            for stack, count in self.samples.most_common():
+                folded.write(f"{';'.join(stack)} {count}\n")
+
+    def _sample(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+
+            while frame:
+                stack.append(f"{_module(frame)}:{frame.f_code.co_qualname}")
+                frame = frame.f_back
+
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+
+@contextmanager
+def trace_allocations(output: str) -> Iterator[None]:
+    """
+    Trace the memory allocated within the context, writing the largest sites
+    still holding memory when it exits, such as the crawl's results and seen
+    URLs.
+
+    Each allocation is attributed to the innermost line of sitemappy that made
+    it, so a URL built by urljoin is counted against the line keeping it.
+    Tracing slows the crawl down, so it should only be used to find where memory
+    goes, not how fast the crawl runs.
+
+    :param output: File to write the report to
+    """
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    try:
+        yield
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    sizes: Counter[tuple[str, int]] = Counter()
+    blocks: Counter[tuple[str, int]] = Counter()
+
+    for trace in snapshot.traces:
+        # Frames run from the oldest to the most recent
+        site = next(
+            (
+                frame
+                for frame in reversed(trace.traceback)
+                if f"{PACKAGE}/" in frame.filename.replace("\\", "/")
+            ),
+            trace.traceback[-1],
+        )
+        sizes[site.filename, site.lineno] += trace.size
+        blocks[site.filename, site.lineno] += 1
+
+    with open(output, "w", encoding="utf-8") as report:
+        report.write(
+            f"{sum(sizes.values()) / 2**20:.1f} MiB still allocated when the crawl "
+            f"finished, largest first by the line of {PACKAGE} allocating it\n\n"
+        )
+
+        for (filename, lineno), size in sizes.most_common(TOP_ALLOCATION_SITES):
+            report.write(
+                f"{size / 2**20:>9.2f} MiB {blocks[filename, lineno]:>10,} blocks  "
+                f"{filename}:{lineno}\n"
+                f"{'':>33}{linecache.getline(filename, lineno).strip()}\n"
+            )
+
+
+class LoopLagMonitor:
+    """
+    Flags whatever blocks the event loop for longer than a threshold, such as
+    parsing a large page in the event loop, as no page is fetched meanwhile.
+
+    A heartbeat task measures how late the event loop wakes it, while a
+    watchdog thread records the event loop's stack once the heartbeat is
+    overdue, naming the code that is blocking it.
+    """
+
+    def __init__(self, threshold: float, output: TextIO = sys.stderr):
+        """
+        Initialise a new event loop lag monitor.
+
+        :param threshold: Seconds the event loop may be blocked for before it is
+            flagged
+        :param output: Stream to print each block to *(default: stderr)*
+        """
+        self.threshold = threshold
+        self.output = output
+
+        # Where the event loop was blocked, and how many times
+        self.blocks: Counter[str] = Counter()
+        self.longest = 0.0
+
+        self._interval = threshold / 2
+        self._expected_at = 0.0
+        self._blocking_site: str | None = None
+
+    async def monitor(self) -> None:
+        """
+        Monitor the running event loop until cancelled.
+        """
+        stop = threading.Event()
+        watchdog = threading.Thread(
+            target=self._watch, args=(threading.get_ident(), stop), daemon=True
+        )
+
+        self._expected_at = time.monotonic() + self._interval
+        watchdog.start()
+
+        try:
+            while True:
+                await asyncio.sleep(self._interval)
+
+                now = time.monotonic()
+                lag = now - self._expected_at
+                self._expected_at = now + self._interval
+
+                if lag > self.threshold:
+                    self._flag(lag, self._blocking_site or "unknown")
+
+                self._blocking_site = None
+        finally:
+            stop.set()
+
+    def _watch(self, loop_thread: int, stop: threading.Event) -> None:
+        # Checked often enough to catch the event loop partway through any block
+        # longer than the threshold
+        while not stop.wait(self._interval / 2):
+            overdue = time.monotonic() - self._expected_at > self._interval
+
+            if overdue and self._blocking_site is None:
+                self._blocking_site = describe_site(
+                    sys._current_frames().get(loop_thread)
+                )
+
+    def _flag(self, lag: float, site: str) -> None:
+        self.blocks[site] += 1
+        self.longest = max(self.longest, lag)
+
+        print(
+            f"Event loop blocked for {lag * 1000:.0f} ms at {site}",
+            file=self.output,
+            flush=True,
+        )
@@ -0,0 +1,79 @@
+"""
+Redirect following, caching where each redirect chain ends so URLs known to
+redirect are requested at the end of their chain.
+"""
+
+from .urls import canonicalize_url
+
+# As many redirects as browsers follow before giving up on a page
+DEFAULT_MAX_REDIRECTS = 10
+
+
+class RedirectError(Exception):
+    """
+    Raised when a page redirects to another URL, to be followed.
+    """
+
+    def __init__(self, status_code: int, location: str):
+        """
+        :param status_code: HTTP status of the redirect response
+        :param location: Absolute URL redirected to
+        """
+        super().__init__(f"{status_code} redirect to {location}")
+        self.status_code = status_code
+        self.location = location
+
+
+class TooManyRedirectsError(Exception):
+    """
+    Raised when a page redirects more times than are followed, as in a loop.
+    """
+
+
+class RedirectCache:
+    """
+    Where every URL followed redirects to, keyed by canonical URL.
+
+    Each hop of a chain is cached, so a later link to any URL of the chain goes
+    straight to the end of it without repeating the redirects.
+    """
+
+    def __init__(self, max_redirects: int = DEFAULT_MAX_REDIRECTS):
+        """
+        Initialise a new, empty redirect cache.
+
+        :param max_redirects: Redirects to follow from a page before giving up
+            on it *(default: 10)*
+        """
+        self.max_redirects = max_redirects
+
+        # Canonical URLs redirected from, mapped to the URL redirected to
+        self.redirects: dict[str, str] = {}
+
+    def record(self, source: str, target: str) -> None:
+        """
+        :param source: URL that was redirected
+        :param target: Absolute URL it redirected to
+        """
+        self.redirects[canonicalize_url(source)] = target
+
+    def resolve(self, url: str) -> str:
+        """
+        Follow the redirects cached from a URL, stopping at a loop.
+
+        :param url: URL to resolve
+        :return: URL at the end of the cached chain, or the URL itself if it is
+            not known to redirect
+        """
+        followed = {url}
+
+        for _ in range(self.max_redirects):
+            target = self.redirects.get(canonicalize_url(url))
+
+            if target is None or target in followed:
+                break
+
+            followed.add(target)
+            url = target
+
+        return url
@@ -0,0 +1,222 @@
+"""
+Retries of failed requests with exponential backoff, and circuit breakers to
+stop requesting pages from hosts that keep failing.
+"""
+
+import random
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from urllib.parse import urlparse
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_BASE_S = 0.5
+DEFAULT_BACKOFF_MAX_S = 30.0
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_S = 30.0
+DEFAULT_MAX_TRIALS = 3
+
+# Responses worth requesting again after waiting, as the failure is temporary
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+class RetryableResponseError(Exception):
+    """
+    Raised when a response is a temporary failure, worth requesting again.
+    """
+
+    def __init__(self, status_code: int, retry_after: float | None = None):
+        """
+        :param status_code: HTTP status of the response
+        :param retry_after: Seconds the server asked to wait before requesting
+            the page again, if it did
+        """
+        super().__init__(f"HTTP {status_code}")
+
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a page is not requested as its host has stayed down.
+    """
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header, given in seconds or as an HTTP date.
+
+    :param value: Value of the header, if it was sent
+    :return: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """
+    A bounded number of retries, waiting an exponentially growing, randomly
+    jittered delay before each one.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE_S,
+        backoff_max: float = DEFAULT_BACKOFF_MAX_S,
+    ):
+        """
+        Initialise a new retry policy.
+
+        :param max_retries: Times to retry a failed request *(default: 2)*
+        :param backoff_base: Largest delay in seconds before the first retry,
+            doubling for each retry after it *(default: 0.5)*
+        :param backoff_max: Longest delay in seconds before any retry, including
+            one asked for by Retry-After *(default: 30)*
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, retries: int, retry_after: float | None = None) -> float | None:
+        """
+        Get the delay before retrying a failed request.
+
+        :param retries: Times the request has already been retried
+        :param retry_after: Seconds the server asked to wait, if it did
+        :return: Seconds to wait before retrying, or None if the request should
+            not be retried
+        """
+        if retries >= self.max_retries:
+            return None
+
+        if retry_after is not None:
+            # Retrying sooner than asked would ignore the server
+            return retry_after if retry_after <= self.backoff_max else None
+
+        # Full jitter, so workers that failed together do not retry together
+        ceiling = min(self.backoff_base * 2**retries, self.backoff_max)
+
+        return random.uniform(0, ceiling)  # noqa: S311 - Not for cryptography
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for each host, opened after consecutive failed requests so
+    the host's pages wait out an outage rather than spending their retries on
+    requests bound to fail.
+
+    Once the reset timeout has passed, a single trial request is let through,
+    closing the circuit if it succeeds or opening it again if it fails. A host
+    whose trial requests keep failing is taken to be down, and its pages fail
+    without being requested.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT_S,
+        max_trials: int = DEFAULT_MAX_TRIALS,
+    ):
+        """
+        Initialise a new set of closed circuit breakers.
+
+        :param failure_threshold: Consecutive failures that open a host's
+            circuit, 0 never opens it *(default: 5)*
+        :param reset_timeout: Seconds before a trial request is let through an
+            open circuit *(default: 30)*
+        :param max_trials: Consecutive failed trial requests before a host is
+            taken to be down *(default: 3)*
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_trials = max_trials
+
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trials: dict[str, int] = {}
+
+    def wait_time(self, url: str) -> float:
+        """
+        Get how long a request to the host of a URL must wait for its circuit.
+
+        :param url: URL about to be requested
+        :return: Seconds until a trial request may be let through, or 0 if the
+            request may be made now
+        :raises CircuitOpenError: If the host's trial requests have kept failing
+        """
+        host = urlparse(url).netloc
+        opened_at = self._opened_at.get(host)
+
+        if opened_at is None:
+            return 0.0
+
+        now = time.monotonic()
+        remaining = opened_at + self.reset_timeout - now
+
+        if remaining > 0:
+            return remaining
+
+        if self._trials.get(host, 0) >= self.max_trials:
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        # Let this request through as the trial, keeping others out until it
+        # has finished or the reset timeout has passed again
+        self._opened_at[host] = now
+        self._trials[host] = self._trials.get(host, 0) + 1
+
+        return 0.0
+
+    def record_success(self, url: str) -> None:
+        """
+        Close the circuit of the host of a URL.
+
+        :param url: URL that was requested successfully
+        """
+        host = urlparse(url).netloc
+        self._failures.pop(host, None)
+        self._opened_at.pop(host, None)
+        self._trials.pop(host, None)
+
+    def record_failure(self, url: str) -> None:
+        """
+        Count a failed request, opening the circuit of the host of the URL if it
+        has reached the failure threshold.
+
+        :param url: URL whose request failed
+        """
+        if not self.failure_threshold:
+            return
+
+        host = urlparse(url).netloc
+        self._failures[host] = self._failures.get(host, 0) + 1
+
+        if self._failures[host] >= self.failure_threshold:
+            self._opened_at[host] = time.monotonic()
+
+    def is_open(self, url: str) -> bool:
+        """
+        :param url: URL of a page on the host
+        :return: True if the host's circuit is open or awaiting a trial request
+        """
+        return urlparse(url).netloc in self._opened_at
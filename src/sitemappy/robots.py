@@ -0,0 +1,355 @@
+"""
+robots.txt rules, fetched once per host and compiled into a matcher cheap enough
+to check every link found during a crawl.
+"""
+
+import asyncio
+import re
+from collections.abc import Iterable, Sequence
+from http import HTTPStatus
+from typing import Protocol
+from urllib.parse import urlsplit
+
+import httpx
+
+# Product token matched against the User-agent lines of robots.txt
+USER_AGENT = "sitemappy"
+ANY_USER_AGENT = "*"
+
+# Parsers must handle at least 500 KiB, from RFC 9309
+ROBOTS_MAX_BYTES = 500 * 1024
+
+# Crawl-delay values beyond this are treated as this, so a typo cannot stall a
+# crawl for hours
+MAX_CRAWL_DELAY_S = 60.0
+
+# Lines belonging to the group of the User-agent lines before them
+GROUP_KEYS = frozenset({"allow", "disallow", "crawl-delay"})
+
+
+class RobotsDisallowedError(Exception):
+    """
+    Raised when a page is not crawled as robots.txt disallows it.
+    """
+
+
+class CrawlDelayLimiter(Protocol):
+    """
+    Paces requests to a host, slowed to the Crawl-delay of its robots.txt.
+    """
+
+    def set_host_delay(self, url: str, delay: float) -> None:
+        """
+        Space requests to the host of a URL at least a delay apart.
+
+        :param url: URL of a page on the host
+        :param delay: Seconds between each request to the host
+        """
+        ...
+
+
+class RobotsRules:
+    """
+    The Allow and Disallow rules of a robots.txt group, compiled into a matcher.
+
+    Every Disallow rule is compiled into one regular expression, so the paths of
+    most links, matching none of them, are allowed after a single match. Only
+    paths it matches walk the rules, ordered most specific first so the first
+    rule matching decides, with Allow winning a tie as RFC 9309 requires.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[tuple[bool, str]] = (),
+        crawl_delay: float | None = None,
+        sitemaps: Sequence[str] = (),
+    ):
+        """
+        Compile a new set of robots.txt rules.
+
+        :param rules: Pairs of whether the rule allows, and its path pattern
+        :param crawl_delay: Seconds to wait between requests, if set
+        :param sitemaps: URLs of the sitemaps listed in robots.txt, for every
+            user agent *(default: none)*
+        """
+        self.crawl_delay = crawl_delay
+        self.sitemaps = list(sitemaps)
+
+        # Longest pattern first, then Allow before Disallow
+        ordered = sorted(rules, key=lambda rule: (-len(rule[1]), not rule[0]))
+
+        self._rules: list[tuple[bool, str, re.Pattern[str] | None]] = [
+            (allow, pattern, compile_pattern(pattern)) for allow, pattern in ordered
+        ]
+
+        self._allows_anything = any(allow for allow, _ in ordered)
+
+        disallows = [pattern_regex(pattern) for allow, pattern in ordered if not allow]
+        self._any_disallow = (
+            re.compile("|".join(f"(?:{regex})" for regex in disallows))
+            if disallows
+            else None
+        )
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        """
+        :return: Rules allowing every path, for a host without a robots.txt
+        """
+        return cls()
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        """
+        :return: Rules disallowing every path, for a host whose robots.txt
+            could not be fetched
+        """
+        return cls([(False, "/")])
+
+    def allowed(self, path: str) -> bool:
+        """
+        :param path: Path and any query string of a URL
+        :return: True if the rules allow the path to be crawled
+        """
+        if self._any_disallow is None or not self._any_disallow.match(path):
+            return True
+
+        # Without Allow rules, no more specific rule can override the match
+        if not self._allows_anything:
+            return False
+
+        for allow, pattern, compiled in self._rules:
+            if compiled is None:
+                if path.startswith(pattern):
+                    return allow
+            elif compiled.match(path):
+                return allow
+
+        return True
+
+
+def pattern_regex(pattern: str) -> str:
+    """
+    Translate a robots.txt path pattern to a regular expression.
+
+    :param pattern: Path pattern, where * matches any characters and a trailing
+        $ anchors the end of the path
+    :return: Regular expression matching the start of the paths the pattern does
+    """
+    anchored = pattern.endswith("$")
+    body = pattern.removesuffix("$") if anchored else pattern
+
+    regex = ".*".join(re.escape(part) for part in body.split("*"))
+
+    return regex + (r"\Z" if anchored else "")
+
+
+def compile_pattern(pattern: str) -> re.Pattern[str] | None:
+    """
+    Compile a robots.txt path pattern using wildcards to a regular expression.
+
+    :param pattern: Path pattern
+    :return: Compiled pattern, or None if the pattern is a plain prefix, matched
+        faster with str.startswith
+    """
+    if "*" not in pattern and not pattern.endswith("$"):
+        return None
+
+    return re.compile(pattern_regex(pattern))
+
+
+def parse_robots(text: str, user_agent: str = USER_AGENT) -> RobotsRules:
+    """
+    Parse robots.txt, keeping the rules of the groups for the user agent, or
+    for any user agent if no group names it, and every Sitemap listed.
+
+    :param text: Content of robots.txt
+    :param user_agent: Product token of the crawler *(default: sitemappy)*
+    :return: Compiled rules for the user agent
+    """
+    user_agent = user_agent.lower()
+
+    # Lines of every group, keyed by each of its user agents
+    groups: dict[str, list[tuple[str, str]]] = {}
+    sitemaps: list[str] = []
+
+    agents: list[str] = []
+    in_rules = False
+
+    for line in text.splitlines():
+        key, _, value = line.split("#", 1)[0].partition(":")
+        key = key.strip().lower()
+        value = value.strip()
+
+        # Sitemaps are not part of any group, so do not end one
+        if key == "sitemap":
+            if value:
+                sitemaps.append(value)
+        elif key == "user-agent":
+            # A User-agent line after rules starts a new group
+            if in_rules:
+                agents, in_rules = [], False
+
+            agents.append(value.lower())
+            groups.setdefault(value.lower(), [])
+        elif key in GROUP_KEYS and agents:
+            in_rules = True
+
+            for agent in agents:
+                groups[agent].append((key, value))
+
+    agent = user_agent if user_agent in groups else ANY_USER_AGENT
+
+    return compile_group(groups.get(agent, []), sitemaps)
+
+
+def compile_group(lines: list[tuple[str, str]], sitemaps: list[str]) -> RobotsRules:
+    """
+    Compile the lines of the robots.txt groups for a user agent.
+
+    :param lines: Keys and values of the Allow, Disallow and Crawl-delay lines
+    :param sitemaps: Sitemaps listed in robots.txt
+    :return: Compiled rules
+    """
+    rules = []
+    crawl_delay = None
+
+    for key, value in lines:
+        if key == "crawl-delay":
+            try:
+                crawl_delay = min(float(value), MAX_CRAWL_DELAY_S)
+            except ValueError:
+                continue
+
+        # An empty Disallow allows everything, so adds no rule
+        elif value:
+            rules.append((key == "allow", value))
+
+    return RobotsRules(rules, crawl_delay, sitemaps)
+
+
+class RobotsCache:
+    """
+    The robots.txt rules of every host seen during a crawl, each fetched once.
+
+    Concurrent checks of a host whose robots.txt is still being fetched wait for
+    the same request, and once fetched, checking a URL is a dictionary lookup
+    and a walk of the compiled rules.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        user_agent: str = USER_AGENT,
+        limiter: CrawlDelayLimiter | None = None,
+    ):
+        """
+        Initialise a new, empty robots.txt cache.
+
+        :param client: Client to fetch robots.txt with
+        :param user_agent: Product token of the crawler *(default: sitemappy)*
+        :param limiter: Rate limiter to slow to the Crawl-delay of each host
+            *(default: None - Crawl-delay is ignored)*
+        """
+        self.client = client
+        self.user_agent = user_agent
+        self.limiter = limiter
+
+        self._rules: dict[str, RobotsRules] = {}
+        self._fetches: dict[str, asyncio.Task[RobotsRules]] = {}
+
+    async def allowed(self, url: str) -> bool:
+        """
+        Check robots.txt allows a URL to be crawled, fetching it for the URL's
+        host if it has not been already.
+
+        :param url: URL to check
+        :return: True if the URL may be crawled
+        """
+        scheme, netloc, path, query, _ = urlsplit(url)
+        origin = f"{scheme}://{netloc}"
+
+        rules = self._rules.get(origin) or await self._fetch_once(origin)
+
+        target = path or "/"
+
+        if query:
+            target = f"{target}?{query}"
+
+        return rules.allowed(target)
+
+    async def rules(self, url: str) -> RobotsRules:
+        """
+        Get the robots.txt rules of the host of a URL, fetching them if they
+        have not been already.
+
+        :param url: URL of a page on the host
+        :return: Compiled rules for the crawler
+        """
+        scheme, netloc, *_ = urlsplit(url)
+        origin = f"{scheme}://{netloc}"
+
+        return self._rules.get(origin) or await self._fetch_once(origin)
+
+    async def _fetch_once(self, origin: str) -> RobotsRules:
+        if origin not in self._fetches:
+            self._fetches[origin] = asyncio.create_task(self._fetch(origin))
+
+        # Shielded, so a cancelled check does not cancel the fetch for others
+        rules = await asyncio.shield(self._fetches[origin])
+
+        if origin not in self._rules:
+            self._rules[origin] = rules
+
+            if rules.crawl_delay and self.limiter:
+                self.limiter.set_host_delay(origin, rules.crawl_delay)
+
+        return rules
+
+    async def _fetch(self, origin: str) -> RobotsRules:
+        """
+        Fetch and parse the robots.txt of a host, following RFC 9309 when it is
+        missing or cannot be fetched.
+
+        :param origin: Scheme and host of the site
+        :return: Compiled rules for the crawler
+        """
+        try:
+            async with self.client.stream(
+                "GET", f"{origin}/robots.txt", follow_redirects=True
+            ) as response:
+                status_code = response.status_code
+
+                # An unreachable robots.txt disallows everything
+                if (
+                    status_code == HTTPStatus.TOO_MANY_REQUESTS
+                    or status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+                ):
+                    return RobotsRules.disallow_all()
+
+                # A missing robots.txt allows everything
+                if not response.is_success:
+                    return RobotsRules.allow_all()
+
+                content = await self._read_body(response)
+        except httpx.HTTPError:
+            return RobotsRules.disallow_all()
+
+        return parse_robots(
+            content.decode("utf-8-sig", errors="replace"), self.user_agent
+        )
+
+    @staticmethod
+    async def _read_body(response: httpx.Response) -> bytes:
+        chunks: list[bytes] = []
+        content_length = 0
+
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            content_length += len(chunk)
+
+            # Rules beyond the size limit are ignored
+            if content_length >= ROBOTS_MAX_BYTES:
+                break
+
+        return b"".join(chunks)[:ROBOTS_MAX_BYTES]
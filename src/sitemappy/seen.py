@@ -0,0 +1,148 @@
+import hashlib
+import math
+from enum import StrEnum
+from typing import Protocol
+
+FINGERPRINT_SIZE_BYTES = 8
+
+DEFAULT_BLOOM_CAPACITY = 10_000_000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+
+class SeenSetBackend(StrEnum):
+    """
+    Storage backends for the set of URLs that have already been seen.
+    """
+
+    EXACT = "exact"
+    FINGERPRINT = "fingerprint"
+    BLOOM = "bloom"
+
+
+class SeenSet(Protocol):
+    """
+    A set of URLs that have already been seen by a Crawler.
+    """
+
+    def __contains__(self, url: object) -> bool: ...
+
+    def __len__(self) -> int: ...
+
+    def add(self, url: str) -> None: ...
+
+
+def fingerprint(url: str) -> int:
+    """
+    Hash a URL to a 64-bit fingerprint.
+
+    :param url: URL to hash
+    :return: Unsigned 64-bit fingerprint
+    """
+    digest = hashlib.blake2b(url.encode(), digest_size=FINGERPRINT_SIZE_BYTES)
+    return int.from_bytes(digest.digest())
+
+
+class FingerprintSeenSet:
+    """
+    A seen set storing 64-bit fingerprints instead of full URL strings.
+
+    Memory use no longer depends on URL length. The chance of two URLs sharing
+    a fingerprint is negligible below billions of URLs.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise a new, empty fingerprint seen set.
+        """
+        self._fingerprints: set[int] = set()
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and fingerprint(url) in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, url: str) -> None:
+        """
+        Add a URL to the set.
+
+        :param url: URL to add
+        """
+        self._fingerprints.add(fingerprint(url))
+
+
+class BloomSeenSet:
+    """
+    A seen set backed by a fixed-size Bloom filter.
+
+    Memory use is fixed up front, at the cost of a small chance of a URL that
+    has not been seen being reported as seen, and so not being crawled.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_BLOOM_CAPACITY,
+        error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+    ):
+        """
+        Initialise a new, empty Bloom filter seen set.
+
+        :param capacity: Number of URLs the filter is sized for
+            *(default: 10,000,000)*
+        :param error_rate: False positive rate once the filter holds its capacity
+            *(default: 0.001)*
+        """
+        self.size_bits = math.ceil(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        )
+        self.number_of_hashes = max(1, round(self.size_bits / capacity * math.log(2)))
+
+        self._bits = bytearray(math.ceil(self.size_bits / 8))
+        self._length = 0
+
+    def _positions(self, url: str) -> list[int]:
+        # Derive every position from one digest with double hashing
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8])
+        second = int.from_bytes(digest[8:]) | 1
+
+        return [
+            (first + index * second) % self.size_bits
+            for index in range(self.number_of_hashes)
+        ]
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(url)
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def add(self, url: str) -> None:
+        """
+        Add a URL to the filter.
+
+        :param url: URL to add
+        """
+        for position in self._positions(url):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self._length += 1
+
+
+def create_seen_set(backend: SeenSetBackend) -> SeenSet:
+    """
+    Create an empty seen set for the given backend.
+
+    :param backend: Storage backend for the seen set
+    :return: Empty seen set
+    """
+    if backend == SeenSetBackend.FINGERPRINT:
+        return FingerprintSeenSet()
+
+    if backend == SeenSetBackend.BLOOM:
+        return BloomSeenSet()
+
+    return set()
@@ -0,0 +1,391 @@
+"""
+Multi-process crawling, where each process runs its own Crawler event loop and
+owns a hash partition of the URL space.
+"""
+
+import asyncio
+import multiprocessing
+from collections import defaultdict
+from dataclasses import replace
+from multiprocessing.context import SpawnProcess
+from multiprocessing.queues import Queue
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any
+
+from .crawl_options import MonitoringOptions, OutputOptions
+from .crawler import POLITENESS_DELAY_DEFAULT_S, Crawler
+from .frontier import CrawlItem
+from .link_graph import LinkGraph
+from .metrics import NO_METRICS_PORT, NO_STATS_INTERVAL, CrawlMetrics, write_metrics
+from .seen import fingerprint
+from .sinks import write_report
+from .urls import canonicalize_url
+from .validator_cache import CacheStats
+
+DEFAULT_NUMBER_OF_PROCESSES = 1
+
+FORWARD_BATCH_SIZE = 100
+FORWARD_FLUSH_INTERVAL_S = 0.5
+TERMINATION_POLL_INTERVAL_S = 0.1
+
+# Sent to a shard's inbox to stop it once the whole crawl has finished
+STOP = None
+
+Batch = list[CrawlItem] | None
+ShardResult = tuple[LinkGraph, float, dict[str, str], dict[str, str], CrawlMetrics]
+
+
+def shard_of(canonical_link: str, shards: int) -> int:
+    """
+    Find the shard that owns a link.
+
+    :param canonical_link: Canonical form of the link
+    :param shards: Number of shards the URL space is partitioned into
+    :return: Index of the owning shard
+    """
+    return fingerprint(canonical_link) % shards
+
+
+class ShardCrawler(Crawler):
+    """
+    A Crawler that only crawls the links of its own shard, forwarding links owned
+    by other shards to them in batches.
+
+    Termination across shards uses a shared count of outstanding work, the
+    number of batches in transit plus the number of active shards. A batch is
+    counted before it is sent, and a shard only stops counting itself as active
+    once its queue is drained and its batches are sent, so the count can only
+    reach zero once the whole crawl has finished.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        shard: int,
+        inboxes: "list[Queue[Batch]]",
+        outstanding: "Synchronized[int]",
+        **crawler_kwargs: Any,
+    ):
+        """
+        Initialise a new shard of a multi-process crawl.
+
+        :param base_url: Website to crawl
+        :param shard: Index of the shard this crawler owns
+        :param inboxes: Inbox queue of every shard, indexed by shard
+        :param outstanding: Shared count of batches in transit and active shards
+        :param crawler_kwargs: Arguments for the Crawler
+        """
+        super().__init__(base_url, **crawler_kwargs)
+
+        self.shard = shard
+        self.shards = len(inboxes)
+
+        self._inboxes = inboxes
+        self._outstanding = outstanding
+        self._outboxes: dict[int, list[CrawlItem]] = defaultdict(list)
+
+        self._active = False
+        self._activity = asyncio.Event()
+        self._stopped = False
+
+    async def _schedule(self, link: str, depth: int) -> None:
+        canonical_link = canonicalize_url(link)
+        owner = shard_of(canonical_link, self.shards)
+
+        if owner == self.shard:
+            await super()._schedule(link, depth)
+            return
+
+        # Links owned by other shards are also remembered, so repeated
+        # navigation links are only forwarded once
+        if canonical_link not in self._seen_urls:
+            self._seen_urls.add(canonical_link)
+            self._outboxes[owner].append((link, depth))
+
+            if len(self._outboxes[owner]) >= FORWARD_BATCH_SIZE:
+                self._flush(owner)
+
+    async def _claim_redirect_target(self, target: str, depth: int) -> bool:
+        # A page redirected to that another shard owns is left to that shard,
+        # which would otherwise crawl it again when it is linked to
+        if shard_of(canonicalize_url(target), self.shards) != self.shard:
+            await self._enqueue(target, depth)
+            return False
+
+        return await super()._claim_redirect_target(target, depth)
+
+    def _flush(self, owner: int) -> None:
+        batch = self._outboxes.pop(owner, None)
+
+        if batch:
+            self._add_outstanding(1)
+            self._inboxes[owner].put(batch)
+
+    def _flush_all(self) -> None:
+        for owner in list(self._outboxes):
+            self._flush(owner)
+
+    def _add_outstanding(self, amount: int) -> None:
+        with self._outstanding.get_lock():
+            self._outstanding.value += amount
+
+    def _set_active(self, active: bool) -> None:
+        if active != self._active:
+            self._active = active
+            self._add_outstanding(1 if active else -1)
+
+    async def _receive(self) -> None:
+        loop = asyncio.get_running_loop()
+        inbox = self._inboxes[self.shard]
+
+        while True:
+            batch = await loop.run_in_executor(None, inbox.get)
+
+            if batch is STOP:
+                self._stopped = True
+                self._activity.set()
+                return
+
+            # The batch stops being in transit as the shard becomes active
+            if self._active:
+                self._add_outstanding(-1)
+            else:
+                self._active = True
+
+            for link, depth in batch:
+                await super()._schedule(link, depth)
+
+            self._activity.set()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(FORWARD_FLUSH_INTERVAL_S)
+            self._flush_all()
+
+    async def crawl(self) -> LinkGraph:
+        """
+        Crawl the links owned by this shard until every shard has finished.
+
+        :return: *LinkGraph* - Map of pages crawled by this shard and
+            links gathered from that page.
+        """
+        if shard_of(canonicalize_url(self.scraper.base_url), self.shards) == self.shard:
+            # The seeding shard starts active, as counted by ShardedCrawler
+            self._active = True
+            self._seed()
+
+        workers = self._start_workers()
+        receiver = asyncio.create_task(self._receive())
+        flusher = asyncio.create_task(self._flush_periodically())
+
+        while not self._stopped:
+            await self._crawl_queue.join()
+            self._flush_all()
+
+            # Links received while waiting for the queue are crawled first
+            if not self._crawl_queue.empty():
+                continue
+
+            self._activity.clear()
+            self._set_active(False)
+            await self._activity.wait()
+
+        flusher.cancel()
+        await receiver
+        await self._stop_workers(workers)
+
+        return self._results
+
+
+def _run_shard(  # noqa: PLR0913 - Everything a process needs to run its shard
+    base_url: str,
+    shard: int,
+    inboxes: "list[Queue[Batch]]",
+    outstanding: "Synchronized[int]",
+    *,
+    results: "Queue[ShardResult]",
+    crawler_kwargs: dict[str, Any],
+) -> None:
+    crawler = ShardCrawler(base_url, shard, inboxes, outstanding, **crawler_kwargs)
+    shard_results = asyncio.run(crawler.crawl())
+
+    results.put(
+        (
+            shard_results,
+            crawler.achieved_request_rate,
+            crawler.failures,
+            crawler.duplicates.duplicates if crawler.duplicates else {},
+            crawler.current_metrics(),
+        )
+    )
+
+
+class ShardedCrawler:
+    """
+    A crawler running a ShardCrawler event loop in each of a number of
+    processes, so one crawl can use every core.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        processes: int = DEFAULT_NUMBER_OF_PROCESSES,
+        **crawler_kwargs: Any,
+    ):
+        """
+        Initialise a new multi-process crawler.
+
+        :param base_url: Website to crawl
+        :param processes: Processes to partition the crawl across
+            *(default: 1)*
+        :param crawler_kwargs: Arguments for the Crawler in each process, the
+            politeness delay is multiplied by the number of processes so the
+            combined request rate is unchanged, and failures, duplicates and
+            metrics are written once merged from every process, without stats
+            lines or a metrics server in each process
+        """
+        self.base_url = base_url
+        self.processes = processes
+        outputs: OutputOptions = crawler_kwargs.get("outputs") or OutputOptions()
+        self.failures_output = outputs.failures_output
+        self.duplicates_output = outputs.duplicates_output
+        self.metrics_output = outputs.metrics_output
+
+        # Each process would print its own stats lines and contend for the port
+        monitoring: MonitoringOptions = (
+            crawler_kwargs.get("monitoring") or MonitoringOptions()
+        )
+
+        politeness_delay = crawler_kwargs.get(
+            "politeness_delay", POLITENESS_DELAY_DEFAULT_S
+        )
+        self.crawler_kwargs = crawler_kwargs | {
+            "politeness_delay": politeness_delay * processes,
+            "outputs": replace(
+                outputs,
+                failures_output=None,
+                duplicates_output=None,
+                metrics_output=None,
+            ),
+            "monitoring": replace(
+                monitoring,
+                stats_interval=NO_STATS_INTERVAL,
+                metrics_port=NO_METRICS_PORT,
+            ),
+        }
+
+        self._achieved_request_rate = 0.0
+
+        # Pages that could not be crawled by any shard, mapped to why
+        self.failures: dict[str, str] = {}
+
+        # Pages any shard found to duplicate another, mapped to the page
+        self.duplicates: dict[str, str] = {}
+
+        # Metrics of every shard, merged once each has finished
+        self.metrics = CrawlMetrics()
+
+    async def crawl(self) -> LinkGraph:
+        """
+        Start a process for each shard and wait for the whole crawl to finish.
+
+        :return: *LinkGraph* - Map of pages that have been crawled and links
+            gathered from that page, merged across every shard.
+        """
+        context = multiprocessing.get_context("spawn")
+
+        inboxes: list[Queue[Batch]] = [context.Queue() for _ in range(self.processes)]
+        results: Queue[ShardResult] = context.Queue()
+
+        # The shard owning the base URL starts active
+        outstanding = context.Value("q", 1)
+
+        shard_processes = [
+            context.Process(
+                target=_run_shard,
+                args=(self.base_url, shard, inboxes, outstanding),
+                kwargs={"results": results, "crawler_kwargs": self.crawler_kwargs},
+            )
+            for shard in range(self.processes)
+        ]
+
+        for process in shard_processes:
+            process.start()
+
+        try:
+            await self._wait_for_outstanding_work(outstanding, shard_processes)
+
+            for inbox in inboxes:
+                inbox.put(STOP)
+
+            merged_results = await self._merge_results(results)
+        finally:
+            for process in shard_processes:
+                process.join()
+
+        if self.failures_output:
+            write_report(self.failures_output, self.failures)
+
+        if self.duplicates_output:
+            write_report(self.duplicates_output, self.duplicates)
+
+        if self.metrics_output:
+            write_metrics(self.metrics_output, self.metrics)
+
+        return merged_results
+
+    @staticmethod
+    async def _wait_for_outstanding_work(
+        outstanding: "Synchronized[int]", shard_processes: list[SpawnProcess]
+    ) -> None:
+        while outstanding.value:
+            if any(process.exitcode is not None for process in shard_processes):
+                for process in shard_processes:
+                    process.terminate()
+
+                raise RuntimeError("A crawler shard process exited unexpectedly")
+
+            await asyncio.sleep(TERMINATION_POLL_INTERVAL_S)
+
+    async def _merge_results(self, results: "Queue[ShardResult]") -> LinkGraph:
+        loop = asyncio.get_running_loop()
+        merged_results = LinkGraph()
+
+        for _ in range(self.processes):
+            (
+                shard_results,
+                request_rate,
+                failures,
+                duplicates,
+                metrics,
+            ) = await loop.run_in_executor(None, results.get)
+
+            # Each page is only crawled by the shard that owns it
+            merged_results.update(shard_results)
+            self._achieved_request_rate += request_rate
+            self.failures |= failures
+            self.duplicates |= duplicates
+            self.metrics.merge(metrics)
+
+        return merged_results
+
+    @property
+    def achieved_request_rate(self) -> float:
+        """
+        :return: Requests per second achieved across all processes during the crawl
+        """
+        return self._achieved_request_rate
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """
+        :return: None, as a validator cache is not shared between processes
+        """
+        return None
+
+    @property
+    def concurrency_limit(self) -> int | None:
+        """
+        :return: None, as each process settles on its own concurrency limit
+        """
+        return None
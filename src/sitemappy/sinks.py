@@ -0,0 +1,321 @@
+"""
+Sinks the pages of a crawl are written to as they are crawled, so results reach
+their destination during the crawl rather than all at once at the end.
+"""
+
+import gzip
+import json
+import os
+import sys
+from collections.abc import Mapping
+from enum import StrEnum
+from typing import Protocol, TextIO
+from xml.sax.saxutils import escape
+
+from .profiling import PROFILE_EXTENSIONS, ProfileMode
+
+DEFAULT_BATCH_SIZE = 100
+
+# Limits of a single <urlset> file, from https://www.sitemaps.org/protocol.html
+SITEMAP_MAX_URLS = 50_000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+SITEMAP_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_START = f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+URLSET_END = "</urlset>\n"
+URLSET_OVERHEAD_BYTES = len(SITEMAP_XML_DECLARATION + URLSET_START + URLSET_END)
+
+
+class OutputFormat(StrEnum):
+    """
+    Formats the results of a crawl can be written in.
+    """
+
+    JSON = "json"
+    NDJSON = "ndjson"
+    SITEMAP_XML = "sitemap-xml"
+
+
+class ResultSink(Protocol):
+    """
+    A destination for the pages crawled by a Crawler.
+    """
+
+    def write(self, page: str, links: list[str], listed: bool = True) -> None:
+        """
+        Write a crawled page.
+
+        :param page: Page that was crawled
+        :param links: Links gathered from the page
+        :param listed: Whether the page belongs in a sitemap, as a final URL
+            served as a 200 HTML page rather than a redirect, an error or an
+            asset *(default: True)*
+        """
+        ...
+
+    def flush(self) -> None:
+        """
+        Write out any pages buffered by the sink.
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Flush any buffered pages and release the sink's destination.
+        """
+        ...
+
+
+class NdjsonSink:
+    """
+    A sink writing each page as a line of JSON, mapping the page to its links.
+
+    Pages are buffered in memory and written in batches, so the destination is
+    written to once per batch rather than once per page.
+    """
+
+    def __init__(self, file: TextIO, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialise a new NDJSON sink.
+
+        :param file: Text file to write pages to
+        :param batch_size: Pages to buffer before writing them to the file
+            *(default: 100)*
+        """
+        self.file = file
+        self.batch_size = batch_size
+
+        self.pages_written = 0
+        self.links_written = 0
+
+        self._pending: list[str] = []
+
+    def write(
+        self,
+        page: str,
+        links: list[str],
+        listed: bool = True,  # noqa: ARG002 - Every page crawled is written
+    ) -> None:
+        self._pending.append(json.dumps({page: links}))
+        self.pages_written += 1
+        self.links_written += len(links)
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self.file.write("\n".join(self._pending) + "\n")
+            self.file.flush()
+            self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+class NdjsonFileSink(NdjsonSink):
+    """
+    An NDJSON sink writing pages to a file, replacing any existing file.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Open a new NDJSON file sink.
+
+        :param path: File to write pages to
+        :param batch_size: Pages to buffer before writing them to the file
+            *(default: 100)*
+        """
+        self.path = path
+
+        # Closed by close()
+        super().__init__(open(path, "w"), batch_size)
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+
+class StdoutSink(NdjsonSink):
+    """
+    An NDJSON sink printing pages to stdout.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialise a new stdout sink.
+
+        :param batch_size: Pages to buffer before printing them
+            *(default: 100)*
+        """
+        super().__init__(sys.stdout, batch_size)
+
+
+class SitemapXmlSink:
+    """
+    A sink writing pages as sitemaps.org XML, in gzipped <urlset> files tied
+    together by a sitemap index.
+
+    Each page is written to the current <urlset> file as it is crawled, starting
+    a new file when the current one reaches the protocol's URL or size limit, so
+    memory use does not grow with the size of the site. Only pages that belong
+    in a sitemap are listed, leaving out redirects, error pages and assets.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sitemap_url: str,
+        max_urls: int = SITEMAP_MAX_URLS,
+        max_bytes: int = SITEMAP_MAX_BYTES,
+    ):
+        """
+        Open a new sitemap sink.
+
+        :param path: Sitemap index file to write, each <urlset> file is written
+            next to it, named after it with a number and .xml.gz suffix
+        :param sitemap_url: URL of the directory the sitemap files will be
+            served from, for the locations listed in the sitemap index
+        :param max_urls: URLs to write to each <urlset> file
+            *(default: 50,000)*
+        :param max_bytes: Uncompressed size of each <urlset> file
+            *(default: 50 MiB)*
+        """
+        self.path = path
+        self.sitemap_url = (
+            sitemap_url if sitemap_url.endswith("/") else f"{sitemap_url}/"
+        )
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+
+        # Pages crawled, and the URLs of those listed in the sitemap
+        self.pages_written = 0
+        self.links_written = 0
+        self.urls_written = 0
+        self.urlset_paths: list[str] = []
+
+        self._urlset: TextIO | None = None
+        self._urlset_urls = 0
+        self._urlset_bytes = 0
+
+    def write(self, page: str, links: list[str], listed: bool = True) -> None:
+        self.pages_written += 1
+        self.links_written += len(links)
+
+        if not listed:
+            return
+
+        entry = f"<url><loc>{escape(page)}</loc></url>\n"
+        entry_bytes = len(entry.encode())
+
+        urlset = self._urlset
+
+        if urlset is None or (
+            self._urlset_urls >= self.max_urls
+            or self._urlset_bytes + entry_bytes > self.max_bytes
+        ):
+            urlset = self._start_urlset()
+
+        urlset.write(entry)
+        self._urlset_urls += 1
+        self._urlset_bytes += entry_bytes
+        self.urls_written += 1
+
+    def flush(self) -> None:
+        if self._urlset is not None:
+            self._urlset.flush()
+
+    def close(self) -> None:
+        self._end_urlset()
+
+        with open(self.path, "w", encoding="utf-8") as index_file:
+            index_file.write(SITEMAP_XML_DECLARATION)
+            index_file.write(f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n')
+
+            for urlset_path in self.urlset_paths:
+                location = escape(self.sitemap_url + os.path.basename(urlset_path))
+                index_file.write(f"<sitemap><loc>{location}</loc></sitemap>\n")
+
+            index_file.write("</sitemapindex>\n")
+
+    def _start_urlset(self) -> TextIO:
+        self._end_urlset()
+
+        stem = self.path.removesuffix(".xml")
+        urlset_path = f"{stem}-{len(self.urlset_paths) + 1}.xml.gz"
+        self.urlset_paths.append(urlset_path)
+
+        # Closed by _end_urlset()
+        self._urlset = gzip.open(urlset_path, "wt", encoding="utf-8")
+        self._urlset.write(SITEMAP_XML_DECLARATION + URLSET_START)
+
+        self._urlset_urls = 0
+        self._urlset_bytes = URLSET_OVERHEAD_BYTES
+
+        return self._urlset
+
+    def _end_urlset(self) -> None:
+        if self._urlset is not None:
+            self._urlset.write(URLSET_END)
+            self._urlset.close()
+            self._urlset = None
+
+
+def failures_path(output: str) -> str:
+    """
+    :param output: File the results of a crawl are written to
+    :return: File next to it to write the pages that could not be crawled to
+    """
+    stem, _ = os.path.splitext(output)
+
+    return f"{stem}.failures.json"
+
+
+def duplicates_path(output: str) -> str:
+    """
+    :param output: File the results of a crawl are written to
+    :return: File next to it to write the pages that duplicated another to
+    """
+    stem, _ = os.path.splitext(output)
+
+    return f"{stem}.duplicates.json"
+
+
+def metrics_path(output: str) -> str:
+    """
+    :param output: File the results of a crawl are written to
+    :return: File next to it to write the metrics of the crawl to
+    """
+    stem, _ = os.path.splitext(output)
+
+    return f"{stem}.metrics.json"
+
+
+def profile_path(output: str, mode: ProfileMode) -> str:
+    """
+    :param output: File the results of a crawl are written to
+    :param mode: How the crawl is profiled
+    :return: File next to it to write the profile of the crawl to
+    """
+    stem, _ = os.path.splitext(output)
+
+    return f"{stem}.profile{PROFILE_EXTENSIONS[mode]}"
+
+
+def write_report(path: str, report: Mapping[str, str]) -> None:
+    """
+    Write a report on pages as a JSON object mapping each page to its entry,
+    such as the error of a page that could not be crawled, or remove a file
+    left by an earlier crawl if there is nothing to report.
+
+    :param path: File to write the report to
+    :param report: Map of pages to report to their entries
+    """
+    if not report:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(dict(report), report_file, indent=2)
@@ -0,0 +1,252 @@
+"""
+Sitemaps a site already publishes, discovered through robots.txt and streamed
+for the URLs they list, so a crawl can start from every page the site knows of.
+"""
+
+import zlib
+from collections import deque
+from collections.abc import AsyncGenerator
+from enum import StrEnum
+from http import HTTPStatus
+from urllib.parse import urljoin
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+
+from .politeness import PolitenessLimiter
+from .robots import RobotsCache
+from .sinks import SITEMAP_MAX_BYTES
+
+# Probed when robots.txt lists no sitemaps
+WELL_KNOWN_SITEMAP_PATHS = ("/sitemap.xml", "/sitemap_index.xml")
+
+# Sitemap files fetched while following sitemap indexes
+DEFAULT_MAX_SITEMAPS = 1000
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Accept a gzip header, as sitemaps may be served gzipped without saying so
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class SitemapEntry(StrEnum):
+    """
+    Entries a sitemap can list.
+    """
+
+    # A page, listed in a <urlset>
+    URL = "url"
+
+    # Another sitemap, listed in a <sitemapindex>
+    SITEMAP = "sitemap"
+
+
+class SitemapParser:
+    """
+    An incremental parser of sitemaps.org XML, optionally gzipped, fed a chunk
+    at a time.
+
+    Each entry is discarded from the document tree once its location has been
+    read, so memory use does not grow with the number of entries.
+    """
+
+    def __init__(self, max_bytes: int = SITEMAP_MAX_BYTES):
+        """
+        Initialise a new sitemap parser.
+
+        :param max_bytes: Uncompressed bytes to parse before ignoring the rest
+            of the sitemap *(default: 50 MiB)*
+        """
+        self.max_bytes = max_bytes
+        self.bytes_parsed = 0
+
+        self._parser: XMLPullParser[Element] = XMLPullParser(events=("start", "end"))
+        self._root: Element | None = None
+        self._decompressor: zlib._Decompress | None = None
+        self._started = False
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        :return: True once the size limit has been reached
+        """
+        return self.bytes_parsed >= self.max_bytes
+
+    def feed(self, chunk: bytes) -> list[tuple[SitemapEntry, str]]:
+        """
+        Parse the next chunk of the sitemap.
+
+        :param chunk: Raw bytes as received
+        :return: Entries completed by the chunk, and their locations
+        :raises xml.etree.ElementTree.ParseError: If the sitemap is not XML
+        """
+        # The rest of a sitemap beyond the size limit is ignored
+        if self.exhausted:
+            return []
+
+        if not self._started:
+            self._started = True
+
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(GZIP_WBITS)
+
+        if self._decompressor:
+            # Bounded, so a small gzip bomb cannot expand beyond the size limit
+            chunk = self._decompressor.decompress(
+                chunk, self.max_bytes - self.bytes_parsed
+            )
+
+        chunk = chunk[: self.max_bytes - self.bytes_parsed]
+        self.bytes_parsed += len(chunk)
+
+        self._parser.feed(chunk)
+
+        return self._read_entries()
+
+    def close(self) -> list[tuple[SitemapEntry, str]]:
+        """
+        Finish parsing the sitemap.
+
+        :return: Entries completed by the end of the sitemap
+        """
+        if self.exhausted:
+            # The document was cut short at the size limit, so is not closed
+            return []
+
+        self._parser.close()
+
+        return self._read_entries()
+
+    def _read_entries(self) -> list[tuple[SitemapEntry, str]]:
+        entries = []
+
+        for event in self._parser.read_events():
+            element = event[-1]
+
+            # Only element events are parsed, never namespace declarations
+            if not isinstance(element, Element):
+                continue
+
+            if event[0] == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+
+            # Tags are namespaced, as {http://www.sitemaps.org/...}loc
+            tag = element.tag.rpartition("}")[2]
+
+            if tag in {SitemapEntry.URL, SitemapEntry.SITEMAP}:
+                location = next(
+                    (
+                        child.text.strip()
+                        for child in element
+                        if child.tag.rpartition("}")[2] == "loc" and child.text
+                    ),
+                    None,
+                )
+
+                if location:
+                    entries.append((SitemapEntry(tag), location))
+
+                # Drop every finished entry, keeping only the root
+                if self._root is not None:
+                    self._root.clear()
+
+        return entries
+
+
+class SitemapSeeder:
+    """
+    Discovers the sitemaps of a site and streams the URLs of the pages they
+    list, following sitemap indexes to the sitemaps they list.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        robots: RobotsCache,
+        politeness: PolitenessLimiter | None = None,
+        max_sitemaps: int = DEFAULT_MAX_SITEMAPS,
+    ):
+        """
+        Initialise a new sitemap seeder.
+
+        :param client: Client to fetch sitemaps with
+        :param robots: robots.txt cache listing the site's sitemaps
+        :param politeness: Rate limiter to wait for before fetching each sitemap
+            *(default: None - no delay)*
+        :param max_sitemaps: Sitemap files to fetch, including sitemap indexes
+            *(default: 1,000)*
+        """
+        self.client = client
+        self.robots = robots
+        self.politeness = politeness
+        self.max_sitemaps = max_sitemaps
+
+        self.sitemaps_read = 0
+
+        # Listed sitemaps that could not be read, mapped to why
+        self.errors: dict[str, str] = {}
+
+    async def urls(self, base_url: str) -> AsyncGenerator[str, None]:
+        """
+        Stream the URLs of every page listed in the sitemaps of a site.
+
+        The sitemaps listed in robots.txt are read, or the well-known sitemap
+        paths if it lists none.
+
+        :param base_url: Website being crawled
+        :return: URLs of the pages listed, as each is parsed
+        """
+        listed = (await self.robots.rules(base_url)).sitemaps
+
+        # Well-known paths are only guesses, so are not errors when missing
+        probed = (
+            set()
+            if listed
+            else {urljoin(base_url, path) for path in WELL_KNOWN_SITEMAP_PATHS}
+        )
+        sitemaps = listed or [
+            urljoin(base_url, path) for path in WELL_KNOWN_SITEMAP_PATHS
+        ]
+
+        pending = deque(sitemaps)
+        seen = set(sitemaps)
+
+        while pending and self.sitemaps_read < self.max_sitemaps:
+            sitemap = pending.popleft()
+            self.sitemaps_read += 1
+
+            try:
+                async for entry, location in self._read(sitemap, sitemap in probed):
+                    if entry == SitemapEntry.URL:
+                        yield location
+                    elif location not in seen:
+                        seen.add(location)
+                        pending.append(location)
+            except (httpx.HTTPError, ParseError, zlib.error) as error:
+                self.errors[sitemap] = f"{type(error).__name__}: {error}"
+
+    async def _read(
+        self, sitemap: str, probed: bool
+    ) -> AsyncGenerator[tuple[SitemapEntry, str], None]:
+        if self.politeness:
+            await self.politeness.wait(sitemap)
+
+        parser = SitemapParser()
+
+        async with self.client.stream("GET", sitemap, follow_redirects=True) as page:
+            if probed and page.status_code == HTTPStatus.NOT_FOUND:
+                return
+
+            page.raise_for_status()
+
+            async for chunk in page.aiter_bytes():
+                for entry in parser.feed(chunk):
+                    yield entry
+
+                if parser.exhausted:
+                    return
+
+        for entry in parser.close():
+            yield entry
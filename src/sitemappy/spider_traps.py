@@ -0,0 +1,183 @@
+"""
+Spider trap detection, dropping links into the endless URL spaces of calendars,
+faceted search and session IDs before they are queued.
+"""
+
+import re
+from collections import Counter
+from enum import StrEnum
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_URLS_PER_TEMPLATE = 1000
+UNLIMITED_URLS_PER_TEMPLATE = 0
+
+DEFAULT_MAX_PATH_DEPTH = 16
+DEFAULT_MAX_SEGMENT_REPEATS = 3
+
+# Longer URLs than most servers and browsers accept
+DEFAULT_MAX_URL_LENGTH = 2048
+
+# Templates named in the report, so it stays small however many traps are found
+MAX_REPORTED_TEMPLATES = 1000
+
+# Path segments that are numbers, dates, hex IDs or UUIDs, which vary between
+# pages generated from the same template
+VARIABLE_SEGMENT = re.compile(r"[0-9a-f._-]*[0-9][0-9a-f._-]*", re.IGNORECASE)
+VARIABLE_PLACEHOLDER = "{n}"
+
+
+class TrapReason(StrEnum):
+    """
+    Reasons a link is suppressed as a spider trap.
+    """
+
+    # The same path segment repeats, as with relative links resolved in a loop
+    REPEATED_SEGMENTS = "Repeated path segments"
+
+    # The path is deeper than any page a person would navigate to
+    PATH_DEPTH = "Path too deep"
+
+    URL_LENGTH = "URL too long"
+
+    # Pages of a calendar, faceted search or session IDs, sharing one template
+    TEMPLATE_LIMIT = "Too many URLs sharing the template"
+
+    # Combinations of the filters of a faceted search, sharing one path
+    QUERY_LIMIT = "Too many query strings sharing the path"
+
+
+def url_template(url: str) -> str:
+    """
+    Reduce a URL to the template of the pages it belongs to, so pages differing
+    only in IDs, dates or query parameter values share it.
+
+    :param url: Canonical URL
+    :return: URL with variable path segments replaced by {n}, path parameters
+        such as ;jsessionid dropped, and only the names of query parameters
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+
+    segments = [
+        VARIABLE_PLACEHOLDER if VARIABLE_SEGMENT.fullmatch(segment) else segment
+        for segment in (segment.partition(";")[0] for segment in path.split("/"))
+    ]
+
+    names = sorted({parameter.partition("=")[0] for parameter in query.split("&")})
+
+    template = f"{scheme}://{netloc}{'/'.join(segments)}"
+
+    return f"{template}?{'&'.join(names)}" if query else template
+
+
+class SpiderTrapDetector:
+    """
+    Checks each link before it is queued for the shapes of a spider trap.
+
+    Paths that repeat a segment, run too deep or are too long are suppressed
+    outright. Every other link is counted against its template, suppressing
+    those beyond the limit, so an endless calendar or faceted search costs a
+    bounded number of requests rather than the rest of the crawl. Links with a
+    query string are also counted against the template of their path, as each
+    combination of a faceted search's filters has a template of its own.
+    """
+
+    def __init__(
+        self,
+        max_urls_per_template: int = DEFAULT_MAX_URLS_PER_TEMPLATE,
+        max_path_depth: int = DEFAULT_MAX_PATH_DEPTH,
+        max_segment_repeats: int = DEFAULT_MAX_SEGMENT_REPEATS,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    ):
+        """
+        Initialise a new spider trap detector.
+
+        :param max_urls_per_template: Links sharing a template to queue
+            *(default: 1,000 - 0 is unlimited)*
+        :param max_path_depth: Most segments in the path of a link *(default: 16)*
+        :param max_segment_repeats: Times a segment may appear in the path of a
+            link *(default: 3)*
+        :param max_url_length: Most characters in a link *(default: 2,048)*
+        """
+        self.max_urls_per_template = max_urls_per_template
+        self.max_path_depth = max_path_depth
+        self.max_segment_repeats = max_segment_repeats
+        self.max_url_length = max_url_length
+
+        self._template_counts: Counter[str] = Counter()
+
+        # Templates of the links suppressed, and how many were
+        self.suppressed: dict[str, tuple[TrapReason, int]] = {}
+        self.suppressed_total = 0
+
+    def is_trap(self, url: str) -> bool:
+        """
+        Check a link not seen before, counting it against its template if it is
+        queued.
+
+        :param url: Canonical URL of the link
+        :return: True if the link is suppressed as a spider trap
+        """
+        reason = self._structural_reason(url)
+        template = url_template(url)
+        path_template = template.partition("?")[0]
+
+        if reason is None and self._over_limit(template):
+            reason = TrapReason.TEMPLATE_LIMIT
+
+        if (
+            reason is None
+            and path_template != template
+            and self._over_limit(path_template)
+        ):
+            reason = TrapReason.QUERY_LIMIT
+            template = path_template
+
+        if reason is None:
+            return False
+
+        self._suppress(template, reason)
+
+        return True
+
+    def report(self) -> dict[str, str]:
+        """
+        :return: Templates of the links suppressed, mapped to why and how many
+        """
+        return {
+            template: f"{reason}: {count} links suppressed"
+            for template, (reason, count) in self.suppressed.items()
+        }
+
+    def _over_limit(self, template: str) -> bool:
+        self._template_counts[template] += 1
+
+        return (
+            UNLIMITED_URLS_PER_TEMPLATE
+            < self.max_urls_per_template
+            < self._template_counts[template]
+        )
+
+    def _structural_reason(self, url: str) -> TrapReason | None:
+        if len(url) > self.max_url_length:
+            return TrapReason.URL_LENGTH
+
+        segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+
+        if len(segments) > self.max_path_depth:
+            return TrapReason.PATH_DEPTH
+
+        if (
+            segments
+            and Counter(segments).most_common(1)[0][1] > self.max_segment_repeats
+        ):
+            return TrapReason.REPEATED_SEGMENTS
+
+        return None
+
+    def _suppress(self, template: str, reason: TrapReason) -> None:
+        self.suppressed_total += 1
+
+        if template in self.suppressed:
+            self.suppressed[template] = (reason, self.suppressed[template][1] + 1)
+        elif len(self.suppressed) < MAX_REPORTED_TEMPLATES:
+            self.suppressed[template] = (reason, 1)
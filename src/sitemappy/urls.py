@@ -0,0 +1,56 @@
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+ROOT_PATH = "/"
+QUERY_SEPARATOR = "&"
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce an HTTP/HTTPS URL to a canonical form, so variants of the same page
+    are only crawled once.
+
+    The scheme and host are lower-cased, default ports, fragments and trailing
+    slashes are removed, and query parameters are sorted. URLs with any other
+    scheme, or that cannot be parsed, are returned unchanged.
+
+    :param url: URL to canonicalize
+    :return: Canonical form of the URL
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname
+
+    # IPv6 hosts lose their brackets when parsed
+    netloc = f"[{host}]" if ":" in host else host
+
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo = f"{userinfo}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    path = parts.path.rstrip(ROOT_PATH) or ROOT_PATH
+
+    # Sort the raw parameters rather than re-encoding them, so the values of the
+    # canonical URL are requested exactly as they were linked
+    query = QUERY_SEPARATOR.join(
+        sorted(
+            parameter for parameter in parts.query.split(QUERY_SEPARATOR) if parameter
+        )
+    )
+
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -0,0 +1,253 @@
+"""
+A persistent cache of page validators and links, so recrawls can make
+conditional requests and reuse the links of pages that have not changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+CONTENT_HASH_SIZE_BYTES = 16
+
+COMMIT_BATCH_SIZE = 1_000
+
+
+def new_content_hash() -> "hashlib.blake2b":
+    """
+    Start hashing the body of a page, for pages read in chunks.
+
+    :return: Hash object to update with each chunk of the page
+    """
+    return hashlib.blake2b(digest_size=CONTENT_HASH_SIZE_BYTES)
+
+
+def content_hash(content: bytes) -> str:
+    """
+    Hash the body of a page.
+
+    :param content: Raw bytes of the page
+    :return: Hex digest of the page
+    """
+    page_hash = new_content_hash()
+    page_hash.update(content)
+
+    return page_hash.hexdigest()
+
+
+@dataclass
+class CachedPage:
+    """
+    The validators, content hash and links of a previously fetched page.
+    """
+
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    content_length: int
+    links: list[str]
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        :return: Headers to only fetch the page if it has changed
+        """
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+@dataclass
+class CacheStats:
+    """
+    How often a ValidatorCache let a crawl skip downloading or parsing a page.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: Fraction of cache lookups whose cached links were reused
+        """
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+
+class ValidatorCache:
+    """
+    A size-bounded cache of pages in a SQLite database, keyed by canonical URL.
+
+    When the cache grows beyond its size limit, the least recently used pages
+    are evicted. Changes are committed in batches and when the cache is closed,
+    so lookups and stores do not each wait on a write to disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Open a cache, creating it if it does not exist.
+
+        :param path: SQLite database file to hold the cache in
+        :param max_bytes: Size of cached pages to keep before evicting the least
+            recently used *(default: 64 MiB)*
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                content_length INTEGER NOT NULL,
+                links TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used_at INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_used_at ON pages (used_at);
+            """
+        )
+
+        # Pages are ordered by a counter rather than the clock, so eviction is
+        # least recently used even if the clock goes backwards
+        self._size, self._used_at = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used_at), 0) FROM pages"
+        ).fetchone()
+
+        # Lookups mark pages as used in memory, and are written with the next
+        # batch of changes
+        self._uses: dict[str, int] = {}
+        self._uncommitted = 0
+
+    @property
+    def size(self) -> int:
+        """
+        :return: Size of the pages currently cached
+        """
+        return int(self._size)
+
+    def get(self, url: str) -> CachedPage | None:
+        """
+        Look up a cached page, marking it as recently used.
+
+        :param url: Canonical URL of the page
+        :return: The cached page, or None if it is not cached
+        """
+        row = self._connection.execute(
+            "SELECT etag, last_modified, content_hash, content_length, links "
+            "FROM pages WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        self._uses[url] = self._next_use()
+        self._changed()
+
+        etag, last_modified, page_hash, content_length, links = row
+        return CachedPage(
+            etag, last_modified, page_hash, content_length, json.loads(links)
+        )
+
+    def put(self, url: str, page: CachedPage) -> None:
+        """
+        Cache a page, evicting the least recently used pages if the cache is
+        full.
+
+        :param url: Canonical URL of the page
+        :param page: Validators, content hash and links of the page
+        """
+        links = json.dumps(page.links)
+        size = (
+            len(url) + len(links) + len(page.etag or "") + len(page.last_modified or "")
+        )
+
+        previous = self._connection.execute(
+            "SELECT size FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                page.etag,
+                page.last_modified,
+                page.content_hash,
+                page.content_length,
+                links,
+                size,
+                self._next_use(),
+            ),
+        )
+        self._uses.pop(url, None)
+
+        self._size += size - (previous[0] if previous else 0)
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+        self._changed()
+
+    def close(self) -> None:
+        """
+        Commit any outstanding changes and close the database.
+        """
+        if self._uncommitted:
+            self._commit()
+
+        self._connection.close()
+
+    def _next_use(self) -> int:
+        self._used_at += 1
+        return int(self._used_at)
+
+    def _changed(self) -> None:
+        self._uncommitted += 1
+
+        if self._uncommitted >= COMMIT_BATCH_SIZE:
+            self._commit()
+
+    def _write_uses(self) -> None:
+        self._connection.executemany(
+            "UPDATE pages SET used_at = ? WHERE url = ?",
+            [(used_at, url) for url, used_at in self._uses.items()],
+        )
+        self._uses.clear()
+
+    def _commit(self) -> None:
+        with self._connection:
+            self._write_uses()
+
+        self._uncommitted = 0
+
+    def _evict(self) -> None:
+        # Pages are evicted in order of use, so the uses held in memory are
+        # written first
+        self._write_uses()
+
+        evicted: list[tuple[str]] = []
+
+        for url, size in self._connection.execute(
+            "SELECT url, size FROM pages ORDER BY used_at"
+        ):
+            if self._size <= self.max_bytes:
+                break
+
+            evicted.append((url,))
+            self._size -= size
+
+        self._connection.executemany("DELETE FROM pages WHERE url = ?", evicted)
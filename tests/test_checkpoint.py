@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+
+from sitemappy.checkpoint import (
+    CRAWLED,
+    ENQUEUED,
+    LISTED,
+    REDIRECT_TARGET,
+    CrawlJournal,
+)
+
+
+class TestCrawlJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        journal_file = tempfile.NamedTemporaryFile(suffix=".ndjson", delete=False)
+        journal_file.close()
+        self.path = journal_file.name
+        self.addCleanup(os.remove, self.path)
+
+    def test_events_are_only_written_on_flush(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+        self.addCleanup(journal.close)
+
+        # Act
+        journal.record_enqueued("https://monzo.com", 0)
+        before_flush = list(CrawlJournal.replay(self.path))
+        journal.flush()
+        after_flush = list(CrawlJournal.replay(self.path))
+
+        # Assert
+        self.assertEqual([], before_flush)
+        self.assertEqual([{ENQUEUED: "https://monzo.com", "depth": 0}], after_flush)
+
+    def test_events_are_written_once_flush_interval_has_passed(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path, flush_interval=0)
+        self.addCleanup(journal.close)
+
+        # Act
+        journal.record_enqueued("https://monzo.com", 0)
+
+        # Assert
+        self.assertEqual(
+            [{ENQUEUED: "https://monzo.com", "depth": 0}],
+            list(CrawlJournal.replay(self.path)),
+        )
+
+    def test_flush_appends_only_new_events(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+
+        # Act
+        journal.record_enqueued("https://monzo.com", 0)
+        journal.flush()
+        size_after_first_flush = os.path.getsize(self.path)
+        journal.flush()
+        size_after_empty_flush = os.path.getsize(self.path)
+        journal.record_crawled("https://monzo.com", ["https://monzo.com/about"])
+        journal.close()
+
+        # Assert
+        self.assertEqual(size_after_first_flush, size_after_empty_flush)
+        self.assertEqual(
+            [
+                {ENQUEUED: "https://monzo.com", "depth": 0},
+                {CRAWLED: "https://monzo.com", "links": ["https://monzo.com/about"]},
+            ],
+            list(CrawlJournal.replay(self.path)),
+        )
+
+    def test_append_keeps_existing_events(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+        journal.record_enqueued("https://monzo.com", 0)
+        journal.close()
+
+        # Act
+        resumed_journal = CrawlJournal(self.path, append=True)
+        resumed_journal.record_enqueued("https://monzo.com/about", 1)
+        resumed_journal.close()
+
+        # Assert
+        self.assertEqual(
+            ["https://monzo.com", "https://monzo.com/about"],
+            [event[ENQUEUED] for event in CrawlJournal.replay(self.path)],
+        )
+
+    def test_new_journal_replaces_existing_events(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+        journal.record_enqueued("https://monzo.com", 0)
+        journal.close()
+
+        # Act
+        CrawlJournal(self.path).close()
+
+        # Assert
+        self.assertEqual([], list(CrawlJournal.replay(self.path)))
+
+    def test_replay_skips_partially_written_event(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+        journal.record_enqueued("https://monzo.com", 0)
+        journal.close()
+
+        with open(self.path, "a") as journal_file:
+            journal_file.write('{"crawled": "https://monzo.com", "li')
+
+        # Act
+        events = list(CrawlJournal.replay(self.path))
+
+        # Assert
+        self.assertEqual([{ENQUEUED: "https://monzo.com", "depth": 0}], events)
+
+    def test_append_drops_partially_written_event(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+        journal.record_enqueued("https://monzo.com", 0)
+        journal.close()
+
+        with open(self.path, "a") as journal_file:
+            journal_file.write('{"crawled": "https://monzo.com", "li')
+
+        # Act
+        resumed_journal = CrawlJournal(self.path, append=True)
+        resumed_journal.record_enqueued("https://monzo.com/about", 1)
+        resumed_journal.close()
+
+        # Assert
+        self.assertEqual(
+            [
+                {ENQUEUED: "https://monzo.com", "depth": 0},
+                {ENQUEUED: "https://monzo.com/about", "depth": 1},
+            ],
+            list(CrawlJournal.replay(self.path)),
+        )
+
+    def test_unlisted_pages_are_journaled(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+
+        # Act
+        journal.record_crawled("https://monzo.com/old", [], listed=False)
+        journal.record_crawled("https://monzo.com/new", [])
+        journal.close()
+
+        # Assert
+        self.assertEqual(
+            [False, True],
+            [event.get(LISTED, True) for event in CrawlJournal.replay(self.path)],
+        )
+
+    def test_redirect_targets_are_journaled(self) -> None:
+        # Arrange
+        journal = CrawlJournal(self.path)
+
+        # Act
+        journal.record_crawled("https://monzo.com/old", [], listed=False)
+        journal.record_crawled("https://monzo.com/new", [], redirect_target=True)
+        journal.close()
+
+        # Assert
+        self.assertEqual(
+            [False, True],
+            [
+                event.get(REDIRECT_TARGET, False)
+                for event in CrawlJournal.replay(self.path)
+            ],
+        )
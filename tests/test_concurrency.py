@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+from http import HTTPStatus
+from unittest.mock import Mock, patch
+
+from parameterized import parameterized
+
+from sitemappy.concurrency import AdaptiveConcurrency
+
+LATENCY_S = 0.1
+
+
+@patch("sitemappy.concurrency.time.monotonic")
+class TestAdaptiveConcurrency(unittest.IsolatedAsyncioTestCase):
+    async def saturate(self, concurrency: AdaptiveConcurrency) -> None:
+        for _ in range(concurrency.limit):
+            await concurrency.acquire()
+
+    async def test_limit_grows_by_one_per_limit_of_healthy_responses(
+        self, mock_monotonic: Mock
+    ) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(2, max_concurrency=3)
+        await self.saturate(concurrency)
+
+        # Act
+        for _ in range(4):
+            concurrency.record_response(HTTPStatus.OK, LATENCY_S)
+
+        # Assert
+        self.assertEqual(3, concurrency.limit)
+        self.assertEqual(1, concurrency.increases)
+
+    async def test_limit_does_not_grow_while_unused(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(2)
+        await concurrency.acquire()
+
+        # Act
+        for _ in range(10):
+            concurrency.record_response(HTTPStatus.OK, LATENCY_S)
+
+        # Assert
+        self.assertEqual(2, concurrency.limit)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [(HTTPStatus.TOO_MANY_REQUESTS,), (HTTPStatus.SERVICE_UNAVAILABLE,)]
+    )
+    async def test_overload_halves_limit_once_per_latency(
+        self, mock_monotonic: Mock, status_code: HTTPStatus
+    ) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(16, min_concurrency=4)
+        concurrency.record_response(HTTPStatus.OK, LATENCY_S)
+
+        # Act
+        concurrency.record_response(status_code, LATENCY_S)
+        concurrency.record_response(status_code, LATENCY_S)
+        limit_after_burst = concurrency.limit
+
+        for _ in range(3):
+            mock_monotonic.return_value += LATENCY_S * 2
+            concurrency.record_response(status_code, LATENCY_S)
+
+        # Assert
+        self.assertEqual(8, limit_after_burst)
+        self.assertEqual(4, concurrency.limit)
+
+    async def test_rising_latency_decreases_limit(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(10)
+        concurrency.record_response(HTTPStatus.OK, LATENCY_S)
+
+        # Act
+        for _ in range(10):
+            concurrency.record_response(HTTPStatus.OK, LATENCY_S * 10)
+
+        # Assert
+        self.assertEqual(5, concurrency.limit)
+
+    async def test_errors_decrease_limit(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(10)
+
+        # Act
+        concurrency.record_error()
+        mock_monotonic.return_value += 1
+
+        concurrency.record_response(HTTPStatus.INTERNAL_SERVER_ERROR, LATENCY_S)
+
+        # Assert
+        self.assertEqual(2, concurrency.limit)
+        self.assertEqual(2, concurrency.decreases)
+
+    async def test_requests_beyond_limit_wait_for_release(
+        self, mock_monotonic: Mock
+    ) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        concurrency = AdaptiveConcurrency(1)
+        await concurrency.acquire()
+
+        # Act
+        waiting = asyncio.create_task(concurrency.acquire())
+        await asyncio.sleep(0)
+        waited = not waiting.done()
+
+        concurrency.release()
+        await asyncio.wait_for(waiting, timeout=1)
+
+        # Assert
+        self.assertTrue(waited)
+        self.assertEqual(1, concurrency.in_flight)
+
+    def test_bounds(self, _: Mock) -> None:
+        # Act / Assert
+        self.assertEqual(5, AdaptiveConcurrency(50, max_concurrency=5).limit)
+        self.assertEqual(2, AdaptiveConcurrency(1, min_concurrency=2).limit)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(5, min_concurrency=10, max_concurrency=5)
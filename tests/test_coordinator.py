@@ -0,0 +1,250 @@
+import asyncio
+import io
+import json
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+from unittest.mock import AsyncMock, Mock, patch
+
+from sitemappy.coordinator import (
+    CoordinatorServer,
+    LocalCoordinator,
+    NodeCrawler,
+    RemoteCoordinator,
+)
+
+BASE_URL = "https://monzo.com"
+
+
+@patch("sitemappy.coordinator.time.monotonic", return_value=0.0)
+class TestLocalCoordinator(unittest.IsolatedAsyncioTestCase):
+    async def test_submitted_links_are_scheduled_once(self, _: Mock) -> None:
+        # Arrange
+        coordinator = LocalCoordinator(BASE_URL)
+        links = [
+            f"{BASE_URL}/careers",
+            f"{BASE_URL}/careers/#jobs",
+            f"{BASE_URL}/",
+            "https://facebook.com/monzo",
+            "mailto:careers@monzo.com",
+        ]
+
+        # Act
+        first_lease = await coordinator.lease("node-1", limit=10)
+        await coordinator.submit("node-1", [(BASE_URL, 0, links)])
+        second_lease = await coordinator.lease("node-1", limit=10)
+
+        # Assert
+        self.assertEqual([(BASE_URL, 0)], first_lease)
+        self.assertEqual([(f"{BASE_URL}/careers", 1)], second_lease)
+        self.assertEqual({BASE_URL: links}, coordinator.results)
+        self.assertFalse(await coordinator.is_finished())
+
+    async def test_links_beyond_crawl_depth_are_not_scheduled(self, _: Mock) -> None:
+        # Arrange
+        coordinator = LocalCoordinator(BASE_URL, crawl_depth=1)
+
+        # Act
+        await coordinator.lease("node-1", limit=10)
+        await coordinator.submit("node-1", [(BASE_URL, 0, [f"{BASE_URL}/careers"])])
+
+        # Assert
+        self.assertEqual([], await coordinator.lease("node-1", limit=10))
+        self.assertTrue(await coordinator.is_finished())
+
+    async def test_variant_of_leased_page_releases_lease(self, _: Mock) -> None:
+        # Arrange
+        coordinator = LocalCoordinator(BASE_URL)
+        await coordinator.lease("node-1", limit=10)
+        await coordinator.submit("node-1", [(BASE_URL, 0, [f"{BASE_URL}/docs"])])
+        await coordinator.lease("node-1", limit=10)
+
+        # Act
+        await coordinator.submit("node-1", [(f"{BASE_URL}/docs/", 1, [])])
+
+        # Assert
+        self.assertTrue(await coordinator.is_finished())
+
+    async def test_expired_lease_is_reassigned(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        coordinator = LocalCoordinator(BASE_URL, lease_timeout=10)
+        await coordinator.lease("dead-node", limit=10)
+
+        # Act
+        mock_monotonic.return_value = 4.0
+        before_expiry = await coordinator.lease("node-2", limit=10)
+        mock_monotonic.return_value = 10.0
+        after_expiry = await coordinator.lease("node-2", limit=10)
+
+        # Assert
+        self.assertEqual([], before_expiry)
+        self.assertEqual([(BASE_URL, 0)], after_expiry)
+
+    async def test_idle_node_steals_old_lease(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        coordinator = LocalCoordinator(BASE_URL, lease_timeout=10)
+        await coordinator.lease("slow-node", limit=10)
+
+        # Act
+        mock_monotonic.return_value = 5.0
+        stolen = await coordinator.lease("idle-node", limit=10)
+        await coordinator.submit("idle-node", [(BASE_URL, 0, [])])
+        await coordinator.submit("slow-node", [(BASE_URL, 0, ["late"])])
+
+        # Assert
+        self.assertEqual([(BASE_URL, 0)], stolen)
+        self.assertEqual({BASE_URL: []}, coordinator.results)
+        self.assertTrue(await coordinator.is_finished())
+
+
+@mock.patch("sitemappy.crawler.AsyncScraper.get_links", new_callable=AsyncMock)
+class TestNodeCrawler(unittest.IsolatedAsyncioTestCase):
+    async def test_nodes_share_the_crawl(
+        self, mock_scraper_get_links: AsyncMock
+    ) -> None:
+        # Arrange
+        pages = [f"{BASE_URL}/{index}" for index in range(20)]
+        mock_scraper_get_links.return_value = pages
+
+        coordinator = LocalCoordinator(BASE_URL)
+        nodes = [
+            NodeCrawler(BASE_URL, coordinator, node_id=f"node-{index}")
+            for index in range(2)
+        ]
+
+        # Act
+        node_results = await asyncio.wait_for(
+            asyncio.gather(*(node.crawl() for node in nodes)), timeout=10
+        )
+
+        # Assert
+        crawled = [page for results in node_results for page in results]
+
+        self.assertEqual(len(pages) + 1, len(crawled))
+        self.assertEqual({BASE_URL, *pages}, set(crawled))
+        self.assertEqual(set(crawled), set(coordinator.results))
+
+    async def test_failed_pages_are_submitted(
+        self, mock_scraper_get_links: AsyncMock
+    ) -> None:
+        # Arrange
+        broken_url = f"{BASE_URL}/broken"
+
+        def get_links(url: str) -> list[str]:
+            if url == broken_url:
+                raise ValueError("Undecodable page")
+            return [broken_url]
+
+        mock_scraper_get_links.side_effect = get_links
+
+        coordinator = LocalCoordinator(BASE_URL)
+        node = NodeCrawler(BASE_URL, coordinator)
+
+        # Act
+        results = await asyncio.wait_for(node.crawl(), timeout=10)
+
+        # Assert
+        self.assertEqual([BASE_URL], list(results))
+        self.assertEqual([broken_url], list(node.failures))
+        self.assertEqual({BASE_URL: [broken_url], broken_url: []}, coordinator.results)
+
+    async def test_slow_page_does_not_hold_up_node(
+        self, mock_scraper_get_links: AsyncMock
+    ) -> None:
+        # Arrange
+        slow_url = f"{BASE_URL}/slow"
+        pages = [f"{BASE_URL}/{index}" for index in range(6)]
+        others_crawled = asyncio.Event()
+        crawled: list[str] = []
+
+        async def get_links(url: str) -> list[str]:
+            if url == slow_url:
+                await others_crawled.wait()
+                return []
+
+            crawled.append(url)
+            if len(crawled) == len(pages) + 1:
+                others_crawled.set()
+
+            return [slow_url, *pages] if url == BASE_URL else []
+
+        mock_scraper_get_links.side_effect = get_links
+
+        coordinator = LocalCoordinator(BASE_URL)
+        node = NodeCrawler(BASE_URL, coordinator, number_of_workers=2)
+
+        # Act
+        results = await asyncio.wait_for(node.crawl(), timeout=10)
+
+        # Assert - The other pages are crawled while the slow page waits on them
+        self.assertEqual({BASE_URL, slow_url, *pages}, set(results))
+
+    async def test_node_over_tcp(self, mock_scraper_get_links: AsyncMock) -> None:
+        # Arrange
+        pages = [f"{BASE_URL}/{index}" for index in range(5)]
+        mock_scraper_get_links.return_value = pages
+
+        server = CoordinatorServer(LocalCoordinator(BASE_URL))
+        serving = asyncio.create_task(server.serve("127.0.0.1", 0))
+
+        while server.port is None:
+            await asyncio.sleep(0.01)
+
+        node = NodeCrawler(BASE_URL, RemoteCoordinator("127.0.0.1", server.port))
+
+        # Act
+        node_results = await asyncio.wait_for(node.crawl(), timeout=10)
+        server_results = await asyncio.wait_for(serving, timeout=10)
+
+        # Assert
+        self.assertEqual({BASE_URL, *pages}, set(node_results))
+        self.assertEqual(node_results, server_results)
+
+    async def test_malformed_message_is_answered_with_error(self, _: AsyncMock) -> None:
+        # Arrange
+        server = CoordinatorServer(LocalCoordinator(BASE_URL))
+        serving = asyncio.create_task(server.serve("127.0.0.1", 0))
+
+        while server.port is None:
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+        # Act
+        responses = []
+        with redirect_stderr(io.StringIO()) as stderr:
+            for message in [
+                b"{not json\n",
+                b'{"op": "lease"}\n',
+                b'{"op": "status"}\n',
+            ]:
+                writer.write(message)
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+
+        # Assert - The connection stays open for the messages after
+        self.assertIn("error", responses[0])
+        self.assertIn("error", responses[1])
+        self.assertEqual(1, responses[2]["queued"])
+        self.assertEqual(2, stderr.getvalue().count("Malformed message"))
+
+        writer.close()
+        await writer.wait_closed()
+        serving.cancel()
+
+    async def test_unknown_operation_raises(self, _: AsyncMock) -> None:
+        # Arrange
+        server = CoordinatorServer(LocalCoordinator(BASE_URL))
+        serving = asyncio.create_task(server.serve("127.0.0.1", 0))
+
+        while server.port is None:
+            await asyncio.sleep(0.01)
+
+        remote = RemoteCoordinator("127.0.0.1", server.port)
+
+        # Act / Assert
+        with self.assertRaises(RuntimeError):
+            await remote._request({"op": "unknown"})
+
+        await remote.close()
+        serving.cancel()
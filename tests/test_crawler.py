@@ -1,20 +1,67 @@
+import asyncio
+import gzip
+import io
+import json
+import os
+import pstats
+import tempfile
 import unittest
+from http import HTTPStatus
 from unittest import mock
 from unittest.mock import AsyncMock, Mock, call, patch
+from xml.etree import ElementTree
 
+import httpx
 from parameterized import parameterized
 
+from sitemappy.checkpoint import CRAWLED, ENQUEUED, CrawlJournal
+from sitemappy.crawl_options import (
+    AdaptiveConcurrencyOptions,
+    CheckpointOptions,
+    ConnectionOptions,
+    DedupOptions,
+    FrontierOptions,
+    MonitoringOptions,
+    OutputOptions,
+    PolitenessOptions,
+)
 from sitemappy.crawler import (
     DEFAULT_NUMBER_OF_WORKERS,
     POLITENESS_DELAY_DEFAULT_S,
     UNLIMITED_DEPTH,
     Crawler,
 )
+from sitemappy.frontier import FrontierBackend, FrontierStrategy
+from sitemappy.profiling import ProfileMode
+from sitemappy.redirects import RedirectCache
+from sitemappy.retry import CircuitBreaker, RetryableResponseError, RetryPolicy
+from sitemappy.robots import RobotsCache
+from sitemappy.seen import SeenSetBackend
+from sitemappy.sinks import SITEMAP_NAMESPACE, NdjsonSink, SitemapXmlSink
+
+LOC = f"{{{SITEMAP_NAMESPACE}}}loc"
+
+
+def robots_cache(robots_txt: str) -> RobotsCache:
+    """
+    Cache serving robots.txt from a mock transport, rather than the network.
+    """
+    transport = httpx.MockTransport(
+        lambda _: httpx.Response(HTTPStatus.OK, text=robots_txt)
+    )
+
+    return RobotsCache(httpx.AsyncClient(transport=transport))
 
 
 @mock.patch("sitemappy.crawler.AsyncScraper.get_links", new_callable=AsyncMock)
-@patch("sitemappy.crawler.time.sleep")
+@patch("sitemappy.politeness.asyncio.sleep", new_callable=AsyncMock)
 class TestCrawler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        journal_file = tempfile.NamedTemporaryFile(suffix=".ndjson", delete=False)
+        journal_file.close()
+        self.journal = journal_file.name
+        self.addCleanup(os.remove, self.journal)
+
     @parameterized.expand(  # type: ignore[misc]
         [
             # Base URL, Links to Return
@@ -27,7 +74,7 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
     )
     async def test_base_url_crawl_links(
         self,
-        mock_sleep: Mock,
+        mock_sleep: AsyncMock,
         mock_scraper_get_links: AsyncMock,
         base_url: str,
         links_to_return: list[str],
@@ -50,11 +97,11 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(POLITENESS_DELAY_DEFAULT_S, crawler.politeness_delay)
 
         mock_scraper_get_links.assert_called_once()
-        self.assertDictEqual(expected, results)
+        self.assertDictEqual(expected, results.to_dict())
 
     async def test_base_url_with_relative_links(
         self,
-        _: Mock,
+        _: AsyncMock,
         mock_scraper_get_links: AsyncMock,
     ) -> None:
         # Arrange
@@ -79,11 +126,256 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
         mock_scraper_get_links.assert_has_calls(
             [call(base_url), call(second_crawl_url)]
         )
-        self.assertDictEqual(expected, results)
+        self.assertDictEqual(expected, results.to_dict())
+
+    async def test_url_variants_are_only_enqueued_once(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        second_crawl_url = f"{base_url}/test?a=1&b=2"
+
+        base_url_links = [
+            f"{base_url}/",
+            f"{base_url}#careers",
+            second_crawl_url,
+            "https://MONZO.com:443/test/?b=2&a=1#section",
+            f"{base_url}/test?b=2&a=1",
+        ]
+
+        expected = {
+            base_url: base_url_links,
+            second_crawl_url: base_url_links,
+        }
+
+        mock_scraper_get_links.return_value = base_url_links
+        crawler = Crawler(base_url)
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        mock_scraper_get_links.assert_has_calls(
+            [call(base_url), call(second_crawl_url)]
+        )
+        self.assertEqual(2, mock_scraper_get_links.await_count)
+        self.assertDictEqual(expected, results.to_dict())
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (FrontierBackend.DISK, SeenSetBackend.EXACT),
+            (FrontierBackend.MEMORY, SeenSetBackend.FINGERPRINT),
+            (FrontierBackend.DISK, SeenSetBackend.BLOOM),
+        ]
+    )
+    async def test_frontier_and_seen_set_backends(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+        frontier: FrontierBackend,
+        seen_set: SeenSetBackend,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        pages = [f"{base_url}/{index}" for index in range(50)]
+
+        mock_scraper_get_links.return_value = pages
+        crawler = Crawler(
+            base_url,
+            frontier=FrontierOptions(frontier, memory_limit=5, seen_set=seen_set),
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual(len(pages) + 1, mock_scraper_get_links.await_count)
+        self.assertEqual({base_url, *pages}, set(results))
+
+    @patch("sitemappy.crawler.create_parse_executor")
+    async def test_parse_executor_created_and_shut_down(
+        self,
+        mock_create_parse_executor: Mock,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        parse_workers = 4
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.return_value = []
+        crawler = Crawler(base_url, parse_workers=parse_workers)
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        mock_create_parse_executor.assert_called_once_with(parse_workers)
+        mock_create_parse_executor.return_value.shutdown.assert_called_once()
+        self.assertIsNone(crawler.scraper.parse_executor)
+
+    async def test_sinks_receive_pages_without_keeping_results(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        links = [f"{base_url}/about", f"{base_url}/careers"]
+        mock_scraper_get_links.side_effect = lambda page: (
+            links if page == base_url else []
+        )
+        sink_file = io.StringIO()
+        crawler = Crawler(
+            base_url,
+            outputs=OutputOptions(
+                sinks=[NdjsonSink(sink_file, batch_size=100)], keep_results=False
+            ),
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertDictEqual({}, results.to_dict())
+        self.assertDictEqual(
+            {base_url: links, links[0]: [], links[1]: []},
+            {
+                page: page_links
+                for line in sink_file.getvalue().splitlines()
+                for page, page_links in json.loads(line).items()
+            },
+        )
+
+    async def test_crawler_owns_http_client(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        mock_scraper_get_links.return_value = []
+        crawler = Crawler("https://monzo.com", number_of_workers=100)
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        self.assertIs(crawler.client, crawler.scraper.client)
+        self.assertTrue(crawler.client.is_closed)
+
+    async def test_checkpoint_journals_crawl(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        links = [f"{base_url}/about", f"{base_url}/careers"]
+        mock_scraper_get_links.side_effect = lambda page: (
+            links if page == base_url else []
+        )
+        crawler = Crawler(base_url, checkpoint=CheckpointOptions(self.journal))
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        events = list(CrawlJournal.replay(self.journal))
+        self.assertEqual(
+            [base_url, *links],
+            [event[ENQUEUED] for event in events if ENQUEUED in event],
+        )
+        self.assertEqual(
+            results,
+            {event[CRAWLED]: event["links"] for event in events if CRAWLED in event},
+        )
+
+    async def test_resume_only_crawls_pending_pages(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        about_url = f"{base_url}/about"
+        careers_url = f"{base_url}/careers"
+
+        # A crawl interrupted after crawling the base URL and about page
+        journal = CrawlJournal(self.journal)
+        journal.record_enqueued(base_url, 0)
+        journal.record_crawled(base_url, [about_url, careers_url])
+        journal.record_enqueued(about_url, 1)
+        journal.record_enqueued(careers_url, 1)
+        journal.record_crawled(about_url, [base_url])
+        journal.close()
+
+        mock_scraper_get_links.return_value = [base_url, about_url]
+        crawler = Crawler(
+            base_url, checkpoint=CheckpointOptions(self.journal, resume=True)
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        mock_scraper_get_links.assert_awaited_once_with(careers_url)
+        self.assertDictEqual(
+            {
+                base_url: [about_url, careers_url],
+                about_url: [base_url],
+                careers_url: [base_url, about_url],
+            },
+            results.to_dict(),
+        )
+
+        # The resumed crawl is appended to the same journal
+        crawled = [
+            event[CRAWLED]
+            for event in CrawlJournal.replay(self.journal)
+            if CRAWLED in event
+        ]
+        self.assertEqual([base_url, about_url, careers_url], crawled)
+
+    async def test_resume_counts_redirect_as_one_page(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        old_url = f"{base_url}/old"
+        new_url = f"{base_url}/new"
+        careers_url = f"{base_url}/careers"
+
+        # A crawl interrupted after one fetch of the base URL and one of a page
+        # redirecting to another
+        journal = CrawlJournal(self.journal)
+        journal.record_enqueued(base_url, 0)
+        journal.record_crawled(base_url, [old_url, careers_url])
+        journal.record_enqueued(old_url, 1)
+        journal.record_enqueued(careers_url, 1)
+        journal.record_crawled(old_url, [new_url], listed=False)
+        journal.record_enqueued(new_url, 1)
+        journal.record_crawled(new_url, [], redirect_target=True)
+        journal.close()
+
+        mock_scraper_get_links.return_value = []
+        crawler = Crawler(
+            base_url,
+            max_pages=3,
+            checkpoint=CheckpointOptions(self.journal, resume=True),
+        )
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        mock_scraper_get_links.assert_awaited_once_with(careers_url)
 
     async def test_crawl_depth_less_than_one(
         self,
-        _: Mock,
+        _: AsyncMock,
         mock_scraper_get_links: AsyncMock,
     ) -> None:
         # Arrange
@@ -108,11 +400,11 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
         mock_scraper_get_links.assert_has_calls(
             [call(base_url), call(second_crawl_url)]
         )
-        self.assertDictEqual(expected, results)
+        self.assertDictEqual(expected, results.to_dict())
 
     async def test_crawl_depth_one_only_crawls_single_page(
         self,
-        _: Mock,
+        _: AsyncMock,
         mock_scraper_get_links: AsyncMock,
     ) -> None:
         # Arrange
@@ -136,11 +428,485 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
         # Assert
         # Only called once due to depth set to 1
         mock_scraper_get_links.assert_has_calls([call(base_url)])
-        self.assertDictEqual(expected, results)
+        self.assertDictEqual(expected, results.to_dict())
+
+    async def test_out_of_depth_links_are_never_enqueued(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.return_value = [f"{base_url}/careers"]
+        crawler = Crawler(
+            base_url, crawl_depth=1, checkpoint=CheckpointOptions(self.journal)
+        )
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        self.assertEqual(
+            [base_url],
+            [
+                event[ENQUEUED]
+                for event in CrawlJournal.replay(self.journal)
+                if ENQUEUED in event
+            ],
+        )
+
+    async def test_max_pages_crawls_shallowest_pages_first(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        base_url_links = [
+            f"{base_url}/blog/2024/post",
+            f"{base_url}/about",
+            f"{base_url}/blog/2023",
+            f"{base_url}/careers",
+        ]
+
+        mock_scraper_get_links.side_effect = lambda url: (
+            base_url_links if url == base_url else []
+        )
+        crawler = Crawler(
+            base_url,
+            number_of_workers=1,
+            max_pages=3,
+            frontier=FrontierOptions(strategy=FrontierStrategy.SHALLOW_FIRST),
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        mock_scraper_get_links.assert_has_calls(
+            [call(base_url), call(f"{base_url}/about"), call(f"{base_url}/careers")]
+        )
+        self.assertEqual(3, mock_scraper_get_links.await_count)
+        self.assertEqual(
+            [base_url, f"{base_url}/about", f"{base_url}/careers"], list(results)
+        )
+
+    async def test_adaptive_concurrency_starts_max_workers(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        pages = [f"{base_url}/page-{index}" for index in range(10)]
+
+        mock_scraper_get_links.side_effect = lambda url: (
+            pages if url == base_url else []
+        )
+        crawler = Crawler(
+            base_url,
+            number_of_workers=2,
+            adaptive_concurrency=AdaptiveConcurrencyOptions(
+                min_workers=1, max_workers=4
+            ),
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual(4, crawler.worker_count)
+        self.assertEqual(2, crawler.concurrency_limit)
+        self.assertIs(crawler.concurrency, crawler.scraper.observer)
+        self.assertEqual({base_url, *pages}, set(results))
+
+    async def test_failed_pages_are_recorded_without_stalling_crawl(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        broken_url = f"{base_url}/broken"
+        about_url = f"{base_url}/about"
+
+        def get_links(url: str) -> list[str]:
+            if url == broken_url:
+                raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+            return [broken_url, about_url] if url == base_url else []
+
+        mock_scraper_get_links.side_effect = get_links
+        crawler = Crawler(
+            base_url,
+            number_of_workers=1,
+            outputs=OutputOptions(failures_output=self.journal),
+        )
+
+        # Act
+        results = await asyncio.wait_for(crawler.crawl(), timeout=5)
+
+        # Assert
+        self.assertEqual([base_url, about_url], list(results))
+        self.assertEqual([broken_url], list(crawler.failures))
+        self.assertTrue(crawler.failures[broken_url].startswith("UnicodeDecodeError"))
+        # Failures that are not temporary are not retried
+        self.assertEqual(3, mock_scraper_get_links.await_count)
+        with open(self.journal) as failures_file:
+            self.assertEqual(crawler.failures, json.load(failures_file))
+
+    async def test_temporary_failures_are_retried(
+        self,
+        mock_sleep: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.side_effect = [
+            httpx.ConnectError("Connection refused"),
+            RetryableResponseError(HTTPStatus.TOO_MANY_REQUESTS, retry_after=7.0),
+            [],
+        ]
+        crawler = Crawler(base_url, politeness=PolitenessOptions(max_retries=2))
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual({base_url: []}, results.to_dict())
+        self.assertEqual({}, crawler.failures)
+        self.assertEqual(3, mock_scraper_get_links.await_count)
+        # Backoff is jittered, but Retry-After is waited for exactly
+        self.assertEqual(2, mock_sleep.await_count)
+        self.assertEqual(call(7.0), mock_sleep.await_args_list[1])
+
+    async def test_retries_are_bounded(
+        self,
+        mock_sleep: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.side_effect = RetryableResponseError(
+            HTTPStatus.SERVICE_UNAVAILABLE
+        )
+        crawler = Crawler(base_url, politeness=PolitenessOptions(max_retries=3))
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual({}, results.to_dict())
+        self.assertEqual(
+            {base_url: "RetryableResponseError: HTTP 503"}, crawler.failures
+        )
+        self.assertEqual(4, mock_scraper_get_links.await_count)
+        self.assertEqual(3, mock_sleep.await_count)
+
+    async def test_page_timeout_fails_page(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        hung = asyncio.Event()
+
+        async def get_links(_: str) -> list[str]:
+            await hung.wait()
+            return []
+
+        mock_scraper_get_links.side_effect = get_links
+        crawler = Crawler(
+            base_url,
+            connection=ConnectionOptions(page_timeout=0.01),
+            politeness=PolitenessOptions(max_retries=0),
+        )
+
+        # Act
+        await asyncio.wait_for(crawler.crawl(), timeout=5)
+
+        # Assert
+        self.assertEqual([base_url], list(crawler.failures))
+        self.assertTrue(crawler.failures[base_url].startswith("TimeoutError"))
+
+    async def test_circuit_breaker_stops_requesting_down_host(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        pages = [f"{base_url}/page-{index}" for index in range(8)]
+
+        def get_links(url: str) -> list[str]:
+            if url == base_url:
+                return pages
+            raise httpx.ConnectError("Connection refused")
+
+        mock_scraper_get_links.side_effect = get_links
+        crawler = Crawler(
+            base_url, number_of_workers=1, politeness=PolitenessOptions(max_retries=0)
+        )
+        crawler.circuit_breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=0, max_trials=3
+        )
+
+        # Act
+        await crawler.crawl()
+
+        # Assert - Two failures open the circuit, then three trials fail
+        self.assertEqual(set(pages), set(crawler.failures))
+        self.assertEqual(6, mock_scraper_get_links.await_count)
+        self.assertTrue(crawler.failures[pages[4]].startswith("ConnectError"))
+        self.assertTrue(crawler.failures[pages[5]].startswith("CircuitOpenError"))
+
+    async def test_robots_txt_disallowed_links_are_not_crawled(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        about_url = f"{base_url}/about"
+        private_url = f"{base_url}/private/page"
+
+        mock_scraper_get_links.side_effect = lambda url: (
+            [about_url, private_url] if url == base_url else []
+        )
+        crawler = Crawler(base_url, politeness=PolitenessOptions(respect_robots=True))
+        crawler.robots = robots_cache("User-agent: *\nDisallow: /private\n")
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual([base_url, about_url], list(results))
+        self.assertEqual(2, mock_scraper_get_links.await_count)
+        self.assertEqual({}, crawler.failures)
+
+    async def test_robots_txt_disallowed_base_url_is_a_failure(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        crawler = Crawler(base_url, politeness=PolitenessOptions(respect_robots=True))
+        crawler.robots = robots_cache("User-agent: *\nDisallow: /\n")
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual({}, results.to_dict())
+        mock_scraper_get_links.assert_not_awaited()
+        self.assertEqual(
+            {base_url: "RobotsDisallowedError: Disallowed by robots.txt"},
+            crawler.failures,
+        )
+
+    async def test_pages_listed_in_sitemaps_are_crawled(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        about_url = f"{base_url}/about"
+        orphan_url = f"{base_url}/orphan"
+        sitemap = (
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<url><loc>{about_url}</loc></url><url><loc>{orphan_url}</loc></url>"
+            "</urlset>"
+        )
+        responses = {
+            f"{base_url}/robots.txt": f"Sitemap: {base_url}/sitemap.xml\n",
+            f"{base_url}/sitemap.xml": sitemap,
+        }
+
+        mock_scraper_get_links.side_effect = lambda url: (
+            [about_url] if url == base_url else []
+        )
+        crawler = Crawler(base_url, seed_sitemaps=True)
+        crawler.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    HTTPStatus.OK, text=responses[str(request.url)]
+                )
+            )
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual({base_url, about_url, orphan_url}, set(results))
+        self.assertEqual(3, mock_scraper_get_links.await_count)
+        self.assertEqual({}, crawler.failures)
+
+    async def test_spider_trap_links_are_not_crawled(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+
+        # Every day of an endless calendar links to the next
+        mock_scraper_get_links.side_effect = lambda url: [
+            f"{base_url}/calendar?day={int(url.partition('=')[2] or 0) + 1}"
+        ]
+        crawler = Crawler(
+            base_url,
+            dedup=DedupOptions(avoid_spider_traps=True, max_urls_per_template=5),
+        )
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual(6, len(results))
+        self.assertEqual(6, mock_scraper_get_links.await_count)
+        self.assertEqual(
+            {
+                f"{base_url}/calendar?day": (
+                    "Too many URLs sharing the template: 1 links suppressed"
+                )
+            },
+            crawler.failures,
+        )
+
+    async def test_crawl_metrics_are_recorded(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        about_url = f"{base_url}/about"
+        down_url = f"{base_url}/down"
+
+        async def get_links(url: str) -> list[str]:
+            if url == down_url:
+                raise ValueError("Not HTML")
+            return [about_url, down_url] if url == base_url else []
+
+        mock_scraper_get_links.side_effect = get_links
+        crawler = Crawler(base_url, outputs=OutputOptions(metrics_output=self.journal))
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        self.assertEqual(2, crawler.metrics.pages_crawled)
+        self.assertEqual(1, crawler.metrics.pages_failed)
+        self.assertEqual(2, crawler.metrics.enqueue.count)
+        self.assertEqual(0, crawler.metrics.active_workers)
+        with open(self.journal) as metrics_file:
+            summary = json.load(metrics_file)
+        self.assertEqual(2, summary["pages_crawled"])
+        self.assertEqual(0, summary["queue_depth"])
+        self.assertEqual(DEFAULT_NUMBER_OF_WORKERS, summary["workers"])
+
+    async def test_redirects_are_recorded_as_links(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        old_url = f"{base_url}/old"
+        moved_url = f"{base_url}/moved"
+        new_url = f"{base_url}/new"
+        community_url = f"{base_url}/community"
+        external_url = "https://community.monzo.com/"
+        careers_url = f"{base_url}/careers"
+        redirects = RedirectCache()
+        crawler = Crawler(base_url)
+        crawler.redirects = crawler.scraper.redirects = redirects
+
+        # The scraper follows redirects, recording each hop
+        async def get_links(url: str) -> list[str]:
+            if url == base_url:
+                return [old_url, community_url]
+            if url == old_url:
+                redirects.record(old_url, moved_url)
+                redirects.record(moved_url, new_url)
+                return [careers_url]
+            if url == community_url:
+                redirects.record(community_url, external_url)
+                return []
+            return [moved_url, new_url]
+
+        mock_scraper_get_links.side_effect = get_links
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual(
+            {
+                base_url: [old_url, community_url],
+                old_url: [new_url],
+                new_url: [careers_url],
+                community_url: [external_url],
+                careers_url: [moved_url, new_url],
+            },
+            results,
+        )
+        self.assertEqual(
+            [call(base_url), call(old_url), call(community_url), call(careers_url)],
+            mock_scraper_get_links.await_args_list,
+        )
+
+    async def test_redirects_are_not_followed(
+        self,
+        _: AsyncMock,
+        __: AsyncMock,
+    ) -> None:
+        # Act
+        crawler = Crawler("https://monzo.com", follow_redirects=False)
+
+        # Assert
+        self.assertIsNone(crawler.redirects)
+        self.assertIsNone(crawler.scraper.redirects)
+
+    async def test_crawl_is_profiled(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.side_effect = lambda url: (
+            [f"{base_url}/about"] if url == base_url else []
+        )
+        crawler = Crawler(
+            base_url,
+            monitoring=MonitoringOptions(
+                profile=ProfileMode.CPROFILE, profile_output=self.journal
+            ),
+        )
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        stats = pstats.Stats(self.journal).get_stats_profile()
+        self.assertEqual("2", stats.func_profiles["_crawl_page"].ncalls)
+
+    async def test_profile_without_output(
+        self,
+        _: AsyncMock,
+        __: AsyncMock,
+    ) -> None:
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            MonitoringOptions(profile=ProfileMode.SAMPLING)
 
     async def test_politeness_delay_less_than_one(
         self,
-        mock_sleep: Mock,
+        mock_sleep: AsyncMock,
         mock_scraper_get_links: AsyncMock,
     ) -> None:
         # Arrange
@@ -161,29 +927,251 @@ class TestCrawler(unittest.IsolatedAsyncioTestCase):
         # Assert
         mock_scraper_get_links.assert_has_calls([call(base_url)])
         mock_sleep.assert_not_called()
-        self.assertDictEqual(expected, results)
+        self.assertDictEqual(expected, results.to_dict())
 
-    async def test_politeness_delay_causes_thread_sleep(
+    async def test_politeness_delay_waits_between_requests(
         self,
-        mock_sleep: Mock,
+        mock_sleep: AsyncMock,
         mock_scraper_get_links: AsyncMock,
     ) -> None:
         # Arrange
         politeness_delay = 99
         base_url = "https://monzo.com"
-        base_url_links = ["mailto:careers@monzo.com"]
+        second_crawl_url = f"{base_url}/test"
+
+        base_url_links = [second_crawl_url, "mailto:careers@monzo.com"]
+        subdomain_links = ["+442038720620"]
 
         expected = {
             base_url: base_url_links,
+            second_crawl_url: subdomain_links,
         }
 
-        mock_scraper_get_links.return_value = base_url_links
+        mock_scraper_get_links.side_effect = [base_url_links, subdomain_links]
         crawler = Crawler(base_url, politeness_delay=politeness_delay)
 
         # Act
         results = await crawler.crawl()
 
         # Assert
-        mock_scraper_get_links.assert_has_calls([call(base_url)])
-        mock_sleep.assert_has_calls([call(politeness_delay)])
-        self.assertDictEqual(expected, results)
+        # First request uses the full bucket, the second waits for the delay
+        mock_sleep.assert_awaited_once()
+        self.assertAlmostEqual(
+            politeness_delay, mock_sleep.await_args_list[0].args[0], 0
+        )
+        self.assertEqual(2, crawler.politeness.requests)
+        self.assertDictEqual(expected, results.to_dict())
+
+    async def test_politeness_delay_does_not_block_event_loop(
+        self,
+        _: AsyncMock,
+        mock_scraper_get_links: AsyncMock,
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        mock_scraper_get_links.return_value = []
+        crawler = Crawler(base_url, politeness_delay=99)
+
+        # Act
+        with patch("time.sleep") as mock_time_sleep:
+            await crawler.crawl()
+
+        # Assert
+        mock_time_sleep.assert_not_called()
+
+
+def serve_site(
+    crawler: Crawler, pages: dict[str, httpx.Response], requested: list[str]
+) -> None:
+    """
+    Serve the crawler's requests from the pages of a site, by path, rather than
+    the network, recording each path requested.
+    """
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return pages.get(request.url.path, httpx.Response(HTTPStatus.NOT_FOUND))
+
+    crawler.client = crawler.scraper.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(respond)
+    )
+
+    if crawler.robots:
+        crawler.robots.client = crawler.client
+
+
+class TestCrawlerSite(unittest.IsolatedAsyncioTestCase):
+    @parameterized.expand([(True,), (False,)])  # type: ignore[misc]
+    async def test_trailing_slash_links_are_requested_as_found(
+        self, follow_redirects: bool
+    ) -> None:
+        # Arrange
+        base_url = "https://monzo.com/"
+        pages = {
+            "/": httpx.Response(HTTPStatus.OK, html="<a href='/docs/'>Docs</a>"),
+            "/docs": httpx.Response(
+                HTTPStatus.MOVED_PERMANENTLY, headers={"Location": "/docs/"}
+            ),
+            "/docs/": httpx.Response(
+                HTTPStatus.OK,
+                html="<a href='/docs/guide/'>Guide</a><a href='/docs'>Docs</a>",
+            ),
+            "/docs/guide/": httpx.Response(HTTPStatus.OK, html="<p>Guide</p>"),
+        }
+        requested: list[str] = []
+        crawler = Crawler(base_url, follow_redirects=follow_redirects)
+        serve_site(crawler, pages, requested)
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual(["/", "/docs/", "/docs/guide/"], requested)
+        self.assertEqual(
+            {
+                base_url: ["https://monzo.com/docs/"],
+                "https://monzo.com/docs/": [
+                    "https://monzo.com/docs/guide/",
+                    "https://monzo.com/docs",
+                ],
+                "https://monzo.com/docs/guide/": [],
+            },
+            results.to_dict(),
+        )
+        self.assertEqual({}, crawler.failures)
+
+    async def test_only_pages_served_as_html_are_listed(self) -> None:
+        # Arrange
+        base_url = "https://monzo.com/"
+        pages = {
+            "/": httpx.Response(
+                HTTPStatus.OK,
+                html="<a href='/about'>About</a><a href='/old'>Old</a>"
+                "<a href='/missing'>Missing</a><a href='/feed'>Feed</a>"
+                "<a href='/terms.pdf'>Terms</a>",
+            ),
+            "/about": httpx.Response(HTTPStatus.OK, html="<p>About</p>"),
+            "/old": httpx.Response(
+                HTTPStatus.MOVED_PERMANENTLY, headers={"Location": "/new"}
+            ),
+            "/new": httpx.Response(HTTPStatus.OK, html="<p>New</p>"),
+            "/missing": httpx.Response(HTTPStatus.NOT_FOUND, html="<p>Missing</p>"),
+            "/feed": httpx.Response(HTTPStatus.OK, json=[]),
+        }
+        sink = Mock()
+        crawler = Crawler(base_url, outputs=OutputOptions(sinks=[sink]))
+        serve_site(crawler, pages, [])
+
+        # Act
+        await crawler.crawl()
+
+        # Assert
+        listed = {write.args[0] for write in sink.write.call_args_list if write.args[2]}
+        self.assertEqual(
+            {base_url, "https://monzo.com/about", "https://monzo.com/new"}, listed
+        )
+        self.assertEqual(7, sink.write.call_count)
+        self.assertEqual(set(), crawler.scraper.unlisted)
+
+    async def test_pages_redirected_to_are_listed(self) -> None:
+        # Arrange
+        base_url = "https://monzo.com/"
+        pages = {
+            "/": httpx.Response(
+                HTTPStatus.OK,
+                html="<a href='/docs'>Docs</a><a href='/start'>Start</a>",
+            ),
+            "/docs": httpx.Response(
+                HTTPStatus.MOVED_PERMANENTLY, headers={"Location": "/docs/"}
+            ),
+            "/docs/": httpx.Response(HTTPStatus.OK, html="<p>Docs</p>"),
+            "/start": httpx.Response(HTTPStatus.FOUND, headers={"Location": "/middle"}),
+            "/middle": httpx.Response(HTTPStatus.FOUND, headers={"Location": "/end"}),
+            "/end": httpx.Response(HTTPStatus.OK, html="<p>End</p>"),
+        }
+        output_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(output_directory.cleanup)
+        sink = SitemapXmlSink(
+            os.path.join(output_directory.name, "sitemap.xml"), base_url
+        )
+        crawler = Crawler(base_url, outputs=OutputOptions(sinks=[sink]))
+        serve_site(crawler, pages, [])
+
+        # Act
+        await crawler.crawl()
+        sink.close()
+
+        # Assert
+        with gzip.open(sink.urlset_paths[0], "rb") as urlset_file:
+            # Only parses sitemaps written by the test
+            urlset = ElementTree.parse(urlset_file).getroot()  # noqa: S314
+        self.assertEqual(
+            [base_url, "https://monzo.com/docs/", "https://monzo.com/end"],
+            sorted(location.text or "" for location in urlset.iter(LOC)),
+        )
+        self.assertEqual(set(), crawler.scraper.unlisted)
+
+    async def test_robots_txt_is_checked_against_requested_urls(self) -> None:
+        # Arrange
+        base_url = "https://monzo.com/"
+        pages = {
+            "/robots.txt": httpx.Response(
+                HTTPStatus.OK, text="User-agent: *\nDisallow: /admin/\n"
+            ),
+            "/": httpx.Response(
+                HTTPStatus.OK,
+                html="<a href='/admin/'>Admin</a><a href='/admin'>Admin</a>",
+            ),
+            "/admin": httpx.Response(
+                HTTPStatus.MOVED_PERMANENTLY, headers={"Location": "/admin/"}
+            ),
+            "/admin/": httpx.Response(HTTPStatus.OK, html="<p>Admin</p>"),
+        }
+        requested: list[str] = []
+        crawler = Crawler(base_url, politeness=PolitenessOptions(respect_robots=True))
+        serve_site(crawler, pages, requested)
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert - The redirect to the disallowed page is not followed
+        self.assertEqual(["/robots.txt", "/", "/admin"], requested)
+        self.assertEqual(
+            {
+                base_url: ["https://monzo.com/admin/", "https://monzo.com/admin"],
+                "https://monzo.com/admin": ["https://monzo.com/admin/"],
+            },
+            results.to_dict(),
+        )
+
+    async def test_pages_wait_out_a_short_outage(self) -> None:
+        # Arrange
+        base_url = "https://monzo.com/"
+        paths = [f"/page-{index}" for index in range(20)]
+        anchors = "".join(f"<a href='{path}'>Page</a>" for path in paths)
+        outage = {"responses": 5}
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/":
+                return httpx.Response(HTTPStatus.OK, html=anchors)
+
+            # The site answers 503 to a burst of requests, then recovers
+            if outage["responses"]:
+                outage["responses"] -= 1
+                return httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE)
+
+            return httpx.Response(HTTPStatus.OK, html="<p>Page</p>")
+
+        crawler = Crawler(base_url, number_of_workers=5)
+        crawler.client = crawler.scraper.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(respond)
+        )
+        crawler.retry_policy = RetryPolicy(backoff_base=0.05)
+        crawler.circuit_breaker = CircuitBreaker(reset_timeout=0.1)
+
+        # Act
+        results = await crawler.crawl()
+
+        # Assert
+        self.assertEqual({}, crawler.failures)
+        self.assertEqual(len(paths) + 1, len(results))
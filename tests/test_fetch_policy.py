@@ -0,0 +1,73 @@
+import unittest
+from http import HTTPStatus
+
+import httpx
+from parameterized import parameterized
+
+from sitemappy.fetch_policy import FetchPolicy, SkippedPageError
+
+
+class TestFetchPolicy(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("https://monzo.com/",),
+            ("https://monzo.com/about",),
+            ("https://monzo.com/about.html",),
+            ("https://monzo.com/blog/v1.2",),
+            ("https://monzo.com/download?file=statement.pdf",),
+        ]
+    )
+    def test_pages_are_requested(self, url: str) -> None:
+        # Act / Assert
+        self.assertTrue(FetchPolicy().should_request(url))
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("https://monzo.com/statement.pdf",),
+            ("https://monzo.com/images/LOGO.PNG",),
+            ("https://monzo.com/video.mp4?autoplay=1",),
+            ("https://monzo.com/static/app.js#main",),
+        ]
+    )
+    def test_assets_are_not_requested(self, url: str) -> None:
+        # Act / Assert
+        self.assertFalse(FetchPolicy().should_request(url))
+        self.assertTrue(FetchPolicy(skip_assets=False).should_request(url))
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ({},),
+            ({"Content-Type": "text/html; charset=utf-8"},),
+            ({"Content-Type": "application/xhtml+xml", "Content-Length": "100"},),
+        ]
+    )
+    def test_html_headers_are_downloaded(self, headers: dict[str, str]) -> None:
+        # Arrange
+        response = httpx.Response(HTTPStatus.OK, headers=headers)
+
+        # Act / Assert
+        FetchPolicy(max_page_bytes=100).check_headers(response)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ({"Content-Type": "application/pdf"},),
+            ({"Content-Type": "image/png"},),
+            ({"Content-Type": "text/html", "Content-Length": "101"},),
+        ]
+    )
+    def test_skipped_headers(self, headers: dict[str, str]) -> None:
+        # Arrange
+        response = httpx.Response(HTTPStatus.OK, headers=headers)
+
+        # Act / Assert
+        with self.assertRaises(SkippedPageError):
+            FetchPolicy(max_page_bytes=100).check_headers(response)
+
+    def test_check_size(self) -> None:
+        # Arrange
+        fetch_policy = FetchPolicy(max_page_bytes=100)
+
+        # Act / Assert
+        fetch_policy.check_size(100)
+        with self.assertRaises(SkippedPageError):
+            fetch_policy.check_size(101)
@@ -0,0 +1,208 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from sitemappy.fingerprints import (
+    DuplicateIndex,
+    hamming_distance,
+    simhash,
+)
+
+BASE_URL = "https://monzo.com"
+
+WORDS = [f"word{index:04}" for index in range(400)]
+
+
+def page(*words: str) -> bytes:
+    paragraphs = "".join(f"<p>{word}</p>" for word in words)
+    return f"<html><body>{paragraphs}</body></html>".encode()
+
+
+def template_page(article: list[str], links: list[str]) -> bytes:
+    navigation = "".join(
+        f"<li class='nav-item dropdown'><a class='nav-link text-muted' "
+        f"data-track='menu-{section}' href='/{section}'>{section}</a></li>"
+        for section in ("about", "blog", "careers", "help", "legal", "press")
+    )
+    anchors = "".join(f"<a class='card' href='{link}'>Read more</a>" for link in links)
+    script = ", ".join(f"handler{index}: null" for index in range(150))
+
+    return (
+        "<html><head><style>.nav-item { display: inline-block; }</style>"
+        f"<script>window.analytics = {{ {script} }};</script></head>"
+        f"<body><nav><ul class='navigation'>{navigation}</ul></nav>"
+        f"<main><article><p>{' '.join(article)}</p>{anchors}</article></main>"
+        f"<footer><p>{' '.join(WORDS[:10])}</p></footer></body></html>"
+    ).encode()
+
+
+class TestSimhash(unittest.TestCase):
+    def test_same_words_give_the_same_fingerprint(self) -> None:
+        # Arrange
+        content = page(*WORDS)
+        reordered = page(*reversed(WORDS), *WORDS[:10])
+
+        # Act / Assert
+        self.assertEqual(simhash(content), simhash(reordered))
+
+    def test_different_words_give_distant_fingerprints(self) -> None:
+        # Arrange
+        other_words = [f"other{index:04}" for index in range(400)]
+
+        # Act
+        fingerprint = simhash(page(*WORDS))
+        other = simhash(page(*other_words))
+
+        # Assert
+        self.assertLess(8, hamming_distance(fingerprint or 0, other or 0))
+
+    def test_fingerprint_is_the_same_in_every_process(self) -> None:
+        # Arrange - Each process salts the builtin hash differently
+        script = (
+            "from sitemappy.fingerprints import simhash; "
+            f"print(simhash({page(*WORDS)!r}))"
+        )
+
+        # Act
+        fingerprints = {
+            subprocess.run(  # noqa: S603 - Runs this interpreter on a fixed script
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+            for seed in ("1", "2")
+        }
+
+        # Assert
+        self.assertEqual({str(simhash(page(*WORDS)))}, fingerprints)
+
+    def test_page_with_few_words_has_no_fingerprint(self) -> None:
+        # Act / Assert
+        self.assertIsNone(simhash(page("Not", "found")))
+
+    def test_large_page_is_sampled(self) -> None:
+        # Arrange
+        words = [f"word{index:05}" for index in range(5000)]
+
+        # Act / Assert
+        self.assertIsNotNone(simhash(page(*words)))
+
+
+class TestDuplicateIndex(unittest.TestCase):
+    def test_exact_duplicate(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+
+        # Act
+        original = index.find_duplicate(f"{BASE_URL}/about", page("About"))
+        duplicate = index.find_duplicate(f"{BASE_URL}/about?utm=x", page("About"))
+
+        # Assert
+        self.assertIsNone(original)
+        self.assertEqual(f"{BASE_URL}/about", duplicate)
+        self.assertEqual(
+            {f"{BASE_URL}/about?utm=x": f"{BASE_URL}/about"}, index.duplicates
+        )
+
+    def test_near_duplicate(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+        index.find_duplicate(f"{BASE_URL}/blog", page(*WORDS))
+
+        # Act - The printer view repeats words, without the page's layout
+        duplicate = index.find_duplicate(
+            f"{BASE_URL}/blog/print", page(*WORDS, *WORDS[:50]).replace(b"<p>", b"")
+        )
+
+        # Assert
+        self.assertEqual(f"{BASE_URL}/blog", duplicate)
+
+    def test_distinct_pages_are_not_duplicates(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+        index.find_duplicate(f"{BASE_URL}/blog", page(*WORDS))
+
+        # Act
+        duplicate = index.find_duplicate(
+            f"{BASE_URL}/careers", page(*(f"job{index:04}" for index in range(400)))
+        )
+
+        # Assert
+        self.assertIsNone(duplicate)
+        self.assertEqual({}, index.duplicates)
+
+    def test_template_pages_with_different_links_are_not_duplicates(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+
+        # Act - Each product lists the same text, but links to other products
+        duplicates = [
+            index.find_duplicate(
+                f"{BASE_URL}/products/{product}",
+                template_page(
+                    ["product", "details"],
+                    [f"/products/{(product * 7 + link) % 200}" for link in range(50)],
+                ),
+            )
+            for product in range(200)
+        ]
+
+        # Assert
+        self.assertEqual([None] * 200, duplicates)
+
+    def test_template_pages_with_different_text_are_not_duplicates(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+
+        # Act - Each post shares the markup and links, but not the article
+        duplicates = [
+            index.find_duplicate(
+                f"{BASE_URL}/blog/{post}",
+                template_page(
+                    [f"post{post:03}word{word:02}" for word in range(20)], ["/blog"]
+                ),
+            )
+            for post in range(200)
+        ]
+
+        # Assert
+        self.assertEqual([None] * 200, duplicates)
+
+    def test_same_relative_links_at_different_paths_are_not_duplicates(
+        self,
+    ) -> None:
+        # Arrange
+        index = DuplicateIndex()
+        content = template_page(["section", "index"], ["next", "archive"])
+        index.find_duplicate(f"{BASE_URL}/blog/", content)
+
+        # Act - The same links resolve to other pages under another path
+        duplicate = index.find_duplicate(f"{BASE_URL}/press/", content)
+
+        # Assert
+        self.assertIsNone(duplicate)
+        self.assertEqual({}, index.duplicates)
+
+    def test_refetched_page_is_not_its_own_duplicate(self) -> None:
+        # Arrange
+        index = DuplicateIndex()
+        index.find_duplicate(f"{BASE_URL}/blog", page(*WORDS))
+
+        # Act / Assert
+        self.assertIsNone(index.find_duplicate(f"{BASE_URL}/blog/", page(*WORDS)))
+
+    def test_zero_distance_only_finds_exact_duplicates(self) -> None:
+        # Arrange
+        index = DuplicateIndex(max_distance=0)
+        index.find_duplicate(f"{BASE_URL}/blog", page(*WORDS))
+
+        # Act
+        duplicate = index.find_duplicate(
+            f"{BASE_URL}/blog/print", page(*reversed(WORDS))
+        )
+
+        # Assert
+        self.assertIsNone(duplicate)
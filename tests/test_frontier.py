@@ -0,0 +1,204 @@
+import asyncio
+import os
+import unittest
+
+from sitemappy.frontier import (
+    DiskFrontier,
+    FrontierBackend,
+    FrontierStrategy,
+    PriorityFrontier,
+    RoundRobinFrontier,
+    SpillBuffer,
+    create_frontier,
+    depth_priority,
+    path_priority,
+    url_group,
+)
+
+
+class TestSpillBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.buffer = SpillBuffer(memory_limit=10)
+
+    def tearDown(self) -> None:
+        self.buffer.close()
+
+    def test_items_are_returned_in_order_across_spills(self) -> None:
+        # Arrange
+        items = [(f"https://monzo.com/{index}", index) for index in range(2_500)]
+
+        # Act
+        for item in items:
+            self.buffer.append(item)
+
+        spilled = self.buffer.spilled
+        length = len(self.buffer)
+        popped = [self.buffer.popleft() for _ in items]
+
+        # Assert
+        self.assertEqual(2_000, spilled)
+        self.assertEqual(len(items), length)
+        self.assertEqual(items, popped)
+        self.assertEqual(0, len(self.buffer))
+
+    def test_interleaved_appends_and_pops_keep_order(self) -> None:
+        # Arrange
+        items = [(f"https://monzo.com/{index}", index) for index in range(3_000)]
+        popped = []
+
+        # Act
+        for index, item in enumerate(items):
+            self.buffer.append(item)
+            if index % 3 == 0:
+                popped.append(self.buffer.popleft())
+
+        while len(self.buffer):
+            popped.append(self.buffer.popleft())
+
+        # Assert
+        self.assertEqual(items, popped)
+
+    def test_temporary_database_removed_on_close(self) -> None:
+        # Arrange
+        buffer = SpillBuffer()
+
+        # Act
+        buffer.close()
+
+        # Assert
+        self.assertFalse(os.path.exists(buffer.path))
+
+
+class TestDiskFrontier(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_semantics(self) -> None:
+        # Arrange
+        frontier = DiskFrontier(memory_limit=1)
+        items = [(f"https://monzo.com/{index}", index) for index in range(1_500)]
+
+        # Act
+        for item in items:
+            await frontier.put(item)
+
+        size = frontier.qsize()
+        popped = []
+        while not frontier.empty():
+            popped.append(await frontier.get())
+            frontier.task_done()
+
+        await asyncio.wait_for(frontier.join(), timeout=1)
+        frontier.close()
+
+        # Assert
+        self.assertEqual(len(items), size)
+        self.assertEqual(items, popped)
+
+    async def test_create_frontier(self) -> None:
+        # Act
+        memory_frontier = create_frontier(FrontierBackend.MEMORY)
+        disk_frontier = create_frontier(FrontierBackend.DISK)
+
+        # Assert
+        self.assertNotIsInstance(memory_frontier, DiskFrontier)
+        self.assertIsInstance(disk_frontier, DiskFrontier)
+
+        if isinstance(disk_frontier, DiskFrontier):
+            disk_frontier.close()
+
+
+class TestFrontierStrategies(unittest.IsolatedAsyncioTestCase):
+    async def drain(self, frontier: asyncio.Queue[tuple[str, int]]) -> list[str]:
+        popped = []
+        while not frontier.empty():
+            page, _ = await frontier.get()
+            popped.append(page)
+            frontier.task_done()
+
+        await asyncio.wait_for(frontier.join(), timeout=1)
+
+        return popped
+
+    async def test_depth_priority_crawls_by_depth_then_order_found(self) -> None:
+        # Arrange
+        frontier = PriorityFrontier(depth_priority)
+
+        # Act
+        for item in [("/b", 2), ("/a", 1), ("/c", 2), ("/d", 1)]:
+            await frontier.put(item)
+
+        # Assert
+        self.assertEqual(["/a", "/d", "/b", "/c"], await self.drain(frontier))
+
+    async def test_path_priority_crawls_shallowest_paths_first(self) -> None:
+        # Arrange
+        frontier = PriorityFrontier(path_priority)
+        items = [
+            ("https://monzo.com/blog/2024/post", 1),
+            ("https://monzo.com/blog?page=2", 1),
+            ("https://monzo.com/careers", 2),
+            ("https://monzo.com/blog", 1),
+        ]
+
+        # Act
+        for item in items:
+            await frontier.put(item)
+
+        # Assert
+        self.assertEqual(
+            [
+                "https://monzo.com/blog",
+                "https://monzo.com/careers",
+                "https://monzo.com/blog?page=2",
+                "https://monzo.com/blog/2024/post",
+            ],
+            await self.drain(frontier),
+        )
+
+    async def test_round_robin_takes_turns_across_path_prefixes(self) -> None:
+        # Arrange
+        frontier = RoundRobinFrontier()
+        pages = [
+            *(f"https://monzo.com/blog/{index}" for index in range(3)),
+            "https://monzo.com/about",
+            "https://monzo.com/careers/engineering",
+        ]
+
+        # Act
+        for page in pages:
+            await frontier.put((page, 1))
+
+        size = frontier.qsize()
+
+        # Assert
+        self.assertEqual(len(pages), size)
+        self.assertEqual(
+            [
+                "https://monzo.com/blog/0",
+                "https://monzo.com/about",
+                "https://monzo.com/careers/engineering",
+                "https://monzo.com/blog/1",
+                "https://monzo.com/blog/2",
+            ],
+            await self.drain(frontier),
+        )
+
+    def test_url_group(self) -> None:
+        # Act / Assert
+        self.assertEqual(
+            ("monzo.com", "blog"), url_group("https://monzo.com/blog/2024/post")
+        )
+        self.assertEqual(("monzo.com", ""), url_group("https://monzo.com/"))
+
+    async def test_create_frontier_for_strategy(self) -> None:
+        # Act / Assert
+        self.assertIsInstance(
+            create_frontier(FrontierBackend.MEMORY, strategy=FrontierStrategy.BFS),
+            PriorityFrontier,
+        )
+        self.assertIsInstance(
+            create_frontier(
+                FrontierBackend.MEMORY, strategy=FrontierStrategy.ROUND_ROBIN
+            ),
+            RoundRobinFrontier,
+        )
+        with self.assertRaises(ValueError):
+            create_frontier(FrontierBackend.DISK, strategy=FrontierStrategy.BFS)
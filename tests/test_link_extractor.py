@@ -0,0 +1,47 @@
+import unittest
+
+from parameterized import parameterized
+
+from sitemappy.link_extractor import AnchorHrefExtractor
+
+
+class TestAnchorHrefExtractor(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            # HTML, Expected hrefs
+            ("<a href='/careers'>Careers</a>", ["/careers"]),
+            ("<A HREF=/about>About</A>", ["/about"]),
+            ("<a href='/a' href='/b'>Duplicate</a>", ["/b"]),
+            ("<a>No href</a><a href=''>Empty</a><a href>Bare</a>", []),
+            ("<link href='/style.css'><img src='/logo.png'>", []),
+            ("<a href='/search?q=1&amp;page=2'>Entity</a>", ["/search?q=1&page=2"]),
+            ("<a href='/self-closing'/>", ["/self-closing"]),
+        ]
+    )
+    def test_extracts_anchor_hrefs(self, html: str, expected_hrefs: list[str]) -> None:
+        # Arrange
+        extractor = AnchorHrefExtractor()
+
+        # Act
+        extractor.feed(html)
+        extractor.close()
+
+        # Assert
+        self.assertEqual(expected_hrefs, extractor.take_hrefs())
+
+    def test_tags_split_across_chunks(self) -> None:
+        # Arrange
+        html = "<html><a href='/careers'>Careers</a><a href='/about'>About</a></html>"
+        extractor = AnchorHrefExtractor()
+
+        # Act
+        hrefs = []
+        for chunk in (html[index : index + 7] for index in range(0, len(html), 7)):
+            extractor.feed(chunk)
+            hrefs.extend(extractor.take_hrefs())
+
+        extractor.close()
+        hrefs.extend(extractor.take_hrefs())
+
+        # Assert
+        self.assertEqual(["/careers", "/about"], hrefs)
@@ -0,0 +1,80 @@
+import pickle
+import unittest
+
+from sitemappy.link_graph import LinkGraph
+
+BASE_URL = "https://monzo.com"
+ABOUT_URL = f"{BASE_URL}/about"
+CAREERS_URL = f"{BASE_URL}/careers"
+
+
+class TestLinkGraph(unittest.TestCase):
+    def test_pages_read_back_as_links(self) -> None:
+        # Arrange
+        graph = LinkGraph()
+
+        # Act
+        graph.add(BASE_URL, [ABOUT_URL, CAREERS_URL, ABOUT_URL])
+        graph.add(ABOUT_URL, [])
+        graph.add(CAREERS_URL, [BASE_URL])
+
+        # Assert
+        self.assertEqual(
+            {
+                BASE_URL: [ABOUT_URL, CAREERS_URL, ABOUT_URL],
+                ABOUT_URL: [],
+                CAREERS_URL: [BASE_URL],
+            },
+            graph.to_dict(),
+        )
+        self.assertEqual([BASE_URL, ABOUT_URL, CAREERS_URL], list(graph))
+        self.assertEqual(3, len(graph))
+        self.assertEqual(4, graph.link_count)
+        self.assertEqual(3, graph.url_count)
+
+    def test_links_are_not_crawled_pages(self) -> None:
+        # Arrange
+        graph = LinkGraph({BASE_URL: [ABOUT_URL]})
+
+        # Act / Assert
+        self.assertIn(BASE_URL, graph)
+        self.assertNotIn(ABOUT_URL, graph)
+        self.assertNotIn(CAREERS_URL, graph)
+        self.assertIsNone(graph.get(ABOUT_URL))
+        with self.assertRaises(KeyError):
+            graph[ABOUT_URL]
+
+    def test_adding_page_again_replaces_its_links(self) -> None:
+        # Arrange
+        graph = LinkGraph({BASE_URL: [ABOUT_URL], ABOUT_URL: []})
+
+        # Act
+        graph.add(BASE_URL, [CAREERS_URL])
+
+        # Assert
+        self.assertEqual([CAREERS_URL], graph[BASE_URL])
+        self.assertEqual([ABOUT_URL, BASE_URL], list(graph))
+        self.assertEqual(2, len(graph))
+        self.assertEqual(1, graph.link_count)
+
+    def test_update_merges_graphs(self) -> None:
+        # Arrange
+        graph = LinkGraph({BASE_URL: [ABOUT_URL]})
+
+        # Act
+        graph.update(LinkGraph({ABOUT_URL: [BASE_URL, CAREERS_URL]}))
+
+        # Assert
+        self.assertEqual(
+            {BASE_URL: [ABOUT_URL], ABOUT_URL: [BASE_URL, CAREERS_URL]}, graph
+        )
+
+    def test_graph_survives_pickling(self) -> None:
+        # Arrange
+        graph = LinkGraph({BASE_URL: [ABOUT_URL, CAREERS_URL], ABOUT_URL: []})
+
+        # Act
+        unpickled_graph = pickle.loads(pickle.dumps(graph))  # noqa: S301
+
+        # Assert
+        self.assertEqual(graph, unpickled_graph)
@@ -1,10 +1,21 @@
+import os
+import tempfile
 import unittest
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from http import HTTPStatus
+from unittest.mock import Mock, patch
 
 import httpx
 from parameterized import parameterized
 
-from sitemappy.link_scraper import AsyncScraper
+from sitemappy.fetch_policy import FetchPolicy
+from sitemappy.fingerprints import DuplicateIndex
+from sitemappy.link_scraper import AsyncScraper, create_http_client
+from sitemappy.metrics import CrawlMetrics
+from sitemappy.redirects import RedirectCache, TooManyRedirectsError
+from sitemappy.retry import RetryableResponseError
+from sitemappy.validator_cache import ValidatorCache
 
 
 class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
@@ -13,7 +24,8 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
         html_links = [f"<a href={link}>{index}</a>" for index, link in enumerate(links)]
         return f"<html>{html_links}</html>"
 
-    async def test_successful_get_links(self) -> None:
+    @parameterized.expand([(False,), (True,)])  # type: ignore[misc]
+    async def test_successful_get_links(self, streaming: bool) -> None:
         # Arrange
         expected_response = [
             "https://monzo.com/careers",
@@ -28,13 +40,307 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
             )
         )
 
-        class_under_test = AsyncScraper("https://monzo.com", client=client)
+        class_under_test = AsyncScraper(
+            "https://monzo.com", client=client, streaming=streaming
+        )
+
+        # Act
+        response = await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual(expected_response, response)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [(ThreadPoolExecutor,), (ProcessPoolExecutor,)]
+    )
+    async def test_get_links_in_parse_executor(
+        self, executor_type: type[ThreadPoolExecutor] | type[ProcessPoolExecutor]
+    ) -> None:
+        # Arrange
+        expected_response = [
+            "https://monzo.com/careers",
+            "https://monzo.com/café",
+        ]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK,
+                    content=self.__generate_html_page_of_links(
+                        ["/careers", "/café"]
+                    ).encode("latin-1"),
+                    headers={"Content-Type": "text/html; charset=latin-1"},
+                )
+            )
+        )
+
+        with executor_type(max_workers=1) as executor:
+            class_under_test = AsyncScraper(
+                "https://monzo.com", client=client, parse_executor=executor
+            )
+
+            # Act
+            response = await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual(expected_response, response)
+
+    async def test_streamed_get_links_matches_beautifulsoup(self) -> None:
+        # Arrange
+        relative_urls = [f"/page-{index}" for index in range(1000)]
+        content = self.__generate_html_page_of_links(relative_urls).encode()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for index in range(0, len(content), 100):
+                yield content[index : index + 100]
+
+        def chunked_response(_: httpx.Request) -> httpx.Response:
+            return httpx.Response(HTTPStatus.OK, content=chunks())
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(chunked_response))
+
+        buffered_scraper = AsyncScraper("https://monzo.com", client=client)
+        streaming_scraper = AsyncScraper(
+            "https://monzo.com", client=client, streaming=True
+        )
+
+        # Act
+        buffered_links = await buffered_scraper.get_links("https://monzo.com")
+        streamed_links = await streaming_scraper.get_links("https://monzo.com")
+
+        # Assert
+        self.assertEqual(len(relative_urls), len(streamed_links))
+        self.assertEqual(buffered_links, streamed_links)
+
+    async def test_asset_is_not_requested(self) -> None:
+        # Arrange
+        requests: list[httpx.Request] = []
+
+        def record_request(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(HTTPStatus.OK)
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(record_request)),
+        )
+
+        # Act
+        response = await class_under_test.get_links("https://monzo.com/report.pdf")
+
+        # Assert
+        self.assertEqual([], response)
+        self.assertEqual([], requests)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (False, {"Content-Type": "application/pdf"}),
+            (True, {"Content-Type": "application/pdf"}),
+            (False, {}),
+            (True, {}),
+        ]
+    )
+    async def test_skipped_response_body_is_not_downloaded(
+        self, streaming: bool, headers: dict[str, str]
+    ) -> None:
+        # Arrange
+        content = self.__generate_html_page_of_links(["/careers"]).encode()
+        chunks_sent = 0
+
+        async def chunks() -> AsyncIterator[bytes]:
+            nonlocal chunks_sent
+
+            for index in range(0, len(content), 10):
+                chunks_sent += 1
+                yield content[index : index + 10]
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK, content=chunks(), headers=headers
+                )
+            )
+        )
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=client,
+            streaming=streaming,
+            fetch_policy=FetchPolicy(max_page_bytes=20),
+        )
+
+        # Act
+        response = await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual([], response)
+        self.assertLessEqual(chunks_sent, 3)
+
+    @parameterized.expand([(False,), (True,)])  # type: ignore[misc]
+    async def test_not_modified_page_reuses_cached_links(self, streaming: bool) -> None:
+        # Arrange
+        expected_response = ["https://monzo.com/careers"]
+        content = self.__generate_html_page_of_links(expected_response).encode()
+        requests: list[httpx.Request] = []
+
+        def conditional_response(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(HTTPStatus.NOT_MODIFIED)
+
+            return httpx.Response(
+                HTTPStatus.OK, content=content, headers={"ETag": '"v1"'}
+            )
+
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        cache = ValidatorCache(os.path.join(cache_directory.name, "cache.sqlite"))
+        self.addCleanup(cache.close)
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=httpx.AsyncClient(
+                transport=httpx.MockTransport(conditional_response)
+            ),
+            streaming=streaming,
+            cache=cache,
+        )
+
+        # Act
+        first_response = await class_under_test.get_links(class_under_test.base_url)
+        second_response = await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual(expected_response, first_response)
+        self.assertEqual(expected_response, second_response)
+        self.assertNotIn("If-None-Match", requests[0].headers)
+        self.assertEqual(1, cache.stats.hits)
+        self.assertEqual(1, cache.stats.misses)
+        self.assertEqual(len(content), cache.stats.bytes_saved)
+
+    async def test_unchanged_content_reuses_cached_links(self) -> None:
+        # Arrange
+        expected_response = ["https://monzo.com/careers"]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK,
+                    content=self.__generate_html_page_of_links(expected_response),
+                )
+            )
+        )
+
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        cache = ValidatorCache(os.path.join(cache_directory.name, "cache.sqlite"))
+        self.addCleanup(cache.close)
+
+        class_under_test = AsyncScraper("https://monzo.com", client=client, cache=cache)
 
         # Act
+        await class_under_test.get_links(class_under_test.base_url)
         response = await class_under_test.get_links(class_under_test.base_url)
 
         # Assert
         self.assertEqual(expected_response, response)
+        self.assertEqual(1, cache.stats.hits)
+        self.assertEqual(0, cache.stats.bytes_saved)
+
+    @parameterized.expand([(False,), (True,)])  # type: ignore[misc]
+    async def test_metrics_are_recorded(self, streaming: bool) -> None:
+        # Arrange
+        content = self.__generate_html_page_of_links(["https://monzo.com/careers"])
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(HTTPStatus.OK, content=content)
+            )
+        )
+        metrics = CrawlMetrics()
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com", client=client, streaming=streaming, metrics=metrics
+        )
+
+        # Act
+        await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual({HTTPStatus.OK: 1}, metrics.status_codes)
+        self.assertEqual(len(content), metrics.bytes_downloaded)
+        self.assertEqual(1, metrics.fetch.count)
+        # Streamed pages are parsed while they are fetched
+        self.assertEqual(0 if streaming else 1, metrics.parse.count)
+
+    @patch("sitemappy.link_scraper.extract_links")
+    async def test_duplicate_page_is_not_parsed(self, mock_extract: Mock) -> None:
+        # Arrange
+        mock_extract.return_value = ["https://monzo.com/careers"]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK,
+                    content=self.__generate_html_page_of_links(
+                        ["https://monzo.com/careers"]
+                    ),
+                )
+            )
+        )
+        duplicates = DuplicateIndex()
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com", client=client, duplicates=duplicates
+        )
+
+        # Act
+        original = await class_under_test.get_links("https://monzo.com/")
+        duplicate = await class_under_test.get_links("https://monzo.com/?print=1")
+
+        # Assert
+        self.assertEqual(["https://monzo.com/careers"], original)
+        self.assertEqual([], duplicate)
+        mock_extract.assert_called_once()
+        self.assertEqual(
+            {"https://monzo.com/?print=1": "https://monzo.com/"},
+            duplicates.duplicates,
+        )
+
+    async def test_duplicate_page_links_are_not_cached(self) -> None:
+        # Arrange
+        expected_response = ["https://monzo.com/careers"]
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK,
+                    content=self.__generate_html_page_of_links(expected_response),
+                    headers={"ETag": '"v1"'},
+                )
+            )
+        )
+
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        cache = ValidatorCache(os.path.join(cache_directory.name, "cache.sqlite"))
+        self.addCleanup(cache.close)
+
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=client,
+            cache=cache,
+            duplicates=DuplicateIndex(),
+        )
+        await class_under_test.get_links("https://monzo.com/")
+
+        # Act
+        duplicate = await class_under_test.get_links("https://monzo.com/?print=1")
+
+        # Assert - A later crawl without duplicate detection parses the page
+        self.assertEqual([], duplicate)
+        self.assertIsNone(cache.get("https://monzo.com/?print=1"))
+        class_under_test.duplicates = None
+        self.assertEqual(
+            expected_response,
+            await class_under_test.get_links("https://monzo.com/?print=1"),
+        )
 
     @parameterized.expand(
         [
@@ -77,6 +383,59 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
         # Assert
         self.assertEqual(expected_urls, response)
 
+    @parameterized.expand([(False, False), (True, False), (False, True), (True, True)])  # type: ignore[misc]
+    async def test_relative_urls_resolve_against_page_url(
+        self, streaming: bool, cache_redirects: bool
+    ) -> None:
+        # Arrange
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.OK,
+                    html="<a href='team'>Team</a><a href='../careers'>Careers</a>",
+                )
+            )
+        )
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=client,
+            streaming=streaming,
+            redirects=RedirectCache() if cache_redirects else None,
+        )
+
+        # Act
+        links = await class_under_test.get_links("https://monzo.com/blog/about/")
+
+        # Assert
+        self.assertEqual(
+            ["https://monzo.com/blog/about/team", "https://monzo.com/blog/careers"],
+            links,
+        )
+
+    async def test_relative_urls_resolve_against_url_redirected_to(self) -> None:
+        # Arrange
+        responses = {
+            "https://monzo.com/blog/about": httpx.Response(
+                HTTPStatus.PERMANENT_REDIRECT, headers={"Location": "/blog/about/"}
+            ),
+            "https://monzo.com/blog/about/": httpx.Response(
+                HTTPStatus.OK, html="<a href='team'>Team</a>"
+            ),
+        }
+
+        # A client following redirects itself, rather than through a cache
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: responses[str(request.url)]),
+            follow_redirects=True,
+        )
+        class_under_test = AsyncScraper("https://monzo.com", client=client)
+
+        # Act
+        links = await class_under_test.get_links("https://monzo.com/blog/about")
+
+        # Assert
+        self.assertEqual(["https://monzo.com/blog/about/team"], links)
+
     async def test_unsuccessful_get_url(self) -> None:
         # Arrange
         expected_number_of_links = 0
@@ -94,6 +453,64 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
         # Assert
         self.assertEqual(expected_number_of_links, len(response))
 
+    async def test_observer_records_responses_and_failed_requests(self) -> None:
+        # Arrange
+        def response(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/timeout":
+                raise httpx.ReadTimeout("Timed out", request=request)
+
+            return httpx.Response(HTTPStatus.NOT_FOUND)
+
+        observer = Mock()
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(response)),
+            observer=observer,
+        )
+
+        # Act
+        await class_under_test.get_links("https://monzo.com/")
+        with self.assertRaises(httpx.ReadTimeout):
+            await class_under_test.get_links("https://monzo.com/timeout")
+
+        # Assert
+        observer.record_response.assert_called_once()
+        status_code, latency = observer.record_response.call_args.args
+        self.assertEqual(HTTPStatus.NOT_FOUND, status_code)
+        self.assertGreaterEqual(latency, 0)
+        observer.record_error.assert_called_once_with()
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "7"}, 7.0),
+            (HTTPStatus.SERVICE_UNAVAILABLE, {}, None),
+            (HTTPStatus.BAD_GATEWAY, {"Retry-After": "soon"}, None),
+        ]
+    )
+    async def test_temporary_failure_is_retryable(
+        self,
+        status_code: HTTPStatus,
+        headers: dict[str, str],
+        expected_retry_after: float | None,
+    ) -> None:
+        # Arrange
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=httpx.AsyncClient(
+                transport=httpx.MockTransport(
+                    lambda _: httpx.Response(status_code, headers=headers)
+                )
+            ),
+        )
+
+        # Act
+        with self.assertRaises(RetryableResponseError) as raised:
+            await class_under_test.get_links(class_under_test.base_url)
+
+        # Assert
+        self.assertEqual(status_code, raised.exception.status_code)
+        self.assertEqual(expected_retry_after, raised.exception.retry_after)
+
     @parameterized.expand(  # type: ignore[misc]
         [
             # (Base URL, Test URL)
@@ -107,6 +524,8 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
                 "https://community.monzo.com",
                 "https://community.monzo.com/profile",
             ),  # Appended path with subdomain
+            ("http://localhost:8080", "http://localhost:8080/careers"),  # Port
+            ("https://monzo.com:443", "https://monzo.com/careers"),  # Default port
         ]
     )
     def test_link_is_in_same_subdomain(self, base_url: str, test_url: str) -> None:
@@ -134,6 +553,7 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
             ("https://www.monzo.com", "https://monzo.com"),  # Appended "www" subdomain
             ("https://facebook.com", "https://monzo.com"),  # Different domain name
             ("https://monzo.co.uk", "https://monzo.com"),  # Different TLD
+            ("http://localhost:8080", "http://localhost:8081/"),  # Different port
             (
                 "https://monzo.com",
                 "https://monzo.com#careers",
@@ -155,3 +575,150 @@ class TestLinkScraper(unittest.IsolatedAsyncioTestCase):
 
         # Assert
         self.assertFalse(response)
+
+    @parameterized.expand([(False,), (True,)])  # type: ignore[misc]
+    async def test_redirects_are_followed_and_cached(self, streaming: bool) -> None:
+        # Arrange
+        base_url = "https://monzo.com"
+        responses = {
+            "http://monzo.com/about": httpx.Response(
+                HTTPStatus.MOVED_PERMANENTLY,
+                headers={"Location": "https://monzo.com/about"},
+            ),
+            "https://monzo.com/about": httpx.Response(
+                HTTPStatus.PERMANENT_REDIRECT, headers={"Location": "/about/"}
+            ),
+            "https://monzo.com/about/": httpx.Response(
+                HTTPStatus.OK,
+                html="<a href='/careers'>Careers</a><a href='team'>Team</a>",
+            ),
+        }
+        requested: list[str] = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            return responses[str(request.url)]
+
+        redirects = RedirectCache()
+        class_under_test = AsyncScraper(
+            base_url,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+            streaming=streaming,
+            redirects=redirects,
+        )
+
+        # Act
+        first_links = await class_under_test.get_links("http://monzo.com/about")
+        second_links = await class_under_test.get_links("http://monzo.com/about")
+
+        # Assert
+        self.assertEqual(
+            ["https://monzo.com/careers", "https://monzo.com/about/team"], first_links
+        )
+        self.assertEqual(first_links, second_links)
+        self.assertEqual(
+            [*responses, "https://monzo.com/about/"],
+            requested,
+        )
+        self.assertEqual(
+            "https://monzo.com/about/", redirects.resolve("http://monzo.com/about")
+        )
+
+    async def test_redirect_out_of_subdomain_is_not_followed(self) -> None:
+        # Arrange
+        requested: list[str] = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            return httpx.Response(
+                HTTPStatus.FOUND, headers={"Location": "https://community.monzo.com/"}
+            )
+
+        redirects = RedirectCache()
+        class_under_test = AsyncScraper(
+            "https://monzo.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(respond)),
+            redirects=redirects,
+        )
+
+        # Act
+        links = await class_under_test.get_links("https://monzo.com/community")
+
+        # Assert
+        self.assertEqual([], links)
+        self.assertEqual(["https://monzo.com/community"], requested)
+        self.assertEqual(
+            "https://community.monzo.com/",
+            redirects.resolve("https://monzo.com/community"),
+        )
+
+    async def test_redirect_loop(self) -> None:
+        # Arrange
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    HTTPStatus.FOUND,
+                    headers={"Location": "/b" if request.url.path == "/a" else "/a"},
+                )
+            )
+        )
+        class_under_test = AsyncScraper(
+            "https://monzo.com", client=client, redirects=RedirectCache()
+        )
+
+        # Act / Assert
+        with self.assertRaises(TooManyRedirectsError):
+            await class_under_test.get_links("https://monzo.com/a")
+
+    async def test_redirects_are_not_followed_without_cache(self) -> None:
+        # Arrange
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda _: httpx.Response(
+                    HTTPStatus.MOVED_PERMANENTLY,
+                    headers={"Location": "https://monzo.com/about"},
+                    html="<a href='/moved'>Moved</a>",
+                )
+            )
+        )
+        class_under_test = AsyncScraper("https://monzo.com", client=client)
+
+        # Act
+        links = await class_under_test.get_links("https://monzo.com/old")
+
+        # Assert
+        self.assertEqual(["https://monzo.com/moved"], links)
+
+
+class TestCreateHttpClient(unittest.TestCase):
+    @patch("sitemappy.link_scraper.httpx.AsyncClient")
+    def test_pool_is_sized_to_max_connections(self, mock_client: Mock) -> None:
+        # Act
+        create_http_client(
+            max_connections=100,
+            keepalive_connections=50,
+            keepalive_expiry=30,
+            request_timeout=10,
+            http2=True,
+        )
+
+        # Assert
+        mock_client.assert_called_once_with(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=30,
+            ),
+            timeout=10,
+        )
+
+    @patch("sitemappy.link_scraper.httpx.AsyncClient")
+    def test_keepalive_connections_are_limited_to_pool(self, mock_client: Mock) -> None:
+        # Act
+        create_http_client(max_connections=5, keepalive_connections=20)
+
+        # Assert
+        self.assertEqual(
+            5, mock_client.call_args.kwargs["limits"].max_keepalive_connections
+        )
@@ -1,19 +1,157 @@
+import json
+import os
+import tempfile
 import unittest
+from typing import Any
 from unittest import mock
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from parameterized import parameterized
 from typer.testing import CliRunner
 
 import sitemappy
+from sitemappy.coordinator import DEFAULT_COORDINATOR_HOST, NodeCrawler
+from sitemappy.crawl_options import (
+    AdaptiveConcurrencyOptions,
+    CacheOptions,
+    CheckpointOptions,
+    ConnectionOptions,
+    DedupOptions,
+    FrontierOptions,
+    MonitoringOptions,
+    OutputOptions,
+    PolitenessOptions,
+)
 from sitemappy.crawler import Crawler
-from sitemappy.main import app
+from sitemappy.fetch_policy import FetchPolicy
+from sitemappy.frontier import FrontierBackend, FrontierStrategy
+from sitemappy.main import app, coordinator_app
+from sitemappy.profiling import ProfileMode
+from sitemappy.seen import SeenSetBackend
+from sitemappy.sharding import ShardedCrawler
+from sitemappy.validator_cache import CacheStats
 
 SUCCESS_EXIT_CODE = 0
 ERROR_EXIT_CODE = 1
 INVALID_ARGS_EXIT_CODE = 2
 
 
+def crawler_kwargs(**overrides: Any) -> dict[str, Any]:
+    """
+    Keyword arguments the CLI is expected to create a Crawler with, using the
+    CLI defaults for any option not overridden. Options are overridden by the
+    name of their CLI option, and grouped as the CLI groups them.
+    """
+    options: dict[str, Any] = {
+        "number_of_workers": sitemappy.main.DEFAULT_WORKERS,
+        "adaptive_concurrency": False,
+        "min_workers": sitemappy.main.DEFAULT_MIN_WORKERS,
+        "max_workers": sitemappy.main.DEFAULT_MAX_WORKERS,
+        "crawl_depth": sitemappy.main.DEFAULT_CRAWL_DEPTH,
+        "politeness_delay": sitemappy.main.DEFAULT_POLITENESS_DELAY_S,
+        "politeness_burst": sitemappy.main.DEFAULT_POLITENESS_BURST,
+        "enable_cmd_out": False,
+        "stream_links": False,
+        "frontier": FrontierBackend.MEMORY,
+        "frontier_memory_limit": sitemappy.main.DEFAULT_FRONTIER_MEMORY_LIMIT,
+        "frontier_strategy": FrontierStrategy.FIFO,
+        "max_pages": sitemappy.main.DEFAULT_MAX_PAGES,
+        "seen_set": SeenSetBackend.EXACT,
+        "parse_workers": sitemappy.main.DEFAULT_PARSE_WORKERS,
+        "checkpoint": None,
+        "resume": False,
+        "cache": None,
+        "cache_max_bytes": sitemappy.main.DEFAULT_CACHE_MAX_BYTES,
+        "keepalive_connections": sitemappy.main.DEFAULT_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": sitemappy.main.DEFAULT_KEEPALIVE_EXPIRY_S,
+        "request_timeout": sitemappy.main.DEFAULT_REQUEST_TIMEOUT_S,
+        "page_timeout": sitemappy.main.DEFAULT_PAGE_TIMEOUT_S,
+        "max_retries": sitemappy.main.DEFAULT_MAX_RETRIES,
+        "circuit_breaker_threshold": sitemappy.main.DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        "failures_output": "result.failures.json",
+        "http2": False,
+        "max_page_bytes": sitemappy.main.DEFAULT_MAX_PAGE_BYTES,
+        "skip_assets": True,
+        "respect_robots": True,
+        "seed_sitemaps": False,
+        "follow_redirects": True,
+        "avoid_spider_traps": False,
+        "max_urls_per_template": sitemappy.main.DEFAULT_MAX_URLS_PER_TEMPLATE,
+        "skip_duplicates": False,
+        "duplicates_output": "result.duplicates.json",
+        "stats_interval": sitemappy.main.DEFAULT_STATS_INTERVAL_S,
+        "metrics_port": sitemappy.main.DEFAULT_METRICS_PORT,
+        "metrics_output": None,
+        "profile": ProfileMode.NONE,
+        "profile_output": None,
+        "loop_lag_threshold": sitemappy.main.DEFAULT_LOOP_LAG_THRESHOLD_S,
+    } | overrides
+
+    return {
+        "number_of_workers": options["number_of_workers"],
+        "crawl_depth": options["crawl_depth"],
+        "politeness_delay": options["politeness_delay"],
+        "enable_cmd_out": options["enable_cmd_out"],
+        "max_pages": options["max_pages"],
+        "parse_workers": options["parse_workers"],
+        "stream_links": options["stream_links"],
+        "seed_sitemaps": options["seed_sitemaps"],
+        "follow_redirects": options["follow_redirects"],
+        "adaptive_concurrency": (
+            AdaptiveConcurrencyOptions(options["min_workers"], options["max_workers"])
+            if options["adaptive_concurrency"]
+            else None
+        ),
+        "frontier": FrontierOptions(
+            options["frontier"],
+            options["frontier_memory_limit"],
+            options["frontier_strategy"],
+            options["seen_set"],
+        ),
+        "checkpoint": (
+            CheckpointOptions(options["checkpoint"], resume=options["resume"])
+            if options["checkpoint"]
+            else None
+        ),
+        "cache": (
+            CacheOptions(options["cache"], options["cache_max_bytes"])
+            if options["cache"]
+            else None
+        ),
+        "connection": ConnectionOptions(
+            options["keepalive_connections"],
+            options["keepalive_expiry"],
+            options["request_timeout"],
+            options["page_timeout"],
+            options["http2"],
+        ),
+        "politeness": PolitenessOptions(
+            options["politeness_burst"],
+            options["respect_robots"],
+            options["max_retries"],
+            options["circuit_breaker_threshold"],
+        ),
+        "fetch_policy": FetchPolicy(options["max_page_bytes"], options["skip_assets"]),
+        "dedup": DedupOptions(
+            options["avoid_spider_traps"],
+            options["max_urls_per_template"],
+            options["skip_duplicates"],
+        ),
+        "outputs": OutputOptions(
+            failures_output=options["failures_output"],
+            duplicates_output=options["duplicates_output"],
+            metrics_output=options["metrics_output"],
+        ),
+        "monitoring": MonitoringOptions(
+            options["stats_interval"],
+            options["metrics_port"],
+            options["profile"],
+            options["profile_output"],
+            options["loop_lag_threshold"],
+        ),
+    }
+
+
 @mock.patch("sitemappy.main.Crawler")
 class BaseUrlArg(unittest.TestCase):
     def setUp(self) -> None:
@@ -37,6 +175,7 @@ class BaseUrlArg(unittest.TestCase):
         mock_crawler_instance = Mock(Crawler)
         mock_crawler.return_value = mock_crawler_instance
         mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
 
         # Act
         cli_output = self.runner.invoke(app, valid_url)
@@ -49,13 +188,7 @@ class BaseUrlArg(unittest.TestCase):
             cli_output.stdout.replace("\n", "").replace(" ", ""),
         )
 
-        mock_crawler.assert_called_once_with(
-            valid_url,
-            number_of_workers=sitemappy.main.DEFAULT_WORKERS,
-            crawl_depth=sitemappy.main.DEFAULT_CRAWL_DEPTH,
-            politeness_delay=sitemappy.main.DEFAULT_POLITENESS_DELAY_S,
-            enable_cmd_out=False,
-        )
+        mock_crawler.assert_called_once_with(valid_url, **crawler_kwargs())
         mock_crawler_instance.crawl.assert_called_once()
 
     def test_url_not_provided(
@@ -122,6 +255,7 @@ class WorkersOptionalArg(unittest.TestCase):
         mock_crawler_instance = Mock(Crawler)
         mock_crawler.return_value = mock_crawler_instance
         mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
 
         # Act
         cli_output = self.runner.invoke(
@@ -132,11 +266,7 @@ class WorkersOptionalArg(unittest.TestCase):
         self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
 
         mock_crawler.assert_called_once_with(
-            valid_url,
-            number_of_workers=expected_number_of_workers,
-            crawl_depth=sitemappy.main.DEFAULT_CRAWL_DEPTH,
-            politeness_delay=sitemappy.main.DEFAULT_POLITENESS_DELAY_S,
-            enable_cmd_out=False,
+            valid_url, **crawler_kwargs(number_of_workers=expected_number_of_workers)
         )
         mock_crawler_instance.crawl.assert_called_once()
 
@@ -187,6 +317,60 @@ class WorkersOptionalArg(unittest.TestCase):
         mock_crawler_instance.crawl.assert_not_called()
 
 
+@mock.patch("sitemappy.main.Crawler")
+class AdaptiveConcurrencyOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_adaptive_concurrency_bounds(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+        mock_crawler_instance.concurrency_limit = 24
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --adaptive-concurrency --min-workers 2 --max-workers 50",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertIn("Concurrency", cli_output.stdout)
+        self.assertIn("24", cli_output.stdout)
+
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(adaptive_concurrency=True, min_workers=2, max_workers=50),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            "--min-workers 0",
+            "--max-workers 0",
+            "--adaptive-concurrency --min-workers 20 --max-workers 10",
+        ]
+    )
+    def test_invalid_adaptive_concurrency_args(
+        self,
+        mock_crawler: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {invalid_args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
 @mock.patch("sitemappy.main.Crawler")
 class CrawlDepthOptionalArg(unittest.TestCase):
     def setUp(self) -> None:
@@ -203,6 +387,7 @@ class CrawlDepthOptionalArg(unittest.TestCase):
         mock_crawler_instance = Mock(Crawler)
         mock_crawler.return_value = mock_crawler_instance
         mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
 
         # Act
         cli_output = self.runner.invoke(
@@ -213,11 +398,7 @@ class CrawlDepthOptionalArg(unittest.TestCase):
         self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
 
         mock_crawler.assert_called_once_with(
-            valid_url,
-            number_of_workers=sitemappy.main.DEFAULT_WORKERS,
-            crawl_depth=expected_crawl_depth,
-            politeness_delay=sitemappy.main.DEFAULT_POLITENESS_DELAY_S,
-            enable_cmd_out=False,
+            valid_url, **crawler_kwargs(crawl_depth=expected_crawl_depth)
         )
         mock_crawler_instance.crawl.assert_called_once()
 
@@ -284,6 +465,7 @@ class PolitenessDelayOptionalArg(unittest.TestCase):
         mock_crawler_instance = Mock(Crawler)
         mock_crawler.return_value = mock_crawler_instance
         mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
 
         # Act
         cli_output = self.runner.invoke(
@@ -295,10 +477,7 @@ class PolitenessDelayOptionalArg(unittest.TestCase):
 
         mock_crawler.assert_called_once_with(
             valid_url,
-            number_of_workers=sitemappy.main.DEFAULT_WORKERS,
-            crawl_depth=sitemappy.main.DEFAULT_POLITENESS_DELAY_S,
-            politeness_delay=expected_politeness_delay,
-            enable_cmd_out=False,
+            **crawler_kwargs(politeness_delay=expected_politeness_delay),
         )
         mock_crawler_instance.crawl.assert_called_once()
 
@@ -347,3 +526,1062 @@ class PolitenessDelayOptionalArg(unittest.TestCase):
 
         mock_crawler.assert_not_called()
         mock_crawler_instance.crawl.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class PolitenessBurstOptionalArg(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_valid_fractional_politeness_delay_with_burst(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        expected_politeness_delay = 0.25
+        expected_politeness_burst = 5
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 4.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --politeness-delay {expected_politeness_delay} "
+            f"--politeness-burst {expected_politeness_burst}",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertIn("4.00", cli_output.stdout)
+
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                politeness_delay=expected_politeness_delay,
+                politeness_burst=expected_politeness_burst,
+            ),
+        )
+        mock_crawler_instance.crawl.assert_called_once()
+
+    def test_invalid_politeness_burst_arg_less_than_one(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        invalid_politeness_burst = 0
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --politeness-burst {invalid_politeness_burst}"
+        )
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_not_called()
+        mock_crawler_instance.crawl.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class StreamLinksOptionalArg(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_stream_links_flag(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} --stream-links")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(stream_links=True)
+        )
+        mock_crawler_instance.crawl.assert_called_once()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class FrontierOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_disk_frontier_with_fingerprint_seen_set(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --frontier disk --frontier-memory-limit 50 "
+            "--seen-set fingerprint",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                frontier=FrontierBackend.DISK,
+                frontier_memory_limit=50,
+                seen_set=SeenSetBackend.FINGERPRINT,
+            ),
+        )
+
+    def test_frontier_strategy_with_max_pages(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --frontier-strategy shallow-first --max-pages 500 "
+            "--seed-sitemaps",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                frontier_strategy=FrontierStrategy.SHALLOW_FIRST,
+                max_pages=500,
+                seed_sitemaps=True,
+            ),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            "--frontier redis",
+            "--seen-set cuckoo",
+            "--frontier-memory-limit 0",
+            "--frontier-strategy random",
+            "--frontier disk --frontier-strategy bfs",
+            "--max-pages -1",
+            "--max-pages 10 --processes 2",
+            "--max-pages 10 --coordinator localhost:8765",
+            "--seed-sitemaps --processes 2",
+            "--seed-sitemaps --coordinator localhost:8765",
+        ]
+    )
+    def test_invalid_frontier_args(
+        self,
+        mock_crawler: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {invalid_args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class ParseWorkersOptionalArg(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_valid_parse_workers(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        expected_parse_workers = 4
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --parse-workers {expected_parse_workers}"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(parse_workers=expected_parse_workers)
+        )
+
+    def test_invalid_parse_workers_arg_less_than_zero(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, "https://monzo.com --parse-workers -1")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.ShardedCrawler")
+@mock.patch("sitemappy.main.Crawler")
+class ProcessesOptionalArg(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_multiple_processes_use_sharded_crawler(
+        self,
+        mock_crawler: Mock,
+        mock_sharded_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        expected_processes = 4
+
+        mock_crawler_instance = Mock(ShardedCrawler)
+        mock_sharded_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --processes {expected_processes}"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_crawler.assert_not_called()
+        mock_sharded_crawler.assert_called_once_with(
+            valid_url, processes=expected_processes, **crawler_kwargs()
+        )
+        mock_crawler_instance.crawl.assert_called_once()
+
+    def test_invalid_processes_arg_less_than_one(
+        self,
+        mock_crawler: Mock,
+        mock_sharded_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, "https://monzo.com --processes 0")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+        mock_sharded_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.RemoteCoordinator")
+@mock.patch("sitemappy.main.NodeCrawler")
+class CoordinatorOptionalArg(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_coordinator_runs_worker_node(
+        self,
+        mock_node_crawler: Mock,
+        mock_remote_coordinator: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(NodeCrawler)
+        mock_node_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --coordinator coordinator.local:8765"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        mock_remote_coordinator.assert_called_once_with("coordinator.local", 8765)
+        mock_node_crawler.assert_called_once_with(
+            valid_url,
+            coordinator=mock_remote_coordinator.return_value,
+            **crawler_kwargs(),
+        )
+        mock_crawler_instance.crawl.assert_called_once()
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            "--coordinator coordinator.local",
+            "--coordinator :8765",
+            "--coordinator coordinator.local:port",
+            "--coordinator coordinator.local:8765 --processes 2",
+            "--coordinator coordinator.local:8765 --avoid-spider-traps",
+        ]
+    )
+    def test_invalid_coordinator_args(
+        self,
+        mock_node_crawler: Mock,
+        _: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {invalid_args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_node_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class CheckpointOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+        journal_file = tempfile.NamedTemporaryFile(suffix=".ndjson", delete=False)
+        journal_file.close()
+        self.journal = journal_file.name
+        self.addCleanup(os.remove, self.journal)
+
+    def test_checkpoint_arg_journals_crawl(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} --checkpoint crawl.ndjson")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(checkpoint="crawl.ndjson", resume=False)
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--resume {journal}",),
+            ("--resume {journal} --checkpoint {journal}",),
+        ]
+    )
+    def test_resume_arg_resumes_crawl(
+        self,
+        mock_crawler: Mock,
+        args: str,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} {args.format(journal=self.journal)}"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(checkpoint=self.journal, resume=True)
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--resume missing.ndjson",),
+            ("--resume {journal} --checkpoint other.ndjson",),
+            ("--checkpoint {journal} --processes 2",),
+            ("--resume {journal} --coordinator coordinator.local:8765",),
+        ]
+    )
+    def test_invalid_checkpoint_args(
+        self,
+        mock_crawler: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"https://monzo.com {invalid_args.format(journal=self.journal)}"
+        )
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class CacheOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_cache_arg_reports_cache_stats(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+        mock_crawler_instance.cache_stats = CacheStats(
+            hits=3, misses=1, bytes_saved=123_456
+        )
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --cache cache.sqlite --cache-max-bytes 1024"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertIn("75.0%", cli_output.stdout)
+        self.assertIn("123,456", cli_output.stdout)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(cache="cache.sqlite", cache_max_bytes=1024),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--cache cache.sqlite --cache-max-bytes 0",),
+            ("--cache cache.sqlite --processes 2",),
+        ]
+    )
+    def test_invalid_cache_args(
+        self,
+        mock_crawler: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {invalid_args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class HttpClientOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    @mock.patch("sitemappy.main.importlib.util.find_spec")
+    def test_valid_http_client_args(
+        self,
+        mock_find_spec: Mock,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --keepalive-connections 100 --keepalive-expiry 0 "
+            "--request-timeout 2.5 --http2",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_find_spec.assert_called_once_with("h2")
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                keepalive_connections=100,
+                keepalive_expiry=0.0,
+                request_timeout=2.5,
+                http2=True,
+            ),
+        )
+
+    @mock.patch("sitemappy.main.importlib.util.find_spec", return_value=None)
+    def test_http2_without_h2_installed(
+        self,
+        _: Mock,
+        mock_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, "https://monzo.com --http2")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--keepalive-connections -1",),
+            ("--keepalive-expiry -1",),
+            ("--request-timeout 0",),
+        ]
+    )
+    def test_invalid_http_client_args(
+        self,
+        mock_crawler: Mock,
+        invalid_args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {invalid_args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class FetchPolicyOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_valid_fetch_policy_args(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --max-page-bytes 1024 --no-skip-assets"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(max_page_bytes=1024, skip_assets=False)
+        )
+
+    def test_no_respect_robots_arg(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} --no-respect-robots")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(respect_robots=False)
+        )
+
+    def test_no_follow_redirects_arg(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} --no-follow-redirects")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url, **crawler_kwargs(follow_redirects=False)
+        )
+
+    def test_invalid_max_page_bytes(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, "https://monzo.com --max-page-bytes 0")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--avoid-spider-traps", True, 1000),
+            ("--avoid-spider-traps --max-urls-per-template 50", True, 50),
+            ("--avoid-spider-traps --max-urls-per-template 0", True, 0),
+            ("--max-urls-per-template 50", False, 50),
+        ]
+    )
+    def test_spider_trap_args(
+        self,
+        mock_crawler: Mock,
+        args: str,
+        avoid_spider_traps: bool,
+        max_urls_per_template: int,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} {args}")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                avoid_spider_traps=avoid_spider_traps,
+                max_urls_per_template=max_urls_per_template,
+            ),
+        )
+
+    def test_invalid_max_urls_per_template(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(
+            app, "https://monzo.com --max-urls-per-template -1"
+        )
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class RetryOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_retry_args(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --page-timeout 0 --max-retries 4 "
+            "--circuit-breaker-threshold 10",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                page_timeout=0.0, max_retries=4, circuit_breaker_threshold=10
+            ),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--page-timeout", "-1"),
+            ("--max-retries", "-1"),
+            ("--circuit-breaker-threshold", "-1"),
+        ]
+    )
+    def test_invalid_retry_args(
+        self,
+        mock_crawler: Mock,
+        option: str,
+        value: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, ["https://monzo.com", option, value])
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class MetricsOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_metrics_args(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"{valid_url} --stats-interval 5 --save-metrics --metrics-port 9464",
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                stats_interval=5.0,
+                metrics_output="result.metrics.json",
+                metrics_port=9464,
+            ),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--stats-interval -1",),
+            ("--metrics-port -1",),
+            ("--metrics-port 65536",),
+            ("--metrics-port 9464 --processes 2",),
+        ]
+    )
+    def test_invalid_metrics_args(
+        self,
+        mock_crawler: Mock,
+        args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class ProfilingOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (ProfileMode.CPROFILE, "result.profile.prof"),
+            (ProfileMode.SAMPLING, "result.profile.folded"),
+            (ProfileMode.TRACEMALLOC, "result.profile.txt"),
+        ]
+    )
+    def test_profile_args(
+        self,
+        mock_crawler: Mock,
+        profile: ProfileMode,
+        profile_output: str,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --profile {profile} --loop-lag-threshold 0.05"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                profile=profile,
+                profile_output=profile_output,
+                loop_lag_threshold=0.05,
+            ),
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("--loop-lag-threshold -1",),
+            ("--profile unknown",),
+            ("--profile cprofile --processes 2",),
+            ("--profile sampling --coordinator 127.0.0.1:8765",),
+        ]
+    )
+    def test_invalid_profile_args(
+        self,
+        mock_crawler: Mock,
+        args: str,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(app, f"https://monzo.com {args}")
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.Crawler")
+class OutputOptionalArgs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+        output_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(output_directory.cleanup)
+        self.output = os.path.join(output_directory.name, "sitemap")
+
+    def test_json_output_arg(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl.return_value = {valid_url: []}
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --output {self.output} --save-metrics"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        mock_crawler.assert_called_once_with(
+            valid_url,
+            **crawler_kwargs(
+                failures_output=f"{self.output}.failures.json",
+                duplicates_output=f"{self.output}.duplicates.json",
+                metrics_output=f"{self.output}.metrics.json",
+            ),
+        )
+        with open(self.output) as output_file:
+            self.assertEqual({valid_url: []}, json.load(output_file))
+
+    def test_failed_pages_are_reported(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        output = f"{self.output}.json"
+
+        async def crawl() -> dict[str, list[str]]:
+            failures_output = mock_crawler.call_args.kwargs["outputs"].failures_output
+            with open(failures_output, "w") as failures_file:
+                json.dump({f"{valid_url}/down": "ConnectError: refused"}, failures_file)
+            return {valid_url: [f"{valid_url}/down"]}
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl = crawl
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(app, f"{valid_url} --output {output}")
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertEqual(
+            f"{self.output}.failures.json",
+            mock_crawler.call_args.kwargs["outputs"].failures_output,
+        )
+        self.assertIn("1 pages could not be crawled", cli_output.stdout)
+
+    def test_duplicate_pages_are_reported(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        output = f"{self.output}.json"
+
+        async def crawl() -> dict[str, list[str]]:
+            duplicates_output = mock_crawler.call_args.kwargs[
+                "outputs"
+            ].duplicates_output
+            with open(duplicates_output, "w") as duplicates_file:
+                json.dump({f"{valid_url}/?print=1": f"{valid_url}/"}, duplicates_file)
+            return {valid_url: [f"{valid_url}/?print=1"], f"{valid_url}/?print=1": []}
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl = crawl
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --output {output} --skip-duplicates"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertTrue(mock_crawler.call_args.kwargs["dedup"].skip_duplicates)
+        self.assertEqual(
+            f"{self.output}.duplicates.json",
+            mock_crawler.call_args.kwargs["outputs"].duplicates_output,
+        )
+        self.assertIn("1 pages duplicated a page already crawled", cli_output.stdout)
+
+    def test_ndjson_output_streams_pages_to_sink(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+
+        async def crawl() -> dict[str, list[str]]:
+            sink = mock_crawler.call_args.kwargs["outputs"].sinks[0]
+            sink.write(valid_url, [f"{valid_url}/about"])
+            sink.write(f"{valid_url}/about", [])
+            return {}
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl = crawl
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --output {self.output} --output-format ndjson"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        self.assertFalse(mock_crawler.call_args.kwargs["outputs"].keep_results)
+        with open(self.output) as output_file:
+            self.assertEqual(
+                [{valid_url: [f"{valid_url}/about"]}, {f"{valid_url}/about": []}],
+                [json.loads(line) for line in output_file],
+            )
+
+    def test_sitemap_xml_output_writes_sitemap_index(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com/about"
+        sitemap_index = f"{self.output}.xml"
+
+        async def crawl() -> dict[str, list[str]]:
+            mock_crawler.call_args.kwargs["outputs"].sinks[0].write(valid_url, [])
+            return {}
+
+        mock_crawler_instance = Mock(Crawler)
+        mock_crawler.return_value = mock_crawler_instance
+        mock_crawler_instance.crawl = crawl
+        mock_crawler_instance.achieved_request_rate = 0.0
+
+        # Act
+        cli_output = self.runner.invoke(
+            app, f"{valid_url} --output {sitemap_index} --output-format sitemap-xml"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+        with open(sitemap_index) as index_file:
+            self.assertIn(
+                "<loc>https://monzo.com/sitemap-1.xml.gz</loc>", index_file.read()
+            )
+        self.assertTrue(os.path.exists(f"{self.output}-1.xml.gz"))
+
+    def test_ndjson_output_with_processes(
+        self,
+        mock_crawler: Mock,
+    ) -> None:
+        # Act
+        cli_output = self.runner.invoke(
+            app,
+            f"https://monzo.com --output {self.output} --output-format ndjson "
+            "--processes 2",
+        )
+
+        # Assert
+        self.assertEqual(INVALID_ARGS_EXIT_CODE, cli_output.exit_code)
+        self.assertFalse(os.path.exists(self.output))
+        mock_crawler.assert_not_called()
+
+
+@mock.patch("sitemappy.main.CoordinatorServer")
+class CoordinatorCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_coordinator_serves_crawl(
+        self,
+        mock_coordinator_server: Mock,
+    ) -> None:
+        # Arrange
+        valid_url: str = "https://monzo.com"
+        mock_coordinator_server.return_value.serve = AsyncMock(
+            return_value={valid_url: [f"{valid_url}/careers"]}
+        )
+
+        # Act
+        cli_output = self.runner.invoke(
+            coordinator_app, f"{valid_url} --port 9000 --crawl-depth 2"
+        )
+
+        # Assert
+        self.assertEqual(SUCCESS_EXIT_CODE, cli_output.exit_code)
+
+        coordinator = mock_coordinator_server.call_args.args[0]
+        self.assertEqual(valid_url, coordinator.base_url)
+        self.assertEqual(2, coordinator.crawl_depth)
+        mock_coordinator_server.return_value.serve.assert_awaited_once_with(
+            DEFAULT_COORDINATOR_HOST, 9000
+        )
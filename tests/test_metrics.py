@@ -0,0 +1,160 @@
+import asyncio
+import io
+import unittest
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+
+from sitemappy.metrics import (
+    CrawlMetrics,
+    LatencyHistogram,
+    MetricsServer,
+    print_stats_periodically,
+)
+
+
+def crawl_metrics() -> CrawlMetrics:
+    metrics = CrawlMetrics()
+    metrics.fetch.observe(0.2)
+    metrics.parse.observe(0.004)
+    metrics.enqueue.observe(0.0001)
+    metrics.bytes_downloaded = 2048
+    metrics.status_codes.update({200: 3, 404: 1})
+    metrics.pages_crawled = 4
+    metrics.queue_depth = 12
+    metrics.active_workers = 2
+    metrics.workers = 10
+
+    return metrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles_are_bucket_bounds(self) -> None:
+        # Arrange
+        histogram = LatencyHistogram(bounds=(0.1, 1.0))
+
+        # Act
+        for latency in (0.05, 0.05, 0.1, 0.5, 5.0):
+            histogram.observe(latency)
+
+        # Assert
+        self.assertEqual([3, 1, 1], histogram.counts)
+        self.assertEqual(0.1, histogram.quantile(0.5))
+        self.assertEqual(1.0, histogram.quantile(0.8))
+        self.assertEqual(float("inf"), histogram.quantile(1.0))
+        self.assertAlmostEqual(5.7, histogram.sum)
+
+    def test_empty_histogram(self) -> None:
+        # Act / Assert
+        self.assertEqual(0.0, LatencyHistogram().quantile(0.95))
+
+
+@patch("sitemappy.metrics.time.monotonic")
+class TestCrawlMetrics(unittest.TestCase):
+    def test_pages_per_second(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        metrics = crawl_metrics()
+
+        # Act
+        metrics.start()
+        mock_monotonic.return_value = 102.0
+        metrics.finish()
+        mock_monotonic.return_value = 200.0
+
+        # Assert
+        self.assertEqual(2.0, metrics.elapsed)
+        self.assertEqual(2.0, metrics.pages_per_second)
+
+    def test_merge(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        metrics = crawl_metrics()
+
+        # Act
+        metrics.merge(crawl_metrics())
+
+        # Assert
+        self.assertEqual(8, metrics.pages_crawled)
+        self.assertEqual({200: 6, 404: 2}, metrics.status_codes)
+        self.assertEqual(2, metrics.fetch.count)
+        self.assertEqual(20, metrics.workers)
+
+    def test_summary(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+
+        # Act
+        summary = crawl_metrics().to_dict()
+
+        # Assert
+        self.assertEqual({"200": 3, "404": 1}, summary["status_codes"])
+        self.assertEqual(0.25, summary["fetch"]["p95_s"])
+        self.assertEqual(1, summary["parse"]["buckets"]["0.005"])
+
+    def test_stats_line(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+
+        # Act
+        line = crawl_metrics().stats_line()
+
+        # Assert
+        self.assertIn("4 pages", line)
+        self.assertIn("queue 12", line)
+        self.assertIn("workers 2/10", line)
+        self.assertIn("fetch p50 250ms", line)
+        self.assertIn("2xx 3 4xx 1", line)
+
+    def test_prometheus_text(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+
+        # Act
+        text = crawl_metrics().to_prometheus()
+
+        # Assert
+        self.assertIn("# TYPE sitemappy_fetch_seconds histogram\n", text)
+        self.assertIn('sitemappy_fetch_seconds_bucket{le="0.1"} 0\n', text)
+        self.assertIn('sitemappy_fetch_seconds_bucket{le="0.25"} 1\n', text)
+        self.assertIn('sitemappy_fetch_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn('sitemappy_responses_total{status="404"} 1\n', text)
+        self.assertIn("sitemappy_queue_depth 12\n", text)
+
+
+class TestMetricsReporting(unittest.IsolatedAsyncioTestCase):
+    async def test_metrics_are_served(self) -> None:
+        # Arrange
+        server = MetricsServer(crawl_metrics)
+        serving = asyncio.create_task(server.serve(port=0))
+        self.addCleanup(serving.cancel)
+
+        while server.port is None:
+            await asyncio.sleep(0.01)
+
+        # Act
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{server.port}"
+        ) as client:
+            metrics = await client.get("/metrics")
+            missing = await client.get("/")
+
+        # Assert
+        self.assertEqual(HTTPStatus.OK, metrics.status_code)
+        self.assertIn("sitemappy_pages_crawled_total 4", metrics.text)
+        self.assertEqual(HTTPStatus.NOT_FOUND, missing.status_code)
+
+    @patch("sitemappy.metrics.asyncio.sleep", new_callable=AsyncMock)
+    async def test_stats_lines_are_printed(self, mock_sleep: AsyncMock) -> None:
+        # Arrange
+        output = io.StringIO()
+        mock_sleep.side_effect = [None, None, RuntimeError("Stop")]
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            await print_stats_periodically(crawl_metrics, 5.0, output)
+
+        # Assert
+        mock_sleep.assert_awaited_with(5.0)
+        self.assertEqual(2, len(output.getvalue().splitlines()))
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from parameterized import parameterized
+
+from sitemappy.politeness import PolitenessLimiter, TokenBucket
+
+
+@patch("sitemappy.politeness.time.monotonic", return_value=100.0)
+class TestTokenBucket(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            # Delay, Burst, Expected waits for consecutive reservations
+            (1.0, 1, [0.0, 1.0, 2.0]),
+            (0.5, 1, [0.0, 0.5, 1.0]),
+            (1.0, 2, [0.0, 0.0, 1.0]),
+            (0.25, 3, [0.0, 0.0, 0.0, 0.25]),
+        ]
+    )
+    def test_reservations_are_spaced_by_delay(
+        self,
+        _: Mock,
+        delay: float,
+        burst: int,
+        expected_waits: list[float],
+    ) -> None:
+        # Arrange
+        bucket = TokenBucket(delay, burst)
+
+        # Act
+        waits = [bucket.reserve() for _ in expected_waits]
+
+        # Assert
+        self.assertEqual(expected_waits, waits)
+
+    def test_bucket_refills_over_time(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        bucket = TokenBucket(delay=1.0, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+
+        # Act
+        mock_monotonic.return_value = 101.5
+        wait = bucket.reserve()
+
+        # Assert
+        self.assertEqual(0.0, wait)
+
+
+@patch("sitemappy.politeness.asyncio.sleep", new_callable=AsyncMock)
+class TestPolitenessLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_no_delay_never_waits(self, mock_sleep: AsyncMock) -> None:
+        # Arrange
+        limiter = PolitenessLimiter()
+
+        # Act
+        for _ in range(5):
+            await limiter.wait("https://monzo.com/")
+
+        # Assert
+        mock_sleep.assert_not_awaited()
+        self.assertEqual(5, limiter.requests)
+
+    async def test_hosts_are_limited_separately(self, mock_sleep: AsyncMock) -> None:
+        # Arrange
+        limiter = PolitenessLimiter(delay=1.0)
+
+        # Act
+        await limiter.wait("https://monzo.com/")
+        await limiter.wait("https://community.monzo.com/")
+
+        # Assert
+        mock_sleep.assert_not_awaited()
+
+    async def test_same_host_waits(self, mock_sleep: AsyncMock) -> None:
+        # Arrange
+        limiter = PolitenessLimiter(delay=1.0)
+
+        # Act
+        await limiter.wait("https://monzo.com/")
+        await limiter.wait("https://monzo.com/careers")
+
+        # Assert
+        mock_sleep.assert_awaited_once()
+
+    @patch("sitemappy.politeness.time.monotonic", return_value=100.0)
+    async def test_host_delay_slows_only_its_host(
+        self, _: Mock, mock_sleep: AsyncMock
+    ) -> None:
+        # Arrange
+        limiter = PolitenessLimiter(delay=1.0, burst=5)
+
+        # Act
+        limiter.set_host_delay("https://monzo.com", 10.0)
+        limiter.set_host_delay("https://community.monzo.com", 0.5)
+
+        for _request in range(2):
+            await limiter.wait("https://monzo.com/careers")
+            await limiter.wait("https://community.monzo.com/")
+
+        # Assert - The shorter delay keeps the politeness delay and its burst
+        mock_sleep.assert_awaited_once_with(10.0)
+
+    @patch("sitemappy.politeness.time.monotonic", side_effect=[0.0, 2.0, 4.0])
+    async def test_achieved_rate(self, *_: Mock) -> None:
+        # Arrange
+        limiter = PolitenessLimiter()
+
+        # Act
+        for _request in range(3):
+            await limiter.wait("https://monzo.com/")
+
+        # Assert
+        self.assertEqual(0.5, limiter.achieved_rate)
+
+    async def test_achieved_rate_without_requests(self, _: AsyncMock) -> None:
+        # Arrange
+        limiter = PolitenessLimiter()
+
+        # Act
+        rate = limiter.achieved_rate
+
+        # Assert
+        self.assertEqual(0.0, rate)
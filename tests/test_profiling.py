@@ -0,0 +1,156 @@
+import asyncio
+import io
+import os
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+from types import FrameType
+
+from parameterized import parameterized
+
+from sitemappy.link_graph import LinkGraph
+from sitemappy.metrics import CrawlMetrics, print_stats_periodically
+from sitemappy.profiling import LoopLagMonitor, ProfileMode, describe_site, profile
+
+BASE_URL = "https://monzo.com"
+
+
+def busy_wait(seconds: float) -> None:
+    finish_at = time.perf_counter() + seconds
+
+    while time.perf_counter() < finish_at:
+        pass
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self) -> None:
+        output_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(output_directory.cleanup)
+        self.output = os.path.join(output_directory.name, "profile")
+
+    def test_cprofile(self) -> None:
+        # Act
+        with profile(ProfileMode.CPROFILE, self.output):
+            busy_wait(0.01)
+
+        # Assert
+        stats = pstats.Stats(self.output).get_stats_profile()
+        self.assertIn("busy_wait", stats.func_profiles)
+
+    def test_sampling(self) -> None:
+        # Act
+        with profile(ProfileMode.SAMPLING, self.output):
+            busy_wait(0.1)
+
+        # Assert
+        with open(self.output, encoding="utf-8") as folded:
+            stack, _, count = folded.readline().rpartition(" ")
+
+        self.assertIn(f"{__name__}:TestProfile.test_sampling;", stack)
+        self.assertTrue(stack.endswith(f"{__name__}:busy_wait"))
+        self.assertGreater(int(count), 1)
+
+    @parameterized.expand([ProfileMode.CPROFILE, ProfileMode.SAMPLING])  # type: ignore[misc]
+    def test_profile_written_when_crawl_raises(self, mode: ProfileMode) -> None:
+        # Act
+        with self.assertRaises(KeyboardInterrupt), profile(mode, self.output):
+            busy_wait(0.01)
+            raise KeyboardInterrupt
+
+        # Assert
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_tracemalloc(self) -> None:
+        # Arrange
+        results = LinkGraph()
+
+        # Act
+        with profile(ProfileMode.TRACEMALLOC, self.output):
+            for index in range(1000):
+                results.add(f"{BASE_URL}/{index}", [f"{BASE_URL}/{index + 1}"])
+
+        # Assert
+        with open(self.output, encoding="utf-8") as report:
+            summary, _, *sites = report.read().splitlines()
+
+        self.assertIn("MiB still allocated", summary)
+        self.assertTrue(
+            any(os.path.join("sitemappy", "link_graph.py") in site for site in sites)
+        )
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (ProfileMode.NONE, "profile"),
+            (ProfileMode.CPROFILE, None),
+        ]
+    )
+    def test_no_profile(self, mode: ProfileMode, output: str | None) -> None:
+        # Act
+        with profile(mode, output and self.output):
+            busy_wait(0.001)
+
+        # Assert
+        self.assertFalse(os.path.exists(self.output))
+
+
+class TestLoopLagMonitor(unittest.IsolatedAsyncioTestCase):
+    async def test_blocking_callback_is_flagged(self) -> None:
+        # Arrange
+        output = io.StringIO()
+        monitor = LoopLagMonitor(0.02, output)
+        monitoring = asyncio.create_task(monitor.monitor())
+        self.addCleanup(monitoring.cancel)
+        await asyncio.sleep(0.05)
+
+        # Act
+        busy_wait(0.2)
+        await asyncio.sleep(0.05)
+
+        # Assert
+        self.assertEqual(1, monitor.blocks.total())
+        self.assertIn("busy_wait", next(iter(monitor.blocks)))
+        self.assertGreaterEqual(monitor.longest, 0.15)
+        self.assertIn("Event loop blocked for", output.getvalue())
+
+    async def test_idle_loop_is_not_flagged(self) -> None:
+        # Arrange
+        output = io.StringIO()
+        monitor = LoopLagMonitor(0.05, output)
+
+        # Act
+        monitoring = asyncio.create_task(monitor.monitor())
+        await asyncio.sleep(0.2)
+        monitoring.cancel()
+
+        # Assert
+        self.assertEqual(0, monitor.blocks.total())
+        self.assertEqual("", output.getvalue())
+
+
+class TestDescribeSite(unittest.IsolatedAsyncioTestCase):
+    async def test_sitemappy_caller_is_named(self) -> None:
+        # Arrange
+        frames: list[FrameType] = []
+
+        def capture_frame() -> CrawlMetrics:
+            frames.append(sys._getframe())
+            raise RuntimeError("Stop")
+
+        with self.assertRaises(RuntimeError):
+            await print_stats_periodically(capture_frame, 0)
+
+        # Act
+        site = describe_site(frames[0])
+
+        # Assert
+        self.assertTrue(site.startswith(f"{__name__}:"))
+        self.assertIn(
+            "called from sitemappy.metrics:", site.partition("capture_frame")[2]
+        )
+        self.assertTrue(site.endswith("in print_stats_periodically"))
+
+    def test_unknown_site(self) -> None:
+        # Act / Assert
+        self.assertEqual("unknown", describe_site(None))
@@ -0,0 +1,48 @@
+import unittest
+
+from parameterized import parameterized
+
+from sitemappy.redirects import RedirectCache
+
+BASE_URL = "https://monzo.com"
+
+
+class TestRedirectCache(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            # (URL, Expected end of chain)
+            (f"{BASE_URL}/old", f"{BASE_URL}/new/"),
+            (f"{BASE_URL}/OLD", f"{BASE_URL}/OLD"),
+            (f"{BASE_URL}/old/", f"{BASE_URL}/new/"),
+            (f"{BASE_URL}/moved", f"{BASE_URL}/new/"),
+            (f"{BASE_URL}/new", f"{BASE_URL}/new/"),
+            (f"{BASE_URL}/about", f"{BASE_URL}/about"),
+        ]
+    )
+    def test_resolve(self, url: str, expected: str) -> None:
+        # Arrange
+        redirects = RedirectCache()
+        redirects.record(f"{BASE_URL}/old", f"{BASE_URL}/moved")
+        redirects.record(f"{BASE_URL}/moved", f"{BASE_URL}/new")
+        redirects.record(f"{BASE_URL}/new", f"{BASE_URL}/new/")
+
+        # Act / Assert
+        self.assertEqual(expected, redirects.resolve(url))
+
+    def test_resolve_stops_at_loop(self) -> None:
+        # Arrange
+        redirects = RedirectCache()
+        redirects.record(f"{BASE_URL}/a", f"{BASE_URL}/b")
+        redirects.record(f"{BASE_URL}/b", f"{BASE_URL}/a")
+
+        # Act / Assert
+        self.assertEqual(f"{BASE_URL}/b", redirects.resolve(f"{BASE_URL}/a"))
+
+    def test_resolve_stops_at_max_redirects(self) -> None:
+        # Arrange
+        redirects = RedirectCache(max_redirects=3)
+        for index in range(10):
+            redirects.record(f"{BASE_URL}/{index}", f"{BASE_URL}/{index + 1}")
+
+        # Act / Assert
+        self.assertEqual(f"{BASE_URL}/3", redirects.resolve(f"{BASE_URL}/0"))
@@ -0,0 +1,158 @@
+import unittest
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+from parameterized import parameterized
+
+from sitemappy.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+PAGE_URL = "https://monzo.com/about"
+OTHER_HOST_URL = "https://community.monzo.com/"
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (None, None),
+            ("", None),
+            ("120", 120.0),
+            (" 5 ", 5.0),
+            ("soon", None),
+            ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ]
+    )
+    def test_parse_retry_after(self, value: str | None, expected: float | None) -> None:
+        # Act / Assert
+        self.assertEqual(expected, parse_retry_after(value))
+
+    def test_http_date_is_seconds_from_now(self) -> None:
+        # Arrange
+        retry_at = datetime.now(UTC) + timedelta(seconds=60)
+
+        # Act
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+        # Assert
+        self.assertAlmostEqual(60, delay or 0, delta=2)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    @patch("sitemappy.retry.random.uniform")
+    def test_backoff_doubles_up_to_maximum(self, mock_uniform: Mock) -> None:
+        # Arrange
+        mock_uniform.side_effect = lambda _, ceiling: ceiling
+        policy = RetryPolicy(max_retries=5, backoff_base=1, backoff_max=5)
+
+        # Act
+        delays = [policy.delay(retries) for retries in range(5)]
+
+        # Assert
+        self.assertEqual([1, 2, 4, 5, 5], delays)
+
+    def test_retries_are_bounded(self) -> None:
+        # Arrange
+        policy = RetryPolicy(max_retries=2)
+
+        # Act / Assert
+        self.assertIsNotNone(policy.delay(1))
+        self.assertIsNone(policy.delay(2))
+        self.assertIsNone(RetryPolicy(max_retries=0).delay(0))
+
+    def test_retry_after_is_respected(self) -> None:
+        # Arrange
+        policy = RetryPolicy(backoff_max=30)
+
+        # Act / Assert
+        self.assertEqual(12.0, policy.delay(0, retry_after=12.0))
+        # Waiting longer than the maximum backoff gives up on the page
+        self.assertIsNone(policy.delay(0, retry_after=3600.0))
+
+
+@patch("sitemappy.retry.time.monotonic")
+class TestCircuitBreaker(unittest.TestCase):
+    def test_circuit_opens_after_consecutive_failures(
+        self, mock_monotonic: Mock
+    ) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=3)
+
+        # Act
+        breaker.record_failure(PAGE_URL)
+        breaker.record_failure(PAGE_URL)
+        opened_early = breaker.is_open(PAGE_URL)
+        breaker.record_failure(PAGE_URL)
+
+        # Assert
+        self.assertFalse(opened_early)
+        self.assertTrue(breaker.is_open(PAGE_URL))
+        self.assertFalse(breaker.is_open(OTHER_HOST_URL))
+        self.assertEqual(30.0, breaker.wait_time(f"{PAGE_URL}/careers"))
+        self.assertEqual(0.0, breaker.wait_time(OTHER_HOST_URL))
+
+    def test_success_resets_failures(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        # Act
+        breaker.record_failure(PAGE_URL)
+        breaker.record_success(PAGE_URL)
+        breaker.record_failure(PAGE_URL)
+
+        # Assert
+        self.assertFalse(breaker.is_open(PAGE_URL))
+
+    def test_trial_request_after_reset_timeout(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure(PAGE_URL)
+
+        # Act
+        mock_monotonic.return_value += 10
+        trial_wait = breaker.wait_time(PAGE_URL)
+
+        # Assert - Only the trial request is let through until it finishes
+        self.assertEqual(0.0, trial_wait)
+        self.assertEqual(10.0, breaker.wait_time(PAGE_URL))
+
+        breaker.record_success(PAGE_URL)
+        self.assertEqual(0.0, breaker.wait_time(PAGE_URL))
+        self.assertFalse(breaker.is_open(PAGE_URL))
+
+    def test_host_is_down_after_failed_trials(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, max_trials=2)
+        breaker.record_failure(PAGE_URL)
+
+        # Act
+        for _ in range(2):
+            mock_monotonic.return_value += 10
+            breaker.wait_time(PAGE_URL)
+            breaker.record_failure(PAGE_URL)
+
+        mock_monotonic.return_value += 10
+
+        # Assert
+        with self.assertRaises(CircuitOpenError):
+            breaker.wait_time(PAGE_URL)
+
+    def test_zero_threshold_never_opens(self, mock_monotonic: Mock) -> None:
+        # Arrange
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=0)
+
+        # Act
+        for _ in range(100):
+            breaker.record_failure(PAGE_URL)
+
+        # Assert
+        self.assertFalse(breaker.is_open(PAGE_URL))
@@ -0,0 +1,183 @@
+import asyncio
+import unittest
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import httpx
+from parameterized import parameterized
+
+from sitemappy.robots import (
+    MAX_CRAWL_DELAY_S,
+    ROBOTS_MAX_BYTES,
+    RobotsCache,
+    RobotsRules,
+    parse_robots,
+)
+
+BASE_URL = "https://monzo.com"
+
+ROBOTS_TXT = """
+# Every crawler
+User-agent: *
+Disallow: /private
+Allow: /private/open
+Disallow: /*.pdf$
+Disallow: /search?q=
+
+User-agent: sitemappy
+User-agent: other-bot
+Disallow: /careers/  # Trailing comment
+Crawl-delay: 2.5
+
+User-agent: sitemappy
+Allow: /careers/jobs
+"""
+
+
+class TestParseRobots(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("/", True),
+            ("/careers", True),
+            ("/careers/", False),
+            ("/careers/jobs/engineer", True),
+            # Groups for another user agent are ignored
+            ("/private", True),
+        ]
+    )
+    def test_group_for_user_agent(self, path: str, expected: bool) -> None:
+        # Arrange
+        rules = parse_robots(ROBOTS_TXT)
+
+        # Act / Assert
+        self.assertEqual(expected, rules.allowed(path))
+        self.assertEqual(2.5, rules.crawl_delay)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("/about", True),
+            ("/private", False),
+            ("/private/keys", False),
+            ("/private/open", True),
+            ("/private/open/door", True),
+            ("/report.pdf", False),
+            ("/report.pdf?download=1", True),
+            ("/search?q=cards", False),
+            ("/search", True),
+        ]
+    )
+    def test_group_for_any_user_agent(self, path: str, expected: bool) -> None:
+        # Arrange
+        rules = parse_robots(ROBOTS_TXT, user_agent="unknown-bot")
+
+        # Act / Assert
+        self.assertEqual(expected, rules.allowed(path))
+        self.assertIsNone(rules.crawl_delay)
+
+    def test_allow_wins_tie(self) -> None:
+        # Arrange
+        rules = RobotsRules([(False, "/page"), (True, "/page")])
+
+        # Act / Assert
+        self.assertTrue(rules.allowed("/page"))
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            ("User-agent: *\nDisallow:\n",),
+            ("",),
+            ("Disallow: /\n",),
+        ]
+    )
+    def test_rules_that_allow_everything(self, robots_txt: str) -> None:
+        # Act / Assert
+        self.assertTrue(parse_robots(robots_txt).allowed("/"))
+
+    def test_crawl_delay_is_capped(self) -> None:
+        # Act
+        rules = parse_robots("User-agent: *\nCrawl-delay: 86400\n")
+
+        # Assert
+        self.assertEqual(MAX_CRAWL_DELAY_S, rules.crawl_delay)
+
+    def test_sitemaps_listed_for_every_user_agent(self) -> None:
+        # Arrange
+        robots_txt = (
+            f"Sitemap: {BASE_URL}/sitemap.xml\n"
+            "User-agent: other-bot\n"
+            f"Sitemap: {BASE_URL}/news.xml\n"
+            "Disallow: /\n"
+        )
+
+        # Act
+        rules = parse_robots(robots_txt)
+
+        # Assert
+        self.assertEqual(
+            [f"{BASE_URL}/sitemap.xml", f"{BASE_URL}/news.xml"], rules.sitemaps
+        )
+        self.assertTrue(rules.allowed("/"))
+
+
+class TestRobotsCache(unittest.IsolatedAsyncioTestCase):
+    def create_cache(
+        self,
+        response: httpx.Response | type[httpx.RequestError],
+        limiter: Mock | None = None,
+    ) -> tuple[RobotsCache, list[httpx.Request]]:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+
+            if isinstance(response, httpx.Response):
+                return response
+            raise response("Failed", request=request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        return RobotsCache(client, limiter=limiter), requests
+
+    async def test_robots_txt_is_fetched_once_per_host(self) -> None:
+        # Arrange
+        limiter = Mock()
+        cache, requests = self.create_cache(
+            httpx.Response(HTTPStatus.OK, text=ROBOTS_TXT), limiter
+        )
+
+        # Act
+        allowed = await asyncio.gather(
+            cache.allowed(f"{BASE_URL}/"),
+            cache.allowed(f"{BASE_URL}/careers/"),
+            cache.allowed(f"{BASE_URL}/careers/jobs"),
+        )
+
+        # Assert
+        self.assertEqual([True, False, True], allowed)
+        self.assertEqual([f"{BASE_URL}/robots.txt"], [str(r.url) for r in requests])
+        limiter.set_host_delay.assert_called_once_with(BASE_URL, 2.5)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (httpx.Response(HTTPStatus.NOT_FOUND), True),
+            (httpx.Response(HTTPStatus.FORBIDDEN), True),
+            (httpx.Response(HTTPStatus.TOO_MANY_REQUESTS), False),
+            (httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE), False),
+            (httpx.ConnectError, False),
+        ]
+    )
+    async def test_missing_or_unreachable_robots_txt(
+        self, response: httpx.Response | type[httpx.RequestError], expected: bool
+    ) -> None:
+        # Arrange
+        cache, _ = self.create_cache(response)
+
+        # Act / Assert
+        self.assertEqual(expected, await cache.allowed(f"{BASE_URL}/about"))
+
+    async def test_rules_beyond_size_limit_are_ignored(self) -> None:
+        # Arrange
+        robots_txt = "User-agent: *\n" + "#" * ROBOTS_MAX_BYTES + "\nDisallow: /\n"
+        cache, _ = self.create_cache(httpx.Response(HTTPStatus.OK, text=robots_txt))
+
+        # Act / Assert
+        self.assertTrue(await cache.allowed(f"{BASE_URL}/about"))
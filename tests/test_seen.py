@@ -0,0 +1,66 @@
+import unittest
+
+from parameterized import parameterized
+
+from sitemappy.seen import (
+    BloomSeenSet,
+    FingerprintSeenSet,
+    SeenSetBackend,
+    create_seen_set,
+    fingerprint,
+)
+
+
+class TestSeenSets(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [(backend,) for backend in SeenSetBackend]
+    )
+    def test_added_urls_are_seen(self, backend: SeenSetBackend) -> None:
+        # Arrange
+        seen_set = create_seen_set(backend)
+        urls = [f"https://monzo.com/{index}" for index in range(1_000)]
+
+        # Act
+        for url in urls:
+            seen_set.add(url)
+
+        # Assert
+        self.assertEqual(len(urls), len(seen_set))
+        self.assertTrue(all(url in seen_set for url in urls))
+        self.assertNotIn("https://monzo.com/careers", seen_set)
+
+    def test_fingerprint_is_64_bit(self) -> None:
+        # Act
+        url_fingerprint = fingerprint("https://monzo.com/")
+
+        # Assert
+        self.assertLess(url_fingerprint, 2**64)
+        self.assertEqual(url_fingerprint, fingerprint("https://monzo.com/"))
+
+    def test_fingerprint_seen_set_stores_integers(self) -> None:
+        # Arrange
+        seen_set = FingerprintSeenSet()
+
+        # Act
+        seen_set.add("https://monzo.com/")
+
+        # Assert
+        self.assertIn("https://monzo.com/", seen_set)
+        self.assertNotIn(fingerprint("https://monzo.com/"), seen_set)
+
+    def test_bloom_false_positive_rate(self) -> None:
+        # Arrange
+        capacity = 10_000
+        error_rate = 0.01
+        seen_set = BloomSeenSet(capacity=capacity, error_rate=error_rate)
+
+        # Act
+        for index in range(capacity):
+            seen_set.add(f"https://monzo.com/seen/{index}")
+
+        false_positives = sum(
+            f"https://monzo.com/unseen/{index}" in seen_set for index in range(capacity)
+        )
+
+        # Assert
+        self.assertLess(false_positives / capacity, error_rate * 2)
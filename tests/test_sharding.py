@@ -0,0 +1,221 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+import unittest
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest import mock
+from unittest.mock import AsyncMock
+
+from parameterized import parameterized
+
+from sitemappy.crawl_options import MonitoringOptions, OutputOptions
+from sitemappy.sharding import STOP, ShardCrawler, ShardedCrawler, shard_of
+from sitemappy.urls import canonicalize_url
+
+NUMBER_OF_PAGES = 30
+
+
+def site_links(url: str) -> list[str]:
+    """
+    Links of a synthetic site, where every page links to the next three pages
+    and back to the home page.
+    """
+    path = url.rstrip("/").rsplit("/", 1)[-1]
+    index = int(path) if path.isdigit() else 0
+
+    return ["/"] + [
+        f"/{page}" for page in range(index + 1, min(index + 4, NUMBER_OF_PAGES))
+    ]
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        links = "".join(f"<a href='{link}'>link</a>" for link in site_links(self.path))
+        body = f"<html>{links}</html>".encode()
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+
+class TestShardOf(unittest.TestCase):
+    @parameterized.expand([(1,), (2,), (7,)])  # type: ignore[misc]
+    def test_every_link_has_one_owner_in_range(self, shards: int) -> None:
+        # Act
+        owners = {
+            shard_of(f"https://monzo.com/{index}", shards) for index in range(100)
+        }
+
+        # Assert
+        self.assertTrue(owners.issubset(range(shards)))
+        self.assertEqual(shards, len(owners))
+
+
+@mock.patch("sitemappy.crawler.AsyncScraper.get_links", new_callable=AsyncMock)
+class TestShardCrawler(unittest.IsolatedAsyncioTestCase):
+    async def test_shards_partition_the_crawl(
+        self, mock_scraper_get_links: AsyncMock
+    ) -> None:
+        # Arrange
+        base_url = "http://localhost"
+        shards = 3
+
+        async def get_links(url: str) -> list[str]:
+            return [f"{base_url}{link}" for link in site_links(url)]
+
+        mock_scraper_get_links.side_effect = get_links
+
+        inboxes: list[Any] = [queue.Queue() for _ in range(shards)]
+        outstanding = multiprocessing.Value("q", 1)
+        crawlers = [
+            ShardCrawler(base_url, shard, inboxes, outstanding)
+            for shard in range(shards)
+        ]
+
+        async def stop_when_finished() -> None:
+            while outstanding.value:
+                await asyncio.sleep(0.01)
+
+            for inbox in inboxes:
+                inbox.put(STOP)
+
+        # Act
+        stopper = asyncio.create_task(stop_when_finished())
+        shard_results = await asyncio.wait_for(
+            asyncio.gather(*(crawler.crawl() for crawler in crawlers)), timeout=10
+        )
+        await stopper
+
+        # Assert
+        crawled = [page for results in shard_results for page in results]
+        expected = {base_url} | {
+            f"{base_url}/{index}" for index in range(1, NUMBER_OF_PAGES)
+        }
+
+        self.assertEqual(len(expected), len(crawled))
+        self.assertEqual(expected, set(crawled))
+        self.assertEqual(0, outstanding.value)
+
+        for shard, results in enumerate(shard_results):
+            for page in results:
+                if page != base_url:
+                    self.assertEqual(shard, shard_of(canonicalize_url(page), shards))
+
+    async def test_redirect_target_is_crawled_by_its_shard(
+        self, mock_scraper_get_links: AsyncMock
+    ) -> None:
+        # Arrange
+        base_url = "http://localhost"
+        old_url, new_url = f"{base_url}/old", f"{base_url}/new"
+        site = {
+            base_url: [old_url, f"{base_url}/about"],
+            f"{base_url}/about": [new_url],
+            old_url: [],
+            new_url: [],
+        }
+
+        inboxes: list[Any] = [queue.Queue() for _ in range(2)]
+        outstanding = multiprocessing.Value("q", 1)
+        crawlers = [
+            ShardCrawler(base_url, shard, inboxes, outstanding) for shard in range(2)
+        ]
+
+        async def get_links(url: str) -> list[str]:
+            if url == old_url:
+                for crawler in crawlers:
+                    if crawler.redirects:
+                        crawler.redirects.record(old_url, new_url)
+
+            return site[url]
+
+        mock_scraper_get_links.side_effect = get_links
+
+        async def stop_when_finished() -> None:
+            while outstanding.value:
+                await asyncio.sleep(0.01)
+
+            for inbox in inboxes:
+                inbox.put(STOP)
+
+        # Act
+        stopper = asyncio.create_task(stop_when_finished())
+        shard_results = await asyncio.wait_for(
+            asyncio.gather(*(crawler.crawl() for crawler in crawlers)), timeout=10
+        )
+        await stopper
+
+        # Assert
+        self.assertNotEqual(shard_of(old_url, 2), shard_of(new_url, 2))
+        self.assertEqual(
+            [shard_of(new_url, 2)],
+            [
+                shard
+                for shard, results in enumerate(shard_results)
+                if new_url in results
+            ],
+        )
+        self.assertEqual([new_url], shard_results[shard_of(old_url, 2)][old_url])
+
+
+class TestShardedCrawler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    async def test_crawl_across_processes(self) -> None:
+        # Arrange
+        base_url = f"http://localhost:{self.server.server_port}/"
+        crawler = ShardedCrawler(base_url, processes=2, number_of_workers=2)
+
+        # Act
+        results = await asyncio.wait_for(crawler.crawl(), timeout=60)
+
+        # Assert
+        expected = {base_url} | {
+            f"{base_url}{index}" for index in range(1, NUMBER_OF_PAGES)
+        }
+
+        self.assertEqual(expected, set(results))
+        self.assertEqual(
+            [f"{base_url}{link.lstrip('/')}" for link in site_links(base_url)],
+            results[base_url],
+        )
+
+    def test_politeness_delay_is_spread_across_processes(self) -> None:
+        # Act
+        crawler = ShardedCrawler("https://monzo.com", processes=4, politeness_delay=1)
+
+        # Assert
+        self.assertEqual(4, crawler.crawler_kwargs["politeness_delay"])
+
+    def test_reports_are_written_once_rather_than_by_each_process(self) -> None:
+        # Arrange
+        outputs = OutputOptions(
+            failures_output="result.failures.json", metrics_output="result.metrics.json"
+        )
+        monitoring = MonitoringOptions(stats_interval=5, metrics_port=9464)
+
+        # Act
+        crawler = ShardedCrawler(
+            "https://monzo.com", processes=2, outputs=outputs, monitoring=monitoring
+        )
+
+        # Assert
+        self.assertEqual("result.failures.json", crawler.failures_output)
+        self.assertEqual("result.metrics.json", crawler.metrics_output)
+        self.assertEqual(OutputOptions(), crawler.crawler_kwargs["outputs"])
+        self.assertEqual(MonitoringOptions(), crawler.crawler_kwargs["monitoring"])
@@ -0,0 +1,184 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from xml.etree import ElementTree
+
+from sitemappy.sinks import (
+    SITEMAP_NAMESPACE,
+    NdjsonFileSink,
+    NdjsonSink,
+    SitemapXmlSink,
+    StdoutSink,
+)
+
+LOC = f"{{{SITEMAP_NAMESPACE}}}loc"
+
+
+class TestNdjsonSink(unittest.TestCase):
+    def test_pages_are_written_in_batches(self) -> None:
+        # Arrange
+        file = io.StringIO()
+        sink = NdjsonSink(file, batch_size=2)
+
+        # Act
+        sink.write("https://monzo.com", ["https://monzo.com/about"])
+        before_batch = file.getvalue()
+        sink.write("https://monzo.com/about", [])
+        after_batch = file.getvalue()
+
+        # Assert
+        self.assertEqual("", before_batch)
+        self.assertEqual(
+            [
+                {"https://monzo.com": ["https://monzo.com/about"]},
+                {"https://monzo.com/about": []},
+            ],
+            [json.loads(line) for line in after_batch.splitlines()],
+        )
+        self.assertEqual(2, sink.pages_written)
+        self.assertEqual(1, sink.links_written)
+
+    def test_close_flushes_partial_batch(self) -> None:
+        # Arrange
+        file = io.StringIO()
+        sink = NdjsonSink(file)
+        sink.write("https://monzo.com", [])
+
+        # Act
+        sink.close()
+
+        # Assert
+        self.assertEqual('{"https://monzo.com": []}\n', file.getvalue())
+
+    def test_file_sink_replaces_file(self) -> None:
+        # Arrange
+        output_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(output_directory.cleanup)
+        path = os.path.join(output_directory.name, "result.ndjson")
+
+        with open(path, "w") as existing_file:
+            existing_file.write('{"https://monzo.com/old": []}\n')
+
+        # Act
+        sink = NdjsonFileSink(path)
+        sink.write("https://monzo.com", [])
+        sink.close()
+
+        # Assert
+        self.assertTrue(sink.file.closed)
+        with open(path) as result_file:
+            self.assertEqual('{"https://monzo.com": []}\n', result_file.read())
+
+    def test_stdout_sink_prints_pages(self) -> None:
+        # Arrange
+        stdout = io.StringIO()
+
+        # Act
+        with redirect_stdout(stdout):
+            sink = StdoutSink()
+            sink.write("https://monzo.com", [])
+            sink.close()
+
+        # Assert
+        self.assertEqual('{"https://monzo.com": []}\n', stdout.getvalue())
+
+
+class TestSitemapXmlSink(unittest.TestCase):
+    def setUp(self) -> None:
+        output_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(output_directory.cleanup)
+        self.path = os.path.join(output_directory.name, "sitemap.xml")
+
+    @staticmethod
+    def read_locations(path: str) -> list[str]:
+        opener = gzip.open if path.endswith(".gz") else open
+
+        with opener(path, "rb") as sitemap_file:
+            # Only parses sitemaps written by the test
+            root = ElementTree.parse(sitemap_file).getroot()  # noqa: S314
+
+        return [location.text or "" for location in root.iter(LOC)]
+
+    def test_pages_are_written_to_gzipped_urlset(self) -> None:
+        # Arrange
+        pages = ["https://monzo.com/", "https://monzo.com/search?q=a&page=2"]
+        sink = SitemapXmlSink(self.path, sitemap_url="https://monzo.com")
+
+        # Act
+        for page in pages:
+            sink.write(page, ["https://monzo.com/about"])
+        sink.close()
+
+        # Assert
+        self.assertEqual(
+            ["https://monzo.com/sitemap-1.xml.gz"], self.read_locations(self.path)
+        )
+        self.assertEqual(pages, self.read_locations(sink.urlset_paths[0]))
+        self.assertEqual(2, sink.pages_written)
+        self.assertEqual(2, sink.links_written)
+
+    def test_unlisted_pages_are_left_out(self) -> None:
+        # Arrange
+        sink = SitemapXmlSink(self.path, sitemap_url="https://monzo.com")
+
+        # Act
+        sink.write("https://monzo.com/old", ["https://monzo.com/new"], listed=False)
+        sink.write("https://monzo.com/new", ["https://monzo.com/about"])
+        sink.close()
+
+        # Assert
+        self.assertEqual(
+            ["https://monzo.com/new"], self.read_locations(sink.urlset_paths[0])
+        )
+        self.assertEqual(2, sink.pages_written)
+        self.assertEqual(1, sink.urls_written)
+
+    def test_urlset_is_split_at_url_limit(self) -> None:
+        # Arrange
+        pages = [f"https://monzo.com/page-{index}" for index in range(5)]
+        sink = SitemapXmlSink(self.path, "https://monzo.com/", max_urls=2)
+
+        # Act
+        for page in pages:
+            sink.write(page, [])
+        sink.close()
+
+        # Assert
+        self.assertEqual(
+            [f"https://monzo.com/sitemap-{number}.xml.gz" for number in (1, 2, 3)],
+            self.read_locations(self.path),
+        )
+        self.assertEqual(
+            pages,
+            [
+                page
+                for urlset_path in sink.urlset_paths
+                for page in self.read_locations(urlset_path)
+            ],
+        )
+
+    def test_urlset_is_split_at_size_limit(self) -> None:
+        # Arrange
+        sink = SitemapXmlSink(self.path, "https://monzo.com/", max_bytes=200)
+
+        # Act
+        for index in range(4):
+            sink.write(f"https://monzo.com/page-{index}", [])
+        sink.close()
+
+        # Assert
+        self.assertGreater(len(sink.urlset_paths), 1)
+        for urlset_path in sink.urlset_paths:
+            with gzip.open(urlset_path, "rb") as urlset_file:
+                self.assertLessEqual(len(urlset_file.read()), 200)
+
+    def test_empty_crawl_writes_empty_index(self) -> None:
+        # Act
+        SitemapXmlSink(self.path, "https://monzo.com/").close()
+
+        # Assert
+        self.assertEqual([], self.read_locations(self.path))
@@ -0,0 +1,183 @@
+import gzip
+import unittest
+from http import HTTPStatus
+
+import httpx
+from parameterized import parameterized
+
+from sitemappy.robots import RobotsCache
+from sitemappy.sitemap_reader import SitemapEntry, SitemapParser, SitemapSeeder
+
+BASE_URL = "https://monzo.com"
+
+SITEMAP_NAMESPACE = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*urls: str) -> bytes:
+    entries = "".join(
+        f"<url><loc> {url} </loc><lastmod>2024-01-01</lastmod></url>" for url in urls
+    )
+    return (
+        f'<?xml version="1.0"?><urlset {SITEMAP_NAMESPACE}>{entries}</urlset>'.encode()
+    )
+
+
+def sitemap_index(*sitemaps: str) -> bytes:
+    entries = "".join(
+        f"<sitemap><loc>{sitemap}</loc></sitemap>" for sitemap in sitemaps
+    )
+    return f"<sitemapindex {SITEMAP_NAMESPACE}>{entries}</sitemapindex>".encode()
+
+
+def parse(parser: SitemapParser, content: bytes, chunk_size: int) -> list[str]:
+    entries = []
+
+    for start in range(0, len(content), chunk_size):
+        entries += parser.feed(content[start : start + chunk_size])
+
+    entries += parser.close()
+
+    return [location for _, location in entries]
+
+
+class TestSitemapParser(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [(1,), (7,), (1024,)]
+    )
+    def test_urls_parsed_across_chunks(self, chunk_size: int) -> None:
+        # Arrange
+        urls = [f"{BASE_URL}/page-{index}" for index in range(20)]
+
+        # Act
+        parsed = parse(SitemapParser(), urlset(*urls), chunk_size)
+
+        # Assert
+        self.assertEqual(urls, parsed)
+
+    def test_gzipped_sitemap(self) -> None:
+        # Arrange
+        urls = [f"{BASE_URL}/page-{index}" for index in range(20)]
+
+        # Act
+        parsed = parse(SitemapParser(), gzip.compress(urlset(*urls)), 16)
+
+        # Assert
+        self.assertEqual(urls, parsed)
+
+    def test_sitemap_index_entries(self) -> None:
+        # Arrange
+        parser = SitemapParser()
+
+        # Act
+        entries = parser.feed(sitemap_index(f"{BASE_URL}/sitemap-1.xml.gz"))
+        entries += parser.close()
+
+        # Assert
+        self.assertEqual(
+            [(SitemapEntry.SITEMAP, f"{BASE_URL}/sitemap-1.xml.gz")], entries
+        )
+
+    def test_finished_entries_are_discarded(self) -> None:
+        # Arrange
+        parser = SitemapParser()
+        content = urlset(*(f"{BASE_URL}/page-{index}" for index in range(1000)))
+
+        # Act
+        parse(parser, content, 512)
+
+        # Assert
+        self.assertIsNotNone(parser._root)
+        self.assertEqual(0, len(list(parser._root or [])))
+
+    def test_sitemap_beyond_size_limit_is_cut_short(self) -> None:
+        # Arrange
+        content = urlset(*(f"{BASE_URL}/page-{index}" for index in range(1000)))
+        parser = SitemapParser(max_bytes=len(content) // 2)
+
+        # Act
+        parsed = parse(parser, gzip.compress(content), 64)
+
+        # Assert
+        self.assertTrue(parser.exhausted)
+        self.assertLess(0, len(parsed))
+        self.assertGreater(1000, len(parsed))
+
+
+class TestSitemapSeeder(unittest.IsolatedAsyncioTestCase):
+    def create_seeder(self, responses: dict[str, httpx.Response]) -> SitemapSeeder:
+        self.requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requested.append(str(request.url))
+            return responses.get(str(request.url), httpx.Response(HTTPStatus.NOT_FOUND))
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        return SitemapSeeder(client, RobotsCache(client))
+
+    async def test_sitemaps_listed_in_robots_txt_are_followed(self) -> None:
+        # Arrange
+        seeder = self.create_seeder(
+            {
+                f"{BASE_URL}/robots.txt": httpx.Response(
+                    HTTPStatus.OK, text=f"Sitemap: {BASE_URL}/index.xml\n"
+                ),
+                f"{BASE_URL}/index.xml": httpx.Response(
+                    HTTPStatus.OK,
+                    content=sitemap_index(
+                        f"{BASE_URL}/pages.xml.gz",
+                        f"{BASE_URL}/missing.xml",
+                        f"{BASE_URL}/index.xml",
+                    ),
+                ),
+                f"{BASE_URL}/pages.xml.gz": httpx.Response(
+                    HTTPStatus.OK,
+                    content=gzip.compress(urlset(f"{BASE_URL}/about", BASE_URL)),
+                ),
+            }
+        )
+
+        # Act
+        urls = [url async for url in seeder.urls(BASE_URL)]
+
+        # Assert
+        self.assertEqual([f"{BASE_URL}/about", BASE_URL], urls)
+        self.assertEqual(3, seeder.sitemaps_read)
+        self.assertEqual([f"{BASE_URL}/missing.xml"], list(seeder.errors))
+
+    async def test_well_known_sitemaps_are_probed(self) -> None:
+        # Arrange
+        seeder = self.create_seeder(
+            {
+                f"{BASE_URL}/sitemap.xml": httpx.Response(
+                    HTTPStatus.OK, content=urlset(f"{BASE_URL}/about")
+                ),
+            }
+        )
+
+        # Act
+        urls = [url async for url in seeder.urls(BASE_URL)]
+
+        # Assert
+        self.assertEqual([f"{BASE_URL}/about"], urls)
+        self.assertIn(f"{BASE_URL}/sitemap_index.xml", self.requested)
+        self.assertEqual({}, seeder.errors)
+
+    async def test_invalid_sitemap_is_an_error(self) -> None:
+        # Arrange
+        seeder = self.create_seeder(
+            {
+                f"{BASE_URL}/sitemap.xml": httpx.Response(
+                    HTTPStatus.OK, content=b"<html><body>Not a sitemap</html>"
+                ),
+            }
+        )
+
+        # Act
+        urls = [url async for url in seeder.urls(BASE_URL)]
+
+        # Assert
+        self.assertEqual([], urls)
+        self.assertTrue(
+            seeder.errors[f"{BASE_URL}/sitemap.xml"].startswith("ParseError")
+        )
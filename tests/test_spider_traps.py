@@ -0,0 +1,135 @@
+import unittest
+
+from parameterized import parameterized
+
+from sitemappy.spider_traps import (
+    MAX_REPORTED_TEMPLATES,
+    SpiderTrapDetector,
+    TrapReason,
+    url_template,
+)
+
+BASE_URL = "https://monzo.com"
+
+
+class TestUrlTemplate(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            # (URL, Expected template)
+            (f"{BASE_URL}/about", f"{BASE_URL}/about"),
+            (f"{BASE_URL}/calendar/2024-05-12", f"{BASE_URL}/calendar/{{n}}"),
+            (f"{BASE_URL}/page/2", f"{BASE_URL}/page/{{n}}"),
+            (
+                f"{BASE_URL}/users/9f1c0b7e-64a2-4d1e-9a0b-2f6c3e8d1a55/posts",
+                f"{BASE_URL}/users/{{n}}/posts",
+            ),
+            (f"{BASE_URL}/cart;jsessionid=A1B2C3", f"{BASE_URL}/cart"),
+            (f"{BASE_URL}/search?colour=red&size=9", f"{BASE_URL}/search?colour&size"),
+            (f"{BASE_URL}/search?tag=a&tag=b", f"{BASE_URL}/search?tag"),
+            (f"{BASE_URL}/v2/card", f"{BASE_URL}/v2/card"),
+        ]
+    )
+    def test_url_template(self, url: str, expected: str) -> None:
+        # Act / Assert
+        self.assertEqual(expected, url_template(url))
+
+
+class TestSpiderTrapDetector(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            (f"{BASE_URL}/a/b/a/b/a/b/a/b", TrapReason.REPEATED_SEGMENTS),
+            (f"{BASE_URL}" + "/segment-{}" * 17, TrapReason.PATH_DEPTH),
+            (f"{BASE_URL}/search?q=" + "x" * 2048, TrapReason.URL_LENGTH),
+        ]
+    )
+    def test_trap_shaped_urls_are_suppressed(
+        self, url: str, reason: TrapReason
+    ) -> None:
+        # Arrange
+        detector = SpiderTrapDetector()
+
+        # Act
+        is_trap = detector.is_trap(url.format(*range(17)))
+
+        # Assert
+        self.assertTrue(is_trap)
+        self.assertEqual(1, detector.suppressed_total)
+        self.assertEqual([(reason, 1)], list(detector.suppressed.values()))
+
+    def test_urls_beyond_template_limit_are_suppressed(self) -> None:
+        # Arrange
+        detector = SpiderTrapDetector(max_urls_per_template=3)
+        months = [
+            f"{BASE_URL}/calendar?month=2024-{month:02}" for month in range(1, 13)
+        ]
+
+        # Act
+        traps = [detector.is_trap(url) for url in months]
+
+        # Assert
+        self.assertEqual([False] * 3 + [True] * 9, traps)
+        self.assertFalse(detector.is_trap(f"{BASE_URL}/about"))
+        self.assertEqual(
+            {
+                f"{BASE_URL}/calendar?month": (
+                    "Too many URLs sharing the template: 9 links suppressed"
+                )
+            },
+            detector.report(),
+        )
+
+    def test_faceted_search_combinations_are_suppressed(self) -> None:
+        # Arrange
+        detector = SpiderTrapDetector(max_urls_per_template=5)
+        facets = [
+            "brand",
+            "colour",
+            "fit",
+            "material",
+            "price",
+            "size",
+            "sort",
+            "style",
+        ]
+        combinations = [
+            "&".join(
+                f"{facet}=1" for bit, facet in enumerate(facets) if mask & (1 << bit)
+            )
+            for mask in range(1, 1 << len(facets))
+        ]
+
+        # Act
+        traps = [detector.is_trap(f"{BASE_URL}/shop?{query}") for query in combinations]
+
+        # Assert
+        self.assertEqual(5, traps.count(False))
+        self.assertEqual(
+            {
+                f"{BASE_URL}/shop": (
+                    "Too many query strings sharing the path: 250 links suppressed"
+                )
+            },
+            detector.report(),
+        )
+
+    def test_unlimited_urls_per_template(self) -> None:
+        # Arrange
+        detector = SpiderTrapDetector(max_urls_per_template=0)
+
+        # Act
+        traps = [detector.is_trap(f"{BASE_URL}/page/{page}") for page in range(5000)]
+
+        # Assert
+        self.assertFalse(any(traps))
+
+    def test_report_is_bounded(self) -> None:
+        # Arrange
+        detector = SpiderTrapDetector(max_path_depth=1)
+
+        # Act
+        for index in range(MAX_REPORTED_TEMPLATES + 10):
+            detector.is_trap(f"{BASE_URL}/section-{index:x}z/page")
+
+        # Assert
+        self.assertEqual(MAX_REPORTED_TEMPLATES + 10, detector.suppressed_total)
+        self.assertEqual(MAX_REPORTED_TEMPLATES, len(detector.report()))
@@ -0,0 +1,47 @@
+import unittest
+
+from parameterized import parameterized
+
+from sitemappy.urls import canonicalize_url
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            # (URL, Expected canonical URL)
+            ("https://monzo.com", "https://monzo.com/"),  # Empty path
+            ("https://monzo.com/", "https://monzo.com/"),  # Root path
+            ("https://monzo.com/careers/", "https://monzo.com/careers"),  # Trailing /
+            ("https://monzo.com/#careers", "https://monzo.com/"),  # Fragment
+            ("https://monzo.com#careers", "https://monzo.com/"),  # Fragment, no path
+            ("HTTPS://MONZO.com/Careers", "https://monzo.com/Careers"),  # Mixed case
+            ("https://monzo.com:443/careers", "https://monzo.com/careers"),
+            ("http://monzo.com:80/careers", "http://monzo.com/careers"),
+            ("https://monzo.com:8443/careers", "https://monzo.com:8443/careers"),
+            ("https://monzo.com/?b=2&a=1", "https://monzo.com/?a=1&b=2"),  # Query
+            ("https://monzo.com/?a=%20&&a=1", "https://monzo.com/?a=%20&a=1"),
+            ("https://user:pw@monzo.com/", "https://user:pw@monzo.com/"),
+            ("http://[::1]:8080/a/", "http://[::1]:8080/a"),  # IPv6
+        ]
+    )
+    def test_canonicalize_http_url(self, url: str, expected: str) -> None:
+        # Act
+        canonical_url = canonicalize_url(url)
+
+        # Assert
+        self.assertEqual(expected, canonical_url)
+
+    @parameterized.expand(  # type: ignore[misc]
+        [
+            "mailto:careers@monzo.com",
+            "+442038720620",
+            "ftp://monzo.com/file/",
+            "https://monzo.com:port/",  # Invalid port
+        ]
+    )
+    def test_non_http_url_unchanged(self, url: str) -> None:
+        # Act
+        canonical_url = canonicalize_url(url)
+
+        # Assert
+        self.assertEqual(url, canonical_url)
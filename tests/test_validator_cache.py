@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sitemappy.validator_cache import (
+    COMMIT_BATCH_SIZE,
+    CachedPage,
+    CacheStats,
+    ValidatorCache,
+    content_hash,
+)
+
+
+def cached_page(links: list[str], etag: str | None = '"v1"') -> CachedPage:
+    return CachedPage(
+        etag=etag,
+        last_modified=None,
+        content_hash=content_hash(b"<html></html>"),
+        content_length=13,
+        links=links,
+    )
+
+
+class TestValidatorCache(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        self.path = os.path.join(cache_directory.name, "cache.sqlite")
+
+    def test_cached_page_persists_across_crawls(self) -> None:
+        # Arrange
+        page = cached_page(["https://monzo.com/about"])
+        cache = ValidatorCache(self.path)
+        cache.put("https://monzo.com/", page)
+        cache.close()
+
+        # Act
+        reopened_cache = ValidatorCache(self.path)
+        self.addCleanup(reopened_cache.close)
+
+        # Assert
+        self.assertEqual(page, reopened_cache.get("https://monzo.com/"))
+        self.assertIsNone(reopened_cache.get("https://monzo.com/careers"))
+
+    def test_replacing_page_updates_size(self) -> None:
+        # Arrange
+        cache = ValidatorCache(self.path)
+        self.addCleanup(cache.close)
+        cache.put("https://monzo.com/", cached_page(["https://monzo.com/about"]))
+
+        # Act
+        cache.put("https://monzo.com/", cached_page([]))
+        cache.close()
+        reopened_cache = ValidatorCache(self.path)
+        self.addCleanup(reopened_cache.close)
+
+        # Assert
+        self.assertEqual(cache.size, reopened_cache.size)
+
+    def test_least_recently_used_pages_are_evicted(self) -> None:
+        # Arrange
+        urls = [f"https://monzo.com/page-{index}" for index in range(3)]
+        cache = ValidatorCache(self.path)
+        self.addCleanup(cache.close)
+        cache.put(urls[0], cached_page([]))
+        cache.max_bytes = cache.size * 2
+
+        # Act
+        cache.put(urls[1], cached_page([]))
+        cache.get(urls[0])
+        cache.put(urls[2], cached_page([]))
+
+        # Assert
+        self.assertIsNotNone(cache.get(urls[0]))
+        self.assertIsNone(cache.get(urls[1]))
+        self.assertIsNotNone(cache.get(urls[2]))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_uses_persist_across_crawls(self) -> None:
+        # Arrange
+        urls = [f"https://monzo.com/page-{index}" for index in range(3)]
+        cache = ValidatorCache(self.path)
+        cache.put(urls[0], cached_page([]))
+        cache.put(urls[1], cached_page([]))
+        cache.get(urls[0])
+        cache.close()
+
+        # Act
+        reopened_cache = ValidatorCache(self.path)
+        self.addCleanup(reopened_cache.close)
+        reopened_cache.max_bytes = reopened_cache.size
+        reopened_cache.put(urls[2], cached_page([]))
+
+        # Assert
+        self.assertIsNotNone(reopened_cache.get(urls[0]))
+        self.assertIsNone(reopened_cache.get(urls[1]))
+
+    def test_changes_are_committed_in_batches(self) -> None:
+        # Arrange
+        cache = ValidatorCache(self.path)
+        self.addCleanup(cache.close)
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+
+        def committed_pages() -> int:
+            return int(reader.execute("SELECT COUNT(*) FROM pages").fetchone()[0])
+
+        # Act
+        for index in range(COMMIT_BATCH_SIZE - 1):
+            cache.put(f"https://monzo.com/page-{index}", cached_page([]))
+        before_batch = committed_pages()
+        cache.get("https://monzo.com/page-0")
+        after_batch = committed_pages()
+
+        # Assert
+        self.assertEqual(0, before_batch)
+        self.assertEqual(COMMIT_BATCH_SIZE - 1, after_batch)
+
+    def test_conditional_headers(self) -> None:
+        # Arrange
+        page = cached_page([], etag='"v1"')
+        page.last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+        # Act / Assert
+        self.assertEqual(
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+            page.conditional_headers(),
+        )
+        self.assertEqual({}, cached_page([], etag=None).conditional_headers())
+
+    def test_hit_rate(self) -> None:
+        # Act / Assert
+        self.assertEqual(0.0, CacheStats().hit_rate)
+        self.assertEqual(0.75, CacheStats(hits=3, misses=1).hit_rate)